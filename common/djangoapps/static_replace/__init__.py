@@ -2,16 +2,19 @@
 
 import logging
 import re
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from django.contrib.staticfiles.storage import staticfiles_storage
 from opaque_keys.edx.locator import AssetLocator
 
+from openedx.core.lib.cache_utils import request_cached
 from xmodule.contentstore.content import StaticContent
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock/'
+ASSET_URL_CACHE_NAMESPACE = 'static_replace.asset_urls'
 
 
 def _url_replace_regex(prefix):
@@ -29,6 +32,24 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)  # noqa: UP032
 
 
+@lru_cache(maxsize=64)
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled _url_replace_regex for the given prefix.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_prefix_regex(static_url, data_dir):
+    """
+    The prefix of the urls handled by process_static_urls.
+    """
+    return '(?:{static_url}|/static/)(?!{data_dir})'.format(  # noqa: UP032
+        static_url=static_url,
+        data_dir=data_dir
+    )
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +91,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # pylint: di
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,42 +111,39 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
-def process_static_urls(text, replacement_function, data_dir=None):
+def _process_static_url(match, replacement_function):
     """
-    Run an arbitrary replacement function on any urls matching the static file
-    directory
+    Unwraps a match group for the captures specified in _url_replace_regex
+    and forward them on as function arguments
     """
-    def wrap_part_extraction(match):
-        """
-        Unwraps a match group for the captures specified in _url_replace_regex
-        and forward them on as function arguments
-        """
-        original = match.group(0)
-        prefix = match.group('prefix')
-        quote = match.group('quote')
-        rest = match.group('rest')
+    original = match.group(0)
+    prefix = match.group('prefix')
+    quote = match.group('quote')
+    rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
+    # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
+    # works for actual static assets and for magical course asset URLs....
+    full_url = prefix + rest
 
-        starts_with_static_url = full_url.startswith(str(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
-            return original
+    starts_with_static_url = full_url.startswith(str(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        return original
+
+    return replacement_function(original, prefix, quote, rest)
 
-        return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(  # noqa: UP032
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
+def process_static_urls(text, replacement_function, data_dir=None):
+    """
+    Run an arbitrary replacement function on any urls matching the static file
+    directory
+    """
+    return _compiled_url_replace_regex(_static_prefix_regex(settings.STATIC_URL, data_dir)).sub(
+        lambda match: _process_static_url(match, replacement_function),
         text
     )
 
@@ -147,34 +165,52 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(
-    text,
-    data_directory=None,
-    course_id=None,
-    static_asset_path='',
-    static_paths_out=None,
-    xblock=None,
-    lookup_asset_url=None
-):
+@request_cached(namespace=ASSET_URL_CACHE_NAMESPACE)
+def _course_asset_url(course_id, rest):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
+    Returns the url of the static file or course asset at the path `rest`.
 
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
-    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
-      * the original unmodified static URI
-      * the updated static URI (will match the original if unchanged)
-    xblock: xblock where the static assets are stored
-    lookup_url_func: Lookup function which returns the correct path of the asset
+    This is memoized for the duration of the request, since the same assets are
+    referenced from many blocks of a course, and each lookup may hit the
+    staticfiles storage and the contentstore.
     """
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
-    if static_paths_out is None:
-        static_paths_out = []
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+    except Exception as err:  # pylint: disable=broad-except
+        log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
+            rest, str(err)))
+
+    if exists_in_staticfiles_storage:
+        return staticfiles_storage.url(rest)
+
+    # if not, then assume it's courseware specific content and then look in the
+    # Mongo-backed database
+    # Import is placed here to avoid model import at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    base_url = AssetBaseUrlConfig.get_base_url()
+    excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+    url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+    if AssetLocator.CANONICAL_NAMESPACE in url:
+        url = url.replace('block@', 'block/', 1)
+    return url
+
+
+def _static_url_replacer(
+    data_directory,
+    course_id,
+    static_asset_path,
+    static_paths_out,
+    xblock,
+    lookup_asset_url
+):
+    """
+    Returns the replacement function used by replace_static_urls, see there for the arguments.
+    """
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -197,29 +233,7 @@ def replace_static_urls(
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(  # noqa: UP032
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = _course_asset_url(course_id, rest)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -239,4 +253,138 @@ def replace_static_urls(
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
+    return replace_static_url
+
+
+def replace_static_urls(
+    text,
+    data_directory=None,
+    course_id=None,
+    static_asset_path='',
+    static_paths_out=None,
+    xblock=None,
+    lookup_asset_url=None
+):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..) or by lookup_asset_url
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
+      * the original unmodified static URI
+      * the updated static URI (will match the original if unchanged)
+    xblock: xblock where the static assets are stored
+    lookup_url_func: Lookup function which returns the correct path of the asset
+    """
+
+    if static_paths_out is None:
+        static_paths_out = []
+
+    replace_static_url = _static_url_replacer(
+        data_directory, course_id, static_asset_path, static_paths_out, xblock, lookup_asset_url
+    )
     return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+class _OverlappingUrls(Exception):
+    """
+    Raised by replace_urls when rewriting a text in a single scan could differ
+    from rewriting each kind of url in turn.
+    """
+
+
+@lru_cache(maxsize=64)
+def _combined_url_regex(static_url, data_dir, with_jump_to_id):
+    """
+    Returns the compiled regexes used by replace_urls for the given configuration:
+
+    * the regex matching static, course and (optionally) jump_to_id urls in quotes,
+      with the same syntax as _url_replace_regex
+    * the regex matching the prefix of any of those urls
+    """
+    prefixes = [_static_prefix_regex(static_url, data_dir), '/course/']
+    if with_jump_to_id:
+        prefixes.append('/jump_to_id/')
+
+    url_regex = _url_replace_regex(
+        '(?P<static>{static})|(?P<course>/course/){jump_to_id}'.format(  # noqa: UP032
+            static=prefixes[0],
+            jump_to_id='|(?P<jump_to_id>/jump_to_id/)' if with_jump_to_id else '',
+        )
+    )
+    prefix_regex = '(?x)(?:{static_url}|/static/|/course/|/jump_to_id/)'.format(  # noqa: UP032
+        static_url=static_url
+    )
+    return re.compile(url_regex), re.compile(prefix_regex)
+
+
+def replace_urls(
+    text,
+    course_id,
+    data_directory=None,
+    static_asset_path='',
+    static_paths_out=None,
+    jump_to_id_base_url=None
+):
+    """
+    Rewrite static, course and jump_to_id urls in a single scan of text.
+
+    The result is the same as calling replace_static_urls, replace_course_urls and,
+    if jump_to_id_base_url is given, replace_jump_to_id_urls on text in turn. Texts
+    where those rewrites would interact, e.g. a url quoted inside another one, are
+    handed to those functions instead.
+    """
+    data_dir = static_asset_path or data_directory
+    url_regex, prefix_regex = _combined_url_regex(str(settings.STATIC_URL), data_dir, bool(jump_to_id_base_url))
+    course_url = '/courses/' + str(course_id) + '/'
+    found_static_paths = []
+    replace_static_url = _static_url_replacer(
+        data_directory, course_id, static_asset_path, found_static_paths, None, None
+    )
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to its prefix.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        # A quote in the url, or a url starting at the closing quote, means that the
+        # other rewrites could have matched a url overlapping this one.
+        if "'" in rest or '"' in rest or prefix_regex.match(text, match.end()):
+            raise _OverlappingUrls
+
+        if match.group('course'):
+            return "".join([quote, course_url, rest, quote])
+        if match.group('static') is None:
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+
+        replaced = _process_static_url(match, replace_static_url)
+        url = replaced[len(quote):len(replaced) - len(quote)]
+        # The rewritten static url would be rewritten again by the other rewrites.
+        if "'" in url or '"' in url or url.startswith(('/course/', '/jump_to_id/')):
+            raise _OverlappingUrls
+        return replaced
+
+    try:
+        text = url_regex.sub(replace_url, text)
+    except _OverlappingUrls:
+        text = replace_static_urls(
+            text,
+            data_directory=data_directory,
+            course_id=course_id,
+            static_asset_path=static_asset_path,
+            static_paths_out=static_paths_out,
+        )
+        text = replace_course_urls(text, course_id)
+        if jump_to_id_base_url:
+            text = replace_jump_to_id_urls(text, course_id, jump_to_id_base_url)
+        return text
+
+    if static_paths_out is not None:
+        static_paths_out.extend(found_static_paths)
+    return text
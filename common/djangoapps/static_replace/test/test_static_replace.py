@@ -8,17 +8,20 @@ from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
 import ddt
 import pytest
 from django.test import override_settings
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from web_fragments.fragment import Fragment
 
 from common.djangoapps.static_replace import (
+    ASSET_URL_CACHE_NAMESPACE,
     _url_replace_regex,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
     replace_jump_to_id_urls,
     replace_static_urls,
+    replace_urls,
 )
 from common.djangoapps.static_replace.services import ReplaceURLService
 from common.djangoapps.static_replace.wrapper import replace_urls_wrapper
@@ -43,6 +46,14 @@ COURSE_KEY = CourseKey.from_string('org/course/run')
 STATIC_SOURCE = '"/static/file.png"'
 
 
+@pytest.fixture(autouse=True)
+def clear_asset_url_cache():
+    """
+    Asset urls are memoized per request, which spans the tests of this module.
+    """
+    RequestCache(ASSET_URL_CACHE_NAMESPACE).clear()
+
+
 def encode_unicode_characters_in_url(url):
     """
     Encodes all Unicode characters to their percent-encoding representation
@@ -268,6 +279,65 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+def replace_urls_in_turn(text, course_id, data_directory=None, static_paths_out=None, jump_to_id_base_url=None):
+    """
+    Rewrite the urls in text with each of the replace_*_urls functions in turn.
+    """
+    text = replace_static_urls(text, data_directory, course_id, static_paths_out=static_paths_out)
+    text = replace_course_urls(text, course_id)
+    if jump_to_id_base_url:
+        text = replace_jump_to_id_urls(text, course_id, jump_to_id_base_url)
+    return text
+
+
+@pytest.mark.parametrize('text', [
+    STATIC_SOURCE,
+    '<a href="/course/file.png">',
+    '<a href="/jump_to_id/block_id">',
+    'EMBED src ="/static/LAlec04_controller.swf?csConfigFile=/static/LAlec04_config.xml&name1=value1"',
+    '<img src="/static/foo.png?raw"/><a href=\'/course/about\'><a href="/jump_to_id/id"><img src="/static/bar.png"/>',
+    '<img src="/static/xblock/resources/foo.png"/><a href="/course/about">',
+    '<a href="/course/about">"/static/foo.png"',
+    '<a href="/course/about"/static/foo.png">',
+    '<a href="/course/about \'/static/foo.png\' \'/jump_to_id/id\'">',
+    '<a href=\'/static/foo.png"/course/about"\'>',
+    '<a href="/static/data_dir/foo.png"><a href="/jump_to_id/id"/course/about">',
+    '<script>var url = \\"/static/foo.png\\"; var other = "/course/about";</script>',
+])
+@pytest.mark.parametrize('jump_to_id_base_url', [None, '/courses/org/course/run/jump_to_id/'])
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls_in_single_scan(mock_storage, jump_to_id_base_url, text):
+    """
+    Make sure replace_urls gives the same result as each of the replace_*_urls functions in turn.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    static_paths = []
+    expected_static_paths = []
+    expected = replace_urls_in_turn(
+        text, COURSE_KEY, DATA_DIRECTORY, expected_static_paths, jump_to_id_base_url=jump_to_id_base_url
+    )
+    assert replace_urls(
+        text, COURSE_KEY, DATA_DIRECTORY, static_paths_out=static_paths, jump_to_id_base_url=jump_to_id_base_url
+    ) == expected
+    assert static_paths == expected_static_paths
+
+
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls_memoizes_asset_urls(mock_storage):
+    """
+    Make sure the url of an asset is only looked up once per request.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/hashed/file.png'
+
+    assert replace_urls(STATIC_SOURCE, COURSE_KEY) == '"/static/hashed/file.png"'
+    assert replace_urls(STATIC_SOURCE + STATIC_SOURCE, COURSE_KEY) == '"/static/hashed/file.png"' * 2
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -621,11 +691,8 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         self.mock_replace_static_urls = self.create_patch(
             'common.djangoapps.static_replace.services.replace_static_urls'
         )
-        self.mock_replace_course_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_course_urls'
-        )
-        self.mock_replace_jump_to_id_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_jump_to_id_urls'
+        self.mock_replace_urls = self.create_patch(
+            'common.djangoapps.static_replace.services.replace_urls'
         )
 
     def create_patch(self, name):
@@ -641,40 +708,39 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
         assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert not self.mock_replace_urls.called
 
     def test_service_block_argument(self):
         """This service accepts either `block` or `xblock` keyword argument."""
         replace_url_service = ReplaceURLService(block=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
         assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert not self.mock_replace_urls.called
 
     def test_replace_course_urls_called(self):
         """
-        Test replace_course_urls method called static_replace_only is passed as False.
+        Test replace_urls method called static_replace_only is passed as False.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_course_urls.called
+        assert self.mock_replace_urls.called
+        assert not self.mock_replace_static_urls.called
 
     def test_replace_jump_to_id_urls_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is provided.
+        Test jump_to_id_base_url is passed to replace_urls when provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course, jump_to_id_base_url="/course/course_id")
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.kwargs['jump_to_id_base_url'] == "/course/course_id"
 
     def test_replace_jump_to_id_urls_not_called(self):
         """
-        Test replace_jump_to_id_urls method called jump_to_id_base_url is not provided.
+        Test jump_to_id_base_url is not passed to replace_urls when not provided.
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_urls.call_args.kwargs['jump_to_id_base_url'] is None
 
 
 @ddt.ddt
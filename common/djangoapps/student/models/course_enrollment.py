@@ -1426,6 +1426,11 @@ class CourseEnrollment(models.Model):
             enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
             cls._update_enrollment_state_in_cache(cache, record.user.id, course_key, enrollment_state)
 
+        # Users who were never enrolled have no record, which is cached as well.
+        for user in users:
+            if (user.id, course_key) not in cache:
+                cls._update_enrollment_state_in_cache(cache, user.id, course_key, CourseEnrollmentState(None, None))
+
     @classmethod
     def _get_mode_active_request_cache(cls):
         """
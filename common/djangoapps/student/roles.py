@@ -11,6 +11,7 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 
 from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.db.models import Q
 from opaque_keys.edx.django.models import CourseKeyField
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import CourseLocator
@@ -288,14 +289,37 @@ class BulkRoleCache:  # pylint: disable=missing-class-docstring
 
     CACHE_NAMESPACE = "student.roles.BulkRoleCache"
     CACHE_KEY = 'roles_by_user'
+    COURSE_IDS_CACHE_KEY = 'course_ids'
 
     @classmethod
-    def prefetch(cls, users):  # pylint: disable=missing-function-docstring
+    def prefetch(cls, users, course_keys=None):
+        """
+        Load the roles of the given users for the rest of the request, with a single query
+        for the legacy roles.
+
+        If `course_keys` is given, only the roles in those courses and the roles not tied to
+        a course (e.g. org-wide roles) are loaded. RoleCache loads a user's other roles when
+        a role in another course is checked.
+        """
+        if course_keys is None:
+            course_ids = None
+        else:
+            course_keys = list(course_keys)
+            course_ids = {get_role_cache_key_for_course(course_key) for course_key in course_keys}
+            course_ids.add(ROLE_CACHE_UNGROUPED_ROLES__KEY)
+
         roles_by_user = defaultdict(lambda: defaultdict(set))
-        get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY] = roles_by_user
+        cache = get_cache(cls.CACHE_NAMESPACE)
+        cache[cls.CACHE_KEY] = roles_by_user
+        cache[cls.COURSE_IDS_CACHE_KEY] = course_ids
 
         # Legacy roles
-        for role in CourseAccessRole.objects.filter(user__in=users).select_related('user'):
+        legacy_roles = CourseAccessRole.objects.filter(user__in=users)
+        if course_keys is not None:
+            legacy_roles = legacy_roles.filter(
+                Q(course_id__in=course_keys) | Q(course_id=CourseKeyField.Empty)
+            )
+        for role in legacy_roles.select_related('user'):
             user_id = role.user.id
             course_id = get_role_cache_key_for_course(role.course_id)
 
@@ -315,8 +339,10 @@ class BulkRoleCache:  # pylint: disable=missing-class-docstring
             compat_roles = get_authz_compat_course_access_roles_for_user(user)
             for role in compat_roles:
                 course_id = get_role_cache_key_for_course(role.course_id)
+                if course_ids is not None and course_id not in course_ids:
+                    continue
                 user_roles_set_for_course = roles_by_user[user.id][course_id]
-                user_roles_set_for_course.add(compat_role)
+                user_roles_set_for_course.add(role)
 
         users_without_roles = [u for u in users if u.id not in roles_by_user]
         for user in users_without_roles:
@@ -324,7 +350,24 @@ class BulkRoleCache:  # pylint: disable=missing-class-docstring
 
     @classmethod
     def get_user_roles(cls, user):
-        return get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY][user.id]
+        """
+        Return the prefetched roles of the user, keyed by course_id.
+
+        Raises KeyError if the roles of the user were not prefetched, so that RoleCache
+        loads them itself.
+        """
+        roles_by_user = get_cache(cls.CACHE_NAMESPACE)[cls.CACHE_KEY]
+        if user.id not in roles_by_user:
+            raise KeyError(user.id)
+        return roles_by_user[user.id]
+
+    @classmethod
+    def get_prefetched_course_ids(cls):
+        """
+        Return the cache keys of the courses whose roles were prefetched, or None if
+        the roles in all courses were.
+        """
+        return get_cache(cls.CACHE_NAMESPACE).get(cls.COURSE_IDS_CACHE_KEY)
 
 
 class RoleCache:
@@ -339,39 +382,73 @@ class RoleCache:
     _roles: This is a set of all roles for a user, ungrouped. It's used for some types of
         lookups and collected from _roles_by_course_id on initialization
         so that it doesn't need to be recalculated.
+    _role_keys: The (course_id, org, role) of each role, which has_role looks up.
+    _course_ids: The keys of the courses whose roles are in the cache, if BulkRoleCache
+        only prefetched some courses, or None if the cache has all the user's roles.
 
     """
     def __init__(self, user):
+        self._user = None
         try:
             self._roles_by_course_id = BulkRoleCache.get_user_roles(user)
+            self._course_ids = BulkRoleCache.get_prefetched_course_ids()
         except KeyError:
-            self._roles_by_course_id = {}
+            self._roles_by_course_id = self._load_roles(user)
+            self._course_ids = None
+        if self._course_ids is not None:
+            self._user = user
+        self._index_roles()
 
-            # openedx-authz compatibility implementation
-            compat_roles = get_authz_compat_course_access_roles_for_user(user)
-            for compat_role in compat_roles:
-                course_id = get_role_cache_key_for_course(compat_role.course_id)
-                if not self._roles_by_course_id.get(course_id):
-                    self._roles_by_course_id[course_id] = set()
-                self._roles_by_course_id[course_id].add(compat_role)
-
-            # legacy implementation
-            roles = CourseAccessRole.objects.filter(user=user).all()
-            for role in roles:
-                course_id = get_role_cache_key_for_course(role.course_id)
-                if not self._roles_by_course_id.get(course_id):
-                    self._roles_by_course_id[course_id] = set()
-                compat_role = AuthzCompatCourseAccessRole(
-                    user_id=user.id,
-                    username=user.username,
-                    org=role.org,
-                    course_id=role.course_id,
-                    role=role.role
-                )
-                self._roles_by_course_id[course_id].add(compat_role)
+    @staticmethod
+    def _load_roles(user):
+        """
+        Return all roles of the user, keyed by course_id.
+        """
+        roles_by_course_id = {}
+
+        # openedx-authz compatibility implementation
+        compat_roles = get_authz_compat_course_access_roles_for_user(user)
+        for compat_role in compat_roles:
+            course_id = get_role_cache_key_for_course(compat_role.course_id)
+            if not roles_by_course_id.get(course_id):
+                roles_by_course_id[course_id] = set()
+            roles_by_course_id[course_id].add(compat_role)
+
+        # legacy implementation
+        roles = CourseAccessRole.objects.filter(user=user).all()
+        for role in roles:
+            course_id = get_role_cache_key_for_course(role.course_id)
+            if not roles_by_course_id.get(course_id):
+                roles_by_course_id[course_id] = set()
+            compat_role = AuthzCompatCourseAccessRole(
+                user_id=user.id,
+                username=user.username,
+                org=role.org,
+                course_id=role.course_id,
+                role=role.role
+            )
+            roles_by_course_id[course_id].add(compat_role)
+        return roles_by_course_id
+
+    def _index_roles(self):
         self._roles = set()
         for roles_for_course in self._roles_by_course_id.values():
             self._roles.update(roles_for_course)
+        self._role_keys = {
+            (get_role_cache_key_for_course(access_role.course_id), access_role.org, access_role.role)
+            for access_role in self._roles
+        }
+
+    def _load_all_roles(self):
+        """
+        Load the roles of the courses that BulkRoleCache didn't prefetch.
+        """
+        if self._course_ids is None:
+            return
+        self._roles_by_course_id = self._load_roles(self._user)
+        self._course_ids = None
+        self._user = None
+        self._index_roles()
 
     @staticmethod
     def get_roles(role: str) -> set[str]:
@@ -382,10 +459,12 @@ class RoleCache:
 
     @property
     def all_roles_set(self):
+        self._load_all_roles()
         return self._roles
 
     @property
     def roles_by_course_id(self):
+        self._load_all_roles()
         return self._roles_by_course_id
 
     def has_role(self, role, course_id, org):
@@ -394,10 +473,11 @@ class RoleCache:
         or a role that inherits from the specified role, course_id and org.
         """
         course_id_string = get_role_cache_key_for_course(course_id)
-        course_roles = self._roles_by_course_id.get(course_id_string, [])
+        if self._course_ids is not None and course_id_string not in self._course_ids:
+            self._load_all_roles()
         return any(
-            access_role.role in self.get_roles(role) and access_role.org == org
-            for access_role in course_roles
+            (course_id_string, org, access_role) in self._role_keys
+            for access_role in self.get_roles(role)
         )
 
 
@@ -7,6 +7,7 @@ from unittest.mock import patch
 import ddt
 from django.contrib.auth.models import Permission
 from django.test import TestCase
+from edx_django_utils.cache import RequestCache
 from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
@@ -28,6 +29,7 @@ from common.djangoapps.student.role_helpers import get_course_roles, has_staff_r
 from common.djangoapps.student.roles import (
     ROLE_CACHE_UNGROUPED_ROLES__KEY,
     AuthzCompatCourseAccessRole,
+    BulkRoleCache,
     CourseAccessRole,
     CourseBetaTesterRole,
     CourseCreatorRole,
@@ -503,6 +505,50 @@ class RoleCacheTestCase(TestCase):  # pylint: disable=missing-class-docstring
         assert roles_dict.get('course-v1:edX+toy2+2013_Fall').pop().course_id.course == 'toy2'
 
 
+class BulkRoleCacheTestCase(TestCase):
+    """
+    Tests of BulkRoleCache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        self.course_key = CourseKey.from_string('course-v1:edX+toy+2012_Fall')
+        self.other_course_key = CourseKey.from_string('course-v1:edX+toy+2013_Fall')
+        self.users = [UserFactory() for __ in range(3)]
+        CourseStaffRole(self.course_key).add_users(self.users[0])
+        CourseInstructorRole(self.other_course_key).add_users(self.users[0])
+        OrgStaffRole('edX').add_users(self.users[1])
+
+    def test_prefetch(self):
+        BulkRoleCache.prefetch(self.users)
+        with self.assertNumQueries(0):
+            caches = [RoleCache(user) for user in self.users]
+            assert caches[0].has_role('staff', self.course_key, 'edX')
+            assert caches[0].has_role('instructor', self.other_course_key, 'edX')
+            assert caches[1].has_role('staff', None, 'edX')
+            assert not caches[2].has_role('staff', self.course_key, 'edX')
+
+    def test_prefetch_courses(self):
+        BulkRoleCache.prefetch(self.users, course_keys=[self.course_key])
+        with self.assertNumQueries(0):
+            caches = [RoleCache(user) for user in self.users]
+            assert caches[0].has_role('staff', self.course_key, 'edX')
+            assert caches[1].has_role('staff', None, 'edX')
+            assert not caches[2].has_role('staff', self.course_key, 'edX')
+
+        # The roles in other courses are loaded when they are needed.
+        assert caches[0].has_role('instructor', self.other_course_key, 'edX')
+        assert len(caches[0].all_roles_set) == 2
+
+    def test_prefetch_other_users(self):
+        BulkRoleCache.prefetch(self.users[1:], course_keys=[self.course_key])
+        # The roles of users that were not prefetched are loaded for them.
+        cache = RoleCache(self.users[0])
+        assert cache.has_role('staff', self.course_key, 'edX')
+        assert cache.has_role('instructor', self.other_course_key, 'edX')
+
+
 class CourseAccessRoleHistoryTest(TestCase):
     """
     Tests for the CourseAccessRoleHistory model and associated signals/admin actions.
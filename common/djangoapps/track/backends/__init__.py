@@ -25,3 +25,8 @@ class BaseBackend(metaclass=abc.ABCMeta):
     def send(self, event):
         """Send event to tracker."""
         pass  # pylint: disable=unnecessary-pass
+
+    def send_many(self, events):
+        """Send a batch of events to tracker, one at a time unless the backend can do better."""
+        for event in events:
+            self.send(event)
@@ -0,0 +1,221 @@
+"""
+Event tracker backend that sends events to another backend in batches, from a background thread.
+
+The backend wraps any other backend, configured as in TRACKING_BACKENDS::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'common.djangoapps.track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'common.djangoapps.track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...},
+              },
+              'max_queue_size': 10000,
+              'overflow': 'drop',
+          }
+      }
+  }
+
+"""
+
+
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from edx_django_utils.monitoring import set_custom_attribute
+
+from common.djangoapps.track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+OVERFLOW_DROP = 'drop'
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_SAMPLE = 'sample'
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_SAMPLE)
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events and sends them to another backend
+    in batches from a background thread, so that requests don't wait for them
+    to be serialized and written.
+
+    The queue is bounded: when it is full, events are dropped, or the request
+    waits up to `block_timeout` seconds for room with the 'block' overflow
+    policy. With the 'sample' policy, only a `sample_rate` fraction of the
+    events is kept once the queue is half full. Queued events are flushed when
+    the process exits.
+    """
+
+    def __init__(
+        self,
+        backend,
+        max_queue_size=10000,
+        batch_size=100,
+        flush_interval=1.0,
+        overflow=OVERFLOW_DROP,
+        block_timeout=1.0,
+        sample_rate=0.1,
+        **kwargs
+    ):
+        """
+        :Parameters:
+          - `backend`: the backend events are sent to, as a dict with its
+            `ENGINE` and `OPTIONS`.
+          - `max_queue_size`: number of events queued before the overflow
+            policy applies.
+          - `batch_size`: largest number of events sent in a batch.
+          - `flush_interval`: longest time, in seconds, an event waits for a
+            batch to fill up.
+          - `overflow`: what happens to events when the queue is full: 'drop',
+            'block' or 'sample'.
+          - `block_timeout`: longest time, in seconds, a request waits for
+            room in the queue with the 'block' policy.
+          - `sample_rate`: fraction of events kept once the queue is half
+            full with the 'sample' policy.
+
+        """
+        super().__init__(**kwargs)  # pylint: disable=super-with-arguments
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Invalid overflow policy {overflow} for the buffered event track backend')
+
+        # Imported here, as the tracker module initializes its backends when it is imported.
+        from common.djangoapps.track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+
+        self.dropped = 0
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def queue_depth(self):
+        """Number of events waiting to be sent."""
+        return self._queue.qsize() if self._queue else 0
+
+    def send(self, event):
+        """Queue the event, to be sent by the background thread."""
+        event_queue = self._ensure_worker()
+        if self._accept(event_queue):
+            try:
+                if self.overflow == OVERFLOW_BLOCK:
+                    event_queue.put(event, timeout=self.block_timeout)
+                else:
+                    event_queue.put_nowait(event)
+            except queue.Full:
+                self._drop()
+        else:
+            self._drop()
+
+        set_custom_attribute('track_buffered_queue_depth', event_queue.qsize())
+        set_custom_attribute('track_buffered_dropped', self.dropped)
+
+    def _accept(self, event_queue):
+        """
+        Return whether the sample overflow policy keeps the next event.
+        """
+        if self.overflow != OVERFLOW_SAMPLE or event_queue.qsize() < self.max_queue_size // 2:
+            return True
+        return random.random() < self.sample_rate
+
+    def _drop(self):
+        with self._lock:
+            self.dropped += 1
+            dropped = self.dropped
+        # Log the first drop and then one in every thousand, to avoid flooding the logs.
+        if dropped % 1000 == 1:
+            log.warning('Event tracking queue is full, %d events dropped so far', dropped)
+
+    def _ensure_worker(self):
+        """
+        Return the queue of events, starting the background thread that drains it if needed.
+
+        The thread is started in the process that sends events, since threads
+        don't survive forks of worker processes; a forked process gets its own
+        queue, as the parent's may have been locked at the time of the fork.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return self._queue
+        with self._lock:
+            if self._pid != pid:
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._worker = threading.Thread(
+                    target=self._run, args=(self._queue,), name='track-buffered-backend', daemon=True,
+                )
+                self._worker.start()
+                self._pid = pid
+        return self._queue
+
+    def _run(self, event_queue):
+        """
+        Send the queued events in batches until the queue is closed.
+        """
+        closed = False
+        while not closed:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    event = event_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is None:
+                    event_queue.task_done()
+                    closed = True
+                    break
+                batch.append(event)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            self._send_batch(batch)
+            for _ in batch:
+                event_queue.task_done()
+
+    def _send_batch(self, batch):
+        if not batch:
+            return
+        try:
+            self.backend.send_many(batch)
+        except Exception:  # pylint: disable=broad-except
+            # The background thread must keep running, whatever the backend raises.
+            log.exception('Error sending %d events to the buffered event track backend', len(batch))
+
+    def flush(self):
+        """Wait until all the queued events have been sent."""
+        if self._queue and self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self, timeout=5.0):
+        """
+        Send the queued events and stop the background thread, waiting up to `timeout` seconds.
+        """
+        with self._lock:
+            if self._pid != os.getpid() or not self._worker.is_alive():
+                return
+            event_queue, worker = self._queue, self._worker
+            self._pid = None
+        try:
+            event_queue.put(None, timeout=timeout)
+        except queue.Full:
+            log.warning('Event tracking queue is still full at shutdown, %d events lost', event_queue.qsize())
+            return
+        worker.join(timeout)
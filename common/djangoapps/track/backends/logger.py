@@ -1,13 +1,12 @@
 """Event tracker backend that saves events to a python logger."""
 
 
-import json
 import logging
 
 from django.conf import settings
 
 from common.djangoapps.track.backends import BaseBackend
-from common.djangoapps.track.utils import DateTimeJSONEncoder
+from common.djangoapps.track.utils import encode_event
 
 log = logging.getLogger('common.djangoapps.track.backends.logger')
 application_log = logging.getLogger('common.djangoapps.track.backends.application_log')  # pylint: disable=invalid-name
@@ -33,8 +32,26 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_many(self, events):
+        """
+        Serialize all the events before logging them, so that a batch is written in one go.
+
+        Each event is still logged as its own record, since handlers such as
+        SysLogHandler frame one record per message.
+        """
+        event_strs = [self._serialize(event) for event in events]
+        for event_str in event_strs:
+            self.event_logger.info(event_str)
+
+    @staticmethod
+    def _serialize(event):
+        """
+        Return the event as a JSON string, truncated to TRACK_MAX_EVENT characters.
+        """
         try:
-            event_str = json.dumps(event, cls=DateTimeJSONEncoder)
+            event_str = encode_event(event)
         except UnicodeDecodeError:
             application_log.exception(
                 "UnicodeDecodeError Event_data: %r", event
@@ -44,6 +61,4 @@ class LoggerBackend(BaseBackend):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
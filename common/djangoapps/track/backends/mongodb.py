@@ -98,3 +98,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert a batch of events in to the Mongo collection with a single request"""
+        try:
+            # insert_many adds an _id to the documents it inserts, so insert copies
+            # to leave the events, which other backends may share, untouched.
+            self.collection.insert_many([dict(event) for event in events], ordered=False)
+        except (PyMongoError, BSONError):
+            # As in send, the events of a failed batch are lost.
+            msg = 'Error inserting %d events to MongoDB event tracker backend'
+            log.exception(msg, len(events))
@@ -0,0 +1,114 @@
+"""Tests for the buffered event tracker backend."""
+
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from common.djangoapps.track.backends import BaseBackend
+from common.djangoapps.track.backends.buffered import BufferedBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend that records the batches of events it is sent, optionally waiting to be released."""
+
+    def __init__(self, blocking=False, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.sending = threading.Event()
+        self.released = threading.Event()
+        if not blocking:
+            self.released.set()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.sending.set()
+        self.released.wait(5)
+        self.batches.append(list(events))
+
+
+def make_backend(blocking=False, **options):
+    options.setdefault('flush_interval', 0.01)
+    return BufferedBackend(
+        backend={
+            'ENGINE': 'common.djangoapps.track.backends.tests.test_buffered.RecordingBackend',
+            'OPTIONS': {'blocking': blocking},
+        },
+        **options
+    )
+
+
+def fill_queue(backend, count):
+    """
+    Send an event that the blocking wrapped backend holds on to, then `count` more events.
+    """
+    backend.send({'event': 'held'})
+    assert backend.backend.sending.wait(5)
+    for index in range(count):
+        backend.send({'event': index})
+
+
+def test_events_are_sent_in_batches():
+    backend = make_backend(batch_size=3, flush_interval=0.01)
+    events = [{'event': index} for index in range(7)]
+    for event in events:
+        backend.send(event)
+    backend.flush()
+
+    batches = backend.backend.batches
+    assert all(len(batch) <= 3 for batch in batches)
+    assert [event for batch in batches for event in batch] == events
+    assert backend.queue_depth == 0
+    backend.close()
+
+
+def test_overflow_drop():
+    backend = make_backend(blocking=True, max_queue_size=2)
+    fill_queue(backend, 5)
+    assert backend.queue_depth == 2
+    assert backend.dropped == 3
+
+    backend.backend.released.set()
+    backend.close()
+    assert [event for batch in backend.backend.batches for event in batch] == [
+        {'event': 'held'}, {'event': 0}, {'event': 1},
+    ]
+
+
+def test_overflow_block():
+    backend = make_backend(blocking=True, max_queue_size=1, overflow='block', block_timeout=0.01)
+    fill_queue(backend, 2)
+    assert backend.queue_depth == 1
+    assert backend.dropped == 1
+    backend.backend.released.set()
+    backend.close()
+
+
+@patch('common.djangoapps.track.backends.buffered.random.random', return_value=0.5)
+def test_overflow_sample(_mock_random):
+    backend = make_backend(blocking=True, max_queue_size=4, overflow='sample', sample_rate=0.1)
+    fill_queue(backend, 4)
+    # Once the queue is half full, events are kept with a probability of 0.1.
+    assert backend.queue_depth == 2
+    assert backend.dropped == 2
+    backend.backend.released.set()
+    backend.close()
+
+
+def test_close_sends_queued_events():
+    backend = make_backend(batch_size=100, flush_interval=60)
+    backend.send({'event': 1})
+    backend.send({'event': 2})
+    worker = backend._worker  # pylint: disable=protected-access
+    backend.close()
+
+    assert not worker.is_alive()
+    assert backend.backend.batches == [[{'event': 1}, {'event': 2}]]
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        make_backend(overflow='invalid')
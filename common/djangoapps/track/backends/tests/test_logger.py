@@ -35,3 +35,18 @@ def test_logger_backend(caplog):
 
     assert saved_events[0] == unpacked_event
     assert saved_events[1] == unpacked_event
+
+
+def test_logger_backend_send_many(caplog):
+    """
+    Send a batch of events and check that each was recorded by the logger.
+    """
+    caplog.set_level(logging.INFO)
+    logger_name = 'common.djangoapps.track.backends.logger.test'
+    backend = LoggerBackend(name=logger_name)
+    events = [{'test': index, 'date': datetime.date(2012, 5, 7)} for index in range(3)]
+
+    backend.send_many(events)
+
+    saved_events = [json.loads(e[2]) for e in caplog.record_tuples if e[0] == logger_name]
+    assert saved_events == [{'test': index, 'date': '2012-05-07'} for index in range(3)]
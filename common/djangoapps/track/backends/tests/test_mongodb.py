@@ -37,3 +37,13 @@ class TestMongoBackend(TestCase):  # pylint: disable=missing-class-docstring
 
         assert events[0] == first_argument(calls[0])
         assert events[1] == first_argument(calls[1])
+
+    def test_mongo_backend_send_many(self):
+        events = [{'test': 1}, {'test': 2}]
+
+        self.backend.send_many(events)
+
+        # The events are inserted with a single request, as copies.
+        self.backend.collection.insert_many.assert_called_once_with(events, ordered=False)
+        inserted_events = self.backend.collection.insert_many.call_args[0][0]
+        assert all(inserted is not event for inserted, event in zip(inserted_events, events))
@@ -0,0 +1,161 @@
+"""
+Command to measure the cost of processing and encoding tracking events.
+"""
+
+
+import copy
+import json
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.djangoapps.track.shim import GoogleAnalyticsProcessor, LegacyFieldMappingProcessor, PrefixedEventProcessor
+from common.djangoapps.track.utils import DateTimeJSONEncoder, encode_event
+
+COURSE_ID = 'course-v1:edX+BenchmarkEventEncoding+run'
+REQUEST_CONTEXT = {
+    'course_id': COURSE_ID,
+    'org_id': 'edX',
+    'enterprise_uuid': '',
+    'session': '0123456789abcdef0123456789abcdef',
+    'user_id': 12345,
+    'username': 'benchmark_user',
+    'ip': '203.0.113.7',
+    'host': 'courses.example.com',
+    'agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'path': f'/courses/{COURSE_ID}/xblock/block-v1:edX+BenchmarkEventEncoding+run+type@video+block@intro/handler',
+    'referer': f'https://courses.example.com/courses/{COURSE_ID}/courseware/week_1/',
+    'accept_language': 'en-US,en;q=0.9',
+    'client_id': '1033501218.1368477899',
+}
+
+
+def representative_events():
+    """
+    Return events shaped as the tracker emits them: a server request, a browser video
+    event with a JSON payload, a mobile video event that is transformed to the legacy
+    format, and a problem check with nested data.
+    """
+    timestamp = datetime(2024, 5, 1, 7, 27, 10, 20000, tzinfo=timezone.utc)
+    return {
+        'server': {
+            'name': REQUEST_CONTEXT['path'],
+            'timestamp': timestamp,
+            'context': dict(REQUEST_CONTEXT, event_source='server', page=None),
+            'data': '{"GET": {}, "POST": {"position": ["3"]}}',
+        },
+        'browser_video': {
+            'name': 'play_video',
+            'timestamp': timestamp,
+            'context': dict(REQUEST_CONTEXT, event_source='browser', page=REQUEST_CONTEXT['referer']),
+            'data': {'id': 'intro', 'code': 'html5', 'currentTime': 12.5, 'duration': 330.2},
+        },
+        'mobile_video': {
+            'name': 'edx.video.position.changed',
+            'timestamp': timestamp,
+            'context': dict(REQUEST_CONTEXT, event_source='mobile', page=None),
+            'data': {
+                'module_id': 'block-v1:edX+BenchmarkEventEncoding+run+type@video+block@intro',
+                'current_time': 12.5,
+                'old_time': 10.0,
+                'new_time': 42.0,
+                'seek_type': 'slide',
+                'code': 'mobile',
+            },
+        },
+        'problem_check': {
+            'name': 'problem_check',
+            'timestamp': timestamp,
+            'context': dict(REQUEST_CONTEXT, event_source='server', page='x_module', module={
+                'display_name': 'Checkpoint',
+                'usage_key': 'block-v1:edX+BenchmarkEventEncoding+run+type@problem+block@checkpoint',
+            }),
+            'data': {
+                'answers': {f'checkpoint_2_{index}': f'choice_{index}' for index in range(1, 6)},
+                'correct_map': {
+                    f'checkpoint_2_{index}': {'correctness': 'correct', 'npoints': None, 'hint': ''}
+                    for index in range(1, 6)
+                },
+                'grade': 5,
+                'max_grade': 5,
+                'attempts': 1,
+                'submission_time': datetime(2024, 5, 1, 7, 27, 9),
+                'success': 'correct',
+            },
+        },
+    }
+
+
+class Command(BaseCommand):
+    """
+    Processes representative tracking events with the shim processors of the tracking
+    logs and segment backends, encodes them as the tracking log backends do, and
+    reports the time taken per event by each step:
+
+    * tracking_logs: LegacyFieldMappingProcessor and PrefixedEventProcessor.
+    * segment: GoogleAnalyticsProcessor.
+    * json.dumps: json.dumps(event, cls=DateTimeJSONEncoder), the previous encoding.
+    * encode_event: the encoding used by the tracking log backends.
+
+    The command fails if the two encodings of an event differ.
+
+    Example usage:
+        $ ./manage.py lms benchmark_event_encoding --iterations 20000 --settings=devstack
+    """
+    help = 'Measures the cost of processing and encoding tracking events.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            help='Number of times each event is processed and encoded.',
+            default=20000,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options['iterations'], 1)
+        legacy_processors = [LegacyFieldMappingProcessor(), PrefixedEventProcessor()]
+        google_analytics_processor = GoogleAnalyticsProcessor()
+
+        self.stdout.write(f'{iterations} iterations, microseconds per event')
+        self.stdout.write(
+            f'{"event":<16}{"bytes":>8}{"tracking_logs":>15}{"segment":>10}{"json.dumps":>12}{"encode_event":>14}'
+        )
+        for name, event in representative_events().items():
+            def process_legacy(event=event):
+                processed = copy.deepcopy(event)
+                for processor in legacy_processors:
+                    processed = processor(processed) or processed
+                return processed
+
+            processed = process_legacy()
+            encoded = encode_event(processed)
+            if encoded != json.dumps(processed, cls=DateTimeJSONEncoder):
+                raise CommandError(f'The encodings of the {name} event differ')
+
+            # The event is deep copied before it is processed, as the processors change it,
+            # so the time taken by the copy is measured and subtracted.
+            copy_elapsed = self._time(lambda event=event: copy.deepcopy(event), iterations)
+            legacy_elapsed = self._time(process_legacy, iterations) - copy_elapsed
+            segment_elapsed = self._time(lambda event=event: google_analytics_processor(event), iterations)
+            dumps_elapsed = self._time(
+                lambda processed=processed: json.dumps(processed, cls=DateTimeJSONEncoder), iterations,
+            )
+            encode_elapsed = self._time(lambda processed=processed: encode_event(processed), iterations)
+            self.stdout.write('{:<16}{:>8}{:>15.2f}{:>10.2f}{:>12.2f}{:>14.2f}'.format(  # noqa: UP032
+                name, len(encoded),
+                *(max(elapsed, 0) / iterations * 1e6 for elapsed in (
+                    legacy_elapsed, segment_elapsed, dumps_elapsed, encode_elapsed,
+                )),
+            ))
+
+    @staticmethod
+    def _time(func, iterations):
+        """
+        Return the time taken to call func the given number of times.
+        """
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return time.perf_counter() - start
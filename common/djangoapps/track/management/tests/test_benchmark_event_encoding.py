@@ -0,0 +1,21 @@
+"""
+Tests for the benchmark_event_encoding management command.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class BenchmarkEventEncodingTest(TestCase):
+    """
+    Test the benchmark_event_encoding management command.
+    """
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_event_encoding', iterations=10, stdout=out)
+        lines = out.getvalue().splitlines()
+        assert lines[0] == '10 iterations, microseconds per event'
+        assert [line.split()[0] for line in lines[2:]] == ['server', 'browser_video', 'mobile_video', 'problem_check']
@@ -72,8 +72,8 @@ class TrackMiddleware(MiddlewareMixin):
                     get_dict[string] = '*' * 8
 
             event = {
-                'GET': dict(get_dict),
-                'POST': dict(post_dict),
+                'GET': get_dict,
+                'POST': post_dict,
             }
 
             # TODO: Confirm no large file uploads
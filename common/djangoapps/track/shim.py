@@ -2,6 +2,7 @@
 
 
 import json
+from functools import lru_cache
 
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
@@ -18,6 +19,10 @@ CONTEXT_FIELDS_TO_INCLUDE = [
     'accept_language'
 ]
 
+# These fields are present elsewhere in the event once they are moved out of the context,
+# and client_id is only used for Segment web analytics and does not concern researchers.
+CONTEXT_FIELDS_TO_REMOVE = frozenset(CONTEXT_FIELDS_TO_INCLUDE + ['client_id'])
+
 
 class LegacyFieldMappingProcessor:
     """Ensures all required fields are included in emitted events"""
@@ -67,13 +72,8 @@ def remove_shim_context(event):
     """
     if 'context' in event:
         context = event['context']
-        # These fields are present elsewhere in the event at this point
-        context_fields_to_remove = set(CONTEXT_FIELDS_TO_INCLUDE)
-        # This field is only used for Segment web analytics and does not concern researchers
-        context_fields_to_remove.add('client_id')
-        for field in context_fields_to_remove:
-            if field in context:
-                del context[field]
+        for field in CONTEXT_FIELDS_TO_REMOVE:
+            context.pop(field, None)
 
 
 class GoogleAnalyticsProcessor:
@@ -88,21 +88,32 @@ class GoogleAnalyticsProcessor:
         copied_event = event.copy()
         if course_id is not None:
             copied_event['label'] = course_id
-            # The value stored as course_id is not always a courserun_key.
-            # It may, for example, be a library instead.  So we parse it first to be sure.
             # We add a str() call to the input so that sentinel values don't cause
             # CourseKey to spit up with a different error.
-            try:
-                courserun_key = CourseKey.from_string(str(course_id))
-                copied_event['courserun_key'] = str(courserun_key)
-            except InvalidKeyError:
-                pass
+            courserun_key = _courserun_key(str(course_id))
+            if courserun_key is not None:
+                copied_event['courserun_key'] = courserun_key
 
         copied_event['nonInteraction'] = 1
 
         return copied_event
 
 
+@lru_cache(maxsize=1024)
+def _courserun_key(course_id):
+    """
+    Return the course run key of the course_id of an event, or None if it isn't one.
+
+    The value stored as course_id is not always a courserun_key. It may, for example,
+    be a library instead.  So we parse it first to be sure. Parsed keys are cached, as
+    most events of a process are about a few courses.
+    """
+    try:
+        return str(CourseKey.from_string(course_id))
+    except InvalidKeyError:
+        return None
+
+
 class PrefixedEventProcessor:
     """
     Process any events whose name or prefix (ending with a '.') is registered
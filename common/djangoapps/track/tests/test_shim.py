@@ -6,6 +6,7 @@ from unittest.mock import sentinel
 
 import ddt
 import pytest
+from django.test import TestCase
 from django.test.utils import override_settings
 from opaque_keys.edx.locator import CourseLocator  # pylint: disable=wrong-import-order
 
@@ -281,6 +282,7 @@ class EventTransformerRegistryTestCase(EventTrackingTestCase):
     @ddt.data(
         'edx.ui.lms.sequence.next_selected.what',
         'edx',
+        'edx.video',
         'unregistered_event',
     )
     def test_dispatch_to_nonexistent_events(self, event_name):
@@ -289,6 +291,37 @@ class EventTransformerRegistryTestCase(EventTrackingTestCase):
             self.registry.create_transformer(event)
 
 
+@ddt.ddt
+class DottedPathMappingTestCase(TestCase):
+    """
+    Test the lookup of exact and prefix keys in DottedPathMapping
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.mapping = transformers.DottedPathMapping()
+        self.mapping['edx.'] = 'edx'
+        self.mapping['edx.video.'] = 'video'
+        self.mapping['edx.video.played'] = 'played'
+        self.mapping['.'] = 'dot'
+
+    @ddt.data(
+        ('edx.video.played', 'played'),
+        ('edx.video.played.again', 'video'),
+        ('edx.video.paused', 'video'),
+        ('edx.videos.paused', 'edx'),
+        ('edx.ui', 'edx'),
+        ('.hidden', 'dot'),
+    )
+    @ddt.unpack
+    def test_longest_match(self, key, expected_value):
+        assert self.mapping[key] == expected_value
+
+    @ddt.data('edx', 'edxvideo.played', 'unregistered', None)
+    def test_no_match(self, key):
+        assert key not in self.mapping
+
+
 @ddt.ddt
 class PrefixedEventProcessorTestCase(EventTrackingTestCase):
     """
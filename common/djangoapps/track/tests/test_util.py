@@ -6,7 +6,7 @@ from zoneinfo import ZoneInfo
 
 from django.test import TestCase
 
-from common.djangoapps.track.utils import DateTimeJSONEncoder
+from common.djangoapps.track.utils import DateTimeJSONEncoder, encode_event
 
 
 class TestDateTimeJSONEncoder(TestCase):  # pylint: disable=missing-class-docstring
@@ -36,3 +36,13 @@ class TestDateTimeJSONEncoder(TestCase):  # pylint: disable=missing-class-docstr
         assert from_json['a_datetime'] == an_iso_datetime
         assert from_json['a_tz_datetime'] == an_iso_datetime
         assert from_json['a_date'] == an_iso_date
+
+    def test_encode_event(self):
+        event = {
+            'name': 'problem_check',
+            'time': datetime(2012, 5, 1, 7, 27, 10, 20000),
+            'date': datetime(2012, 5, 1).date(),
+            'event': {'answers': {'1_2_1': ['choice_0', 'choice_é']}, 'grade': 1.5, 'hint': None},
+        }
+
+        assert encode_event(event) == json.dumps(event, cls=DateTimeJSONEncoder)
@@ -26,12 +26,10 @@ class DottedPathMapping:
     be used.
     """
 
-    # TODO: The current implementation of the prefix registry requires
-    # O(number of prefix event transformers) to access an event.  If we get a
-    # large number of EventTransformers, it may be worth writing a tree-based
-    # map structure where each node is a segment of the match key, which would
-    # reduce access time to O(len(match.key.split('.'))), or essentially constant
-    # time.
+    # Prefixes are looked up by the dotted prefixes of the key, from the
+    # longest, so access time is O(len(key.split('.'))) rather than
+    # O(number of prefix event transformers), which matters as every tracked
+    # event is looked up, and most events don't match any transformer.
 
     def __init__(self, registry=None):
         self._match_registry = {}
@@ -49,10 +47,14 @@ class DottedPathMapping:
         if key in self._match_registry:
             return self._match_registry[key]
         if isinstance(key, str):
-            # Reverse-sort the keys to find the longest matching prefix.
-            for prefix in sorted(self._prefix_registry, reverse=True):
-                if key.startswith(prefix):
+            # Prefixes end with a dot, so the longest matching prefix is the
+            # longest prefix of the key ending at one of its dots.
+            index = key.rfind('.')
+            while index >= 0:
+                prefix = key[:index + 1]
+                if prefix in self._prefix_registry:
                     return self._prefix_registry[prefix]
+                index = key.rfind('.', 0, index)
         raise KeyError(f'Key {key} not found in {type(self)}')
 
     def __setitem__(self, key, value):
@@ -29,3 +29,15 @@ class DateTimeJSONEncoder(json.JSONEncoder):
             return obj.isoformat()
 
         return super().default(obj)  # pylint: disable=super-with-arguments
+
+
+# Events are encoded by a single encoder, rather than by a new encoder for each
+# event as json.dumps(event, cls=DateTimeJSONEncoder) does. Its output is the same.
+_EVENT_ENCODER = DateTimeJSONEncoder()
+
+
+def encode_event(event):
+    """
+    Return the JSON encoding of the event, as json.dumps(event, cls=DateTimeJSONEncoder) does.
+    """
+    return _EVENT_ENCODER.encode(event)
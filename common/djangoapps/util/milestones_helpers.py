@@ -379,6 +379,25 @@ def get_course_content_milestones(course_id, content_id=None, relationship='requ
     return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == str(content_id)]
 
 
+def bulk_cache_course_content_milestones(course_id, user_ids, relationship='requires'):
+    """
+    Caches the given users' content milestones of the course in the request
+    cache used by get_course_content_milestones, when no content in the course
+    has milestones of the given relationship, so that no user has any either.
+
+    Otherwise, each user's milestones are still fetched when first needed.
+    """
+    if not ENABLE_MILESTONES_APP.is_enabled():
+        return
+
+    if milestones_api.get_course_content_milestones(course_id, None, relationship):
+        return
+
+    request_cache_dict = get_cache(REQUEST_CACHE_NAME)
+    for user_id in user_ids:
+        request_cache_dict.setdefault(user_id, {})[relationship] = []
+
+
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
     """
     Removes the specified User-Milestone link from the system for the specified course content module.
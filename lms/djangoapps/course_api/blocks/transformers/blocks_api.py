@@ -34,6 +34,7 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
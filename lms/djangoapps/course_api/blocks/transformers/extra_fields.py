@@ -17,6 +17,7 @@ class ExtraFieldsTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -0,0 +1,310 @@
+"""
+Command to benchmark the course_blocks transformer pipeline.
+"""
+
+
+import time
+import timeit
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from ccx_keys.locator import CCXLocator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.locator import CourseLocator
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.roles import CourseStaffRole
+from lms.djangoapps.ccx.models import CustomCourseForEdX
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from openedx.core.djangoapps.course_groups.cohorts import (
+    add_cohort,
+    add_user_to_cohort,
+    get_cohort_by_name,
+    is_cohort_exists,
+    set_course_cohorted,
+)
+from openedx.core.djangoapps.course_groups.models import CourseCohort, CourseUserGroupPartitionGroup
+from xmodule.modulestore import ModuleStoreEnum  # pylint: disable=wrong-import-order
+from xmodule.modulestore.django import modulestore  # pylint: disable=wrong-import-order
+from xmodule.modulestore.exceptions import DuplicateCourseError  # pylint: disable=wrong-import-order
+from xmodule.partitions.partitions import Group, UserPartition  # pylint: disable=wrong-import-order
+
+from ...api import get_course_block_access_transformers, get_course_blocks
+from ...usage_info import CourseUsageInfo
+
+COURSE_KEY = CourseLocator('edX', 'BenchmarkCourseBlocks', 'run')
+COHORT_PARTITION_ID = 50
+EXPERIMENT_PARTITION_ID = 51
+NUM_GROUPS = 2
+
+
+class Command(BaseCommand):
+    """
+    Creates a synthetic course and reports, for each user profile, the
+    time each course_blocks access transformer takes to transform the
+    course's collected block structure, the memory it allocates and the
+    number of blocks it leaves, followed by the time of a complete
+    get_course_blocks call.
+
+    The synthetic course exercises the start date, visibility, user
+    partition (cohorted content groups) and split_test transformers.
+    It is benchmarked for course staff, for a learner in a cohort and,
+    when CCX is enabled, for a learner in a CCX of the course.  The
+    course is deleted afterwards, unless --keep_course is given.
+
+    Example usage:
+        $ ./manage.py lms benchmark_course_blocks --chapters 20 --iterations 5 --settings=devstack
+    """
+    help = 'Reports the time and allocations of each course_blocks transformer on a synthetic course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chapters',
+            help='Number of chapters in the synthetic course.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--sequentials',
+            help='Number of sequentials in each chapter.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--verticals',
+            help='Number of verticals in each sequential.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--problems',
+            help='Number of problems in each vertical.',
+            default=4,
+            type=int,
+        )
+        parser.add_argument(
+            '--iterations',
+            help='Number of timed iterations per user profile.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--keep_course',
+            help='Keep the synthetic course instead of deleting it when done.',
+            action='store_true',
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+        store = modulestore()
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        try:
+            course_key = self._create_course(store, user_id, options)
+        except DuplicateCourseError:
+            raise CommandError(  # pylint: disable=raise-missing-from  # noqa: B904
+                f'{COURSE_KEY} already exists. Delete it before running the benchmark again.'
+            )
+
+        try:
+            for profile_name, (user, profile_course_key) in self._create_profiles(course_key).items():
+                self._benchmark_profile(store, profile_name, user, profile_course_key, options['iterations'])
+        finally:
+            if not options['keep_course']:
+                store.delete_course(course_key, user_id)
+
+    def _benchmark_profile(self, store, profile_name, user, course_key, iterations):
+        """
+        Writes the benchmark results of the given user profile.
+        """
+        collected_block_structure = get_course_in_cache(course_key)
+        transformers = get_course_block_access_transformers(user)
+        usage_info = CourseUsageInfo(course_key, user)
+
+        # Each transformer is run on its own, in pipeline order, so that
+        # its cost can be told apart from the other transformers'.
+        # Filtering transformers are combined in a single traversal by
+        # get_course_blocks, which is timed separately below.
+        times = defaultdict(float)
+        for _ in range(iterations):
+            RequestCache.clear_all_namespaces()
+            block_structure = collected_block_structure.copy()
+            for transformer in transformers:
+                start = time.perf_counter()
+                transformer.transform(usage_info, block_structure)
+                times[transformer.name()] += time.perf_counter() - start
+
+        RequestCache.clear_all_namespaces()
+        allocations, num_blocks = self._measure_allocations(transformers, usage_info, collected_block_structure)
+
+        self.stdout.write(
+            f'{profile_name}: {len(collected_block_structure)} collected blocks, '
+            f'{iterations} iterations (ms per iteration)'
+        )
+        self.stdout.write(f'{"transformer":<40}{"time":>10}{"peak KiB":>12}{"blocks":>10}')
+        for transformer in transformers:
+            name = transformer.name()
+            self.stdout.write('{:<40}{:>10.2f}{:>12.1f}{:>10}'.format(  # noqa: UP032
+                name, times[name] * 1000 / iterations, allocations[name] / 1024, num_blocks[name],
+            ))
+
+        starting_block_usage_key = store.make_course_usage_key(course_key)
+
+        def get_transformed_blocks():
+            RequestCache.clear_all_namespaces()
+            get_course_blocks(user, starting_block_usage_key, collected_block_structure=collected_block_structure)
+
+        self.stdout.write('{:<40}{:>10.2f}'.format(  # noqa: UP032
+            'get_course_blocks', timeit.timeit(get_transformed_blocks, number=iterations) * 1000 / iterations,
+        ))
+
+    @staticmethod
+    def _measure_allocations(transformers, usage_info, collected_block_structure):
+        """
+        Runs the given transformers once, in order, and returns the peak
+        memory allocated by each of them, in bytes, along with the
+        number of blocks left after each of them.
+        """
+        allocations = {}
+        num_blocks = {}
+        block_structure = collected_block_structure.copy()
+        tracemalloc.start()
+        try:
+            for transformer in transformers:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                transformer.transform(usage_info, block_structure)
+                _, peak = tracemalloc.get_traced_memory()
+                allocations[transformer.name()] = peak - before
+                num_blocks[transformer.name()] = len(block_structure)
+        finally:
+            tracemalloc.stop()
+        return allocations, num_blocks
+
+    @staticmethod
+    def _create_course(store, user_id, options):
+        """
+        Creates and publishes the synthetic course and returns its key.
+
+        Every third chapter starts in the future, every fourth
+        sequential is visible to staff only, every other vertical is
+        restricted to one of the cohorted content groups and the last
+        vertical of each sequential is a split_test.
+        """
+        now = datetime.now(timezone.utc)
+        groups = [Group(group_id, f'Group {group_id}') for group_id in range(NUM_GROUPS)]
+        user_partitions = [
+            UserPartition(
+                COHORT_PARTITION_ID, 'Content groups', 'Cohorted content groups', groups, scheme_id='cohort',
+            ),
+            UserPartition(
+                EXPERIMENT_PARTITION_ID, 'Experiment', 'Random experiment groups', groups, scheme_id='random',
+            ),
+        ]
+        with store.default_store(ModuleStoreEnum.Type.split):
+            course = store.create_course(
+                COURSE_KEY.org, COURSE_KEY.course, COURSE_KEY.run, user_id,
+                fields={
+                    'display_name': 'Course blocks benchmark',
+                    'start': now - timedelta(days=30),
+                    'user_partitions': user_partitions,
+                    'enable_ccx': True,
+                },
+            )
+
+        def create_child(parent_key, block_type, index, **fields):
+            return store.create_child(
+                user_id, parent_key, block_type, block_id=f'{block_type}_{index}',
+                fields=dict(display_name=f'{block_type} {index}', **fields),
+            ).location
+
+        counts = defaultdict(int)
+
+        def next_index(block_type):
+            counts[block_type] += 1
+            return counts[block_type]
+
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course.id), store.bulk_operations(course.id):
+            for chapter_index in range(options['chapters']):
+                chapter_fields = {'start': now + timedelta(days=30)} if chapter_index % 3 == 2 else {}
+                chapter_key = create_child(course.location, 'chapter', next_index('chapter'), **chapter_fields)
+                for sequential_index in range(options['sequentials']):
+                    sequential_key = create_child(
+                        chapter_key, 'sequential', next_index('sequential'),
+                        visible_to_staff_only=sequential_index % 4 == 3,
+                    )
+                    for vertical_index in range(options['verticals']):
+                        if vertical_index == options['verticals'] - 1:
+                            split_test_key = create_child(
+                                sequential_key, 'split_test', next_index('split_test'),
+                                user_partition_id=EXPERIMENT_PARTITION_ID,
+                            )
+                            group_id_to_child = {}
+                            for group in groups:
+                                vertical_key = create_child(split_test_key, 'vertical', next_index('vertical'))
+                                group_id_to_child[str(group.id)] = vertical_key
+                                for _ in range(options['problems']):
+                                    create_child(vertical_key, 'problem', next_index('problem'))
+                            split_test = store.get_item(split_test_key)
+                            split_test.group_id_to_child = group_id_to_child
+                            store.update_item(split_test, user_id)
+                            continue
+
+                        vertical_fields = {}
+                        if vertical_index % 2:
+                            group_id = groups[vertical_index // 2 % NUM_GROUPS].id
+                            vertical_fields['group_access'] = {COHORT_PARTITION_ID: [group_id]}
+                        vertical_key = create_child(
+                            sequential_key, 'vertical', next_index('vertical'), **vertical_fields
+                        )
+                        for _ in range(options['problems']):
+                            create_child(vertical_key, 'problem', next_index('problem'))
+            store.publish(course.location, user_id)
+
+        return course.id
+
+    @staticmethod
+    def _create_profiles(course_key):
+        """
+        Returns {profile name: (user, course key)} for the user profiles
+        to benchmark, creating their users, roles, enrollments and
+        cohort as needed.
+        """
+        user_model = get_user_model()
+
+        staff, _ = user_model.objects.get_or_create(username='benchmark_course_blocks_staff')
+        CourseStaffRole(course_key).add_users(staff)
+
+        learner, _ = user_model.objects.get_or_create(username='benchmark_course_blocks_learner')
+        CourseEnrollment.enroll(learner, course_key)
+        set_course_cohorted(course_key, True)
+        if is_cohort_exists(course_key, 'Benchmark cohort'):
+            cohort = get_cohort_by_name(course_key, 'Benchmark cohort')
+        else:
+            cohort = add_cohort(course_key, 'Benchmark cohort', CourseCohort.MANUAL)
+        CourseUserGroupPartitionGroup.objects.update_or_create(
+            course_user_group=cohort,
+            defaults={'partition_id': COHORT_PARTITION_ID, 'group_id': 0},
+        )
+        try:
+            add_user_to_cohort(cohort, learner)
+        except ValueError:
+            # The learner is still in the cohort from a previous run.
+            pass
+
+        profiles = {
+            'staff': (staff, course_key),
+            'learner in a cohort': (learner, course_key),
+        }
+
+        if settings.CUSTOM_COURSES_EDX:
+            ccx_learner, _ = user_model.objects.get_or_create(username='benchmark_course_blocks_ccx_learner')
+            ccx = CustomCourseForEdX.objects.create(course_id=course_key, display_name='Benchmark CCX', coach=staff)
+            ccx_key = CCXLocator.from_course_locator(course_key, str(ccx.id))
+            CourseEnrollment.enroll(ccx_learner, ccx_key)
+            profiles['learner in a CCX'] = (ccx_learner, ccx_key)
+
+        return profiles
@@ -0,0 +1,54 @@
+"""
+Tests for the benchmark_course_blocks management command.
+"""
+
+
+from io import StringIO
+
+import ddt
+import pytest
+from django.core.management import CommandError, call_command
+from django.test.utils import override_settings
+
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # pylint: disable=wrong-import-order
+
+from ..benchmark_course_blocks import COURSE_KEY
+
+
+@ddt.ddt
+class TestBenchmarkCourseBlocks(ModuleStoreTestCase):
+    """
+    Tests the benchmark_course_blocks management command.
+    """
+    def run_benchmark(self, *args):
+        """
+        Runs the command on a small course and returns its output.
+        """
+        out = StringIO()
+        call_command(
+            'benchmark_course_blocks',
+            '--chapters', '3', '--sequentials', '4', '--verticals', '3', '--problems', '1', '--iterations', '1',
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    @ddt.data(True, False)
+    def test_benchmark(self, ccx_enabled):
+        with override_settings(CUSTOM_COURSES_EDX=ccx_enabled):
+            output = self.run_benchmark()
+
+        assert 'staff: ' in output
+        assert 'learner in a cohort: ' in output
+        assert ('learner in a CCX: ' in output) == ccx_enabled
+        for transformer_name in ('start_date', 'user_partitions', 'visibility', 'get_course_blocks'):
+            assert transformer_name in output
+        assert not self.store.has_course(COURSE_KEY)
+
+    @override_settings(CUSTOM_COURSES_EDX=False)
+    def test_keep_course(self):
+        self.run_benchmark('--keep_course')
+        assert self.store.has_course(COURSE_KEY)
+
+        with pytest.raises(CommandError):
+            self.run_benchmark()
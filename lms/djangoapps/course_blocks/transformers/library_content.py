@@ -39,6 +39,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -216,6 +217,7 @@ class ContentLibraryOrderTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
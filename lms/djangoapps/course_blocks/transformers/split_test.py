@@ -26,6 +26,7 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -28,6 +28,7 @@ class UserPartitionTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -19,6 +19,9 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:class:`BulkFieldDataCache`: A prefetch cache of the field data of a set of blocks for
+    many users, which hands out a :class:`~FieldDataCache` for each of them.
 """
 
 
@@ -37,9 +40,16 @@ from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.django import modulestore  # pylint: disable=wrong-import-order
 
-from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
+from .models import (
+    StudentModule,
+    XModuleStudentInfoField,
+    XModuleStudentPrefsField,
+    XModuleUserStateSummaryField,
+    chunks,
+)
 
 log = logging.getLogger(__name__)
 
@@ -167,7 +177,17 @@ class DjangoOrmFieldCache(metaclass=ABCMeta):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        self.cache_field_objects(self._read_objects(fields, xblocks, aside_types))
+
+    def cache_field_objects(self, field_objects):
+        """
+        Add the supplied ``field_objects``, which were already read from the
+        underlying datastore, to this cache.
+
+        Arguments:
+            field_objects (iterable): Django model instances that store the data for fields in this cache
+        """
+        for field_object in field_objects:
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
     def get(self, kvs_key):
@@ -357,6 +377,16 @@ class UserStateCache:
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+    def cache_block_states(self, block_states):
+        """
+        Add the supplied field state, which was already read from the
+        underlying datastore, to this cache.
+
+        Arguments:
+            block_states (dict): A dictionary mapping block usage keys to dicts of field values.
+        """
+        self._cache.update(block_states)
+
     def set(self, kvs_key, value):
         """
         Set the specified `kvs_key` to the field value `value`.
@@ -776,7 +806,8 @@ class FieldDataCache:
         cache.add_block_descendents(block, depth, block_filter)
         return cache
 
-    def _fields_to_cache(self, blocks):
+    @staticmethod
+    def _fields_to_cache(blocks):
         """
         Returns a map of scopes to fields in that scope that should be cached
         """
@@ -908,15 +939,160 @@ class FieldDataCache:
         return sum(len(cache) for cache in self.cache.values())
 
 
+class BulkFieldDataCache:
+    """
+    A cache of the django model objects needed to supply the data for a
+    set of blocks for many users.
+
+    Where a :class:`~FieldDataCache` issues its queries for a single user,
+    this reads the state of a batch of users with each query, and hands out
+    a read-through :class:`~FieldDataCache` per user that is already filled
+    with that user's data. The user_state_summary data, which is shared by
+    all users, is read only once.
+
+    Only the data of one batch of users is held at a time, and batches are
+    made small enough that a batch reads at most MAX_ROWS_PER_BATCH
+    StudentModule rows.
+    """
+    # The most StudentModule rows that are read for a single batch of users.
+    MAX_ROWS_PER_BATCH = 100000
+
+    def __init__(self, blocks, course_id, asides=None, read_only=False, users_per_batch=100):
+        """
+        Arguments
+        blocks: A list of XBlocks.
+        course_id: The id of the course that the blocks are in
+        asides: The list of aside types to load, or None to prefetch no asides.
+        read_only: The handed out FieldDataCaches should not perform writes.
+        users_per_batch: The most users whose data is read with each query.
+        """
+        assert isinstance(course_id, LearningContextKey)
+        self.blocks = blocks
+        self.course_id = course_id
+        self.asides = asides or []
+        self.read_only = read_only
+
+        self._fields = FieldDataCache._fields_to_cache(blocks)  # pylint: disable=protected-access
+        self._usage_keys = _all_usage_keys(blocks, self.asides)
+        self.users_per_batch = max(1, min(users_per_batch, self.MAX_ROWS_PER_BATCH // max(1, len(self._usage_keys))))
+        self._block_types = _all_block_types(blocks, self.asides)
+        self.scorable_locations = {block.location for block in blocks if block.has_score}
+
+        self._user_state_summary_cache = UserStateSummaryCache(self.course_id)
+        summary_fields = self._fields.get(Scope.user_state_summary)
+        if summary_fields:
+            self._user_state_summary_cache.cache_fields(summary_fields, blocks, self.asides)
+
+    @classmethod
+    def cache_for_block_descendents(cls, course_id, blocks, **kwargs):
+        """
+        Returns a BulkFieldDataCache for the given blocks and all of their
+        descendents, the bulk counterpart of
+        :meth:`FieldDataCache.cache_for_block_descendents`.
+        """
+        def get_descendents(block):
+            """
+            Return `block` and all of its descendents.
+            """
+            descendents = [block]
+            for child in block.get_children() + block.get_required_block_descriptors():
+                descendents.extend(get_descendents(child))
+            return descendents
+
+        all_blocks = []
+        for block in blocks:
+            with modulestore().bulk_operations(block.location.course_key):
+                all_blocks.extend(get_descendents(block))
+        return cls(all_blocks, course_id, **kwargs)
+
+    def iter_field_data_caches(self, users):
+        """
+        Yields a (user, FieldDataCache) pair for each of the given users,
+        reading the data of users_per_batch users at a time.
+        """
+        for users_batch in chunks(users, self.users_per_batch):
+            authenticated_users = [user for user in users_batch if user.is_authenticated]
+            user_ids = [user.id for user in authenticated_users]
+            block_states = self._read_user_states(user_ids)
+            preferences = self._read_field_objects(
+                XModuleStudentPrefsField, Scope.preferences, user_ids, module_type__in=self._block_types,
+            )
+            user_info = self._read_field_objects(XModuleStudentInfoField, Scope.user_info, user_ids)
+
+            for user in users_batch:
+                field_data_cache = FieldDataCache([], self.course_id, user, self.asides, self.read_only)
+                field_data_cache.cache[Scope.user_state_summary] = self._user_state_summary_cache
+                if user.is_authenticated:
+                    field_data_cache.scorable_locations.update(self.scorable_locations)
+                    field_data_cache.cache[Scope.user_state].cache_block_states(block_states.get(user.id, {}))
+                    field_data_cache.cache[Scope.preferences].cache_field_objects(preferences.get(user.id, []))
+                    field_data_cache.cache[Scope.user_info].cache_field_objects(user_info.get(user.id, []))
+                yield user, field_data_cache
+
+    def _read_user_states(self, user_ids):
+        """
+        Returns a map of user ids to the user_state of the blocks, keyed by block usage key.
+        """
+        block_states = defaultdict(dict)
+        if not user_ids or not self._fields.get(Scope.user_state):
+            return block_states
+
+        student_modules = StudentModule.objects.chunked_filter(
+            'module_state_key__in',
+            self._usage_keys,
+            student_id__in=user_ids,
+            course_id=self.course_id,
+        )
+        for student_module in student_modules:
+            state = json.loads(student_module.state) if student_module.state else {}
+            if not state:
+                continue
+            # Locations in StudentModule don't necessarily have course key info attached.
+            block_key = student_module.module_state_key.map_into_course(student_module.course_id)
+            block_states[student_module.student_id][block_key] = state
+        return block_states
+
+    def _read_field_objects(self, model_class, scope, user_ids, **kwargs):
+        """
+        Returns a map of user ids to the model_class objects that store the
+        data of the scope's fields for that user.
+        """
+        field_objects = defaultdict(list)
+        fields = self._fields.get(scope)
+        if not user_ids or not fields:
+            return field_objects
+
+        for field_object in model_class.objects.filter(
+            student_id__in=user_ids,
+            field_name__in={field.name for field in fields},
+            **kwargs
+        ):
+            field_objects[field_object.student_id].append(field_object)
+        return field_objects
+
+
 class ScoresClient:
     """
     Basic client interface for retrieving Score information.
 
     Eventually, this should read and write scores, but at the moment it only
     handles the read side of things.
+
+    The scores of many users can be read ahead of time with :meth:`prefetch`,
+    after which :meth:`create_for_locations` does not query the database for
+    the prefetched users.
     """
     Score = namedtuple('Score', 'correct total created')
 
+    _CACHE_NAMESPACE = 'courseware.model_data.ScoresClient'
+
+    # The most StudentModule rows that are held in memory by a single
+    # prefetch. Scores of the users that don't fit are read per user.
+    PREFETCH_MAX_ROWS = 200000
+
+    # The number of users whose scores are read with each prefetch query.
+    PREFETCH_USERS_PER_QUERY = 100
+
     def __init__(self, course_key, user_id):
         self.course_key = course_key
         self.user_id = user_id
@@ -963,9 +1139,54 @@ class ScoresClient:
     def create_for_locations(cls, course_id, user_id, scorable_locations):
         """Create a ScoresClient with pre-fetched data for the given locations."""
         client = cls(course_id, user_id)
-        client.fetch_scores(scorable_locations)
+        prefetched = get_cache(cls._CACHE_NAMESPACE).get(str(course_id), {}).get(user_id)
+        if prefetched is not None:
+            client._locations_to_scores.update(prefetched)  # pylint: disable=protected-access
+            client._has_fetched = True  # pylint: disable=protected-access
+        else:
+            client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def prefetch(cls, course_key, users, scorable_locations, max_rows=None):
+        """
+        Prefetches the scores of the given users for the given locations,
+        reading PREFETCH_USERS_PER_QUERY users with each query.
+
+        Stops prefetching once more than max_rows (defaults to
+        PREFETCH_MAX_ROWS) rows were read, so that scores of the remaining
+        users are read per user by create_for_locations.
+        """
+        max_rows = cls.PREFETCH_MAX_ROWS if max_rows is None else max_rows
+        scorable_locations = set(scorable_locations)
+        prefetched = {}
+        get_cache(cls._CACHE_NAMESPACE)[str(course_key)] = prefetched
+
+        num_rows = 0
+        for user_ids in chunks([user.id for user in users], cls.PREFETCH_USERS_PER_QUERY):
+            if num_rows >= max_rows:
+                break
+            scores_by_user = {user_id: {} for user_id in user_ids}
+            for locations in chunks(scorable_locations, 500):
+                scores_qset = StudentModule.objects.filter(
+                    student_id__in=user_ids,
+                    course_id=course_key,
+                    module_state_key__in=locations,
+                ).values_list('student_id', 'module_state_key', 'grade', 'max_grade', 'created')
+                for user_id, location, correct, total, created in scores_qset:
+                    # See fetch_scores for why the course key is added back in.
+                    location = location.map_into_course(course_key)
+                    scores_by_user[user_id][location] = cls.Score(correct, total, created)
+                    num_rows += 1
+            prefetched.update(scores_by_user)
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key):
+        """
+        Clears prefetched scores for this course from the RequestCache.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(str(course_key), None)
+
 
 def set_score(user_id, usage_key, score, max_score):
     """
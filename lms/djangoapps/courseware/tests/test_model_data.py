@@ -13,7 +13,13 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    BulkFieldDataCache,
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    ScoresClient,
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -29,6 +35,7 @@ from lms.djangoapps.courseware.tests.factories import (
 )
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.djangolib.testing.utils import AUTHZ_TABLES, FilteredQueryCountMixin
 
 QUERY_COUNT_TABLE_IGNORELIST = WAFFLE_TABLES + AUTHZ_TABLES
@@ -452,3 +459,113 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestBulkFieldDataCache(TestCase):
+    """Tests for reading the field data of many users with a BulkFieldDataCache"""
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.users = [UserFactory.create() for _ in range(3)]
+        for index, user in enumerate(self.users[:2]):
+            StudentModuleFactory(student=user, state=json.dumps({'a_field': f'value_{index}'}))
+            StudentPrefsFactory(student=user, value=json.dumps(f'pref_{index}'))
+            StudentInfoFactory(student=user, value=json.dumps(f'info_{index}'))
+        StudentModuleFactory(student=self.users[2], state=json.dumps({}))
+        UserStateSummaryFactory()
+        self.block = mock_block([
+            mock_field(Scope.user_state, 'a_field'),
+            mock_field(Scope.preferences, 'existing_field'),
+            mock_field(Scope.user_info, 'existing_field'),
+            mock_field(Scope.user_state_summary, 'existing_field'),
+        ])
+
+    def test_field_data_caches(self):
+        # The user_state_summary data is read once for all users.
+        with self.assertNumQueries(1):
+            bulk_cache = BulkFieldDataCache([self.block], COURSE_KEY, users_per_batch=2)
+
+        # Each batch of users reads the user_state, preferences and user_info data.
+        with self.assertNumQueries(6):
+            field_data_caches = list(bulk_cache.iter_field_data_caches(self.users))
+
+        with self.assertNumQueries(0):
+            assert [user for user, _ in field_data_caches] == self.users
+            for index, (user, field_data_cache) in enumerate(field_data_caches[:2]):
+                assert field_data_cache.user == user
+                kvs = DjangoKeyValueStore(field_data_cache)
+                state_field = DjangoKeyValueStore.Key(Scope.user_state, user.id, LOCATION('usage_id'), 'a_field')
+                prefs_field = DjangoKeyValueStore.Key(Scope.preferences, user.id, 'mock_problem', 'existing_field')
+                info_field = DjangoKeyValueStore.Key(Scope.user_info, user.id, None, 'existing_field')
+                assert kvs.get(state_field) == f'value_{index}'
+                assert kvs.get(prefs_field) == f'pref_{index}'
+                assert kvs.get(info_field) == f'info_{index}'
+                assert kvs.get(user_state_summary_key('existing_field')) == 'old_value'
+
+            user, field_data_cache = field_data_caches[2]
+            kvs = DjangoKeyValueStore(field_data_cache)
+            assert not kvs.has(DjangoKeyValueStore.Key(Scope.user_state, user.id, LOCATION('usage_id'), 'a_field'))
+            assert not kvs.has(DjangoKeyValueStore.Key(Scope.preferences, user.id, 'mock_problem', 'existing_field'))
+            assert kvs.get(user_state_summary_key('existing_field')) == 'old_value'
+
+    @patch.object(BulkFieldDataCache, 'MAX_ROWS_PER_BATCH', 1)
+    def test_rows_per_batch_capped(self):
+        bulk_cache = BulkFieldDataCache([self.block], COURSE_KEY, users_per_batch=2)
+        assert bulk_cache.users_per_batch == 1
+
+        # Each user is read in a batch of their own.
+        with self.assertNumQueries(9):
+            assert len(list(bulk_cache.iter_field_data_caches(self.users))) == 3
+
+    def test_matches_field_data_cache(self):
+        bulk_cache = BulkFieldDataCache([self.block], COURSE_KEY)
+        for user, field_data_cache in bulk_cache.iter_field_data_caches(self.users):
+            expected = FieldDataCache([self.block], COURSE_KEY, user)
+            assert len(field_data_cache) == len(expected)
+            assert field_data_cache.scorable_locations == expected.scorable_locations
+
+
+class TestScoresClientPrefetch(TestCase):
+    """Tests for prefetching the scores of many users with ScoresClient.prefetch"""
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.location = LOCATION('usage_id')
+        self.users = [UserFactory.create() for _ in range(3)]
+        for index, user in enumerate(self.users[:2]):
+            StudentModuleFactory(student=user, grade=index, max_grade=2)
+        self.addCleanup(ScoresClient.clear_prefetched_data, COURSE_KEY)
+
+    def test_prefetch(self):
+        with self.assertNumQueries(1):
+            ScoresClient.prefetch(COURSE_KEY, self.users, [self.location])
+
+        with self.assertNumQueries(0):
+            for index, user in enumerate(self.users):
+                client = ScoresClient.create_for_locations(COURSE_KEY, user.id, [self.location])
+                score = client.get(self.location)
+                if index < 2:
+                    assert (score.correct, score.total) == (index, 2)
+                else:
+                    assert score is None
+
+        ScoresClient.clear_prefetched_data(COURSE_KEY)
+        assert str(COURSE_KEY) not in get_cache(ScoresClient._CACHE_NAMESPACE)  # pylint: disable=protected-access
+        with self.assertNumQueries(1):
+            ScoresClient.create_for_locations(COURSE_KEY, self.users[0].id, [self.location])
+
+    def test_prefetch_max_rows(self):
+        with patch.object(ScoresClient, 'PREFETCH_USERS_PER_QUERY', 1):
+            with self.assertNumQueries(1):
+                ScoresClient.prefetch(COURSE_KEY, self.users, [self.location], max_rows=1)
+
+        # Users that were not prefetched have their scores read on their own.
+        with self.assertNumQueries(0):
+            ScoresClient.create_for_locations(COURSE_KEY, self.users[0].id, [self.location])
+        with self.assertNumQueries(1):
+            client = ScoresClient.create_for_locations(COURSE_KEY, self.users[1].id, [self.location])
+        assert client.get(self.location).correct == 1
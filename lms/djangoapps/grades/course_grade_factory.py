@@ -2,8 +2,10 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
+from lms.djangoapps.courseware.model_data import ScoresClient
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
@@ -13,7 +15,12 @@ from openedx.core.djangoapps.signals.signals import (
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
-from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .models_api import (
+    buffer_subsection_grade_writes,
+    flush_subsection_grade_writes,
+    prefetch_grade_overrides_and_visible_blocks,
+)
+from .scores import possibly_scored
 
 log = getLogger(__name__)
 
@@ -24,6 +31,9 @@ class CourseGradeFactory:
     """
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'error'])
 
+    # The number of users whose scores are prefetched together by iter.
+    USERS_PER_SCORES_PREFETCH = 100
+
     def read(
             self,
             user,
@@ -76,6 +86,7 @@ class CourseGradeFactory:
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            prefetch_scores=False,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -85,6 +96,12 @@ class CourseGradeFactory:
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If prefetch_scores or force_update is True, the problem scores stored in
+        the courseware student state are read for up to USERS_PER_SCORES_PREFETCH
+        students at a time, rather than with a query per student.  If
+        force_update is True, the subsection grades of those students are
+        also written together, once all of them have been graded.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -94,8 +111,32 @@ class CourseGradeFactory:
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if not (prefetch_scores or force_update):
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
+            return
+
+        scorable_locations = [
+            block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+        ]
+        # Keep each batch small enough for its scores to fit in one prefetch,
+        # so that no student of the batch falls back to a query of their own.
+        users_per_batch = max(1, min(
+            self.USERS_PER_SCORES_PREFETCH,
+            ScoresClient.PREFETCH_MAX_ROWS // max(1, len(scorable_locations)),
+        ))
+        users = iter(users)
+        while users_batch := list(islice(users, users_per_batch)):
+            ScoresClient.prefetch(course_data.course_key, users_batch, scorable_locations)
+            if force_update:
+                buffer_subsection_grade_writes(course_data.course_key, users_batch)
+            try:
+                for user in users_batch:
+                    yield self._iter_grade_result(user, course_data, force_update)
+            finally:
+                ScoresClient.clear_prefetched_data(course_data.course_key)
+                if force_update:
+                    flush_subsection_grade_writes(course_data.course_key)
 
     def _iter_grade_result(self, user, course_data, force_update):  # pylint: disable=missing-function-docstring
         try:
@@ -451,12 +451,38 @@ class PersistentSubsectionGrade(TimeStampedModel):
                 course_id=course_key,
             )
 
+    @classmethod
+    def buffer_writes(cls, course_key, users=()):
+        """
+        Starts accumulating the grades written for the given course by
+        update_or_create_grade and bulk_create_grades in a
+        SubsectionGradeWriteBuffer, until flush_buffered_writes is called.
+        The existing grades of the given users are read up front.
+        """
+        get_cache(cls._CACHE_NAMESPACE)[cls._write_buffer_cache_key(course_key)] = SubsectionGradeWriteBuffer(
+            course_key, users,
+        )
+
+    @classmethod
+    def flush_buffered_writes(cls, course_key):
+        """
+        Writes the grades buffered for the given course, if any, and stops
+        buffering them.
+        """
+        write_buffer = get_cache(cls._CACHE_NAMESPACE).pop(cls._write_buffer_cache_key(course_key), None)
+        if write_buffer is not None:
+            write_buffer.flush()
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
         Wrapper for objects.update_or_create.
         """
         cls._prepare_params(params)
+        write_buffer = cls._get_write_buffer(params['course_id'])
+        if write_buffer is not None:
+            return write_buffer.update_or_create_grade(params)
+
         VisibleBlocks.cached_get_or_create(params['user_id'], params['visible_blocks'])
         cls._prepare_params_visible_blocks_id(params)
 
@@ -488,6 +514,11 @@ class PersistentSubsectionGrade(TimeStampedModel):
         if not grade_params_iter:
             return
 
+        write_buffer = cls._get_write_buffer(course_key)
+        if write_buffer is not None:
+            list(map(cls._prepare_params, grade_params_iter))
+            return [write_buffer.update_or_create_grade(params) for params in grade_params_iter]
+
         PersistentSubsectionGradeOverride.prefetch(user_id, course_key)
 
         list(map(cls._prepare_params, grade_params_iter))
@@ -533,6 +564,14 @@ class PersistentSubsectionGrade(TimeStampedModel):
     def _cache_key(cls, course_id):
         return f"subsection_grades_cache.{course_id}"
 
+    @classmethod
+    def _get_write_buffer(cls, course_key):
+        return get_cache(cls._CACHE_NAMESPACE).get(cls._write_buffer_cache_key(course_key))
+
+    @classmethod
+    def _write_buffer_cache_key(cls, course_id):
+        return f"subsection_grades_write_buffer.{course_id}"
+
     @classmethod
     def delete_subsection_grades_for_learner(cls, user_id, course_key):
         """
@@ -555,6 +594,155 @@ class PersistentSubsectionGrade(TimeStampedModel):
         return deleted_count
 
 
+class SubsectionGradeWriteBuffer:
+    """
+    Accumulates the PersistentSubsectionGrades written for any number of
+    users in a course, along with the VisibleBlocks they reference, and
+    writes them with a few multi-row statements when flushed, rather than
+    with a few statements per grade.
+
+    Grades are returned as update_or_create_grade would return them, but
+    are de-duplicated by user and subsection, keeping the last write.  The
+    grade_calculated event of each write is emitted right away, as
+    update_or_create_grade does, so that it still precedes the course
+    grade events of the same user.
+    """
+    # The number of rows written or read by each statement.
+    BATCH_SIZE = 500
+
+    # The fields of existing grades that are written on flush.
+    UPDATE_FIELDS = [
+        'course_version', 'subtree_edited_timestamp', 'earned_all', 'possible_all', 'earned_graded',
+        'possible_graded', 'first_attempted', 'visible_blocks_id', 'modified',
+    ]
+
+    def __init__(self, course_key, users=()):
+        self.course_key = course_key
+        self._grades = {}
+        self._overrides = {}
+        self._loaded_user_ids = set()
+        self._unsaved_grades = {}
+        self._unsaved_visible_blocks = {}
+        self._saved_visible_blocks_hashes = set()
+        self._load_grades([user.id for user in users])
+
+    def update_or_create_grade(self, params):
+        """
+        Buffers the grade described by the given params, prepared by
+        PersistentSubsectionGrade._prepare_params, and returns its model.
+        """
+        user_id = params.pop('user_id')
+        usage_key = params.pop('usage_key')
+        first_attempted = params.pop('first_attempted')
+        visible_blocks = params.pop('visible_blocks')
+        params['visible_blocks_id'] = visible_blocks.hash_value
+        if visible_blocks.hash_value not in self._saved_visible_blocks_hashes:
+            self._unsaved_visible_blocks[visible_blocks.hash_value] = visible_blocks
+
+        self._load_grades([user_id])
+        key = (user_id, str(usage_key))
+        grade = self._grades.get(key)
+        if grade is None:
+            grade = PersistentSubsectionGrade(user_id=user_id, usage_key=usage_key, **params)
+            self._grades[key] = grade
+        else:
+            for field_name, value in params.items():
+                setattr(grade, field_name, value)
+        if first_attempted is not None and grade.first_attempted is None:
+            grade.first_attempted = first_attempted
+
+        grade.override = self._overrides.get(key)
+        self._unsaved_grades[key] = grade
+        PersistentSubsectionGrade._emit_grade_calculated_event(grade)  # pylint: disable=protected-access
+        return grade
+
+    def flush(self):
+        """
+        Writes the buffered VisibleBlocks and grades.
+        """
+        self._save_visible_blocks()
+
+        grades = list(self._unsaved_grades.values())
+        self._unsaved_grades.clear()
+        new_grades = [grade for grade in grades if grade.pk is None]
+        existing_grades = [grade for grade in grades if grade.pk is not None]
+
+        self._create_grades(new_grades)
+        modified = now()
+        for grade in existing_grades:
+            grade.modified = modified
+        PersistentSubsectionGrade.objects.bulk_update(existing_grades, self.UPDATE_FIELDS, batch_size=self.BATCH_SIZE)
+
+    def _load_grades(self, user_ids):
+        """
+        Reads the stored grades of those of the given users whose grades
+        have not been read yet, along with their overrides.
+        """
+        user_ids = [user_id for user_id in user_ids if user_id not in self._loaded_user_ids]
+        self._loaded_user_ids.update(user_ids)
+        for index in range(0, len(user_ids), self.BATCH_SIZE):
+            for grade in PersistentSubsectionGrade.objects.select_related('override').filter(
+                user_id__in=user_ids[index:index + self.BATCH_SIZE],
+                course_id=self.course_key,
+            ):
+                key = (grade.user_id, str(grade.usage_key))
+                self._grades[key] = grade
+                try:
+                    self._overrides[key] = grade.override
+                except PersistentSubsectionGradeOverride.DoesNotExist:
+                    pass
+
+    def _save_visible_blocks(self):
+        """
+        Creates the buffered VisibleBlocks that do not exist yet.
+        """
+        hashes = list(self._unsaved_visible_blocks)
+        existing_hashes = set()
+        for index in range(0, len(hashes), self.BATCH_SIZE):
+            existing_hashes.update(
+                VisibleBlocks.objects.filter(
+                    hashed__in=hashes[index:index + self.BATCH_SIZE],
+                ).values_list('hashed', flat=True)
+            )
+
+        # Other processes may create the same VisibleBlocks concurrently.
+        VisibleBlocks.objects.bulk_create(
+            [
+                VisibleBlocks(blocks_json=brl.json_value, hashed=brl.hash_value, course_id=brl.course_key)
+                for brl in self._unsaved_visible_blocks.values()
+                if brl.hash_value not in existing_hashes
+            ],
+            batch_size=self.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        self._saved_visible_blocks_hashes.update(hashes)
+        self._unsaved_visible_blocks.clear()
+
+    def _create_grades(self, grades):
+        """
+        Creates the given new grades, falling back to updating those
+        that were created by another process in the meantime.
+        """
+        try:
+            with transaction.atomic():
+                PersistentSubsectionGrade.objects.bulk_create(grades, batch_size=self.BATCH_SIZE)
+        except IntegrityError:
+            log.warning('Falling back to create PersistentSubsectionGrades one by one in course %s', self.course_key)
+            for grade in grades:
+                try:
+                    with transaction.atomic():
+                        grade.save(force_insert=True)
+                except IntegrityError:
+                    stored_grade = PersistentSubsectionGrade.objects.get(
+                        user_id=grade.user_id, course_id=grade.course_id, usage_key=grade.usage_key,
+                    )
+                    grade.id = stored_grade.id
+                    grade.created = stored_grade.created
+                    grade.first_attempted = stored_grade.first_attempted or grade.first_attempted
+                    grade._state.adding = False  # pylint: disable=protected-access
+                    grade.save()
+
+
 class PersistentCourseGrade(TimeStampedModel):
     """
     A django model tracking persistent course grades.
@@ -17,6 +17,14 @@ def prefetch_grade_overrides_and_visible_blocks(user, course_key):
     _VisibleBlocks.bulk_read(user.id, course_key)
 
 
+def buffer_subsection_grade_writes(course_key, users):
+    _PersistentSubsectionGrade.buffer_writes(course_key, users)
+
+
+def flush_subsection_grade_writes(course_key):
+    _PersistentSubsectionGrade.flush_buffered_writes(course_key)
+
+
 def prefetch_course_grades(course_key, users):
     _PersistentCourseGrade.prefetch(course_key, users)
 
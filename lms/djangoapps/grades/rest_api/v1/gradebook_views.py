@@ -88,7 +88,7 @@ def bulk_gradebook_view_context(course_key, users):
     prefetch_course_and_subsection_grades(course_key, users)
     CourseEnrollment.bulk_fetch_enrollment_states(users, course_key)
     cohorts.bulk_cache_cohorts(course_key, users)
-    BulkRoleCache.prefetch(users)
+    BulkRoleCache.prefetch(users, course_keys=[course_key])
     try:
         yield
     finally:
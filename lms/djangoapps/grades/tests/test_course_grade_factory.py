@@ -160,6 +160,24 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    def test_iter_force_update_prefetches_scores(self):
+        with patch('lms.djangoapps.courseware.model_data.ScoresClient.fetch_scores') as mock_fetch_scores:
+            results = list(CourseGradeFactory().iter(
+                users=[self.request.user], course=self.course, force_update=True,
+            ))
+        assert results[0].error is None
+        assert not mock_fetch_scores.called
+
+    def test_iter_prefetch_batches_capped(self):
+        with patch('lms.djangoapps.courseware.model_data.ScoresClient.PREFETCH_MAX_ROWS', 1), patch(
+            'lms.djangoapps.courseware.model_data.ScoresClient.prefetch'
+        ) as mock_prefetch:
+            list(CourseGradeFactory().iter(
+                users=[self.request.user, UserFactory.create()], course=self.course, prefetch_scores=True,
+            ))
+        # Each batch holds a single user once the scores of two no longer fit in one prefetch.
+        assert [len(call.args[1]) for call in mock_prefetch.call_args_list] == [1, 1]
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
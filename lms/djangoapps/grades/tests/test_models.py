@@ -30,6 +30,7 @@ from lms.djangoapps.grades.models import (
     PersistentCourseGrade,
     PersistentSubsectionGrade,
     PersistentSubsectionGradeOverride,
+    SubsectionGradeWriteBuffer,
     VisibleBlocks,
 )
 
@@ -369,6 +370,131 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         self.assertEqual(deleted, 2)  # noqa: PT009
 
 
+class SubsectionGradeWriteBufferTest(GradesModelTestCase):
+    """
+    Test writing PersistentSubsectionGrades through a SubsectionGradeWriteBuffer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.usage_key = BlockUsageLocator(
+            course_key=self.course_key,
+            block_type='subsection',
+            block_id='subsection_12345',
+        )
+        self.users = [UserFactory() for _ in range(3)]
+        self.first_attempted = datetime(2000, 1, 1, 12, 30, 45, tzinfo=pytz.UTC)
+
+    def _params(self, user, earned_all=6.0, first_attempted=None, records=None):
+        """
+        Returns the params of a grade for the given user.
+        """
+        return {
+            "user_id": user.id,
+            "usage_key": self.usage_key,
+            "course_version": "deadbeef",
+            "earned_all": earned_all,
+            "possible_all": 12.0,
+            "earned_graded": 6.0,
+            "possible_graded": 8.0,
+            "visible_blocks": BlockRecordList(records or [self.record_a, self.record_b], self.course_key),
+            "first_attempted": first_attempted or self.first_attempted,
+        }
+
+    def test_writes_deferred_until_flush(self):
+        PersistentSubsectionGrade.buffer_writes(self.course_key, self.users)
+        with patch('lms.djangoapps.grades.events.tracker') as tracker_mock:
+            grades = [
+                PersistentSubsectionGrade.update_or_create_grade(**self._params(user)) for user in self.users
+            ]
+            assert grades[0].earned_all == 6.0
+            assert not PersistentSubsectionGrade.objects.exists()
+            assert not VisibleBlocks.objects.exists()
+            # Events are emitted in the order of the writes, as without the buffer.
+            assert tracker_mock.emit.call_count == len(self.users)
+
+            PersistentSubsectionGrade.flush_buffered_writes(self.course_key)
+
+        assert tracker_mock.emit.call_count == len(self.users)
+        assert VisibleBlocks.objects.count() == 1
+        for user in self.users:
+            read_grade = PersistentSubsectionGrade.read_grade(user.id, self.usage_key)
+            assert read_grade.earned_all == 6.0
+            assert read_grade.first_attempted == self.first_attempted
+            assert read_grade.visible_blocks.blocks == BlockRecordList([self.record_a, self.record_b], self.course_key)
+
+        # Writes are no longer buffered after a flush.
+        PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[0], earned_all=7.0))
+        assert PersistentSubsectionGrade.read_grade(self.users[0].id, self.usage_key).earned_all == 7.0
+
+    def test_updates_existing_grades(self):
+        created_grade = PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[0]))
+
+        PersistentSubsectionGrade.buffer_writes(self.course_key, self.users[:1])
+        params = self._params(self.users[0], earned_all=7.0, records=[self.record_a])
+        params['first_attempted'] = None
+        updated_grade = PersistentSubsectionGrade.update_or_create_grade(**params)
+        PersistentSubsectionGrade.flush_buffered_writes(self.course_key)
+
+        assert updated_grade.id == created_grade.id
+        read_grade = PersistentSubsectionGrade.read_grade(self.users[0].id, self.usage_key)
+        assert read_grade.earned_all == 7.0
+        assert read_grade.first_attempted == self.first_attempted
+        assert read_grade.modified > created_grade.modified
+        assert read_grade.visible_blocks.blocks == BlockRecordList([self.record_a], self.course_key)
+
+    def test_deduplicates_writes(self):
+        PersistentSubsectionGrade.buffer_writes(self.course_key)
+        PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[0]))
+        PersistentSubsectionGrade.bulk_create_grades(
+            [self._params(self.users[0], earned_all=7.0), self._params(self.users[1])],
+            self.users[0].id,
+            self.course_key,
+        )
+        PersistentSubsectionGrade.flush_buffered_writes(self.course_key)
+
+        assert PersistentSubsectionGrade.objects.count() == 2
+        assert PersistentSubsectionGrade.read_grade(self.users[0].id, self.usage_key).earned_all == 7.0
+
+    def test_overrides_read_with_grades(self):
+        stored_grade = PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[0]))
+        override = PersistentSubsectionGradeOverride.update_or_create_override(
+            requesting_user=self.users[0],
+            subsection_grade_model=stored_grade,
+            earned_all_override=0.0,
+            earned_graded_override=0.0,
+            feature=GradeOverrideFeatureEnum.gradebook,
+        )
+        PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[1]))
+
+        PersistentSubsectionGrade.buffer_writes(self.course_key, self.users)
+        with patch('lms.djangoapps.grades.events.tracker'), self.assertNumQueries(0):
+            grades = [
+                PersistentSubsectionGrade.update_or_create_grade(**self._params(user)) for user in self.users
+            ]
+        PersistentSubsectionGrade.flush_buffered_writes(self.course_key)
+
+        assert grades[0].override == override
+        assert not hasattr(grades[1], 'override')
+        assert not hasattr(grades[2], 'override')
+
+    def test_grade_created_concurrently(self):
+        stored_grade = PersistentSubsectionGrade.update_or_create_grade(**self._params(self.users[0]))
+
+        PersistentSubsectionGrade.buffer_writes(self.course_key)
+        with patch.object(SubsectionGradeWriteBuffer, '_load_grades'):
+            # Buffer the grade as if another process created it after it was read.
+            PersistentSubsectionGrade.update_or_create_grade(
+                **self._params(self.users[0], earned_all=8.0, first_attempted=now())
+            )
+        PersistentSubsectionGrade.flush_buffered_writes(self.course_key)
+
+        read_grade = PersistentSubsectionGrade.read_grade(self.users[0].id, self.usage_key)
+        assert read_grade.id == stored_grade.id
+        assert read_grade.earned_all == 8.0
+        assert read_grade.first_attempted == self.first_attempted
+
+
 @ddt.ddt
 class PersistentCourseGradesTest(GradesModelTestCase):
     """
@@ -28,6 +28,29 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course and problem grade reports, fan out into subtasks that each grade
+#   a contiguous range of learners into a partial CSV, and merge the partial CSVs into the final report once all of
+#   them have completed. The number of learners in each subtask is set by GRADE_REPORT_USERS_PER_SHARD.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.compress_grade_reports
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When grade reports are written to disk or generated in shards, upload them gzip-compressed,
+#   as .csv.gz files, instead of as plain CSV files.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+COMPRESS_GRADE_REPORTS = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.compress_grade_reports', __name__
+)
+
 
 def problem_grade_report_verified_only(course_id):
     """
@@ -54,3 +77,19 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if grade reports should be generated by
+    subtasks that each grade a range of learners, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
+
+
+def compress_grade_reports(course_id):
+    """
+    Returns True if grade reports should be uploaded
+    gzip-compressed, False otherwise.
+    """
+    return COMPRESS_GRADE_REPORTS.is_enabled(course_id)
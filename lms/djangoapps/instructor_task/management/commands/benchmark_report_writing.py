@@ -0,0 +1,141 @@
+"""
+Command to compare the memory used by the ways of writing CSV reports.
+"""
+
+
+import csv
+import shutil
+import tempfile
+import time
+import tracemalloc
+from tempfile import TemporaryFile
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+from lms.djangoapps.instructor_task.models import DjangoStorageReportStore
+from lms.djangoapps.instructor_task.tasks_helper.utils import ReportCSVFile
+
+COURSE_KEY = CourseLocator('edX', 'BenchmarkReportWriting', 'run')
+
+
+class Command(BaseCommand):
+    """
+    Generates the rows of a synthetic grade report in batches, the way
+    grade reports generate them, and writes them to a report store on the
+    local filesystem with each of:
+
+        in_memory: compiling all rows into a list and storing them with
+            ReportStore.store_rows, as InMemoryReportMixin does.
+        temp_file: writing rows to a TemporaryFile and storing it with
+            ReportStore.store, as TemporaryFileReportMixin used to.
+        streaming: writing rows to a ReportCSVFile and streaming it to the
+            report store, as TemporaryFileReportMixin does.
+        streaming_gzip: the same, with a gzip-compressed ReportCSVFile.
+
+    For each, reports the peak memory allocated by Python, the time taken
+    and the size of the stored report.  The peak of the streaming writers
+    stays bounded by the size of one batch and of the in-memory spool as
+    the number of rows grows.
+
+    Does not touch the database or the modulestore.
+
+    Example usage:
+        $ ./manage.py lms benchmark_report_writing --num_rows 200000 --settings=devstack
+    """
+    help = 'Compares the peak memory used to write CSV reports in memory, through temp files and streaming.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_rows',
+            help='Number of learner rows in the synthetic report.',
+            default=50000,
+            type=int,
+        )
+        parser.add_argument(
+            '--num_columns',
+            help='Number of grade columns in each row.',
+            default=40,
+            type=int,
+        )
+        parser.add_argument(
+            '--batch_size',
+            help='Number of rows generated per batch.',
+            default=1000,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        num_rows, num_columns, batch_size = options['num_rows'], options['num_columns'], options['batch_size']
+        writers = {
+            'in_memory': self._write_in_memory,
+            'temp_file': self._write_temp_file,
+            'streaming': lambda report_store, batches: self._write_streaming(report_store, batches, False),
+            'streaming_gzip': lambda report_store, batches: self._write_streaming(report_store, batches, True),
+        }
+
+        self.stdout.write(f'{num_rows} rows, {num_columns} columns, batches of {batch_size} rows')
+        self.stdout.write(f'{"writer":<16}{"peak KiB":>12}{"ms":>12}{"bytes":>14}')
+        for writer_name, write in writers.items():
+            root_path = tempfile.mkdtemp()
+            try:
+                report_store = DjangoStorageReportStore(
+                    storage_class='django.core.files.storage.FileSystemStorage',
+                    storage_kwargs={'location': root_path},
+                )
+                batches = self._batched_rows(num_rows, num_columns, batch_size)
+
+                tracemalloc.start()
+                start = time.perf_counter()
+                filename = write(report_store, batches)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                size = report_store.storage.size(report_store.path_to(COURSE_KEY, filename))
+            finally:
+                shutil.rmtree(root_path)
+
+            self.stdout.write(f'{writer_name:<16}{peak / 1024:>12.0f}{elapsed * 1000:>12.0f}{size:>14}')
+
+    @staticmethod
+    def _batched_rows(num_rows, num_columns, batch_size):
+        """
+        Yields the header row of a synthetic grade report in a batch of
+        its own, followed by batches of up to batch_size learner rows.
+        """
+        yield [['Student ID', 'Email', 'Username', 'Grade'] + [f'Assignment {i}' for i in range(num_columns)]]
+        for batch_start in range(0, num_rows, batch_size):
+            yield [
+                [user_id, f'learner_{user_id}@example.com', f'learner_{user_id}', (user_id % 100) / 100] + [
+                    ((user_id + column) % 11) / 10 for column in range(num_columns)
+                ]
+                for user_id in range(batch_start, min(batch_start + batch_size, num_rows))
+            ]
+
+    @staticmethod
+    def _write_in_memory(report_store, batches):
+        rows = []
+        for batch in batches:
+            rows.extend(batch)
+        report_store.store_rows(COURSE_KEY, 'report.csv', rows)
+        return 'report.csv'
+
+    @staticmethod
+    def _write_temp_file(report_store, batches):
+        with TemporaryFile('r+') as report_file:
+            writer = csv.writer(report_file)
+            for batch in batches:
+                writer.writerows(batch)
+            report_file.seek(0)
+            report_store.store(COURSE_KEY, 'report.csv', report_file)
+        return 'report.csv'
+
+    @staticmethod
+    def _write_streaming(report_store, batches, compress):
+        filename = 'report.csv.gz' if compress else 'report.csv'
+        with ReportCSVFile(compress) as report_file:
+            for batch in batches:
+                report_file.writerows(batch)
+            report_store.store_file(COURSE_KEY, filename, report_file.finish())
+        return filename
@@ -0,0 +1,25 @@
+"""
+Tests for the benchmark_report_writing management command.
+"""
+
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class TestBenchmarkReportWriting(SimpleTestCase):
+    """
+    Tests the benchmark_report_writing management command.
+    """
+    def test_benchmark(self):
+        out = StringIO()
+        call_command(
+            'benchmark_report_writing', '--num_rows', '25', '--num_columns', '3', '--batch_size', '10', stdout=out,
+        )
+        output = out.getvalue()
+
+        assert '25 rows, 3 columns' in output
+        for writer_name in ('in_memory', 'temp_file', 'streaming', 'streaming_gzip'):
+            assert f'\n{writer_name} ' in output
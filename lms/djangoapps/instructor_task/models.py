@@ -23,7 +23,7 @@ from botocore.exceptions import ClientError
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from django.utils.translation import gettext as _
 from model_utils.models import TimeStampedModel
@@ -306,6 +306,16 @@ class DjangoStorageReportStore(ReportStore):
 
         self.storage.save(path, buff)
 
+    def store_file(self, course_id, filename, file, parent_dir=''):
+        """
+        Store the contents of the binary file-like object `file`, ready to
+        be read from the beginning, in the same location as `store` would.
+        Unlike `store`, the contents are streamed to the storage backend
+        (in a multipart upload, for S3) instead of being read into memory.
+        """
+        path = self.path_to(course_id, filename, parent_dir)
+        self.storage.save(path, File(file, name=filename))
+
     def store_rows(self, course_id, filename, rows, parent_dir=''):
         """
         Given a course_id, filename, and rows (each row is an iterable of
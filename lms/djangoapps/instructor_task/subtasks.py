@@ -11,7 +11,7 @@ from time import time
 from uuid import uuid4
 
 import psutil
-from celery.states import READY_STATES, RETRY, SUCCESS
+from celery.states import FAILURE, READY_STATES, RETRY, SUCCESS
 from django.core.cache import cache
 from django.db import DatabaseError, transaction
 
@@ -208,7 +208,7 @@ class SubtaskStatus:
         return str(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, subtask_info=None):
     """
     Store initial subtask information to InstructorTask object.
 
@@ -262,6 +262,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'failed': 0,
         'status': subtask_status
     }
+    if subtask_info:
+        subtask_dict.update(subtask_info)
     entry.subtasks = json.dumps(subtask_dict)
 
     # and save the entry immediately, before any subtasks actually start work:
@@ -455,7 +457,8 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
         raise DuplicateTaskException(msg)
 
 
-def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
+def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0,
+                          fail_on_subtask_failure=False):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -466,16 +469,23 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    If `fail_on_subtask_failure` is set, the InstructorTask is marked as failed rather than
+    succeeded once all of its subtasks have completed, if any of them failed.
+
+    Returns the number of subtasks of the InstructorTask that have not yet completed.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status, fail_on_subtask_failure)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
         if retry_count < MAX_DATABASE_LOCK_RETRIES:
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(
+                entry_id, current_task_id, new_subtask_status, retry_count, fail_on_subtask_failure,
+            )
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",  # pylint: disable=line-too-long
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -488,7 +498,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
 
 @transaction.atomic
-def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
+def _update_subtask_status(entry_id, current_task_id, new_subtask_status, fail_on_subtask_failure=False):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -508,12 +518,15 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     subtasks.  'Total' is expected to have been set at the time the subtasks were created.
     The other three counters are incremented depending on the value of `status`.  Once the counters
     for 'succeeded' and 'failed' match the 'total', the subtasks are done and the InstructorTask's
-    "status" is changed to SUCCESS.
+    "status" is changed to SUCCESS, or to FAILURE if `fail_on_subtask_failure` is set and any
+    subtask failed.
 
     The "subtasks" field also contains a 'status' key, that contains a dict that stores status
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns the number of subtasks that have not yet completed.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -565,7 +578,11 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # if there was a catastrophic failure that occurred, and figure out how to
         # report that here.
         if num_remaining <= 0:
-            entry.task_state = SUCCESS
+            if fail_on_subtask_failure and subtask_dict['failed'] > 0:
+                entry.task_state = FAILURE
+                task_progress['message'] = f"{subtask_dict['failed']} of {subtask_dict['total']} subtasks failed"
+            else:
+                entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
 
@@ -573,6 +590,43 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         entry.save()
         TASK_LOG.info("Task output updated to %s for subtask %s of instructor task %d",
                       entry.task_output, current_task_id, entry_id)
+        return num_remaining
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         raise
+
+
+@transaction.atomic
+def reset_failed_subtasks(entry_id, subtask_ids):
+    """
+    Reset the status of those of the given subtasks of the InstructorTask that failed, so
+    that they can be queued again.
+
+    Each failed subtask gets a new SubtaskStatus, and is no longer counted as failed in the
+    InstructorTask's "subtasks" field, nor are its counts in its "task_output" field.  Uses
+    select_for_update to lock the InstructorTask object while it is being updated.
+
+    Returns a dict of the new SubtaskStatus of each reset subtask, keyed by its task_id.
+    """
+    entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+    subtask_dict = json.loads(entry.subtasks)
+    task_progress = json.loads(entry.task_output)
+    reset_statuses = {}
+    for subtask_id in subtask_ids:
+        subtask_status = SubtaskStatus.from_dict(subtask_dict['status'][subtask_id])
+        if subtask_status.state != FAILURE:
+            continue
+        for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
+            task_progress[statname] -= getattr(subtask_status, statname)
+        subtask_dict['failed'] -= 1
+        reset_statuses[subtask_id] = SubtaskStatus.create(subtask_id)
+        subtask_dict['status'][subtask_id] = reset_statuses[subtask_id].to_dict()
+
+    if reset_statuses:
+        task_progress.pop('message', None)
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.task_output = InstructorTask.create_output_for_success(task_progress)
+        entry.save()
+        TASK_LOG.info("Reset the status of failed subtasks %s of instructor task %d",
+                      list(reset_statuses), entry_id)
+    return reset_statuses
@@ -36,7 +36,13 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv,
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    generate_report_shard,
+    merge_report_shards,
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     generate_anonymous_ids,
@@ -82,7 +88,7 @@ def rescore_problem(entry_id, xblock_instance_args):
     action_name = gettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xblock_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, prefetch_field_data=True)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
@@ -219,6 +225,30 @@ def calculate_problem_grade_report(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task
+@set_code_owner_attribute
+def generate_grade_report_shard(entry_id, xblock_instance_args, shard_index, subtask_status_dict):
+    """
+    Write the rows of a sharded course or problem grade report for one range
+    of learners to partial CSVs, to be merged by `merge_grade_report_shards`.
+
+    `subtask_status_dict` is the SubtaskStatus of this shard, in dict form.
+    """
+    return generate_report_shard(entry_id, xblock_instance_args, shard_index, subtask_status_dict)
+
+
+@shared_task
+@set_code_owner_attribute
+def merge_grade_report_shards(entry_id, xblock_instance_args, subtask_status_dict):
+    """
+    Merge the partial CSVs of all shards of a sharded course or problem grade
+    report into the final report, and push it to an S3 bucket for download.
+
+    `subtask_status_dict` is the SubtaskStatus of this subtask, in dict form.
+    """
+    return merge_report_shards(entry_id, xblock_instance_args, subtask_status_dict)
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_students_features_csv(entry_id, xblock_instance_args):
@@ -2,17 +2,21 @@
 Functionality for generating grade reports.
 """
 
+import codecs
 import csv
+import json
 import logging
+import os
 import re
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from itertools import chain
-from tempfile import TemporaryFile
 from time import time
 
+from celery.states import FAILURE, READY_STATES, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.base import File
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -21,19 +25,35 @@ from six.moves import zip_longest
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.roles import BulkRoleCache
+from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.api import get_certificates_for_course_and_users
 from lms.djangoapps.course_blocks.api import get_course_block_access_transformers, get_course_blocks
 from lms.djangoapps.course_blocks.transformers import library_content
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
-from lms.djangoapps.grades.api import CourseGradeFactory, prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.api import (
+    CourseGradeFactory,
+    clear_prefetched_course_grades,
+    prefetch_course_and_subsection_grades,
+)
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
+    compress_grade_reports,
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_grade_reporting,
+)
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    initialize_subtask_info,
+    reset_failed_subtasks,
+    update_subtask_status,
 )
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
@@ -49,7 +69,7 @@ from xmodule.partitions.partitions_service import PartitionService  # pylint: di
 from xmodule.split_test_block import get_split_user_partitions  # pylint: disable=wrong-import-order
 
 from .runner import TaskProgress
-from .utils import upload_csv_file_to_report_store, upload_csv_to_report_store
+from .utils import ReportCSVFile, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -73,6 +93,20 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _shard_subtask_id(task_id, shard_index):
+    """
+    Returns the id of the subtask for the given shard of a sharded grade report.
+    """
+    return f'{task_id}-shard-{shard_index}'
+
+
+def _merge_subtask_id(task_id):
+    """
+    Returns the id of the subtask that merges the shards of a sharded grade report.
+    """
+    return f'{task_id}-merge'
+
+
 class _CourseGradeReportContext:
     """
     Internal class that provides a common context to use for a single grade
@@ -93,6 +127,8 @@ class _CourseGradeReportContext:
             course_id=course_id,
             task_input=_task_input,
         )
+        self.xblock_instance_args = _xblock_instance_args
+        self.entry_id = _entry_id
         self.action_name = action_name
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
@@ -186,6 +222,7 @@ class _ProblemGradeReportContext:
             task_input=_task_input,
         )
         self.task_id = task_id
+        self.xblock_instance_args = _xblock_instance_args
         self.entry_id = _entry_id
         self.task_input = _task_input
         self.action_name = action_name
@@ -272,7 +309,7 @@ class _CourseGradeBulkContext:  # pylint: disable=missing-class-docstring
         self.teams = _TeamBulkContext(context, users)
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
-        BulkRoleCache.prefetch(users)
+        BulkRoleCache.prefetch(users, course_keys=[context.course_id])
         prefetch_course_and_subsection_grades(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
@@ -341,7 +378,9 @@ class InMemoryReportMixin:
 
 class TemporaryFileReportMixin:
     """
-    Mixin for a file report that will write rows iteratively to a TempFile
+    Mixin for a file report that will write rows iteratively to a spooled
+    TempFile and stream it to the report store, so that memory use does not
+    grow with the number of rows.
     """
 
     def _generate(self):
@@ -351,7 +390,8 @@ class TemporaryFileReportMixin:
         self.context.update_status('TemporaryFileReportMixin - 1: Starting grade report')
         batched_rows = self._batched_rows()
 
-        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+        compress = compress_grade_reports(self.context.course_id)
+        with ReportCSVFile(compress) as success_file, ReportCSVFile(compress) as error_file:
             self.context.update_status('TemporaryFileReportMixin - 2: Compiling grades into temp files')
             has_errors = self.iter_and_write_batched_rows(batched_rows, success_file, error_file)
 
@@ -362,22 +402,19 @@ class TemporaryFileReportMixin:
 
     def iter_and_write_batched_rows(self, batched_rows, success_file, error_file):
         """
-        Iterate through batched rows, writing returned chunks to disk as we go.
-        This should hopefully help us avoid out of memory errors.
+        Iterate through batched rows, writing returned chunks to the given
+        ReportCSVFiles as we go, so that only one batch is held in memory.
         """
-        success_writer = csv.writer(success_file)
-        error_writer = csv.writer(error_file)
-
         # Write headers
-        success_writer.writerow(self._success_headers())
-        error_writer.writerow(self._error_headers())
+        success_file.writerow(self._success_headers())
+        error_file.writerow(self._error_headers())
 
         succeeded, failed = 0, 0
         # Iterate through batched rows, writing to temp file
         for success_rows, error_rows in batched_rows:
-            success_writer.writerows(success_rows)
+            success_file.writerows(success_rows)
             if len(error_rows) > 0:
-                error_writer.writerows(error_rows)
+                error_file.writerows(error_rows)
             succeeded += len(success_rows)
             failed += len(error_rows)
 
@@ -390,13 +427,11 @@ class TemporaryFileReportMixin:
 
     def upload_temp_files(self, success_file, error_file, has_errors):
         """
-        Uploads success and error csv files to report store
+        Uploads success and error ReportCSVFiles to report store
         """
         date = datetime.now(UTC)
 
-        success_file.seek(0)
-        upload_csv_file_to_report_store(
-            success_file,
+        success_file.upload(
             self.context.upload_filename,
             self.context.course_id,
             date,
@@ -404,9 +439,7 @@ class TemporaryFileReportMixin:
         )
 
         if has_errors:
-            error_file.seek(0)
-            upload_csv_file_to_report_store(
-                error_file,
+            error_file.upload(
                 self.context.upload_filename + '_err',
                 self.context.course_id,
                 date,
@@ -414,6 +447,243 @@ class TemporaryFileReportMixin:
             )
 
 
+class ShardedReportMixin(TemporaryFileReportMixin):
+    """
+    Mixin for a file report that fans out into subtasks, each of which writes
+    the rows for a contiguous range of user ids to a partial CSV in the report
+    store.  Once all of them have completed, a final subtask concatenates the
+    partial CSVs, in user id order, into the same files that
+    TemporaryFileReportMixin would upload.
+
+    Progress is tracked with the subtask accounting in instructor_task.subtasks.
+    Partial CSVs are named after the InstructorTask and the shard, so a shard
+    that is run again after a worker crash reuses a partial CSV that was already
+    stored, and running the parent task again only re-queues the subtasks that
+    have not completed.
+    """
+    SHARD_DIRECTORY = 'grade_report_shards'
+
+    def _generate(self):
+        """
+        Queues the subtasks for this report, or the ones that have not yet
+        completed if they were already queued.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        if len(entry.subtasks) > 0:
+            return self._requeue_incomplete_subtasks(entry)
+
+        self.context.update_status('ShardedReportMixin - 1: Dividing learners into shards')
+        user_ids = list(self._enrolled_user_ids())
+        if not user_ids:
+            return super()._generate()
+
+        users_per_shard = settings.GRADE_REPORT_USERS_PER_SHARD
+        shards = [
+            [user_ids[start], user_ids[min(start + users_per_shard, len(user_ids)) - 1]]
+            for start in range(0, len(user_ids), users_per_shard)
+        ]
+        subtask_ids = [_shard_subtask_id(entry.task_id, index) for index in range(len(shards))]
+        subtask_ids.append(_merge_subtask_id(entry.task_id))
+        with outer_atomic():
+            progress = initialize_subtask_info(
+                entry, self.context.action_name, len(user_ids), subtask_ids, subtask_info={'shards': shards},
+            )
+
+        self.context.update_status(f'ShardedReportMixin - 2: Queueing {len(shards)} shards')
+        for shard_index in range(len(shards)):
+            self._queue_shard(shard_index, SubtaskStatus.create(subtask_ids[shard_index]))
+        return progress
+
+    def _requeue_incomplete_subtasks(self, entry):
+        """
+        Re-queues the shards of the given InstructorTask that have not
+        completed or have failed, or its merge subtask if all of the shards
+        have succeeded.  The failed subtasks are reset first, so that the
+        merge subtask runs again once the shards have completed.
+        """
+        subtask_dict = json.loads(entry.subtasks)
+        num_shards = len(subtask_dict['shards'])
+        subtask_ids = [_shard_subtask_id(entry.task_id, shard_index) for shard_index in range(num_shards)]
+        subtask_ids.append(_merge_subtask_id(entry.task_id))
+        reset_statuses = reset_failed_subtasks(entry.id, subtask_ids)
+
+        incomplete_shards = []
+        for shard_index in range(num_shards):
+            subtask_id = _shard_subtask_id(entry.task_id, shard_index)
+            subtask_status = reset_statuses.get(subtask_id) or SubtaskStatus.from_dict(
+                subtask_dict['status'][subtask_id]
+            )
+            if subtask_status.state not in READY_STATES:
+                incomplete_shards.append((shard_index, subtask_status))
+
+        TASK_LOG.warning(
+            '%s, Task type: %s, Subtasks already defined, re-queueing %d incomplete shards',
+            self.context.task_info_string, self.context.action_name, len(incomplete_shards),
+        )
+        for shard_index, subtask_status in incomplete_shards:
+            self._queue_shard(shard_index, subtask_status)
+        if not incomplete_shards:
+            merge_subtask_id = _merge_subtask_id(entry.task_id)
+            merge_status = reset_statuses.get(merge_subtask_id) or SubtaskStatus.from_dict(
+                subtask_dict['status'][merge_subtask_id]
+            )
+            if merge_status.state not in READY_STATES:
+                self._queue_merge(merge_status)
+        return json.loads(InstructorTask.objects.get(pk=entry.id).task_output)
+
+    def _queue_shard(self, shard_index, subtask_status):
+        """
+        Queues the subtask for the given shard.
+        """
+        # Imported here to avoid a circular import, since the tasks module imports this one.
+        from lms.djangoapps.instructor_task.tasks import generate_grade_report_shard
+        generate_grade_report_shard.apply_async(
+            (self.context.entry_id, self.context.xblock_instance_args, shard_index, subtask_status.to_dict()),
+            task_id=subtask_status.task_id,
+        )
+
+    def _queue_merge(self, subtask_status):
+        """
+        Queues the subtask that merges the partial CSVs of all shards.
+        """
+        # Imported here to avoid a circular import, since the tasks module imports this one.
+        from lms.djangoapps.instructor_task.tasks import merge_grade_report_shards
+        merge_grade_report_shards.apply_async(
+            (self.context.entry_id, self.context.xblock_instance_args, subtask_status.to_dict()),
+            task_id=subtask_status.task_id,
+        )
+
+    def _generate_shard(self, shard_index, subtask_status):
+        """
+        Writes the rows for the users in the given shard to partial CSVs, and
+        queues the merge subtask if this was the last shard to complete.
+        """
+        entry_id = self.context.entry_id
+        check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+        entry = InstructorTask.objects.get(pk=entry_id)
+        try:
+            success_path, error_path = self._partial_paths(shard_index)
+            storage = self._report_store.storage
+            if storage.exists(success_path):
+                TASK_LOG.info('%s, Reusing stored rows for shard %d', self.context.task_info_string, shard_index)
+                succeeded = self._count_partial_rows(success_path)
+                failed = self._count_partial_rows(error_path)
+            else:
+                user_id_range = json.loads(entry.subtasks)['shards'][shard_index]
+                with modulestore().bulk_operations(self.context.course_id):
+                    with ReportCSVFile() as success_file, ReportCSVFile() as error_file:
+                        self.iter_and_write_batched_rows(
+                            self._batched_rows(user_id_range), success_file, error_file,
+                        )
+                        # The success partial is stored last, since its presence marks the shard as complete.
+                        self._store_partial(error_path, error_file)
+                        self._store_partial(success_path, success_file)
+                succeeded = self.context.task_progress.succeeded
+                failed = self.context.task_progress.failed
+        except Exception:
+            TASK_LOG.exception('%s, Shard %d failed', self.context.task_info_string, shard_index)
+            subtask_status.increment(state=FAILURE)
+            self._update_shard_status(entry, subtask_status)
+            raise
+
+        subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+        self._update_shard_status(entry, subtask_status)
+        return subtask_status.to_dict()
+
+    def _update_shard_status(self, entry, subtask_status):
+        """
+        Records the status of a completed shard, and queues the merge subtask
+        if it was the last shard to complete.  The merge subtask also runs when
+        a shard has failed, so that it can record the failure of the report.
+        """
+        num_remaining = update_subtask_status(
+            entry.id, subtask_status.task_id, subtask_status, fail_on_subtask_failure=True,
+        )
+        if num_remaining == 1:
+            self._queue_merge(SubtaskStatus.create(_merge_subtask_id(entry.task_id)))
+
+    def _merge_shards(self, subtask_status):
+        """
+        Concatenates the partial CSVs of all shards into the final report,
+        and deletes them.
+        """
+        entry_id = self.context.entry_id
+        check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+        try:
+            subtask_dict = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+            if subtask_dict['failed'] > 0:
+                raise ValueError(f"{subtask_dict['failed']} shards of the report failed")
+
+            num_shards = len(subtask_dict['shards'])
+            compress = compress_grade_reports(self.context.course_id)
+            with ReportCSVFile(compress) as success_file, ReportCSVFile(compress) as error_file:
+                success_file.writerow(self._success_headers())
+                error_file.writerow(self._error_headers())
+
+                for shard_index in range(num_shards):
+                    success_path, error_path = self._partial_paths(shard_index)
+                    success_file.writerows(self._read_partial_rows(success_path))
+                    error_file.writerows(self._read_partial_rows(error_path))
+
+                # Both files start with their header row.
+                self.upload_temp_files(success_file, error_file, error_file.num_rows > 1)
+
+            for shard_index in range(num_shards):
+                for path in self._partial_paths(shard_index):
+                    self._report_store.storage.delete(path)
+        except Exception:
+            TASK_LOG.exception('%s, Merging shards failed', self.context.task_info_string)
+            subtask_status.increment(state=FAILURE)
+            update_subtask_status(entry_id, subtask_status.task_id, subtask_status, fail_on_subtask_failure=True)
+            raise
+
+        subtask_status.increment(state=SUCCESS)
+        update_subtask_status(entry_id, subtask_status.task_id, subtask_status, fail_on_subtask_failure=True)
+        return subtask_status.to_dict()
+
+    @lazy
+    def _report_store(self):
+        return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def _partial_paths(self, shard_index):
+        """
+        Returns the storage paths of the success and error partial CSVs for
+        the given shard.
+        """
+        shard_directory = os.path.join(
+            self._report_store.path_to(self.context.course_id),
+            self.SHARD_DIRECTORY,
+            str(self.context.entry_id),
+        )
+        return (
+            os.path.join(shard_directory, f'{shard_index:05d}.csv'),
+            os.path.join(shard_directory, f'{shard_index:05d}_err.csv'),
+        )
+
+    def _store_partial(self, path, partial_file):
+        """
+        Streams the given partial ReportCSVFile to path, replacing any
+        partial left there by an earlier attempt.
+        """
+        storage = self._report_store.storage
+        if storage.exists(path):
+            storage.delete(path)
+        storage.save(path, File(partial_file.finish()))
+
+    def _read_partial_rows(self, path):
+        """
+        Yields the rows of the partial CSV at path, without its header row,
+        reading it line by line rather than all at once.
+        """
+        with self._report_store.storage.open(path, 'rb') as partial_file:
+            rows = csv.reader(codecs.iterdecode(partial_file, 'utf-8'))
+            next(rows, None)
+            yield from rows
+
+    def _count_partial_rows(self, path):
+        return sum(1 for _ in self._read_partial_rows(path))
+
+
 class GradeReportBase:
     """
     Base class for grade reports (ProblemGradeReport and CourseGradeReport).
@@ -447,9 +717,21 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_user_ids(self):
+        """
+        Returns the ids of all the users in this report, in ascending order.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+
+    def _batch_users(self, user_id_range=None):
         """
-        Returns a generator of batches of users.
+        Returns a generator of batches of users, optionally limited to the
+        users whose ids are within the inclusive (first_id, last_id) user_id_range.
         """
         def grouper(iterable, chunk_size=100, fillvalue=None):
             args = [iter(iterable)] * chunk_size
@@ -467,7 +749,10 @@ class GradeReportBase:
             if verified_only:
                 filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
 
-            user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            user_ids_list = self._enrolled_user_ids()
+            if user_id_range is not None:
+                first_id, last_id = user_id_range
+                user_ids_list = user_ids_list.filter(id__gte=first_id, id__lte=last_id)
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
@@ -477,7 +762,7 @@ class GradeReportBase:
                     id__gte=min_id,
                     id__lte=max_id,
                     **filter_kwargs
-                ).select_related('profile')
+                ).select_related('profile').order_by('id')
 
                 yield users
 
@@ -500,11 +785,11 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, user_id_range=None):
         """
         A generator of batches of (success_rows, error_rows) for this report.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(user_id_range):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -523,7 +808,9 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                return ShardedCourseGradeReport(context)._generate()  # pylint: disable=protected-access
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryCourseGradeReport(context)._generate()  # pylint: disable=protected-access
@@ -710,6 +997,11 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, ShardedReportMixin):
+    """ Course Grade Report that is written by subtasks for ranges of learners and then merged """
+    context_class = _CourseGradeReportContext
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -722,7 +1014,9 @@ class ProblemGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _ProblemGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                return ShardedProblemGradeReport(context)._generate()  # pylint: disable=protected-access
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileProblemGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryProblemGradeReport(context)._generate()  # pylint: disable=protected-access
@@ -753,12 +1047,15 @@ class ProblemGradeReport(GradeReportBase):
         """
         Returns a list of rows for the given users for this report.
         """
+        prefetch_course_and_subsection_grades(self.context.course_id, users)
+
         success_rows, error_rows = [], []
         for student, course_grade, error in CourseGradeFactory().iter(
             users,
             course=self.context.course,
             collected_block_structure=self.context.course_structure,
             course_key=self.context.course_id,
+            prefetch_scores=True,
         ):
             if not course_grade:
                 err_msg = str(error)
@@ -795,6 +1092,7 @@ class ProblemGradeReport(GradeReportBase):
     def _clear_caches(self):
         get_cache('get_enrollment').clear()
         get_cache(CourseEnrollment.MODE_CACHE_NAMESPACE).clear()
+        clear_prefetched_course_grades(self.context.course_id)
 
 
 class InMemoryProblemGradeReport(ProblemGradeReport, InMemoryReportMixin):
@@ -805,6 +1103,49 @@ class TempFileProblemGradeReport(ProblemGradeReport, TemporaryFileReportMixin):
     """ Program Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedProblemGradeReport(ProblemGradeReport, ShardedReportMixin):
+    """ Problem Grade Report that is written by subtasks for ranges of learners and then merged """
+    context_class = _ProblemGradeReportContext
+
+
+SHARDED_GRADE_REPORTS = {
+    InstructorTaskTypes.GRADE_COURSE: ShardedCourseGradeReport,
+    InstructorTaskTypes.GRADE_PROBLEMS: ShardedProblemGradeReport,
+}
+
+
+def _sharded_report_for_entry(entry_id, xblock_instance_args):
+    """
+    Returns the sharded grade report for the given InstructorTask.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    action_name = json.loads(entry.task_output)['action_name']
+    report_class = SHARDED_GRADE_REPORTS[entry.task_type]
+    context = report_class.context_class(
+        xblock_instance_args, entry_id, entry.course_id, json.loads(entry.task_input), action_name,
+    )
+    return report_class(context)
+
+
+def generate_report_shard(entry_id, xblock_instance_args, shard_index, subtask_status_dict):
+    """
+    Writes the rows for the given shard of a sharded grade report to partial CSVs.
+    """
+    report = _sharded_report_for_entry(entry_id, xblock_instance_args)
+    return report._generate_shard(  # pylint: disable=protected-access
+        shard_index, SubtaskStatus.from_dict(subtask_status_dict),
+    )
+
+
+def merge_report_shards(entry_id, xblock_instance_args, subtask_status_dict):
+    """
+    Merges the partial CSVs of a sharded grade report into the final report.
+    """
+    report = _sharded_report_for_entry(entry_id, xblock_instance_args)
+    with modulestore().bulk_operations(report.context.course_id):
+        return report._merge_shards(SubtaskStatus.from_dict(subtask_status_dict))  # pylint: disable=protected-access
+
+
 class ProblemResponses:
     """
     Class to encapsulate functionality related to generating Problem Responses Reports.
@@ -7,6 +7,7 @@ import json
 import logging
 from time import time
 
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_noop
 from opaque_keys.edx.keys import UsageKey
 from xblock.scorable import Score
@@ -18,8 +19,8 @@ from common.djangoapps.track.views import task_track
 from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.courseware.block_render import get_block_for_descriptor
 from lms.djangoapps.courseware.courses import get_problems_in_section
-from lms.djangoapps.courseware.model_data import FieldDataCache
-from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.model_data import BulkFieldDataCache, FieldDataCache
+from lms.djangoapps.courseware.models import StudentModule, chunks
 from lms.djangoapps.grades.api import events as grades_events
 from openedx.core.lib.courses import get_course_by_id
 from xmodule.modulestore.django import modulestore  # pylint: disable=wrong-import-order
@@ -31,7 +32,8 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                prefetch_field_data=False):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -43,6 +45,9 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If `prefetch_field_data` is True, the field data of the problems is read for a batch of students at a
+    time, and the FieldDataCache of the module's student is passed to `update_fcn` as `field_data_cache`.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -88,12 +93,17 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
+    if prefetch_field_data:
+        updates = _iter_modules_with_field_data_caches(course_id, problems.values(), modules_to_update)
+    else:
+        updates = ((module_to_update, {}) for module_to_update in modules_to_update)
+
+    for module_to_update, update_kwargs in updates:
         task_progress.attempted += 1
         block = problems[str(module_to_update.module_state_key)]
         # There is no try here:  if there's an error, we let it throw, and the task will
         # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(block, module_to_update, task_input)
+        update_status = update_fcn(block, module_to_update, task_input, **update_kwargs)
         if update_status == UPDATE_STATUS_SUCCEEDED:
             # If the update_fcn returns true, then it performed some kind of work.
             # Logging of failures is left to the update_fcn itself.
@@ -109,7 +119,7 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
 
 @outer_atomic
-def rescore_problem_module_state(xblock_instance_args, block, student_module, task_input):
+def rescore_problem_module_state(xblock_instance_args, block, student_module, task_input, field_data_cache=None):
     '''
     Takes an XBlock and a corresponding StudentModule object, and
     performs rescoring on the student's problem submission.
@@ -120,6 +130,8 @@ def rescore_problem_module_state(xblock_instance_args, block, student_module, ta
 
     Returns True if problem was successfully rescored for the given student, and False
     if problem encountered some kind of error in rescoring.
+
+    If `field_data_cache` is provided, it is used instead of reading the field data of the student.
     '''
     # unpack the StudentModule:
     course_id = student_module.course_id
@@ -137,7 +149,8 @@ def rescore_problem_module_state(xblock_instance_args, block, student_module, ta
             block,
             xblock_instance_args,
             grade_bucket_type='rescore',
-            course=course
+            course=course,
+            field_data_cache=field_data_cache,
         )
 
         if instance is None:
@@ -329,13 +342,17 @@ def delete_problem_module_state(xblock_instance_args, _block, student_module, _t
 
 
 def _get_module_instance_for_task(course_id, student, block, xblock_instance_args=None,
-                                  grade_bucket_type=None, course=None):
+                                  grade_bucket_type=None, course=None, field_data_cache=None):
     """
     Fetches a StudentModule instance for a given `course_id`, `student` object, and `block`.
 
     `xblock_instance_args` is used to provide information for creating a track function.
     It is passed, along with `grade_bucket_type`, to get_block_for_descriptor.
+    The field data of the student is read unless a prefetched `field_data_cache` is provided.
     """
+    if field_data_cache is None:
+        field_data_cache = FieldDataCache.cache_for_block_descendents(course_id, student, block)
+
     # get request-related tracking information from args passthrough, and supplement with task-specific information:
     request_info = xblock_instance_args.get('request_info', {}) if xblock_instance_args is not None else {}
     task_info = {"student": student.username, "task_id": _get_task_id_from_xblock_args(xblock_instance_args)}
@@ -354,7 +371,7 @@ def _get_module_instance_for_task(course_id, student, block, xblock_instance_arg
         user=student,
         request=None,
         block=block,
-        field_data_cache=FieldDataCache.cache_for_block_descendents(course_id, student, block),
+        field_data_cache=field_data_cache,
         course_key=course_id,
         track_function=make_track_function(),
         grade_bucket_type=grade_bucket_type,
@@ -389,6 +406,25 @@ def _get_task_id_from_xblock_args(xblock_instance_args):
         return xblock_instance_args.get('task_id', UNKNOWN_TASK_ID)
 
 
+def _iter_modules_with_field_data_caches(course_id, blocks, student_modules):
+    """
+    Yields each of the `student_modules` together with the keyword arguments
+    that pass the FieldDataCache of its student for `blocks` to an update_fcn.
+
+    The students and their field data are read for a batch of modules at a time.
+    """
+    bulk_cache = BulkFieldDataCache.cache_for_block_descendents(course_id, blocks)
+    for modules_batch in chunks(student_modules, bulk_cache.users_per_batch):
+        students = get_user_model().objects.in_bulk({module.student_id for module in modules_batch})
+        field_data_caches = {
+            user.id: field_data_cache
+            for user, field_data_cache in bulk_cache.iter_field_data_caches(list(students.values()))
+        }
+        for module in modules_batch:
+            module.student = students[module.student_id]
+            yield module, {'field_data_cache': field_data_caches[module.student_id]}
+
+
 def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn, override_score_task=False):
     """
     Fetches a StudentModule instances for a given `course_id`, `student` object, and `usage_keys`.
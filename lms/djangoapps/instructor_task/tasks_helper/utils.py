@@ -3,6 +3,11 @@ Utility methods for instructor tasks
 """
 
 
+import csv
+import io
+from gzip import GzipFile
+from tempfile import SpooledTemporaryFile
+
 from eventtracking import tracker
 
 from common.djangoapps.util.file import course_filename_prefix_generator
@@ -91,6 +96,89 @@ def upload_zip_to_report_store(file, zip_name, course_id, timestamp, config_name
     return report_name
 
 
+class ReportCSVFile:
+    """
+    A CSV report that is written row by row to a spooled temporary file,
+    optionally gzip-compressed, and streamed from there to the report
+    store when uploaded, so that the memory used to generate a report is
+    bounded regardless of its number of rows.
+
+    Rows are written the same way as ReportStore.store_rows writes them.
+    """
+    # Reports larger than this many (possibly compressed) bytes are
+    # spooled to disk.
+    MAX_MEMORY_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, compress=False):
+        self.compress = compress
+        self.num_rows = 0
+        self._file = SpooledTemporaryFile(max_size=self.MAX_MEMORY_SIZE)  # pylint: disable=consider-using-with
+        self._compressed_file = GzipFile(fileobj=self._file, mode='wb') if compress else None
+        self._text_file = io.TextIOWrapper(self._compressed_file or self._file, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._text_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def writerow(self, row):
+        """
+        Writes the given row, an iterable of values, to the report.
+        """
+        self._writer.writerow([str(item) for item in row])
+        self.num_rows += 1
+
+    def writerows(self, rows):
+        """
+        Writes the given rows to the report.
+        """
+        for row in rows:
+            self.writerow(row)
+
+    def finish(self):
+        """
+        Completes the report and returns its binary file, ready to be
+        read from the beginning.  No rows can be written afterwards.
+        """
+        if self._text_file is not None:
+            self._text_file.flush()
+            # Detach rather than close the text wrapper, which would close
+            # the underlying file as well.
+            self._text_file.detach()
+            self._text_file = None
+            if self._compressed_file is not None:
+                self._compressed_file.close()
+        self._file.seek(0)
+        return self._file
+
+    def upload(self, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD', parent_dir=''):
+        """
+        Completes the report and streams it to the ReportStore.
+
+        Returns:
+            report_name: string - Name of the uploaded report
+        """
+        report_store = ReportStore.from_config(config_name)
+        report_name = "{course_prefix}_{csv_name}_{timestamp_str}.{extension}".format(
+            course_prefix=course_filename_prefix_generator(course_id),
+            csv_name=csv_name,
+            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M"),
+            extension='csv.gz' if self.compress else 'csv',
+        )
+
+        report_store.store_file(course_id, report_name, self.finish(), parent_dir)
+        tracker_emit(csv_name)
+        return report_name
+
+    def close(self):
+        """
+        Discards the report.
+        """
+        self._file.close()
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
@@ -490,6 +490,29 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    def test_rescoring_prefetches_field_data(self):
+        """
+        Tests that rescoring reads the field data of all students together
+        rather than for each student.
+        """
+        mock_instance = MagicMock()
+        mock_instance.has_submitted_answer.return_value = True
+
+        students = self._create_students_with_state(3)
+        task_entry = self._create_input_entry()
+        with patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.get_block_for_descriptor'
+        ) as mock_get_block, patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.FieldDataCache.cache_for_block_descendents'
+        ) as mock_cache_for_block_descendents:
+            mock_get_block.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+
+        mock_cache_for_block_descendents.assert_not_called()
+        assert sorted(
+            (call.kwargs['user'].id, call.kwargs['field_data_cache'].user.id) for call in mock_get_block.call_args_list
+        ) == [(student.id, student.id) for student in sorted(students, key=lambda student: student.id)]
+
 
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
     """Tests instructor task that resets problem attempts."""
@@ -7,6 +7,8 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import gzip
+import json
 import os
 import shutil
 import tempfile
@@ -14,14 +16,19 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.test import TestCase
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 from freezegun import freeze_time
+from opaque_keys.edx.locator import CourseLocator
 from pytz import UTC
 from xblocks_contrib.problem.capa.testing.response_xml_factory import (
     MultipleChoiceResponseXMLFactory,  # pylint: disable=wrong-import-order
@@ -42,12 +49,15 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
     NOT_ENROLLED_IN_COURSE,
     CourseGradeReport,
+    GradeReportBase,
     ProblemGradeReport,
     ProblemResponses,
 )
@@ -58,6 +68,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary,
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -87,13 +98,14 @@ from xmodule.partitions.partitions import Group, UserPartition  # pylint: disabl
 from xmodule.tests.helpers import override_descriptor_system  # pylint: disable=unused-import  # noqa: F401
 
 from ..models import ReportStore
-from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
+from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED, ReportCSVFile
 
 _TEAMS_CONFIG = TeamsConfig({
     'max_size': 2,
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
 
 QUERY_COUNT_TABLE_IGNORELIST = AUTHZ_TABLES
 
@@ -2051,6 +2063,164 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             assert not mock_get_score.called
 
 
+@ddt.ddt
+@override_settings(GRADE_REPORT_USERS_PER_SHARD=2)
+@patch(USE_SHARDED_GRADE_REPORT, return_value=True)
+@patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+class TestShardedGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
+    """
+    Test that grade reports generated by subtasks for ranges of learners are merged correctly.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.initialize_course()
+        self.define_option_problem('Problem1', parent=self.problem_section)
+        self.students = [self.create_student(f'student_{index}') for index in range(5)]
+        self.submit_student_answer(self.students[1].username, 'Problem1', ['Option 1'])
+        self.report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def _create_entry(self, task_type):
+        return InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type=task_type,
+            task_id=str(uuid4()),
+        )
+
+    def _shard_directory(self, entry):
+        return os.path.join(self.report_store.path_to(self.course.id), 'grade_report_shards', str(entry.id))
+
+    @ddt.data(
+        (CourseGradeReport, InstructorTaskTypes.GRADE_COURSE),
+        (ProblemGradeReport, InstructorTaskTypes.GRADE_PROBLEMS),
+    )
+    @ddt.unpack
+    def test_sharded_report(self, report_class, task_type, *_mocks):
+        entry = self._create_entry(task_type)
+        result = report_class.generate(None, entry.id, self.course.id, {}, 'graded')
+        assert_dict_contains_subset(self, {'action_name': 'graded', 'total': 5}, result)
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        assert entry.task_state == SUCCESS
+        assert_dict_contains_subset(
+            self, {'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output),
+        )
+        subtasks = json.loads(entry.subtasks)
+        assert subtasks['total'] == 4
+        assert subtasks['succeeded'] == 4
+        assert subtasks['shards'] == [
+            [self.students[0].id, self.students[1].id],
+            [self.students[2].id, self.students[3].id],
+            [self.students[4].id, self.students[4].id],
+        ]
+
+        self.verify_rows_in_csv(
+            [{'Student ID': str(student.id), 'Username': student.username} for student in self.students],
+            ignore_other_columns=True,
+        )
+        assert self.report_store.storage.listdir(self._shard_directory(entry))[1] == []
+
+    def test_stored_shard_is_reused(self, *_mocks):
+        entry = self._create_entry(InstructorTaskTypes.GRADE_PROBLEMS)
+        self.report_store.storage.save(
+            os.path.join(self._shard_directory(entry), '00000_err.csv'),
+            ContentFile('Student ID,Email,Username,error_msg\r\n'),
+        )
+        self.report_store.storage.save(
+            os.path.join(self._shard_directory(entry), '00000.csv'),
+            ContentFile(
+                'Student ID,Email,Username,Enrollment Status,Grade\r\n'
+                f'{self.students[0].id},stored@example.com,stored,enrolled,1.0\r\n'
+            ),
+        )
+
+        ProblemGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        self.verify_rows_in_csv(
+            [{'Student ID': str(self.students[0].id), 'Username': 'stored'}] + [
+                {'Student ID': str(student.id), 'Username': student.username} for student in self.students[2:]
+            ],
+            ignore_other_columns=True,
+        )
+        assert_dict_contains_subset(
+            self,
+            {'attempted': 4, 'succeeded': 4, 'failed': 0},
+            json.loads(InstructorTask.objects.get(pk=entry.id).task_output),
+        )
+
+    def test_failed_shard_is_rerun(self, *_mocks):
+        entry = self._create_entry(InstructorTaskTypes.GRADE_PROBLEMS)
+        batched_rows = GradeReportBase._batched_rows  # pylint: disable=protected-access
+
+        def failing_batched_rows(report, user_id_range=None):
+            if user_id_range and user_id_range[0] == self.students[2].id:
+                raise ValueError('Shard failed')
+            return batched_rows(report, user_id_range)
+
+        with patch.object(GradeReportBase, '_batched_rows', failing_batched_rows):
+            ProblemGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        assert entry.task_state == FAILURE
+        # The failed shard, and the merge subtask that found it.
+        assert json.loads(entry.subtasks)['failed'] == 2
+        assert json.loads(entry.task_output)['message'] == '2 of 4 subtasks failed'
+        assert not self.report_store.links_for(self.course.id)
+
+        ProblemGradeReport.generate(None, entry.id, self.course.id, {}, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        assert entry.task_state == SUCCESS
+        subtasks = json.loads(entry.subtasks)
+        assert subtasks['succeeded'] == 4
+        assert subtasks['failed'] == 0
+        assert_dict_contains_subset(
+            self, {'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output),
+        )
+        self.verify_rows_in_csv(
+            [{'Student ID': str(student.id), 'Username': student.username} for student in self.students],
+            ignore_other_columns=True,
+        )
+
+
+@ddt.ddt
+class TestReportCSVFile(TestReportMixin, TestCase):
+    """
+    Test that ReportCSVFiles are streamed to the report store intact.
+    """
+    course_id = CourseLocator('edX', 'ReportCSVFile', 'run')
+    rows = [['Student ID', 'Username'], [1, 'ünicode'], [2, None], [3, 'comma, quoted']]
+
+    def _read_report(self, report_name):
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        with report_store.storage.open(report_store.path_to(self.course_id, report_name), 'rb') as report_file:
+            return report_file.read()
+
+    @ddt.data(False, True)
+    def test_upload(self, compress):
+        with ReportCSVFile(compress) as report_file:
+            report_file.writerow(self.rows[0])
+            report_file.writerows(self.rows[1:])
+            assert report_file.num_rows == 4
+            report_name = report_file.upload('grade_report', self.course_id, datetime(2026, 1, 2, 3, 4, tzinfo=UTC))
+
+        assert report_name.endswith('_grade_report_2026-01-02-0304.csv' + ('.gz' if compress else ''))
+        contents = self._read_report(report_name)
+        if compress:
+            contents = gzip.decompress(contents)
+        assert contents.decode('utf-8') == (
+            'Student ID,Username\r\n1,ünicode\r\n2,None\r\n3,"comma, quoted"\r\n'
+        )
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.utils.ReportCSVFile.MAX_MEMORY_SIZE', 64)
+    def test_spooled_to_disk(self):
+        with ReportCSVFile() as report_file:
+            report_file.writerows([index, 'x' * 10] for index in range(100))
+            report_name = report_file.upload('grade_report', self.course_id, datetime.now(UTC))
+
+        assert len(self._read_report(report_name).splitlines()) == 100
+
+
 @ddt.ddt
 @patch('lms.djangoapps.instructor_task.tasks_helper.misc.DefaultStorage', new=MockDefaultStorage)
 class TestGradeReportEnrollmentAndCertificateInfo(TestReportMixin, InstructorTaskModuleTestCase):
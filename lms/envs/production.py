@@ -454,6 +454,10 @@ EXPLICIT_QUEUES = {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.instructor_task.tasks.calculate_problem_grade_report': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
+    'lms.djangoapps.instructor_task.tasks.generate_grade_report_shard': {
+        'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
+    'lms.djangoapps.instructor_task.tasks.merge_grade_report_shards': {
+        'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.instructor_task.tasks.generate_certificates': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},  # noqa: F405
     'lms.djangoapps.verify_student.tasks.send_verification_status_email': {
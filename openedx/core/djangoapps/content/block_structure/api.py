@@ -9,6 +9,7 @@ from xmodule.modulestore.django import modulestore
 
 from .manager import BlockStructureManager
 from .models import BlockStructureModel
+from .store import process_cache
 
 BLOCK_STRUCTURE_VERSION_KEY = 'block_structure_version:{}'
 
@@ -64,13 +65,17 @@ def get_course_in_cache(course_key):
     return get_block_structure_manager(course_key).get_collected()
 
 
-def update_course_in_cache(course_key):
+def update_course_in_cache(course_key, changed_block_keys=None, published_version=None):
     """
     A higher order function implemented on top of the
     block_structure.updated_collected function that updates the block
     structure in the cache for the given course_key.
+
+    If the usage keys of the changed blocks are given, along with the
+    version of the published course they lead to, only the affected
+    parts of the block structure are collected again, when possible.
     """
-    get_block_structure_manager(course_key).update_collected_if_needed()
+    get_block_structure_manager(course_key).update_collected_if_needed(changed_block_keys, published_version)
     _update_block_structure_version(course_key)
 
 
@@ -88,6 +93,15 @@ def clear_course_from_cache(course_key):
     get_block_structure_manager(course_key).clear()
 
 
+def clear_course_from_process_cache(course_key):
+    """
+    Removes the block structure for the given course_key from this
+    process' in-memory cache, so that the next access reloads it from
+    the django cache or storage.
+    """
+    process_cache.invalidate(modulestore().make_course_usage_key(course_key))
+
+
 def get_block_structure_manager(course_key):
     """
     Returns the manager for managing Block Structures for the given course.
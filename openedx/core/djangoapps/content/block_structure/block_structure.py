@@ -41,6 +41,15 @@ class _BlockRelations:
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a new instance with copies of this instance's lists.
+        """
+        relations = _BlockRelations()
+        relations.parents = list(self.parents)
+        relations.children = list(self.children)
+        return relations
+
 
 class BlockStructure:
     """
@@ -432,6 +441,27 @@ class BlockStructureBlockData(BlockStructure):
             deepcopy(self._block_data_map),
         )
 
+    def copy_on_read(self):
+        """
+        Returns a new instance of BlockStructureBlockData that shares
+        this instance's data, for block structures that are never
+        changed once they are loaded, such as those in the process
+        cache.
+
+        Block relations are copied, and each block's data is copied
+        the first time it is accessed, but only down to the dicts that
+        hold its fields: field values are shared, so they must be
+        replaced rather than changed in place.
+        """
+        from .columnar import copy_block_data_map, copy_transformer_data_map
+        from .factory import BlockStructureFactory
+        return BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            {usage_key: relations.copy() for usage_key, relations in self._block_relations.items()},
+            copy_transformer_data_map(self.transformer_data),
+            copy_block_data_map(self._block_data_map),
+        )
+
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
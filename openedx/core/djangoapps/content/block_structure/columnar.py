@@ -0,0 +1,678 @@
+"""
+Module for the columnar serialization format of collected BlockStructures.
+
+The legacy format zpickles a single tuple of the structure's block
+relations, transformer data and block data map, so every cache hit
+has to rebuild every _BlockRelations, BlockData, TransformerData and
+UsageKey object of the structure before a single field can be read.
+
+The columnar format instead writes, after a short header:
+
+  * a table of interned usage keys, encoded relative to the course
+    key of the structure's root,
+  * integer-indexed children and parents arrays,
+  * one column per collected xBlock field and one per transformer
+    block field, each holding the indices of the blocks that have a
+    value and the list of those values,
+  * the structure-wide transformer data.
+
+The structural sections are plain binary arrays and strings.  Field
+values can be any picklable type, so each column's values are pickled
+as one unit and only unpickled the first time one of them is read.
+
+Decoding is lazy: BlockData and TransformerData objects are only
+materialized for the blocks and transformers that are actually
+accessed, so a request that reads a few transformer fields does not
+pay for the whole structure.
+
+The same lazy mappings back the copies made by copy_block_data_map and
+copy_transformer_data_map, which read the entries of a shared
+structure on first access instead of copying all of them up front.
+"""
+import pickle
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+
+# Leading bytes of a columnar serialization.  A zlib stream (as written
+# by the legacy zpickle format) can never start with these bytes, which
+# allows readers to tell both formats apart.
+MAGIC = b'BSCF'
+
+# The current version of the columnar format.  Increment whenever the
+# layout below changes.
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sB')
+_LENGTH = struct.Struct('<I')
+
+# Key table encodings.
+_KEYS_RELATIVE = 0
+_KEYS_PICKLED = 1
+
+# Separators used in the relative key table.  Neither can appear in a
+# block type or a block id.
+_KEY_SEPARATOR = '\n'
+_TYPE_SEPARATOR = '\x1f'
+_ABSOLUTE_PREFIX = '\x1e'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data was written by
+    serialize().
+    """
+    return bytes(serialized_data[:len(MAGIC)]) == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given BlockStructureBlockData into the columnar
+    format.
+    """
+    # pylint: disable=protected-access
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    keys = list(block_relations)
+    key_indices = {key: index for index, key in enumerate(keys)}
+    for key in block_data_map:
+        if key not in key_indices:
+            key_indices[key] = len(keys)
+            keys.append(key)
+
+    children_offsets, children = _encode_relations(keys, block_relations, key_indices, 'children')
+    parents_offsets, parents = _encode_relations(keys, block_relations, key_indices, 'parents')
+
+    data_indices = array('I')
+    xblock_columns = {}
+    transformer_groups = {}
+    for key, block_data in block_data_map.items():
+        index = key_indices[key]
+        data_indices.append(index)
+        for field_name, value in block_data.fields.items():
+            _add_to_column(xblock_columns, field_name, index, value)
+        for transformer_name, transformer_data in block_data.transformer_data.items():
+            presence, columns = transformer_groups.setdefault(transformer_name, (array('I'), {}))
+            presence.append(index)
+            for field_name, value in transformer_data.fields.items():
+                _add_to_column(columns, field_name, index, value)
+
+    writer = _SectionWriter()
+    _write_key_table(writer, keys, block_structure.root_block_usage_key)
+    writer.write_int(len(block_relations))
+    for int_array in (children_offsets, children, parents_offsets, parents, data_indices):
+        writer.write_array(int_array)
+    _write_columns(writer, xblock_columns)
+    writer.write_int(len(transformer_groups))
+    for transformer_name, (presence, columns) in transformer_groups.items():
+        writer.write_str(transformer_name)
+        writer.write_array(presence)
+        _write_columns(writer, columns)
+    writer.write_bytes(pickle.dumps(dict(block_structure.transformer_data), 4))
+
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(writer.getvalue())
+
+
+def deserialize(serialized_data):
+    """
+    Deserializes the given columnar data and returns a tuple of
+    (block_relations, transformer_data, block_data_map), as expected
+    by BlockStructureFactory.create_new.
+
+    Raises ValueError if the data is not in a supported columnar format.
+    """
+    magic, version = _HEADER.unpack_from(serialized_data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported block structure serialization: {magic!r}, version {version}')
+
+    reader = _SectionReader(zlib.decompress(memoryview(serialized_data)[_HEADER.size:]))
+    keys = _read_key_table(reader)
+    num_relations = reader.read_int()
+    children_offsets, children, parents_offsets, parents, data_indices = (reader.read_array() for _ in range(5))
+    xblock_columns = _read_columns(reader)
+    transformer_groups = {}
+    for _ in range(reader.read_int()):
+        transformer_name = reader.read_str()
+        presence = reader.read_array()
+        transformer_groups[transformer_name] = (presence, _read_columns(reader))
+    transformer_data = TransformerDataMap(pickle.loads(reader.read_bytes()))
+
+    block_relations = {}
+    for index in range(num_relations):
+        relations = _BlockRelations()
+        relations.children = [keys[child] for child in children[children_offsets[index]:children_offsets[index + 1]]]
+        relations.parents = [keys[parent] for parent in parents[parents_offsets[index]:parents_offsets[index + 1]]]
+        block_relations[keys[index]] = relations
+
+    block_data_map = _LazyBlockDataMap(keys, data_indices, xblock_columns, transformer_groups)
+    return block_relations, transformer_data, block_data_map
+
+
+def _encode_relations(keys, block_relations, key_indices, relation_name):
+    """
+    Returns (offsets, flattened indices) arrays for the given relation
+    ('children' or 'parents') of every block in block_relations.
+    """
+    offsets = array('I', [0])
+    flattened = array('I')
+    for key in keys[:len(block_relations)]:
+        flattened.extend(key_indices[related] for related in getattr(block_relations[key], relation_name))
+        offsets.append(len(flattened))
+    return offsets, flattened
+
+
+def _add_to_column(columns, field_name, index, value):
+    """
+    Appends the given block index and value to the named column.
+    """
+    indices, values = columns.setdefault(field_name, (array('I'), []))
+    indices.append(index)
+    values.append(value)
+
+
+def _write_key_table(writer, keys, root_block_usage_key):
+    """
+    Writes the usage key table.  When all keys are UsageKeys, each key
+    is stored as its block type and id relative to the root's course
+    key (or as a full string if it belongs to another context).
+    Otherwise, the key table is pickled as is.
+    """
+    if isinstance(root_block_usage_key, UsageKey) and all(isinstance(key, UsageKey) for key in keys):
+        context_key = root_block_usage_key.course_key
+        writer.write_int(_KEYS_RELATIVE)
+        writer.write_str(str(context_key))
+        writer.write_str(_KEY_SEPARATOR.join(
+            f'{key.block_type}{_TYPE_SEPARATOR}{key.block_id}' if key.course_key == context_key
+            else f'{_ABSOLUTE_PREFIX}{key}'
+            for key in keys
+        ))
+    else:
+        writer.write_int(_KEYS_PICKLED)
+        writer.write_bytes(pickle.dumps(keys, 4))
+
+
+def _read_key_table(reader):
+    """
+    Reads and returns the list of usage keys written by _write_key_table.
+    """
+    if reader.read_int() == _KEYS_PICKLED:
+        return pickle.loads(reader.read_bytes())
+
+    context_key = CourseKey.from_string(reader.read_str())
+    encoded_keys = reader.read_str()
+    if not encoded_keys:
+        return []
+
+    keys = []
+    for encoded_key in encoded_keys.split(_KEY_SEPARATOR):
+        if encoded_key.startswith(_ABSOLUTE_PREFIX):
+            keys.append(UsageKey.from_string(encoded_key[len(_ABSOLUTE_PREFIX):]))
+        else:
+            block_type, block_id = encoded_key.split(_TYPE_SEPARATOR, 1)
+            keys.append(context_key.make_usage_key(block_type, block_id))
+    return keys
+
+
+def _write_columns(writer, columns):
+    """
+    Writes the given {field_name: (indices, values)} columns.
+    """
+    writer.write_int(len(columns))
+    for field_name, (indices, values) in columns.items():
+        writer.write_str(field_name)
+        writer.write_array(indices)
+        writer.write_bytes(pickle.dumps(values, 4))
+
+
+def _read_columns(reader):
+    """
+    Reads and returns the columns written by _write_columns as a list
+    of _Column objects.
+    """
+    return [
+        _Column(reader.read_str(), reader.read_array(), reader.read_bytes())
+        for _ in range(reader.read_int())
+    ]
+
+
+class _SectionWriter:
+    """
+    Accumulates length-prefixed sections of the columnar format.
+    """
+    def __init__(self):
+        self._parts = []
+
+    def write_int(self, value):
+        self._parts.append(_LENGTH.pack(value))
+
+    def write_bytes(self, value):
+        self._parts.append(_LENGTH.pack(len(value)))
+        self._parts.append(value)
+
+    def write_str(self, value):
+        self.write_bytes(value.encode('utf-8'))
+
+    def write_array(self, int_array):
+        if sys.byteorder != 'little':
+            int_array = array(int_array.typecode, int_array)
+            int_array.byteswap()
+        self.write_bytes(int_array.tobytes())
+
+    def getvalue(self):
+        return b''.join(self._parts)
+
+
+class _SectionReader:
+    """
+    Reads back the sections written by _SectionWriter, in order.
+    """
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def read_int(self):
+        (value,) = _LENGTH.unpack_from(self._data, self._offset)
+        self._offset += _LENGTH.size
+        return value
+
+    def read_bytes(self):
+        length = self.read_int()
+        value = self._data[self._offset:self._offset + length]
+        self._offset += length
+        return value
+
+    def read_str(self):
+        return str(self.read_bytes(), 'utf-8')
+
+    def read_array(self):
+        int_array = array('I')
+        int_array.frombytes(self.read_bytes())
+        if sys.byteorder != 'little':
+            int_array.byteswap()
+        return int_array
+
+
+class _Column:
+    """
+    A single field column: the indices of the blocks that have a value
+    for the field and their (lazily unpickled) values.
+    """
+    def __init__(self, field_name, indices, pickled_values):
+        self.field_name = field_name
+        self._indices = indices
+        self._pickled_values = pickled_values
+        self._positions = None
+        self._values = None
+        self._lock = threading.Lock()
+
+    def position_of(self, block_index):
+        """
+        Returns the position of the given block's value in this column,
+        or None if the block has no value for the field.
+        """
+        positions = self._positions
+        if positions is None:
+            positions = self._positions = {index: position for position, index in enumerate(self._indices)}
+        return positions.get(block_index)
+
+    def value_at(self, position):
+        """
+        Returns the value at the given position, unpickling the
+        column's values on first access.
+        """
+        values = self._values
+        if values is None:
+            with self._lock:
+                if self._values is None:
+                    self._values = pickle.loads(self._pickled_values)
+                    self._pickled_values = None
+                values = self._values
+        return values[position]
+
+
+def _field_loaders(columns, block_index):
+    """
+    Returns {field_name: (column, position)} for all of the given
+    columns that have a value for the given block.
+    """
+    loaders = {}
+    for column in columns:
+        position = column.position_of(block_index)
+        if position is not None:
+            loaders[column.field_name] = (column, position)
+    return loaders
+
+
+def _new_field_data(field_data_class, **attributes):
+    """
+    Returns a new instance of the given FieldData class with the given
+    attributes, bypassing __init__ and FieldData.__setattr__ the same
+    way unpickling does.
+    """
+    field_data = field_data_class.__new__(field_data_class)
+    field_data.__dict__.update(attributes)
+    return field_data
+
+
+class _LazyMappingMixin:
+    """
+    Mixin for dict subclasses whose entries are built on first access.
+
+    Pending entries are kept in self._pending as {key: token} and are
+    built with self._build(key, token).  Any operation that needs the
+    whole mapping first builds all pending entries, in their original
+    order.  Copies and pickles of a lazy mapping are eager instances of
+    self._eager_class.
+
+    Deserialized structures are shared by the threads of a process once
+    they are in the process cache, so entries are built, and looked up
+    while entries may be rebuilt, under a per-instance lock.
+    """
+    _eager_class = dict
+
+    def _init_pending(self, pending):
+        self._pending = pending
+        self._lock = threading.RLock()
+        # The original order of keys, recorded before the first entry
+        # is built or replaced individually.
+        self._order = None
+
+    def _record_order(self):
+        if self._order is None:
+            self._order = tuple(self._pending)
+
+    def _build(self, key, token):
+        raise NotImplementedError
+
+    def _translate_key(self, key):
+        return key
+
+    def _keys_in_order(self):
+        """
+        Returns the keys of the mapping in order, without building any
+        pending entries.
+        """
+        with self._lock:
+            if self._order is None:
+                return tuple(dict.keys(self)) + tuple(self._pending)
+            keys = [key for key in self._order if key in self._pending or dict.__contains__(self, key)]
+            ordered_keys = set(self._order)
+            keys.extend(key for key in dict.keys(self) if key not in ordered_keys)
+            return keys
+
+    def _load(self, key):
+        """
+        Builds the entry for the given key if it is still pending.
+        """
+        key = self._translate_key(key)
+        with self._lock:
+            if key in self._pending:
+                self._record_order()
+                dict.__setitem__(self, key, self._build(key, self._pending[key]))
+                del self._pending[key]
+
+    def _load_all(self):
+        """
+        Builds all pending entries, keeping the original order of keys
+        ahead of any keys that were added afterwards.
+        """
+        if not self._pending:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            if self._order is None:
+                for key, token in self._pending.items():
+                    dict.__setitem__(self, key, self._build(key, token))
+                self._pending = {}
+                return
+
+            built = {key: self._build(key, token) for key, token in self._pending.items()}
+            entries = dict(dict.items(self))
+            dict.clear(self)
+            for key in self._order:
+                if key in built:
+                    dict.__setitem__(self, key, built[key])
+                elif key in entries:
+                    dict.__setitem__(self, key, entries.pop(key))
+            for key, value in entries.items():
+                dict.__setitem__(self, key, value)
+            self._pending = {}
+
+    def __getitem__(self, key):
+        self._load(key)
+        if not self._pending:
+            return super().__getitem__(key)
+        with self._lock:
+            return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        key = self._translate_key(key)
+        with self._lock:
+            return key in self._pending or dict.__contains__(self, key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._record_order()
+            self._pending.pop(self._translate_key(key), None)
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *args):
+        self._load(key)
+        return dict.pop(self, self._translate_key(key), *args)
+
+    def setdefault(self, key, default=None):
+        self._load(key)
+        return dict.setdefault(self, self._translate_key(key), default)
+
+    def __iter__(self):
+        self._load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending) + dict.__len__(self)
+
+    def __eq__(self, other):
+        self._load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load_all()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def popitem(self):
+        self._load_all()
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            dict.clear(self)
+
+    def copy(self):
+        self._load_all()
+        return self._eager_class(dict.items(self))
+
+    def __reduce_ex__(self, protocol):
+        self._load_all()
+        return (self._eager_class, (), None, None, iter(dict.items(self)))
+
+
+class _LazyFieldDict(_LazyMappingMixin, dict):
+    """
+    The fields dict of a BlockData or TransformerData whose values are
+    read from columns on first access.
+    """
+    def __init__(self, field_loaders):
+        super().__init__()
+        self._init_pending(field_loaders)
+
+    def _build(self, key, token):
+        column, position = token
+        return column.value_at(position)
+
+
+class _LazyTransformerDataMap(_LazyMappingMixin, TransformerDataMap):
+    """
+    The TransformerDataMap of a BlockData whose TransformerData objects
+    are built on first access.
+    """
+    _eager_class = TransformerDataMap
+
+    def __init__(self, block_index, transformer_groups):
+        super().__init__()
+        self._block_index = block_index
+        self._init_pending({
+            transformer_name: columns
+            for transformer_name, (presence, columns) in transformer_groups.items()
+            if block_index in presence
+        })
+
+    def _translate_key(self, key):
+        return TransformerDataMap._translate_key(self, key)
+
+    def _build(self, key, token):
+        return _new_field_data(TransformerData, fields=_LazyFieldDict(_field_loaders(token, self._block_index)))
+
+
+class _LazyBlockDataMap(_LazyMappingMixin, dict):
+    """
+    A block data map whose BlockData objects are built on first access.
+    """
+    def __init__(self, keys, data_indices, xblock_columns, transformer_groups):
+        super().__init__()
+        self._xblock_columns = xblock_columns
+        self._transformer_groups = {
+            transformer_name: (frozenset(presence), columns)
+            for transformer_name, (presence, columns) in transformer_groups.items()
+        }
+        self._init_pending({keys[index]: index for index in data_indices})
+
+    def _build(self, key, token):
+        return _new_field_data(
+            BlockData,
+            fields=_LazyFieldDict(_field_loaders(self._xblock_columns, token)),
+            location=key,
+            transformer_data=_LazyTransformerDataMap(token, self._transformer_groups),
+        )
+
+
+def copy_block_data_map(block_data_map):
+    """
+    Returns a copy of the given block data map whose BlockData objects
+    are copied from it on first access.
+
+    Only the dicts that hold the fields and transformer data of a block
+    are copied, so changes to the copy don't affect the given map, but
+    field values are shared and must be replaced rather than changed in
+    place.  The given map must not be changed afterwards.
+    """
+    return _CopiedBlockDataMap(block_data_map)
+
+
+def copy_transformer_data_map(transformer_data_map):
+    """
+    Returns a copy of the given TransformerDataMap whose TransformerData
+    objects are copied from it on first access, as copy_block_data_map
+    does.
+    """
+    return _CopiedTransformerDataMap(transformer_data_map)
+
+
+class _CopiedMappingMixin(_LazyMappingMixin):
+    """
+    Mixin for copies of a mapping whose entries are copied from the
+    source mapping on first access, in the source's order.
+    """
+    def _init_source(self, source):
+        self._source = source
+        keys = source._keys_in_order() if isinstance(source, _LazyMappingMixin) else tuple(source)
+        self._init_pending(dict.fromkeys(keys))
+
+    def _build(self, key, token):
+        return self._copy_entry(self._source[key])
+
+    def _copy_entry(self, entry):
+        return entry
+
+
+class _CopiedFieldDict(_CopiedMappingMixin, dict):
+    """
+    A copy of the fields dict of a BlockData or TransformerData.
+    """
+    def __init__(self, source):
+        super().__init__()
+        self._init_source(source)
+
+
+class _CopiedTransformerDataMap(_CopiedMappingMixin, TransformerDataMap):
+    """
+    A copy of a TransformerDataMap.
+    """
+    _eager_class = TransformerDataMap
+
+    def __init__(self, source):
+        super().__init__()
+        self._init_source(source)
+
+    def _translate_key(self, key):
+        return TransformerDataMap._translate_key(self, key)
+
+    def _copy_entry(self, entry):
+        return _new_field_data(TransformerData, fields=_CopiedFieldDict(entry.fields))
+
+
+class _CopiedBlockDataMap(_CopiedMappingMixin, dict):
+    """
+    A copy of a block data map.
+    """
+    def __init__(self, source):
+        super().__init__()
+        self._init_source(source)
+
+    def _copy_entry(self, entry):
+        return _new_field_data(
+            BlockData,
+            fields=_CopiedFieldDict(entry.fields),
+            location=entry.location,
+            transformer_data=_CopiedTransformerDataMap(entry.transformer_data),
+        )
@@ -2,13 +2,38 @@
 This module contains various configuration settings via
 waffle switches for the Block Structure framework.
 """
+from django.conf import settings
 from edx_django_utils.cache import RequestCache  # noqa: F401
-from edx_toggles.toggles import WaffleSwitch  # noqa: F401
+from edx_toggles.toggles import WaffleSwitch
 
 from openedx.core.lib.cache_utils import request_cached
 
 from .models import BlockStructureConfiguration
 
+# .. toggle_name: block_structure.columnar_serialization
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures are written to the cache and
+#   storage in the lazily decoded columnar format (see block_structure/columnar.py) instead of
+#   as a single zpickled tuple. Structures in either format can always be read, so the switch
+#   can be toggled at any time.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+COLUMNAR_SERIALIZATION = WaffleSwitch('block_structure.columnar_serialization', __name__)
+
+# .. toggle_name: block_structure.incremental_collection
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, the blocks that were published or deleted in a course are
+#   passed on to the task that updates the course's block structure, which then collects data again
+#   only for the affected subtrees and their ancestors. This is only done if all registered transformers
+#   set INCREMENTAL_COLLECT, and if the stored block structure was collected from the published version
+#   right before the publish; otherwise, and whenever the course block itself is affected, the whole
+#   block structure is collected again.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-16
+INCREMENTAL_COLLECTION = WaffleSwitch('block_structure.incremental_collection', __name__)
+
 
 @request_cached()
 def num_versions_to_keep():
@@ -24,3 +49,11 @@ def cache_timeout_in_seconds():
     Returns and caches the current setting for cache_timeout_in_seconds.
     """
     return BlockStructureConfiguration.current().cache_timeout_in_seconds
+
+
+def process_cache_size():
+    """
+    Returns the maximum number of block structures to keep in the
+    in-process cache, or 0 if the in-process cache is disabled.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_SIZE', 0)
@@ -33,38 +33,96 @@ class BlockStructureFactory:
         """
         root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=False)
         block_structure = BlockStructureModulestoreData(root_block_usage_key.for_branch(None))
-        blocks_visited = set()
+        cls._add_xblock_subtree(block_structure, root_xblock, blocks_visited=set())
+        return block_structure
+
+    @classmethod
+    def create_partial_from_modulestore(
+            cls,
+            root_block_usage_key,
+            modulestore,
+            subtree_keys,
+            collected_block_structure,
+    ):
+        """
+        Creates and returns a block structure from the modulestore with
+        only the subtrees starting at the given subtree_keys, along with
+        all of their ancestors.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks within the block
+                structure.
+
+            subtree_keys ([UsageKey]) - The usage_keys for the roots of
+                the subtrees, none of which may be a descendant of
+                another.
 
-        def build_block_structure(xblock):
-            """
-            Recursively update the block structure with the given xBlock
-            and its descendants.
-            """
-            # Check if the xblock was already visited (can happen in
-            # DAGs).
-            # Normalize location to remove branch/version information
-            # When create_from_modulestore is wrapped in published_only branch decorator,
-            # "xblock being changed" location contains branch and version info which causes
-            # mismatch when removing inaccessible blocks in
-            # CourseNavigationBlocksView.filter_inaccessible_blocks
-            # while fetching course navigation.
-            location = xblock.location.for_branch(None)
-            if location in blocks_visited:
-                return
-
-            # Add the xBlock.
-            blocks_visited.add(location)
-            block_structure._add_xblock(location, xblock)  # pylint: disable=protected-access
-
-            # Add relations with its children and recurse.
-            for child in xblock.get_children():
-                child_location = child.location.for_branch(None)
-                block_structure._add_relation(location, child_location)  # pylint: disable=protected-access
-                build_block_structure(child)
-
-        build_block_structure(root_xblock)
+            collected_block_structure (BlockStructure) - A previously
+                collected block structure that the ancestors of the
+                subtrees, and the relations between them, are taken
+                from.
+
+        Returns:
+            BlockStructureModulestoreData - The created block structure
+                with instantiated xBlocks from the given modulestore.
+
+        Raises:
+            xmodule.modulestore.exceptions.ItemNotFoundError if a block
+                is not found in the modulestore.
+        """
+        block_structure = BlockStructureModulestoreData(root_block_usage_key.for_branch(None))
+        blocks_visited = set()
+        for subtree_key in subtree_keys:
+            subtree_xblock = modulestore.get_item(subtree_key, depth=None, lazy=False)
+            cls._add_xblock_subtree(block_structure, subtree_xblock, blocks_visited)
+
+        ancestor_keys = set()
+        pending_keys = list(subtree_keys)
+        while pending_keys:
+            child_key = pending_keys.pop()
+            for parent_key in collected_block_structure.get_parents(child_key):
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                if parent_key not in ancestor_keys:
+                    ancestor_keys.add(parent_key)
+                    pending_keys.append(parent_key)
+
+        for ancestor_key in ancestor_keys:
+            ancestor_xblock = modulestore.get_item(ancestor_key)
+            block_structure._add_xblock(ancestor_key, ancestor_xblock)  # pylint: disable=protected-access
         return block_structure
 
+    @classmethod
+    def _add_xblock_subtree(cls, block_structure, xblock, blocks_visited):
+        """
+        Recursively update the block structure with the given xBlock
+        and its descendants.
+        """
+        # Check if the xblock was already visited (can happen in
+        # DAGs).
+        # Normalize location to remove branch/version information
+        # When create_from_modulestore is wrapped in published_only branch decorator,
+        # "xblock being changed" location contains branch and version info which causes
+        # mismatch when removing inaccessible blocks in
+        # CourseNavigationBlocksView.filter_inaccessible_blocks
+        # while fetching course navigation.
+        location = xblock.location.for_branch(None)
+        if location in blocks_visited:
+            return
+
+        # Add the xBlock.
+        blocks_visited.add(location)
+        block_structure._add_xblock(location, xblock)  # pylint: disable=protected-access
+
+        # Add relations with its children and recurse.
+        for child in xblock.get_children():
+            child_location = child.location.for_branch(None)
+            block_structure._add_relation(location, child_location)  # pylint: disable=protected-access
+            cls._add_xblock_subtree(block_structure, child, blocks_visited)
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -0,0 +1,157 @@
+"""
+Command to compare the serialization formats of BlockStructureStore.
+"""
+
+
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+from openedx.core.djangoapps.content.block_structure import columnar
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+
+BLOCK_TYPES = ['chapter', 'sequential', 'vertical', 'problem']
+
+
+class Command(BaseCommand):
+    """
+    Builds a synthetic collected block structure and reports the size of
+    each serialization format along with the time it takes to serialize,
+    to fully deserialize, and to deserialize and read a few fields.
+
+    Does not touch the cache, storage or the modulestore.
+
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 5000 --settings=devstack
+    """
+    help = 'Compares the pickled and columnar serialization formats of block structures.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_blocks',
+            help='Approximate number of blocks in the synthetic course.',
+            default=3000,
+            type=int,
+        )
+        parser.add_argument(
+            '--branching',
+            help='Number of children of each non-leaf block.',
+            default=6,
+            type=int,
+        )
+        parser.add_argument(
+            '--num_transformers',
+            help='Number of transformers that collect block data.',
+            default=8,
+            type=int,
+        )
+        parser.add_argument(
+            '--iterations',
+            help='Number of timed iterations per measurement.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        block_structure = self._create_block_structure(
+            options['num_blocks'], options['branching'], options['num_transformers'],
+        )
+        root_key = block_structure.root_block_usage_key
+        sample_keys = list(block_structure.get_block_keys())[::20]
+        iterations = options['iterations']
+
+        formats = {
+            'pickle': (
+                lambda: zpickle((
+                    block_structure._block_relations,  # pylint: disable=protected-access
+                    block_structure.transformer_data,
+                    block_structure._block_data_map,  # pylint: disable=protected-access
+                )),
+                zunpickle,
+            ),
+            'columnar': (
+                lambda: columnar.serialize(block_structure),
+                columnar.deserialize,
+            ),
+        }
+
+        self.stdout.write(
+            f'{len(block_structure)} blocks, {options["num_transformers"]} transformers, '
+            f'{iterations} iterations (ms per iteration)'
+        )
+        self.stdout.write(f'{"format":<10}{"bytes":>12}{"serialize":>12}{"full read":>12}{"sparse read":>12}')
+        for format_name, (serialize, deserialize) in formats.items():
+            serialized_data = serialize()
+
+            def full_read(serialized_data=serialized_data, deserialize=deserialize):
+                loaded = BlockStructureFactory.create_new(root_key, *deserialize(serialized_data))
+                for _, block_data in loaded.iteritems():
+                    for transformer_data in block_data.transformer_data.values():
+                        dict(transformer_data.fields)
+
+            def sparse_read(serialized_data=serialized_data, deserialize=deserialize):
+                loaded = BlockStructureFactory.create_new(root_key, *deserialize(serialized_data))
+                for block_key in sample_keys:
+                    loaded.get_transformer_block_field(block_key, 'transformer_0', 'field_0')
+
+            self.stdout.write('{:<10}{:>12}{:>12.2f}{:>12.2f}{:>12.2f}'.format(  # noqa: UP032
+                format_name,
+                len(serialized_data),
+                self._time_ms(serialize, iterations),
+                self._time_ms(full_read, iterations),
+                self._time_ms(sparse_read, iterations),
+            ))
+
+    @staticmethod
+    def _time_ms(func, iterations):
+        """
+        Returns the average time, in milliseconds, of calling func.
+        """
+        return timeit.timeit(func, number=iterations) * 1000 / iterations
+
+    @staticmethod
+    def _create_block_structure(num_blocks, branching, num_transformers):
+        """
+        Returns a collected block structure for a synthetic course with
+        about num_blocks blocks.
+        """
+        course_key = CourseLocator('edX', 'Benchmark', 'run')
+        root_key = course_key.make_usage_key('course', 'course')
+        block_structure = BlockStructureBlockData(root_key)
+        block_structure._get_or_create_block(root_key)  # pylint: disable=protected-access
+
+        parents = [root_key]
+        depth = 0
+        while len(block_structure) < num_blocks:
+            block_type = BLOCK_TYPES[min(depth, len(BLOCK_TYPES) - 1)]
+            children = []
+            for parent_key in parents:
+                for _ in range(branching):
+                    if len(block_structure) >= num_blocks:
+                        break
+                    child_key = course_key.make_usage_key(block_type, f'{block_type}_{len(block_structure)}')
+                    block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                    children.append(child_key)
+            parents = children
+            depth += 1
+
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        for index, block_key in enumerate(block_structure.get_block_keys()):
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {index}')
+            block_structure.override_xblock_field(block_key, 'category', block_key.block_type)
+            block_structure.override_xblock_field(block_key, 'start', start)
+            block_structure.override_xblock_field(block_key, 'graded', bool(index % 2))
+            for transformer_index in range(num_transformers):
+                transformer_name = f'transformer_{transformer_index}'
+                for field_name, value in (
+                    ('field_0', bool(index % (transformer_index + 2))),
+                    ('field_1', {(index * (transformer_index + 1)) % 97}),
+                    ('field_2', start + timedelta(days=index % (transformer_index + 5))),
+                ):
+                    block_structure.set_transformer_block_field(block_key, transformer_name, field_name, value)
+        return block_structure
@@ -5,14 +5,18 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from logging import getLogger
 
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
 
 class BlockStructureManager:
     """
@@ -119,14 +123,222 @@ class BlockStructureManager:
 
         return block_structure
 
-    def update_collected_if_needed(self):
+    def update_collected_if_needed(self, changed_block_keys=None, published_version=None):
         """
         The store is updated with newly collected transformers data from
         the modulestore, only if the data in the store is outdated.
+
+        Arguments:
+            changed_block_keys ([UsageKey]) - Optional usage keys of the
+                blocks that were changed, added or deleted by the publish
+                that led to published_version. When given, only the
+                affected parts of the block structure are collected
+                again, if all registered transformers support it.
+            published_version (str) - The version of the published
+                course that the changed_block_keys lead to.
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                if not (
+                    changed_block_keys and published_version and
+                    self._update_collected_incrementally(changed_block_keys, published_version)
+                ):
+                    self._update_collected()
+
+    def _update_collected_incrementally(self, changed_block_keys, published_version):
+        """
+        The store is updated by collecting transformers data from the
+        modulestore only for the subtrees of the block structure that
+        contain the given changed blocks, and merging it into the
+        collected block structure in the store.
+
+        Returns:
+            BlockStructureBlockData - The updated block structure, or None
+                if the block structure could not be updated incrementally.
+        """
+        try:
+            block_structure = BlockStructureFactory.create_from_store(self.root_block_usage_key, self.store)
+        except BlockStructureNotFound:
+            return None
+        if not BlockStructureTransformers.supports_incremental_collect(block_structure):
+            return None
+
+        with self._bulk_operations():
+            # Always uses published-only branch regardless of CMS or LMS context.
+            with self.modulestore.branch_setting(
+                ModuleStoreEnum.Branch.published_only,
+                self.root_block_usage_key.course_key
+            ):
+                if not self._is_next_version(published_version):
+                    return None
+                try:
+                    subtree_keys = self._get_changed_subtree_keys(block_structure, changed_block_keys)
+                    if not subtree_keys:
+                        return None
+                    partial_block_structure = BlockStructureFactory.create_partial_from_modulestore(
+                        self.root_block_usage_key,
+                        self.modulestore,
+                        subtree_keys,
+                        block_structure,
+                    )
+                except ItemNotFoundError:
+                    return None
+
+            if not all(
+                self._is_self_contained(structure, subtree_key)
+                for structure in (block_structure, partial_block_structure)
+                for subtree_key in subtree_keys
+            ):
+                return None
+
+            BlockStructureTransformers.collect(partial_block_structure)
+            self._merge_collected(block_structure, partial_block_structure, subtree_keys)
+            self.store.add(block_structure)
+            logger.info(
+                'BlockStructure: Incrementally collected %d of %d blocks of %s.',
+                len(partial_block_structure),
+                len(block_structure),
+                self.root_block_usage_key,
+            )
+            return block_structure
+
+    def _is_next_version(self, published_version):
+        """
+        Returns whether the published course is still at the given
+        published_version, and that version directly follows the one
+        the data in the store was collected from. Otherwise, other
+        publishes changed blocks besides the given changed blocks, for
+        instance when the tasks for consecutive publishes run out of
+        order.
+        """
+        root_block = self.modulestore.get_item(self.root_block_usage_key)
+        if str(getattr(root_block, 'course_version', None)) != published_version:
+            return False
+
+        try:
+            history_info = self.modulestore.get_course_history_info(self.root_block_usage_key.course_key)
+        except (ItemNotFoundError, NotImplementedError):
+            return False
+        collected_version = self.store.get_data_version(self.root_block_usage_key)
+        return collected_version is not None and str(history_info['previous_version']) == collected_version
+
+    def _get_changed_subtree_keys(self, block_structure, changed_block_keys):
+        """
+        Returns the usage keys of the parents of the changed blocks,
+        excluding any that are descendants of others, since publishing,
+        adding or deleting a block changes the children of its parents.
+
+        Returns None if the root block is affected, or the changed
+        blocks can't be located in either the block structure or the
+        modulestore.
+        """
+        subtree_keys = set()
+        pending_keys = [block_key.for_branch(None) for block_key in changed_block_keys]
+        visited_keys = set()
+        while pending_keys:
+            block_key = pending_keys.pop()
+            if block_key in visited_keys:
+                continue
+            visited_keys.add(block_key)
+
+            parent_keys = set(block_structure.get_parents(block_key)) if block_key in block_structure else set()
+            current_parent_key = self.modulestore.get_parent_location(block_key)
+            if current_parent_key:
+                parent_keys.add(current_parent_key.for_branch(None))
+            if not parent_keys:
+                return None
+
+            for parent_key in parent_keys:
+                if parent_key == block_structure.root_block_usage_key:
+                    return None
+                if parent_key in block_structure and self.modulestore.has_item(parent_key):
+                    subtree_keys.add(parent_key)
+                else:
+                    # The parent was itself added or deleted.
+                    pending_keys.append(parent_key)
+
+        return [
+            subtree_key for subtree_key in subtree_keys
+            if not self._get_ancestor_keys(block_structure, subtree_key) & subtree_keys
+        ]
+
+    @staticmethod
+    def _get_ancestor_keys(block_structure, block_key):
+        """
+        Returns the usage keys of all ancestors of the given block.
+        """
+        ancestor_keys = set()
+        pending_keys = [block_key]
+        while pending_keys:
+            for parent_key in block_structure.get_parents(pending_keys.pop()):
+                if parent_key not in ancestor_keys:
+                    ancestor_keys.add(parent_key)
+                    pending_keys.append(parent_key)
+        return ancestor_keys
+
+    @staticmethod
+    def _is_self_contained(block_structure, subtree_key):
+        """
+        Returns whether no block within the subtree starting at the given
+        subtree_key, other than its root, has a parent outside of the
+        subtree. Otherwise, data that transformers percolate down from
+        the outside parents can't be collected for the subtree alone.
+        """
+        subtree_block_keys = set(block_structure.post_order_traversal(start_node=subtree_key))
+        return all(
+            set(block_structure.get_parents(block_key)) <= subtree_block_keys
+            for block_key in subtree_block_keys
+            if block_key != subtree_key
+        )
+
+    @staticmethod
+    def _merge_collected(block_structure, partial_block_structure, subtree_keys):
+        """
+        Mutates the given block structure by replacing its subtrees
+        starting at the given subtree_keys with those in the given
+        partial block structure, along with the data collected for the
+        blocks in those subtrees. The data collected for other blocks in
+        the partial block structure, i.e. the ancestors of the subtrees
+        and blocks that transformers set data for from an ancestor, is
+        merged field by field into their existing data.
+
+        The structure-wide data that transformers collected for the
+        partial block structure replaces that in the block structure,
+        while any not collected again is kept.
+        """
+        # pylint: disable=protected-access
+        for transformer_name, transformer_data in partial_block_structure.transformer_data.items():
+            block_structure.transformer_data.get_or_create(transformer_name).fields.update(transformer_data.fields)
+
+        for subtree_key in subtree_keys:
+            for block_key in list(block_structure.post_order_traversal(start_node=subtree_key)):
+                for child_key in block_structure.get_children(block_key):
+                    block_structure._block_relations[child_key].parents.remove(block_key)
+                block_structure._block_relations[block_key].children = []
+
+            for block_key in partial_block_structure.topological_traversal(start_node=subtree_key):
+                for child_key in partial_block_structure.get_children(block_key):
+                    block_structure._add_relation(block_key, child_key)
+
+        subtree_block_keys = set()
+        for subtree_key in subtree_keys:
+            subtree_block_keys.update(partial_block_structure.post_order_traversal(start_node=subtree_key))
+
+        for block_key, block_data in partial_block_structure.iteritems():
+            if block_key in subtree_block_keys:
+                block_structure._block_data_map[block_key] = block_data
+            elif block_key in block_structure._block_data_map:
+                merged_block_data = block_structure._block_data_map[block_key]
+                merged_block_data.fields.update(block_data.fields)
+                for transformer_name, transformer_data in block_data.transformer_data.items():
+                    merged_block_data.transformer_data.get_or_create(transformer_name).fields.update(
+                        transformer_data.fields
+                    )
+
+        block_structure._prune_unreachable()
+        for block_key in list(block_structure._block_data_map.keys()):
+            if block_key not in block_structure:
+                del block_structure._block_data_map[block_key]
 
     def _update_collected(self):
         """
@@ -8,9 +8,11 @@ from django.conf import settings
 from django.dispatch.dispatcher import receiver
 from opaque_keys.edx.locator import LibraryLocator
 
-from xmodule.modulestore.django import SignalHandler
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import SignalHandler, modulestore
 
-from .api import clear_course_from_cache
+from .api import clear_course_from_cache, clear_course_from_process_cache
+from .config import INCREMENTAL_COLLECTION
 from .tasks import update_course_in_cache_v2
 
 log = logging.getLogger(__name__)
@@ -26,12 +28,47 @@ def update_block_structure_on_course_publish(sender, course_key, **kwargs):  # p
     if isinstance(course_key, LibraryLocator):
         return
 
+    # Entries in the in-process cache are keyed on the stored version, so
+    # they can't be served once the structure is re-collected. Dropping the
+    # entry right away frees the memory of the now outdated structure.
+    clear_course_from_process_cache(course_key)
+
+    task_kwargs = dict(course_id=str(course_key))
+    if INCREMENTAL_COLLECTION.is_enabled():
+        task_kwargs.update(_get_changed_blocks_kwargs(course_key))
+
     update_course_in_cache_v2.apply_async(
-        kwargs=dict(course_id=str(course_key)),
+        kwargs=task_kwargs,
         countdown=settings.BLOCK_STRUCTURES_SETTINGS['COURSE_PUBLISH_TASK_DELAY'],
     )
 
 
+def _get_changed_blocks_kwargs(course_key):
+    """
+    Returns the task kwargs for the blocks published or deleted by the
+    publish that sent the course_published signal, along with the version
+    of the published course they lead to.
+
+    Returns no kwargs, so that the whole block structure is collected
+    again, if the modulestore can't tell the changed blocks.
+    """
+    store = modulestore()
+    changed_block_keys = store.get_published_block_keys(course_key)
+    if not changed_block_keys:
+        return {}
+
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        course = store.get_course(course_key, depth=0)
+    published_version = getattr(course, 'course_version', None)
+    if published_version is None:
+        return {}
+
+    return dict(
+        changed_block_keys=sorted(str(block_key) for block_key in changed_block_keys),
+        published_version=str(published_version),
+    )
+
+
 @receiver(SignalHandler.course_deleted)
 def _delete_block_structure_on_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
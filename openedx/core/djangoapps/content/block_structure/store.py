@@ -4,13 +4,15 @@ Module for the Storage of BlockStructure objects.
 # pylint: disable=protected-access
 
 
+from collections import OrderedDict
 from logging import getLogger
+from threading import Lock
 
 from edx_django_utils import monitoring
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import columnar, config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -20,6 +22,89 @@ from .transformer_registry import TransformerRegistry
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+class ProcessCache:
+    """
+    A size-bounded, in-process LRU cache of deserialized block
+    structures, shared by all BlockStructureStores in the process.
+
+    Each root block usage key maps to a single entry, tagged with the
+    cache key of the BlockStructureModel it was loaded from.  Since that
+    cache key includes the version fields of the model, an entry for an
+    outdated version is never returned.
+
+    Callers must not mutate the block structures returned by get, which
+    are shared; BlockStructureStore returns copies that read from them
+    (see BlockStructureBlockData.copy_on_read).
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, root_block_usage_key, cache_key):
+        """
+        Returns the block structure cached for the given root key and
+        version, or None if not found.
+        """
+        with self._lock:
+            entry = self._entries.get(root_block_usage_key)
+            if entry is not None and entry[0] == cache_key:
+                self._entries.move_to_end(root_block_usage_key)
+                block_structure = entry[1]
+            else:
+                block_structure = None
+
+        # .. custom_attribute_name: block_structure.process_cache.hits
+        # .. custom_attribute_description: The number of block structures found in the
+        #   in-process cache during this transaction.
+        # .. custom_attribute_name: block_structure.process_cache.misses
+        # .. custom_attribute_description: The number of block structures not found (or found
+        #   with an outdated version) in the in-process cache during this transaction.
+        monitoring.accumulate(
+            'block_structure.process_cache.hits' if block_structure is not None
+            else 'block_structure.process_cache.misses',
+            1,
+        )
+        return block_structure
+
+    def set(self, root_block_usage_key, cache_key, block_structure, max_size):
+        """
+        Caches the given block structure for the given root key and
+        version, evicting the least recently used entries beyond
+        max_size.
+        """
+        num_evicted = 0
+        with self._lock:
+            self._entries[root_block_usage_key] = (cache_key, block_structure)
+            self._entries.move_to_end(root_block_usage_key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+                num_evicted += 1
+
+        if num_evicted:
+            # .. custom_attribute_name: block_structure.process_cache.evictions
+            # .. custom_attribute_description: The number of block structures evicted from the
+            #   in-process cache during this transaction to stay within
+            #   BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_SIZE'].
+            monitoring.accumulate('block_structure.process_cache.evictions', num_evicted)
+
+    def invalidate(self, root_block_usage_key):
+        """
+        Removes any entry cached for the given root key.
+        """
+        with self._lock:
+            self._entries.pop(root_block_usage_key, None)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+process_cache = ProcessCache()
+
+
 class BlockStructureStore:
     """
     Storage for BlockStructure objects.
@@ -50,6 +135,7 @@ class BlockStructureStore:
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        process_cache.invalidate(block_structure.root_block_usage_key)
 
     def get(self, root_block_usage_key):
         """
@@ -59,6 +145,11 @@ class BlockStructureStore:
         The given root_block_usage_key must equate the
         root_block_usage_key previously passed to the `add` method.
 
+        If BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_SIZE'] is set, the
+        deserialized block structure is kept in the in-process cache and
+        a copy of it, which copies each block's data on first access, is
+        returned.
+
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the
                 root of the block structure that is to be retrieved
@@ -74,13 +165,16 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
 
-        try:
-            serialized_data = self._get_from_cache(bs_model)
-        except BlockStructureNotFound:
-            serialized_data = self._get_from_store(bs_model)
-            self._add_to_cache(serialized_data, bs_model)
+        process_cache_size = config.process_cache_size()
+        if process_cache_size:
+            cache_key = self._encode_root_cache_key(bs_model)
+            block_structure = process_cache.get(root_block_usage_key, cache_key)
+            if block_structure is None:
+                block_structure = self._get_and_deserialize(bs_model, root_block_usage_key)
+                process_cache.set(root_block_usage_key, cache_key, block_structure, process_cache_size)
+            return block_structure.copy_on_read()
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        return self._get_and_deserialize(bs_model, root_block_usage_key)
 
     def delete(self, root_block_usage_key):
         """
@@ -93,6 +187,7 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        process_cache.invalidate(root_block_usage_key)
         bs_model.delete()
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -110,6 +205,30 @@ class BlockStructureStore:
 
         return False
 
+    def get_data_version(self, root_block_usage_key):
+        """
+        Returns the version of the modulestore data that the block
+        structure in storage for the given key was collected from, or
+        None if not found.
+        """
+        try:
+            return self._get_model(root_block_usage_key).data_version
+        except BlockStructureNotFound:
+            return None
+
+    def _get_and_deserialize(self, bs_model, root_block_usage_key):
+        """
+        Returns the deserialized block structure for the given
+        BlockStructureModel, from the cache or else from storage.
+        """
+        try:
+            serialized_data = self._get_from_cache(bs_model)
+        except BlockStructureNotFound:
+            serialized_data = self._get_from_store(bs_model)
+            self._add_to_cache(serialized_data, bs_model)
+
+        return self._deserialize(serialized_data, root_block_usage_key)
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -175,6 +294,9 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
+        if config.COLUMNAR_SERIALIZATION.is_enabled():
+            return columnar.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -188,7 +310,10 @@ class BlockStructureStore:
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            if columnar.is_columnar(serialized_data):
+                block_relations, transformer_data, block_data_map = columnar.deserialize(serialized_data)
+            else:
+                block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
@@ -4,13 +4,14 @@ Asynchronous tasks related to the Course Blocks sub-application.
 
 
 import logging
+from functools import partial
 
 from celery import shared_task
 from django.conf import settings
 from edx_django_utils.monitoring import set_code_owner_attribute
 from edxval.api import ValInternalError
 from lxml.etree import XMLSyntaxError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from xblocks_contrib.problem.capa.responsetypes import LoncapaProblemError
 
 from openedx.core.djangoapps.content.block_structure import api
@@ -42,6 +43,10 @@ def update_course_in_cache_v2(self, **kwargs):
     Updates the course blocks (mongo -> BlockStructure) for the specified course.
     Keyword Arguments:
         course_id (string) - The string serialized value of the course key.
+        changed_block_keys (list) - Optional string serialized values of the
+            usage keys of the blocks that were published or deleted.
+        published_version (string) - The version of the published course
+            that the changed_block_keys lead to; required along with them.
     """
     _update_course_in_cache(self, **kwargs)
 
@@ -59,7 +64,14 @@ def _update_course_in_cache(self, **kwargs):
     """
     Updates the course blocks (mongo -> BlockStructure) for the specified course.
     """
-    _call_and_retry_if_needed(self, api.update_course_in_cache, **kwargs)
+    api_method = api.update_course_in_cache
+    if kwargs.get('changed_block_keys') and kwargs.get('published_version'):
+        api_method = partial(
+            api_method,
+            changed_block_keys=[UsageKey.from_string(block_key) for block_key in kwargs['changed_block_keys']],
+            published_version=kwargs['published_version'],
+        )
+    _call_and_retry_if_needed(self, api_method, **kwargs)
 
 
 @block_structure_task()
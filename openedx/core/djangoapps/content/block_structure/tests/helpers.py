@@ -79,6 +79,7 @@ class MockModulestore:
     def __init__(self):
         self.get_items_call_count = 0
         self.blocks = None
+        self.previous_version = None
 
     def set_blocks(self, blocks):
         """
@@ -103,6 +104,29 @@ class MockModulestore:
             raise ItemNotFoundError
         return item
 
+    def has_item(self, block_key):
+        """
+        Returns whether the given block_key is in the mock modulestore.
+        """
+        return block_key in self.blocks
+
+    def get_parent_location(self, block_key):
+        """
+        Returns the key of the first block that has the given block_key as a
+        child, or None if there is none.
+        """
+        for parent_key, item in self.blocks.items():
+            if block_key in item.children:
+                return parent_key
+        return None
+
+    def get_course_history_info(self, course_key):  # pylint: disable=unused-argument
+        """
+        Returns the history info of the course in the mock modulestore,
+        with only the version that preceded the current one.
+        """
+        return {'previous_version': self.previous_version}
+
     @contextmanager
     def bulk_operations(self, ignore):  # pylint: disable=unused-argument
         """
@@ -213,6 +237,30 @@ class MockFilteringTransformer(FilteringTransformerMixin, BlockStructureTransfor
         return [block_structure.create_universal_filter()]
 
 
+def assert_equivalent_block_structures(block_structure, expected):
+    """
+    Verifies that the given collected block structures have the same blocks,
+    relations, xBlock fields and transformer data, regardless of the order in
+    which their blocks were added.
+    """
+    # pylint: disable=protected-access
+    assert set(block_structure.get_block_keys()) == set(expected.get_block_keys())
+    assert set(block_structure._block_data_map) == set(expected._block_data_map)
+    for block_key in expected.get_block_keys():
+        assert block_structure.get_children(block_key) == expected.get_children(block_key)
+        assert set(block_structure.get_parents(block_key)) == set(expected.get_parents(block_key))
+
+        block_data, expected_block_data = block_structure[block_key], expected[block_key]
+        assert block_data.fields == expected_block_data.fields
+        assert set(block_data.transformer_data) == set(expected_block_data.transformer_data)
+        for transformer_name, transformer_block_data in expected_block_data.transformer_data.items():
+            assert block_data.transformer_data[transformer_name].fields == transformer_block_data.fields
+
+    assert set(block_structure.transformer_data) == set(expected.transformer_data)
+    for transformer_name, transformer_data in expected.transformer_data.items():
+        assert block_structure.transformer_data[transformer_name].fields == transformer_data.fields
+
+
 def clear_registered_transformers_cache():
     """
     Test helper to clear out any cached values of registered transformers.
@@ -293,3 +293,25 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         assert _get_value(block_structure) == 'edit1'
         assert _get_value(new_copy) == 'edit2'
+
+    def test_copy_on_read(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'original_value')
+        block_structure.set_transformer_data('transformer', 'test_key', 'original_value')
+
+        new_copy = block_structure.copy_on_read()
+        assert block_structure.root_block_usage_key == new_copy.root_block_usage_key
+        assert [key for key, _ in new_copy.iteritems()] == [key for key, _ in block_structure.iteritems()]
+        assert new_copy.get_transformer_block_field(1, 'transformer', 'test_key') == 'original_value'
+
+        # verify edits to the copy do not affect the original
+        new_copy.remove_block(2, keep_descendants=True)
+        new_copy.set_transformer_block_field(1, 'transformer', 'test_key', 'edit')
+        new_copy.set_transformer_data('transformer', 'test_key', 'edit')
+        new_copy.override_xblock_field(3, 'display_name', 'edit')
+        self.assert_block_structure(new_copy, [[1], [3], [], []], missing_blocks=[2])
+        self.assert_block_structure(block_structure, [[1], [2], [3], []])
+        assert new_copy.get_transformer_block_field(1, 'transformer', 'test_key') == 'edit'
+        assert block_structure.get_transformer_block_field(1, 'transformer', 'test_key') == 'original_value'
+        assert block_structure.get_transformer_data('transformer', 'test_key') == 'original_value'
+        assert block_structure.get_xblock_field(3, 'display_name') is None
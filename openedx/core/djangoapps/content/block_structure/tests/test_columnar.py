@@ -0,0 +1,171 @@
+"""
+Tests for block_structure/columnar.py
+"""
+
+import pickle
+import threading
+from copy import deepcopy
+from datetime import datetime, timezone
+from unittest import TestCase
+
+import ddt
+import pytest
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+
+from .. import columnar
+from ..block_structure import TransformerDataMap
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+class ColumnarTestMixin(ChildrenMapTestMixin):
+    """
+    Test Mixin that builds block structures with xBlock fields and
+    transformer data, and round-trips them through the columnar format.
+    """
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map, with
+        collected xBlock fields and transformer data.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        block_structure.set_transformer_data(MockTransformer, 'course_wide', {'a': [1, 2]})
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_id}')
+            if block_id % 2:
+                start = datetime(2020, 1, block_id, tzinfo=timezone.utc)
+                block_structure.override_xblock_field(block_key, 'start', start)
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', {block_id})
+        return block_structure
+
+    def round_trip(self, block_structure):
+        """
+        Returns a new block structure deserialized from the columnar
+        serialization of the given one.
+        """
+        serialized_data = columnar.serialize(block_structure)
+        assert columnar.is_columnar(serialized_data)
+        return BlockStructureFactory.create_new(
+            block_structure.root_block_usage_key,
+            *columnar.deserialize(serialized_data)
+        )
+
+    def assert_same_data(self, block_structure, expected):
+        """
+        Verifies that the block data of the given block structures are equal.
+        """
+        assert list(block_structure.get_block_keys()) == list(expected.get_block_keys())
+        for block_key in expected:
+            assert block_structure.get_children(block_key) == expected.get_children(block_key)
+            assert block_structure.get_parents(block_key) == expected.get_parents(block_key)
+        assert [key for key, _ in block_structure.iteritems()] == [key for key, _ in expected.iteritems()]
+        for block_key, block_data in expected.iteritems():
+            assert block_structure[block_key].fields == block_data.fields
+            for transformer_name, transformer_data in block_data.transformer_data.items():
+                assert block_structure[block_key].transformer_data[transformer_name].fields == transformer_data.fields
+        assert block_structure.get_transformer_data(MockTransformer, 'course_wide') == {'a': [1, 2]}
+
+
+@ddt.ddt
+class TestColumnarSerialization(ColumnarTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format, using integer block keys.
+    """
+    @ddt.data(
+        [],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        self.assert_same_data(self.round_trip(block_structure), block_structure)
+
+    def test_lazy_materialization(self):
+        block_structure = self.round_trip(self.create_collected_block_structure(self.DAG_CHILDREN_MAP))
+        block_data_map = block_structure._block_data_map  # pylint: disable=protected-access
+        assert dict.__len__(block_data_map) == 0
+        assert len(block_data_map) == len(self.DAG_CHILDREN_MAP)
+
+        assert block_structure.get_transformer_block_field(3, MockTransformer, 'odd') == {3}
+        assert block_structure.get_transformer_block_field(2, MockTransformer, 'odd', 'default') == 'default'
+        assert dict.__len__(block_data_map) == 2
+
+        assert block_structure.get_xblock_field(5, 'display_name') == 'Block 5'
+        assert block_structure.get_xblock_field(5, 'missing', 'default') == 'default'
+        assert dict.__len__(block_data_map) == 3
+
+    def test_mutations(self):
+        block_structure = self.round_trip(self.create_collected_block_structure(self.DAG_CHILDREN_MAP))
+        block_structure.override_xblock_field(1, 'display_name', 'Changed')
+        block_structure.set_transformer_block_field(2, MockTransformer, 'odd', {'new'})
+        block_structure.remove_transformer_block_field(3, MockTransformer, 'odd')
+        block_structure.remove_block(4, keep_descendants=False)
+
+        assert block_structure.get_xblock_field(1, 'display_name') == 'Changed'
+        assert block_structure.get_transformer_block_field(2, MockTransformer, 'odd') == {'new'}
+        assert block_structure.get_transformer_block_field(3, MockTransformer, 'odd') is None
+        assert 4 not in block_structure
+        assert [key for key, _ in block_structure.iteritems()] == [0, 1, 2, 3, 5, 6]
+
+    @ddt.data(deepcopy, lambda value: pickle.loads(pickle.dumps(value)))
+    def test_copies_are_eager(self, copy_function):
+        block_structure = self.round_trip(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        block_data_map = copy_function(block_structure._block_data_map)  # pylint: disable=protected-access
+        assert type(block_data_map) is dict
+        assert type(block_data_map[1].transformer_data) is TransformerDataMap
+        assert block_data_map[1].transformer_data[MockTransformer].odd == {1}
+
+    def test_concurrent_materialization(self):
+        block_structure = self.round_trip(self.create_collected_block_structure(self.DAG_CHILDREN_MAP))
+        block_keys = list(range(len(self.DAG_CHILDREN_MAP)))
+        barrier = threading.Barrier(8)
+        errors = []
+
+        def read_blocks(thread_index):
+            barrier.wait()
+            try:
+                if thread_index % 2:
+                    # Builds all pending entries while the other threads build single ones.
+                    list(block_structure.iteritems())
+                for block_id in block_keys[thread_index:] + block_keys[:thread_index]:
+                    assert block_structure.get_xblock_field(block_id, 'display_name') == f'Block {block_id}'
+                    expected = {block_id} if block_id % 2 else None
+                    assert block_structure.get_transformer_block_field(block_id, MockTransformer, 'odd') == expected
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        threads = [threading.Thread(target=read_blocks, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert [key for key, _ in block_structure.iteritems()] == block_keys
+
+    def test_unsupported_version(self):
+        serialized_data = bytearray(columnar.serialize(self.create_collected_block_structure([])))
+        serialized_data[len(columnar.MAGIC)] = columnar.FORMAT_VERSION + 1
+        with pytest.raises(ValueError):
+            columnar.deserialize(bytes(serialized_data))
+
+
+class TestColumnarSerializationWithUsageKeys(UsageKeyFactoryMixin, ColumnarTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format, using usage keys.
+    """
+    def test_round_trip(self):
+        block_structure = self.create_collected_block_structure(self.DAG_CHILDREN_MAP)
+        self.assert_same_data(self.round_trip(block_structure), block_structure)
+
+    def test_keys_from_other_contexts(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        library_block_key = BlockUsageLocator(CourseLocator('org', 'library', 'run'), 'html', 'other')
+        block_structure._add_relation(self.block_key_factory(2), library_block_key)  # pylint: disable=protected-access
+        block_structure.override_xblock_field(library_block_key, 'display_name', 'Library block')
+
+        deserialized = self.round_trip(block_structure)
+        assert deserialized.get_children(self.block_key_factory(2)) == [library_block_key]
+        assert deserialized.get_xblock_field(library_block_key, 'display_name') == 'Library block'
@@ -12,6 +12,7 @@ from xmodule.modulestore import ModuleStoreEnum
 
 from ..block_structure import BlockStructureBlockData
 from ..exceptions import UsageKeyNotInBlockStructure
+from ..factory import BlockStructureFactory
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
 from .helpers import (
@@ -19,7 +20,9 @@ from .helpers import (
     MockCache,
     MockModulestoreFactory,
     MockTransformer,
+    MockXBlock,
     UsageKeyFactoryMixin,
+    assert_equivalent_block_structures,
     mock_registered_transformers,
 )
 
@@ -254,3 +257,203 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
                 setattr(self.modulestore, attr_name, original_branch_setting)
             elif hasattr(self.modulestore, attr_name):
                 delattr(self.modulestore, attr_name)
+
+
+class IncrementalTestTransformer(MockTransformer):
+    """
+    Test Transformer class that supports incremental collection, by
+    percolating an xBlock field down from the ancestors of each block.
+    """
+    INCREMENTAL_COLLECT = True
+    collected_block_keys = set()
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the path of labels from the root to each block.
+        """
+        block_structure.request_xblock_fields('course_version', 'label')
+        for block_key in block_structure.topological_traversal():
+            parent_paths = [
+                block_structure.get_transformer_block_field(parent_key, cls, 'path')
+                for parent_key in block_structure.get_parents(block_key)
+            ]
+            label = block_structure.get_xblock(block_key).field_map.get('label', '')
+            block_structure.set_transformer_block_field(
+                block_key, cls, 'path', min(parent_paths, default='') + '/' + label,
+            )
+        cls.collected_block_keys = set(block_structure.get_block_keys())
+
+
+class LibraryTestTransformer(MockTransformer):
+    """
+    Test Transformer class that supports incremental collection and, like
+    ContentLibraryTransformer, sets data for all children of library blocks,
+    as listed by their xBlocks.
+    """
+    INCREMENTAL_COLLECT = True
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the label of each child of a library block.
+        """
+        block_structure.request_xblock_fields('is_library')
+        for block_key in block_structure.topological_traversal():
+            xblock = block_structure.get_xblock(block_key)
+            if xblock.field_map.get('is_library'):
+                for child_key in xblock.children:
+                    block_structure.set_transformer_block_field(child_key, cls, 'library', str(block_key))
+
+
+@ddt.ddt
+class TestIncrementalCollection(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Test class for incrementally updating collected block structures with
+    the BlockStructureManager, verified against a full rebuild.
+    """
+    #       0
+    #      / \
+    #     1   2
+    #    / \   \
+    #   3   4   5
+    #  /
+    # 6
+    CHILDREN_MAP = [[1, 2], [3, 4], [5], [6], [], [], []]
+
+    def setUp(self):
+        super().setUp()
+        self.registered_transformers = [IncrementalTestTransformer()]
+        self.modulestore = MockModulestoreFactory.create(self.CHILDREN_MAP, self.block_key_factory)
+        for block_id in range(len(self.CHILDREN_MAP)):
+            self._get_xblock(block_id).field_map['label'] = str(block_id)
+        self._set_course_version('v1')
+        self.bs_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, MockCache())
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+    def _get_xblock(self, block_id):
+        return self.modulestore.blocks[self.block_key_factory(block_id)]
+
+    def _set_course_version(self, version, previous_version=None):
+        self._get_xblock(0).field_map['course_version'] = version
+        self.modulestore.previous_version = previous_version
+
+    def _update_collected(self, changed_block_ids, published_version='v2'):
+        """
+        Updates the collected block structure for the given changed blocks,
+        verifies that it equals a fully collected block structure, and
+        returns the keys of the blocks that were collected.
+        """
+        self._set_course_version('v2', previous_version='v1')
+        IncrementalTestTransformer.collected_block_keys = set()
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed(
+                [self.block_key_factory(block_id) for block_id in changed_block_ids],
+                published_version,
+            )
+            collected_block_keys = IncrementalTestTransformer.collected_block_keys
+
+            expected = BlockStructureFactory.create_from_modulestore(self.block_key_factory(0), self.modulestore)
+            BlockStructureTransformers.collect(expected)
+            block_structure = self.bs_manager.get_collected()
+        assert_equivalent_block_structures(block_structure, expected)
+        assert block_structure.get_xblock_field(self.block_key_factory(0), 'course_version') == 'v2'
+        return collected_block_keys
+
+    def _remove_child(self, parent_id, child_id):
+        self._get_xblock(parent_id).children.remove(self.block_key_factory(child_id))
+
+    def _add_child(self, parent_id, child_id):
+        self._get_xblock(parent_id).children.append(self.block_key_factory(child_id))
+
+    def _assert_collected(self, collected_block_keys, expected_block_ids):
+        assert collected_block_keys == {self.block_key_factory(block_id) for block_id in expected_block_ids}
+
+    def test_edit_block(self):
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([6]), [0, 1, 3, 6])
+
+    def test_add_block(self):
+        block_key = self.block_key_factory(7)
+        self.modulestore.blocks[block_key] = MockXBlock(block_key, {'label': '7'}, modulestore=self.modulestore)
+        self._add_child(4, 7)
+        self._assert_collected(self._update_collected([7]), [0, 1, 4, 7])
+
+    def test_delete_block(self):
+        self._remove_child(3, 6)
+        del self.modulestore.blocks[self.block_key_factory(6)]
+        self._assert_collected(self._update_collected([6]), [0, 1, 3])
+
+    def test_delete_subtree(self):
+        self._remove_child(1, 3)
+        for block_id in (3, 6):
+            del self.modulestore.blocks[self.block_key_factory(block_id)]
+        self._assert_collected(self._update_collected([3, 6]), [0, 1, 4])
+
+    def test_move_block(self):
+        self._remove_child(3, 6)
+        self._add_child(5, 6)
+        self._assert_collected(self._update_collected([6]), [0, 1, 2, 3, 5, 6])
+
+    def test_multiple_changes(self):
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._get_xblock(5).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([6, 5]), [0, 1, 2, 3, 5, 6])
+
+    def test_root_child_changed(self):
+        self._get_xblock(2).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([2]), range(len(self.CHILDREN_MAP)))
+
+    def test_unknown_block(self):
+        self._assert_collected(self._update_collected([100]), range(len(self.CHILDREN_MAP)))
+
+    def test_transformer_without_incremental_collect(self):
+        TestTransformer1.collect_call_count = 0
+        self.registered_transformers.append(TestTransformer1())
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([6]), range(len(self.CHILDREN_MAP)))
+        assert TestTransformer1.collect_call_count > 0
+
+    def test_newer_published_version(self):
+        # Another publish followed the one that changed the blocks.
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._get_xblock(5).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([6], published_version='v1.5'), range(len(self.CHILDREN_MAP)))
+
+    def test_skipped_published_version(self):
+        # The collected data precedes the version before the one that changed the blocks.
+        self._set_course_version('v2', previous_version='v1.5')
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._get_xblock(5).field_map['label'] = 'changed'
+        IncrementalTestTransformer.collected_block_keys = set()
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed([self.block_key_factory(6)], 'v2')
+            block_structure = self.bs_manager.get_collected()
+        self._assert_collected(IncrementalTestTransformer.collected_block_keys, range(len(self.CHILDREN_MAP)))
+        assert block_structure.get_transformer_block_field(
+            self.block_key_factory(5), IncrementalTestTransformer, 'path',
+        ) == '/0/2/changed'
+
+    def test_change_under_library_block(self):
+        self.registered_transformers.append(LibraryTestTransformer())
+        self._get_xblock(1).field_map['is_library'] = True
+        self.bs_manager.clear()
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+        self._get_xblock(6).field_map['label'] = 'changed'
+        self._assert_collected(self._update_collected([6]), [0, 1, 3, 6])
+        block_structure = self.bs_manager.get_collected()
+        # The data of the sibling of the changed subtree is kept.
+        assert block_structure.get_transformer_block_field(
+            self.block_key_factory(4), IncrementalTestTransformer, 'path',
+        ) == '/0/1/4'
+
+    @ddt.data(None, [])
+    def test_no_changed_blocks(self, changed_block_keys):
+        self._set_course_version('v2')
+        IncrementalTestTransformer.collected_block_keys = set()
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed(changed_block_keys, 'v2')
+        self._assert_collected(IncrementalTestTransformer.collected_block_keys, range(len(self.CHILDREN_MAP)))
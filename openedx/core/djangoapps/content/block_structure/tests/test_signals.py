@@ -5,14 +5,18 @@ from unittest.mock import patch
 
 import ddt
 import pytest
+from edx_toggles.toggles.testutils import override_waffle_switch
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory
 
 from ..api import get_block_structure_manager
+from ..config import INCREMENTAL_COLLECTION
 from ..signals import update_block_structure_on_course_publish
+from ..store import process_cache
 from .helpers import is_course_in_block_structure_cache
 
 
@@ -64,3 +68,42 @@ class CourseBlocksSignalTest(ModuleStoreTestCase):
     def test_update_only_for_courses(self, key, expect_update_called, mock_update):
         update_block_structure_on_course_publish(sender=None, course_key=key)
         assert mock_update.called == expect_update_called
+
+    @patch('openedx.core.djangoapps.content.block_structure.tasks.update_course_in_cache_v2.apply_async')
+    def test_publish_clears_process_cache(self, mock_update):  # pylint: disable=unused-argument
+        process_cache.set(self.course_usage_key, 'cache_key', 'block_structure', max_size=1)
+        self.addCleanup(process_cache.clear)
+
+        update_block_structure_on_course_publish(sender=None, course_key=self.course.id)
+        assert process_cache.get(self.course_usage_key, 'cache_key') is None
+
+    @ddt.data(True, False)
+    @patch('openedx.core.djangoapps.content.block_structure.tasks.update_course_in_cache_v2.apply_async')
+    def test_publish_passes_changed_blocks(self, incremental_enabled, mock_update):
+        chapter = BlockFactory.create(parent=self.course, category='chapter')
+        sequential = BlockFactory.create(parent=chapter, category='sequential')
+        published = BlockFactory.create(parent=sequential, category='vertical', publish_item=False)
+        deleted = BlockFactory.create(parent=sequential, category='vertical')
+        mock_update.reset_mock()
+
+        with override_waffle_switch(INCREMENTAL_COLLECTION, active=incremental_enabled):
+            with self.store.bulk_operations(self.course.id):
+                self.store.publish(published.location, self.user.id)
+                self.store.delete_item(deleted.location, self.user.id)
+
+            mock_update.assert_called_once()
+            task_kwargs = mock_update.call_args.kwargs['kwargs']
+            if incremental_enabled:
+                changed_block_keys = set(task_kwargs['changed_block_keys'])
+                assert str(published.location.for_branch(None)) in changed_block_keys
+                assert str(deleted.location.for_branch(None)) in changed_block_keys
+                with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, self.course.id):
+                    published_course = self.store.get_course(self.course.id, depth=0)
+                assert task_kwargs['published_version'] == str(published_course.course_version)
+            else:
+                assert 'changed_block_keys' not in task_kwargs
+                assert 'published_version' not in task_kwargs
+
+            # The changed blocks are only passed on with the publish that changed them.
+            update_block_structure_on_course_publish(sender=None, course_key=self.course.id)
+            assert 'changed_block_keys' not in mock_update.call_args.kwargs['kwargs']
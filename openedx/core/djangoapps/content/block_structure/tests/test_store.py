@@ -2,14 +2,21 @@
 Tests for block_structure/cache.py
 """
 
+from unittest.mock import patch
+
 import ddt
 import pytest
+from django.conf import settings
+from django.test.utils import override_settings
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
+from ..columnar import is_columnar
+from ..config import COLUMNAR_SERIALIZATION
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
-from ..store import BlockStructureStore
+from ..store import BlockStructureStore, process_cache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
 
@@ -54,6 +61,20 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert stored_value is not None
         self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_add_and_get_columnar(self, columnar_enabled):
+        with override_waffle_switch(COLUMNAR_SERIALIZATION, active=columnar_enabled):
+            self.store.add(self.block_structure)
+        assert is_columnar(next(iter(self.mock_cache.map.values()))) == columnar_enabled
+
+        # Stored structures are readable regardless of the current setting.
+        with override_waffle_switch(COLUMNAR_SERIALIZATION, active=not columnar_enabled):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test',
+        ) == f'{MockTransformer.name()} val'
+
     def test_delete(self):
         self.store.add(self.block_structure)
         self.store.delete(self.block_structure.root_block_usage_key)
@@ -76,3 +97,114 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert self.mock_cache.timeout_from_last_call == 0
         self.store.add(self.block_structure)
         assert self.mock_cache.timeout_from_last_call == timeout
+
+
+@ddt.ddt
+class TestBlockStructureStoreProcessCache(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheIsolationTestCase):
+    """
+    Tests for the in-process cache of BlockStructureStore
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(process_cache.clear)
+        self.store = BlockStructureStore(MockCache())
+
+    def _create_and_add_block_structure(self, children_map):
+        """
+        Creates a block structure for the given children_map and adds it
+        to the store.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        self.store.add(block_structure)
+        return block_structure
+
+    def _override_cache_size(self, size):
+        return override_settings(BLOCK_STRUCTURES_SETTINGS={
+            **settings.BLOCK_STRUCTURES_SETTINGS,
+            'PROCESS_CACHE_SIZE': size,
+        })
+
+    @ddt.data(0, 1)
+    def test_deserialized_once(self, cache_size):
+        block_structure = self._create_and_add_block_structure(self.SIMPLE_CHILDREN_MAP)
+        root_key = block_structure.root_block_usage_key
+
+        with self._override_cache_size(cache_size):
+            deserialize = self.store._deserialize  # pylint: disable=protected-access
+            with patch.object(self.store, '_deserialize', wraps=deserialize) as mock_deserialize:
+                first = self.store.get(root_key)
+                second = self.store.get(root_key)
+
+        assert mock_deserialize.call_count == (1 if cache_size else 2)
+        assert first is not second
+        self.assert_block_structure(second, self.SIMPLE_CHILDREN_MAP)
+
+    def test_copy_on_read(self):
+        block_structure = self._create_and_add_block_structure(self.SIMPLE_CHILDREN_MAP)
+        root_key = block_structure.root_block_usage_key
+
+        with self._override_cache_size(1):
+            first = self.store.get(root_key)
+            first.remove_block(self.block_key_factory(1), keep_descendants=False)
+            first.override_xblock_field(root_key, 'display_name', 'Changed')
+            second = self.store.get(root_key)
+
+        self.assert_block_structure(second, self.SIMPLE_CHILDREN_MAP)
+        assert second.get_xblock_field(root_key, 'display_name') is None
+
+    def test_shared_structure_not_materialized(self):
+        with override_waffle_switch(COLUMNAR_SERIALIZATION, active=True):
+            block_structure = self._create_and_add_block_structure(self.SIMPLE_CHILDREN_MAP)
+        root_key = block_structure.root_block_usage_key
+
+        with self._override_cache_size(1):
+            first = self.store.get(root_key)
+            assert first.get_transformer_data(MockTransformer, '_version') == MockTransformer.WRITE_VERSION
+            first.override_xblock_field(root_key, 'display_name', 'Changed')
+            cached = process_cache.get(root_key, self.store._encode_root_cache_key(  # pylint: disable=protected-access
+                self.store._get_model(root_key)  # pylint: disable=protected-access
+            ))
+
+        # Only the block that was accessed through the copy was built in the cached structure.
+        assert dict.__len__(cached._block_data_map) == 1  # pylint: disable=protected-access
+        assert cached.get_xblock_field(root_key, 'display_name') is None
+
+    def test_invalidated_on_add(self):
+        block_structure = self._create_and_add_block_structure(self.SIMPLE_CHILDREN_MAP)
+        root_key = block_structure.root_block_usage_key
+
+        with self._override_cache_size(1):
+            self.store.get(root_key)
+            self._create_and_add_block_structure(self.LINEAR_CHILDREN_MAP)
+            updated = self.store.get(root_key)
+
+        self.assert_block_structure(updated, self.LINEAR_CHILDREN_MAP)
+
+    def test_outdated_version_not_returned(self):
+        block_structure = self._create_and_add_block_structure(self.SIMPLE_CHILDREN_MAP)
+        root_key = block_structure.root_block_usage_key
+        process_cache.set(root_key, 'outdated cache key', block_structure, max_size=1)
+
+        with self._override_cache_size(1):
+            deserialize = self.store._deserialize  # pylint: disable=protected-access
+            with patch.object(self.store, '_deserialize', wraps=deserialize) as mock_deserialize:
+                self.store.get(root_key)
+
+        assert mock_deserialize.call_count == 1
+
+    def test_eviction(self):
+        with patch('openedx.core.djangoapps.content.block_structure.store.monitoring') as mock_monitoring:
+            process_cache.set('first', 'key', 'first structure', max_size=2)
+            process_cache.set('second', 'key', 'second structure', max_size=2)
+            assert process_cache.get('first', 'key') == 'first structure'
+            process_cache.set('third', 'key', 'third structure', max_size=2)
+
+            assert process_cache.get('second', 'key') is None
+            assert process_cache.get('first', 'key') == 'first structure'
+            assert process_cache.get('third', 'key') == 'third structure'
+
+        mock_monitoring.accumulate.assert_any_call('block_structure.process_cache.evictions', 1)
+        mock_monitoring.accumulate.assert_any_call('block_structure.process_cache.misses', 1)
@@ -58,6 +58,26 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collected data can be updated by
+    # collecting only the changed parts of a course.
+    #
+    # When a course is published, the block_structure framework may
+    # call the collect method with a partial block structure that
+    # contains only the changed subtrees and all of their ancestors,
+    # and then merge the collected block data into the previously
+    # collected block structure. This is only done if all registered
+    # transformers set this attribute to True.
+    #
+    # A transformer may set this to True only if the data it collects
+    # for a block depends solely on the xBlock fields of the block and
+    # of its ancestors. Any non-block-specific data that it stores
+    # (with set_transformer_data) for the partial block structure
+    # replaces the previously collected data, so it must depend only on
+    # the root block, which is always included, or else keeping its
+    # previously collected value must be safe when it isn't set again.
+    #
+    INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
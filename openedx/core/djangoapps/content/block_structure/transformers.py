@@ -80,6 +80,21 @@ class BlockStructureTransformers:
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls, block_structure):
+        """
+        Returns whether the collected data in the given block structure
+        can be updated by collecting only the changed parts of it, that
+        is, whether all registered transformers support incremental
+        collection and their data in the block structure was collected
+        with their current WRITE_VERSION.
+        """
+        get_version = block_structure._get_transformer_data_version  # pylint: disable=protected-access
+        return all(
+            transformer.INCREMENTAL_COLLECT and get_version(transformer) == transformer.WRITE_VERSION
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
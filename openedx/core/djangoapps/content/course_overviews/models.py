@@ -3,9 +3,12 @@ Declaration of CourseOverview model
 """
 
 
+import copy
 import json
 import logging
+from collections import OrderedDict
 from datetime import datetime
+from threading import Lock
 from urllib.parse import urlparse, urlunparse
 from zoneinfo import ZoneInfo
 
@@ -27,7 +30,7 @@ from lms.djangoapps.courseware.model_data import FieldDataCache
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.lang_pref.api import get_closest_released_language
 from openedx.core.djangoapps.models.course_details import CourseDetails
-from openedx.core.lib.cache_utils import RequestCache, request_cached
+from openedx.core.lib.cache_utils import RequestCache
 from xmodule import block_metadata_utils, course_metadata_utils  # pylint: disable=wrong-import-order
 from xmodule.course_block import DEFAULT_START_DATE, CourseBlock  # pylint: disable=wrong-import-order
 from xmodule.error_block import ErrorBlock  # pylint: disable=wrong-import-order
@@ -41,6 +44,81 @@ class CourseOverviewCaseMismatchException(Exception):
     pass
 
 
+class CourseOverviewCache:
+    """
+    A size-bounded, process-wide LRU cache of CourseOverviews, with their
+    image sets and tabs, keyed by course id.
+
+    Each overview is cached with its version: its format version and the
+    modification times of the overview and of its image set.  A cached
+    overview is only handed out if the caller found the same version in the
+    database, so cached overviews can't go stale.  Callers may change the
+    overviews they are given, so copies of the cached overviews are handed
+    out.
+
+    The cache holds up to COURSE_OVERVIEW_CACHE_SIZE overviews, and is
+    disabled if that is 0.
+    """
+    def __init__(self):
+        self._overviews = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'COURSE_OVERVIEW_CACHE_SIZE', 0)
+
+    @staticmethod
+    def overview_version(overview):
+        """
+        Returns the version of the given overview, as cached.
+        """
+        return (overview.version, overview.modified, overview.image_set.modified)
+
+    def get_many(self, versions):
+        """
+        Returns a dict of copies of the cached overviews of the given versions.
+
+        Arguments:
+            versions (dict[CourseKey, tuple]): the current version of the
+                overview of each course, as returned by overview_version.
+        """
+        if not self.max_size:
+            return {}
+        found = {}
+        with self._lock:
+            for course_id, version in versions.items():
+                cached = self._overviews.get(course_id)
+                if cached is not None and cached[0] == version:
+                    self._overviews.move_to_end(course_id)
+                    found[course_id] = cached[1]
+        return {course_id: copy.copy(overview) for course_id, overview in found.items()}
+
+    def set(self, overview):
+        """
+        Caches a copy of the given overview, evicting the least recently used
+        ones beyond the cache's size.
+
+        Overviews without an image set are not cached, since their image set
+        is created without changing the overview.
+        """
+        max_size = self.max_size
+        if not max_size or not hasattr(overview, 'image_set'):
+            return
+        cached = (self.overview_version(overview), copy.copy(overview))
+        with self._lock:
+            self._overviews[overview.id] = cached
+            self._overviews.move_to_end(overview.id)
+            while len(self._overviews) > max_size:
+                self._overviews.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._overviews.clear()
+
+
+COURSE_OVERVIEW_CACHE = CourseOverviewCache()
+
+
 class CourseOverview(TimeStampedModel):
     """
     Model for storing and caching basic information about a course.
@@ -392,7 +470,68 @@ class CourseOverview(TimeStampedModel):
         return modulestore().has_course(course_id)
 
     @classmethod
-    @request_cached('course_overview')
+    def _request_overviews(cls):
+        """
+        Returns the CourseOverviews loaded in the current request, by course id.
+
+        This identity map is shared by get_from_id and get_from_ids, so that a
+        course's overview is only loaded once per request, and is cleared
+        whenever an overview is saved or deleted.
+        """
+        request_cache = RequestCache('course_overview')
+        cached_response = request_cache.get_cached_response('overviews')
+        if cached_response.is_found:
+            return cached_response.value
+        overviews = {}
+        request_cache.set('overviews', overviews)
+        return overviews
+
+    @classmethod
+    def _get_current_from_db(cls, course_ids, prefetch_tabs=True):
+        """
+        Return a dict mapping course_ids to the up-to-date CourseOverviews of
+        the given courses in the database, with their image sets and, if
+        prefetch_tabs is True, their tabs.
+
+        The overviews are loaded with a constant number of queries, however
+        many courses are given.  If the process cache of overviews is enabled,
+        a first query fetches the current versions of the overviews so that
+        cached overviews can be used, and tabs are always prefetched.
+
+        Arguments:
+            course_ids (iterable[CourseKey])
+            prefetch_tabs (bool)
+
+        Returns: dict[CourseKey, CourseOverview]
+        """
+        course_ids = list(course_ids)
+        if not course_ids:
+            return {}
+        current_overviews = cls.objects.filter(version__gte=cls.VERSION)
+
+        overviews = {}
+        if COURSE_OVERVIEW_CACHE.max_size:
+            prefetch_tabs = True
+            versions = {
+                course_id: (version, modified, image_set_modified)
+                for course_id, version, modified, image_set_modified in current_overviews.filter(
+                    id__in=course_ids
+                ).values_list('id', 'version', 'modified', 'image_set__modified')
+            }
+            overviews = COURSE_OVERVIEW_CACHE.get_many(versions)
+            course_ids = [course_id for course_id in versions if course_id not in overviews]
+            if not course_ids:
+                return overviews
+
+        queryset = current_overviews.filter(id__in=course_ids).select_related('image_set')
+        if prefetch_tabs:
+            queryset = queryset.prefetch_related('tab_set')
+        for overview in queryset:
+            overviews[overview.id] = overview
+            COURSE_OVERVIEW_CACHE.set(overview)
+        return overviews
+
+    @classmethod
     def get_from_id(cls, course_id):
         """
         Load a CourseOverview object for a given course ID.
@@ -402,6 +541,9 @@ class CourseOverview(TimeStampedModel):
         CourseOverview object from it, and then cache it in the database for
         future use.
 
+        The overview is then returned by every call for the course in the same
+        request, including calls of get_from_ids.
+
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
 
@@ -414,13 +556,12 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Reload the overview from the modulestore to update the version
-                course_overview = cls.load_from_module_store(course_id)
-        except cls.DoesNotExist:
-            course_overview = None
+        course_overview = cls._request_overviews().get(course_id)
+        if course_overview is None:
+            # Overviews with an old version aren't returned, and are reloaded
+            # from the modulestore to update the version.
+            overviews = cls._get_current_from_db([course_id], prefetch_tabs=False)
+            course_overview = next(iter(overviews.values()), None)
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -428,15 +569,19 @@ class CourseOverview(TimeStampedModel):
         if course_overview and not hasattr(course_overview, 'image_set'):
             CourseOverviewImageSet.create(course_overview)
 
-        return course_overview or cls.load_from_module_store(course_id)
+        course_overview = course_overview or cls.load_from_module_store(course_id)
+        cls._request_overviews()[course_id] = course_overview
+        return course_overview
 
     @classmethod
     def get_from_ids(cls, course_ids):
         """
         Return a dict mapping course_ids to CourseOverviews.
 
-        Tries to select all CourseOverviews in one query,
-        then fetches remaining (uncached) overviews from the modulestore.
+        Overviews already loaded in the current request are reused, and the
+        others are selected, with their image sets and tabs, in a constant
+        number of queries.  Then remaining (uncached) overviews are fetched
+        from the modulestore.
 
         Course IDs for non-existant courses will map to None.
 
@@ -445,19 +590,28 @@ class CourseOverview(TimeStampedModel):
 
         Returns: dict[CourseKey, CourseOverview|None]
         """
+        course_ids = list(course_ids)
+        request_overviews = cls._request_overviews()
         overviews = {
-            overview.id: overview
-            for overview in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
-            )
+            course_id: request_overviews[course_id]
+            for course_id in course_ids
+            if course_id in request_overviews
         }
+        overviews.update(cls._get_current_from_db(
+            course_id for course_id in course_ids if course_id not in overviews
+        ))
         for course_id in course_ids:
             if course_id not in overviews:
                 try:
                     overviews[course_id] = cls.load_from_module_store(course_id)
                 except CourseOverview.DoesNotExist:
                     overviews[course_id] = None
+
+        # Saving overviews loaded from the modulestore clears the identity map,
+        # so it is looked up again.
+        cls._request_overviews().update(
+            (course_id, overview) for course_id, overview in overviews.items() if overview is not None
+        )
         return overviews
 
     @classmethod
@@ -777,7 +931,11 @@ class CourseOverview(TimeStampedModel):
         """
         Returns an iterator of CourseTabs.
         """
-        for tab_dict in self.tab_set.all().values():
+        # The tabs are read from the instances, rather than with values(), to
+        # use tabs prefetched by get_from_ids.
+        tab_fields = [field.attname for field in CourseOverviewTab._meta.concrete_fields]
+        for tab_model in self.tab_set.all():
+            tab_dict = {field: getattr(tab_model, field) for field in tab_fields}
             tab = CourseTab.from_json(tab_dict)
             if tab is None:
                 log.warning("Can't instantiate CourseTab from %r", tab_dict)
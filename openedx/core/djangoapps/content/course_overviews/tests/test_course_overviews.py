@@ -25,6 +25,7 @@ from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
 from openedx.core.djangoapps.dark_lang.models import DarkLangConfig
 from openedx.core.djangoapps.models.course_details import CourseDetails
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import RequestCache
 from openedx.core.lib.courses import course_image_url
 from xmodule.assetstore.assetmgr import AssetManager  # pylint: disable=wrong-import-order
 from xmodule.contentstore.content import StaticContent  # pylint: disable=wrong-import-order
@@ -46,7 +47,13 @@ from xmodule.modulestore.tests.factories import (  # pylint: disable=wrong-impor
     check_mongo_calls_range,
 )
 
-from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet, CourseOverviewTab
+from ..models import (
+    COURSE_OVERVIEW_CACHE,
+    CourseOverview,
+    CourseOverviewImageConfig,
+    CourseOverviewImageSet,
+    CourseOverviewTab,
+)
 from .factories import CourseOverviewFactory
 
 
@@ -399,8 +406,8 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
     # created with `None` as 'id' - We are going to mock this to as this isn't being tested in this test case, instead
     # we are testing that on the first request course overview is created and stored and for the second request
     # it gives IntegrityError - It is just to mimic race condition.
-    # Also we are mocking the RequestCache to disable caching as we want to mimic race condition and we want both
-    # requests to be served without involving cache
+    # Also we are mocking the request's map of overviews to disable caching as we want to mimic race condition and we
+    # want both requests to be served without involving cache
     @mock.patch(
         'openedx.core.djangoapps.content.course_overviews.models.CourseOverviewTab.objects.filter',
         mock.Mock(return_value=CourseOverviewTab.objects.none())
@@ -409,7 +416,7 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         'openedx.core.djangoapps.content.course_overviews.models.CourseOverviewImageSet.objects.filter',
         mock.Mock(return_value=CourseOverviewImageSet.objects.none())
     )
-    @mock.patch('openedx.core.lib.cache_utils.RequestCache', mock.Mock(return_value=None))
+    @mock.patch.object(CourseOverview, '_request_overviews', mock.Mock(side_effect=dict))
     @mock.patch('openedx.core.djangoapps.content.course_overviews.models.log')
     def test_course_overview_saving_race_condition(self, mock_log):
         """
@@ -609,6 +616,61 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         assert overviews_by_id[non_existent_course_key] is None
         assert mock_load_from_modulestore.call_count == 3
 
+    def test_get_from_ids_request_identity_map(self):
+        """
+        Assert that get_from_ids loads overviews with their image sets and
+        tabs in a constant number of queries, and that the overviews are
+        reused for the rest of the request.
+        """
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        RequestCache('course_overview').clear()
+
+        # One query for the overviews and their image sets, and one for their tabs.
+        with self.assertNumQueries(2):
+            overviews_by_id = CourseOverview.get_from_ids(course_ids)
+            for overview in overviews_by_id.values():
+                assert overview.image_set
+                assert list(overview.tabs)
+
+        with self.assertNumQueries(0):
+            for course_id in course_ids:
+                assert CourseOverview.get_from_id(course_id) is overviews_by_id[course_id]
+            assert CourseOverview.get_from_ids(course_ids) == overviews_by_id
+
+        # Saving an overview clears the request's overviews.
+        overviews_by_id[course_ids[0]].save()
+        assert CourseOverview.get_from_id(course_ids[0]) is not overviews_by_id[course_ids[0]]
+
+    @override_settings(COURSE_OVERVIEW_CACHE_SIZE=10)
+    def test_process_cache(self):
+        """
+        Assert that overviews are cached in the process, and are reloaded from
+        the database once they are changed.
+        """
+        COURSE_OVERVIEW_CACHE.clear()
+        self.addCleanup(COURSE_OVERVIEW_CACHE.clear)
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        RequestCache('course_overview').clear()
+
+        # One more query, for the versions of the overviews.
+        with self.assertNumQueries(3):
+            overviews_by_id = CourseOverview.get_from_ids(course_ids)
+
+        RequestCache('course_overview').clear()
+        with self.assertNumQueries(1):
+            cached_overviews_by_id = CourseOverview.get_from_ids(course_ids)
+            for course_id, overview in cached_overviews_by_id.items():
+                assert overview is not overviews_by_id[course_id]
+                assert overview.display_name == overviews_by_id[course_id].display_name
+                assert list(overview.tabs) == list(overviews_by_id[course_id].tabs)
+
+        changed_overview = cached_overviews_by_id[course_ids[0]]
+        changed_overview.display_name = 'Changed Name'
+        changed_overview.save()
+        # The changed overview is loaded again, with its tabs.
+        with self.assertNumQueries(3):
+            assert CourseOverview.get_from_id(course_ids[0]).display_name == 'Changed Name'
+
     def test_mongo_course_overview_generation(self):
         """
         Tests that course_overview can be generated for old Mongo course.
@@ -0,0 +1,253 @@
+"""
+Caching of CourseOutlineData, for get_course_outline.
+
+Outlines are cached by course key, published version and the time the outline
+was last replaced, so that a cached outline never outlives the outline it was
+built from, even if an outline is replaced without a new published version:
+
+* Each process keeps the most recently used outlines in a size-bounded LRU
+  cache. Outlines are immutable, so the same object is handed to every caller.
+* The django cache holds a compact form of each outline (tuples of strings,
+  booleans and ints, with no UsageKeys or attrs classes), which is much smaller
+  and quicker to unpickle than the outline itself, for the other processes.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from ..data import (
+    CourseLearningSequenceData,
+    CourseOutlineData,
+    CourseSectionData,
+    CourseVisibility,
+    ExamData,
+    VisibilityData,
+)
+
+CACHE_KEY_PREFIX = "learning_sequences.api.get_course_outline.v3"
+
+# Bump this when the compact form of outlines changes.
+COMPACT_FORMAT_VERSION = 1
+
+
+class CourseOutlineCache:
+    """
+    A two-tier cache of CourseOutlineData: a size-bounded LRU cache in the
+    process, in front of the django cache.
+
+    The process cache holds up to LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE
+    outlines, and is disabled if that is 0. Compact outlines are kept in the
+    django cache for LEARNING_SEQUENCES_OUTLINE_CACHE_TIMEOUT seconds.
+    """
+    def __init__(self):
+        self._outlines = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE', 0)
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'LEARNING_SEQUENCES_OUTLINE_CACHE_TIMEOUT', 86400)
+
+    @staticmethod
+    def cache_key(learning_context):
+        """
+        Returns the cache key of the outline of the given LearningContext.
+        """
+        return "{}.{}.{}.{}".format(
+            CACHE_KEY_PREFIX,
+            learning_context.context_key,
+            learning_context.published_version,
+            learning_context.modified.timestamp(),
+        )
+
+    def get(self, learning_context):
+        """
+        Returns the cached outline of the given LearningContext, or None.
+        """
+        cache_key = self.cache_key(learning_context)
+        with self._lock:
+            outline = self._outlines.get(cache_key)
+            if outline is not None:
+                self._outlines.move_to_end(cache_key)
+                return outline
+
+        compact_outline = cache.get(cache_key)
+        if compact_outline is None or compact_outline[0] != COMPACT_FORMAT_VERSION:
+            return None
+        outline = from_compact(compact_outline)
+        self._remember(cache_key, outline)
+        return outline
+
+    def set(self, learning_context, outline):
+        """
+        Caches the outline of the given LearningContext.
+        """
+        cache_key = self.cache_key(learning_context)
+        self._remember(cache_key, outline)
+        cache.set(cache_key, to_compact(outline), self.timeout)
+
+    def invalidate(self, course_key):
+        """
+        Drops the outlines of the given course from the process cache.
+
+        The outlines in the django cache are keyed by the time they were
+        replaced, so they are never read again once replaced.
+        """
+        with self._lock:
+            for cache_key in [key for key, outline in self._outlines.items() if outline.course_key == course_key]:
+                del self._outlines[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._outlines.clear()
+
+    def _remember(self, cache_key, outline):
+        """
+        Adds the outline to the process cache, evicting the least recently
+        used outlines beyond its size.
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+        with self._lock:
+            self._outlines[cache_key] = outline
+            self._outlines.move_to_end(cache_key)
+            while len(self._outlines) > max_size:
+                self._outlines.popitem(last=False)
+
+
+COURSE_OUTLINE_CACHE = CourseOutlineCache()
+
+
+def to_compact(outline: CourseOutlineData) -> tuple:
+    """
+    Returns the compact form of the given outline.
+
+    Usage keys are reduced to their block type and block id, within the
+    course of the outline. Identical strings are shared, so that pickle
+    stores each of them once.
+    """
+    strings = {}
+
+    def intern(string):
+        return strings.setdefault(string, string)
+
+    def compact_user_partition_groups(user_partition_groups):
+        return tuple(
+            (partition_id, tuple(sorted(group_ids)))
+            for partition_id, group_ids in sorted(user_partition_groups.items())
+        )
+
+    return (
+        COMPACT_FORMAT_VERSION,
+        str(outline.course_key),
+        outline.title,
+        outline.published_at,
+        outline.published_version,
+        outline.days_early_for_beta,
+        outline.self_paced,
+        outline.course_visibility.value,
+        outline.entrance_exam_id,
+        tuple(
+            (
+                intern(section.usage_key.block_type),
+                section.usage_key.block_id,
+                section.title,
+                section.visibility.hide_from_toc,
+                section.visibility.visible_to_staff_only,
+                compact_user_partition_groups(section.user_partition_groups),
+                tuple(
+                    (
+                        intern(sequence.usage_key.block_type),
+                        sequence.usage_key.block_id,
+                        sequence.title,
+                        sequence.visibility.hide_from_toc,
+                        sequence.visibility.visible_to_staff_only,
+                        sequence.exam.is_practice_exam,
+                        sequence.exam.is_proctored_enabled,
+                        sequence.exam.is_time_limited,
+                        sequence.inaccessible_after_due,
+                        compact_user_partition_groups(sequence.user_partition_groups),
+                    )
+                    for sequence in section.sequences
+                ),
+            )
+            for section in outline.sections
+        ),
+    )
+
+
+def from_compact(compact_outline: tuple) -> CourseOutlineData:
+    """
+    Returns the outline of the given compact form, as made by to_compact.
+    """
+    (
+        _format_version, course_key, title, published_at, published_version, days_early_for_beta,
+        self_paced, course_visibility, entrance_exam_id, compact_sections,
+    ) = compact_outline
+    course_key = CourseKey.from_string(course_key)
+
+    # Few combinations of these flags are used, and the data is immutable, so
+    # their instances are shared.
+    visibilities = {}
+    exams = {}
+
+    def visibility(hide_from_toc, visible_to_staff_only):
+        flags = (hide_from_toc, visible_to_staff_only)
+        if flags not in visibilities:
+            visibilities[flags] = VisibilityData(*flags)
+        return visibilities[flags]
+
+    def exam(is_practice_exam, is_proctored_enabled, is_time_limited):
+        flags = (is_practice_exam, is_proctored_enabled, is_time_limited)
+        if flags not in exams:
+            exams[flags] = ExamData(*flags)
+        return exams[flags]
+
+    def user_partition_groups(compact_user_partition_groups):
+        return {
+            partition_id: frozenset(group_ids)
+            for partition_id, group_ids in compact_user_partition_groups
+        }
+
+    sections = [
+        CourseSectionData(
+            usage_key=course_key.make_usage_key(block_type, block_id),
+            title=section_title,
+            visibility=visibility(hide_from_toc, visible_to_staff_only),
+            user_partition_groups=user_partition_groups(compact_section_groups),
+            sequences=[
+                CourseLearningSequenceData(
+                    usage_key=course_key.make_usage_key(sequence[0], sequence[1]),
+                    title=sequence[2],
+                    visibility=visibility(sequence[3], sequence[4]),
+                    exam=exam(sequence[5], sequence[6], sequence[7]),
+                    inaccessible_after_due=sequence[8],
+                    user_partition_groups=user_partition_groups(sequence[9]),
+                )
+                for sequence in compact_sequences
+            ],
+        )
+        for (
+            block_type, block_id, section_title, hide_from_toc, visible_to_staff_only,
+            compact_section_groups, compact_sequences,
+        ) in compact_sections
+    ]
+
+    return CourseOutlineData(
+        course_key=course_key,
+        title=title,
+        published_at=published_at,
+        published_version=published_version,
+        days_early_for_beta=days_early_for_beta,
+        sections=sections,
+        self_paced=self_paced,
+        course_visibility=CourseVisibility(course_visibility),
+        entrance_exam_id=entrance_exam_id,
+    )
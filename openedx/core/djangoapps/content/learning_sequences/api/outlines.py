@@ -4,18 +4,22 @@ directly. Use openedx.core.djangoapps.content.learning_sequences.api -- that
 __init__.py imports from here, and is a more stable place to import from.
 """
 import logging
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, FrozenSet, List, Optional, Union  # noqa: UP035
 
-from django.db import transaction
+import crum
+from django.conf import settings
+from django.db import connections, transaction
 from django.db.models.query import QuerySet
-from edx_django_utils.cache import TieredCache
 from edx_django_utils.monitoring import function_trace, set_custom_attribute
 from opaque_keys import OpaqueKey
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 
+from common.djangoapps.student.models import CourseEnrollment
 from openedx.core import types
 from openedx.core.djangoapps.content.learning_sequences.api.processors.team_partition_groups import (
     TeamPartitionGroupsOutlineProcessor,
@@ -43,7 +47,9 @@ from ..models import (
     PublishReport,
     UserPartitionGroup,
 )
+from .outline_cache import COURSE_OUTLINE_CACHE
 from .permissions import can_see_all_content
+from .processors.base import OutlineProcessor
 from .processors.cohort_partition_groups import CohortPartitionGroupsOutlineProcessor
 from .processors.content_gating import ContentGatingOutlineProcessor
 from .processors.enrollment import EnrollmentOutlineProcessor
@@ -62,11 +68,29 @@ __all__ = [
     'get_course_outline',
     'get_user_course_outline',
     'get_user_course_outline_details',
+    'get_user_course_outlines',
     'key_supports_outlines',
     'replace_course_outline',
 ]
 
 
+# These are processors that alter which sequences are visible to students.
+# For instance, certain sequences that are intentionally hidden or not yet
+# released. These do not need to be run for staff users. This is where we
+# would add in pluggability for OutlineProcessors down the road.
+_OUTLINE_PROCESSOR_CLASSES = [
+    ('content_gating', ContentGatingOutlineProcessor),
+    ('milestones', MilestonesOutlineProcessor),
+    ('schedule', ScheduleOutlineProcessor),
+    ('special_exams', SpecialExamsOutlineProcessor),
+    ('visibility', VisibilityOutlineProcessor),
+    ('enrollment', EnrollmentOutlineProcessor),
+    ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
+    ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
+    ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
+]
+
+
 def key_supports_outlines(opaque_key: OpaqueKey) -> bool:
     """
     Does this key-type support outlines?
@@ -117,12 +141,9 @@ def get_course_outline(course_key: CourseKey) -> CourseOutlineData:
     course_context = _get_course_context_for_outline(course_key)
 
     # Check to see if it's in the cache.
-    cache_key = "learning_sequences.api.get_course_outline.v2.{}.{}".format(  # noqa: UP032
-        course_context.learning_context.context_key, course_context.learning_context.published_version
-    )
-    outline_cache_result = TieredCache.get_cached_response(cache_key)
-    if outline_cache_result.is_found:
-        return outline_cache_result.value
+    cached_outline = COURSE_OUTLINE_CACHE.get(course_context.learning_context)
+    if cached_outline is not None:
+        return cached_outline
 
     # Fetch model data, and remember that empty Sections should still be
     # represented (so query CourseSection explicitly instead of relying only on
@@ -194,7 +215,7 @@ def get_course_outline(course_key: CourseKey) -> CourseOutlineData:
         self_paced=course_context.self_paced,
         course_visibility=CourseVisibility(course_context.course_visibility),
     )
-    TieredCache.set_all_tiers(cache_key, outline_data, 300)
+    COURSE_OUTLINE_CACHE.set(course_context.learning_context, outline_data)
 
     return outline_data
 
@@ -302,6 +323,44 @@ def get_user_course_outline_details(course_key: CourseKey,
     )
 
 
+@function_trace('learning_sequences.api.get_user_course_outlines')
+def get_user_course_outlines(course_key: CourseKey,
+                             users: List[types.User],  # noqa: UP006
+                             at_time: datetime) -> List[UserCourseOutlineData]:  # noqa: UP006
+    """
+    Get the outlines customized for each of many users at a particular time.
+
+    Returns a list of the UserCourseOutlineData of each of the given users, in
+    the same order, each identical to what get_user_course_outline returns for
+    that user. The outline processors load the data of all users together,
+    with set-based queries where they can, so this is much cheaper than
+    calling get_user_course_outline for each user.
+    """
+    set_custom_attribute('learning_sequences.api.num_users', len(users))
+    full_course_outline = get_course_outline(course_key)
+
+    # Several processors check enrollments, so fetch them all up front.
+    CourseEnrollment.bulk_fetch_enrollment_states(
+        [user for user in users if not user.is_anonymous], course_key
+    )
+
+    processors_by_name = {}
+    for name, processor_cls in _OUTLINE_PROCESSOR_CLASSES:
+        processors_by_name[name] = [processor_cls(course_key, user, at_time) for user in users]
+        with function_trace(f'learning_sequences.api.outline_processors.{name}.load_data_for_users'):
+            processor_cls.load_data_for_users(processors_by_name[name], full_course_outline)
+
+    return [
+        _build_user_course_outline(
+            full_course_outline,
+            user,
+            at_time,
+            {name: processors[index] for name, processors in processors_by_name.items()},
+        )
+        for index, user in enumerate(users)
+    ]
+
+
 def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: disable=missing-function-docstring
                                             user: types.User,
                                             at_time: datetime):
@@ -319,36 +378,32 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
     set_custom_attribute('learning_sequences.api.user_id', user.id)
 
     full_course_outline = get_course_outline(course_key)
-    user_can_see_all_content = can_see_all_content(user, course_key)
-
-    # These are processors that alter which sequences are visible to students.
-    # For instance, certain sequences that are intentionally hidden or not yet
-    # released. These do not need to be run for staff users. This is where we
-    # would add in pluggability for OutlineProcessors down the road.
-    processor_classes = [
-        ('content_gating', ContentGatingOutlineProcessor),
-        ('milestones', MilestonesOutlineProcessor),
-        ('schedule', ScheduleOutlineProcessor),
-        ('special_exams', SpecialExamsOutlineProcessor),
-        ('visibility', VisibilityOutlineProcessor),
-        ('enrollment', EnrollmentOutlineProcessor),
-        ('enrollment_track_partitions', EnrollmentTrackPartitionGroupsOutlineProcessor),
-        ('cohorts_partitions', CohortPartitionGroupsOutlineProcessor),
-        ('teams_partitions', TeamPartitionGroupsOutlineProcessor),
-    ]
 
-    # Run each OutlineProcessor in order to figure out what items we have to
-    # remove from the CourseOutline.
-    processors = {}
+    # Run each OutlineProcessor to figure out what items we have to remove
+    # from the CourseOutline. Their data loading doesn't rely on a particular
+    # ordering, so it may run concurrently.
+    processors = {
+        name: processor_cls(course_key, user, at_time)
+        for name, processor_cls in _OUTLINE_PROCESSOR_CLASSES
+    }
+    _load_processors_data(processors, full_course_outline)
+
+    user_course_outline = _build_user_course_outline(full_course_outline, user, at_time, processors)
+    return user_course_outline, processors
+
+
+def _build_user_course_outline(full_course_outline: CourseOutlineData,
+                               user: types.User,
+                               at_time: datetime,
+                               processors: Dict[str, OutlineProcessor]) -> UserCourseOutlineData:  # noqa: UP006
+    """
+    Build the outline of the given user from the full course outline and the
+    user's outline processors, which have loaded their data.
+    """
     usage_keys_to_remove = set()
     inaccessible_sequences = set()
-    for name, processor_cls in processor_classes:
-        # Future optimization: This should be parallelizable (don't rely on a
-        # particular ordering).
-        processor = processor_cls(course_key, user, at_time)
-        processors[name] = processor
-        processor.load_data(full_course_outline)
-        if not user_can_see_all_content:
+    if not can_see_all_content(user, full_course_outline.course_key):
+        for name, processor in processors.items():
             # function_trace lets us see how expensive each processor is being.
             with function_trace(f'learning_sequences.api.outline_processors.{name}'):
                 processor_usage_keys_removed = processor.usage_keys_to_remove(full_course_outline)
@@ -360,7 +415,7 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
     trimmed_course_outline = full_course_outline.remove(usage_keys_to_remove)
     accessible_sequences = frozenset(set(trimmed_course_outline.sequences) - inaccessible_sequences)
 
-    user_course_outline = UserCourseOutlineData(
+    return UserCourseOutlineData(
         base_outline=full_course_outline,
         user=user,
         at_time=at_time,
@@ -381,7 +436,50 @@ def _get_user_course_outline_and_processors(course_key: CourseKey,  # pylint: di
         }
     )
 
-    return user_course_outline, processors
+
+def _load_processors_data(processors: Dict[str, OutlineProcessor],  # noqa: UP006
+                          full_course_outline: CourseOutlineData):
+    """
+    Run load_data on each of the given OutlineProcessors (keyed by name), and
+    record how long each took as a custom attribute.
+
+    If LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS is set, the processors
+    load their data concurrently in a pool of threads. Each thread opens its
+    own database connections, which can't see the writes of a transaction in
+    progress, so the processors always run in this thread inside one.
+    """
+    max_workers = getattr(settings, 'LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS', 0)
+    if max_workers and len(processors) > 1 and not transaction.get_connection().in_atomic_block:
+        request = crum.get_current_request()
+
+        def load_data_in_thread(processor):
+            # Waffle flags and other request-scoped lookups need the current request.
+            crum.set_current_request(request)
+            try:
+                return _timed_load_data(processor, full_course_outline)
+            finally:
+                crum.set_current_request(None)
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(processors))) as executor:
+            durations = dict(zip(processors, executor.map(load_data_in_thread, processors.values())))
+    else:
+        durations = {
+            name: _timed_load_data(processor, full_course_outline)
+            for name, processor in processors.items()
+        }
+
+    for name, duration in durations.items():
+        set_custom_attribute(f'learning_sequences.api.outline_processors.{name}.load_data_ms', round(duration * 1000))
+
+
+def _timed_load_data(processor: OutlineProcessor, full_course_outline: CourseOutlineData) -> float:
+    """
+    Run load_data on the given OutlineProcessor, returning how long it took in seconds.
+    """
+    start = time.perf_counter()
+    processor.load_data(full_course_outline)
+    return time.perf_counter() - start
 
 
 @function_trace('learning_sequences.api.replace_course_outline')
@@ -414,6 +512,9 @@ def replace_course_outline(course_outline: CourseOutlineData,
         _update_course_section_sequences(course_outline, course_context)
         _update_publish_report(course_outline, content_errors, course_context)
 
+    # The new outline is cached under a new key when it's first read.
+    COURSE_OUTLINE_CACHE.invalidate(course_outline.course_key)
+
 
 def _update_course_context(course_outline: CourseOutlineData):
     """
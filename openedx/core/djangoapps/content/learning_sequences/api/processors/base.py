@@ -4,6 +4,7 @@ of adding new logic that manipulates the Course Outline for a given student.
 """
 import logging
 from datetime import datetime
+from typing import List  # noqa: UP035
 
 from opaque_keys.edx.keys import CourseKey  # pylint: disable=unused-import
 
@@ -24,12 +25,14 @@ class OutlineProcessor:
     An OutlineProcessor is invoked synchronously during a request for the
     CourseOutline. The steps are:
         * __init__
-        * load_data
+        * load_data (or load_data_for_users, when outlines for many users
+          are requested at once)
         * inaccessible_sequences, usage_keys_to_remove (no ordering guarantee)
 
     Also note that you should not assume any ordering relative to any other
-    OutlineProcessor. Once async support works its way fully into Django, we'll
-    likely even want to run these in parallel.
+    OutlineProcessor. If LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS is set,
+    the load_data of each processor runs in parallel in a thread of its own,
+    where the current request is set but the request cache starts out empty.
 
     Some outline processors (like ScheduleOutlineProcessor) may choose to have
     additional methods to return specific metadata to feed into
@@ -62,6 +65,21 @@ class OutlineProcessor:
         """
         pass  # pylint: disable=unnecessary-pass
 
+    @classmethod
+    def load_data_for_users(cls, processors: List['OutlineProcessor'],  # noqa: UP006
+                            full_course_outline: CourseOutlineData):
+        """
+        Run load_data on each of the given processors of this class, which are
+        for the same course and time but for different users.
+
+        By default this calls load_data on each processor in turn. Override it
+        to load the data of all users with set-based queries instead, leaving
+        each processor in the same state load_data would have. The same rules
+        as for load_data apply.
+        """
+        for processor in processors:
+            processor.load_data(full_course_outline)
+
     def inaccessible_sequences(self, full_course_outline: CourseOutlineData):  # pylint: disable=unused-argument
         """
         Return a set/frozenset of Sequence UsageKeys that are not accessible.
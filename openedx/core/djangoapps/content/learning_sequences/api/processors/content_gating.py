@@ -39,6 +39,25 @@ class ContentGatingOutlineProcessor(OutlineProcessor):
                 self.user, self.course_key
             )
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline):
+        """
+        Get the required content for the course for each user, and which users
+        can skip the entrance exam, with one query for the latter.
+        """
+        if not processors:
+            return
+        course_key = processors[0].course_key
+        authenticated_users = [processor.user for processor in processors if processor.user.is_authenticated]
+        can_skip_user_ids = EntranceExamConfiguration.user_ids_can_skip_entrance_exam(
+            authenticated_users, course_key
+        ) if authenticated_users else set()
+
+        for processor in processors:
+            processor.required_content = milestones_helpers.get_required_content(course_key, processor.user)
+            if processor.user.is_authenticated:
+                processor.can_skip_entrance_exam = processor.user.id in can_skip_user_ids
+
     def inaccessible_sequences(self, full_course_outline):
         """
         Mark any section that is gated by required content as inaccessible
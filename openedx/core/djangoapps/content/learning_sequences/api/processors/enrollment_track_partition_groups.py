@@ -49,6 +49,25 @@ class EnrollmentTrackPartitionGroupsOutlineProcessor(OutlineProcessor):
         # TODO: fix type annotation: https://github.com/openedx/tcril-engineering/issues/313
         self.user_group = self.enrollment_track_groups.get(ENROLLMENT_TRACK_PARTITION_ID)  # type: ignore
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline) -> None:
+        """
+        Pull the track groups for this course once, and which group each user is in.
+        """
+        if not processors:
+            return
+
+        course_key = processors[0].course_key
+        user_partition = create_enrollment_track_partition_with_course_id(course_key)
+        for processor in processors:
+            processor.enrollment_track_groups = get_user_partition_groups(
+                course_key,
+                [user_partition],
+                processor.user,
+                partition_dict_key='id'
+            )
+            processor.user_group = processor.enrollment_track_groups.get(ENROLLMENT_TRACK_PARTITION_ID)  # type: ignore
+
     def _is_user_excluded_by_partition_group(self, user_partition_groups):
         """
         Is the user part of the group to which the block is restricting content?
@@ -18,6 +18,19 @@ class MilestonesOutlineProcessor(OutlineProcessor):
     This does not include Entrance Exams (see `ContentGatingOutlineProcessor`),
     or Special Exams (see `SpecialExamsOutlineProcessor`)
     """
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline):
+        """
+        If no content in the course requires milestones, no user has pending
+        milestones, so cache that for all users at once.
+        """
+        if not processors:
+            return
+        milestones_helpers.bulk_cache_course_content_milestones(
+            str(processors[0].course_key),
+            [processor.user.id for processor in processors if processor.user.is_authenticated],
+        )
+
     def inaccessible_sequences(self, full_course_outline):
         """
         Returns the set of sequence usage keys for which the
@@ -9,7 +9,7 @@ from edx_when.api import get_dates_for_course
 from opaque_keys.edx.keys import CourseKey, UsageKey  # pylint: disable=unused-import
 
 from common.djangoapps.student.auth import user_has_role
-from common.djangoapps.student.roles import CourseBetaTesterRole
+from common.djangoapps.student.roles import BulkRoleCache, CourseBetaTesterRole
 from openedx.core import types
 
 from ...data import ScheduleData, ScheduleItemData, UserCourseOutlineData
@@ -62,6 +62,23 @@ class ScheduleOutlineProcessor(OutlineProcessor):
         self._course_end = self.keys_to_schedule_fields[course_usage_key].get('end')
         self._is_beta_tester = user_has_role(self.user, CourseBetaTesterRole(self.course_key))
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline):
+        """
+        Load the course roles of all users with one query before checking
+        which of them are beta testers.
+
+        edx-when has no API for the dates of many users, so the dates are
+        still loaded with get_dates_for_course for each user.
+        """
+        if not processors:
+            return
+        BulkRoleCache.prefetch(
+            [processor.user for processor in processors if processor.user.is_active],
+            course_keys=[processors[0].course_key],
+        )
+        super().load_data_for_users(processors, full_course_outline)
+
     def inaccessible_sequences(self, full_course_outline):
         """
         This might include Sequences that have not yet started, or Sequences
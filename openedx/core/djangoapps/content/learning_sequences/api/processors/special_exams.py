@@ -36,6 +36,23 @@ class SpecialExamsOutlineProcessor(OutlineProcessor):
         Check if special exams are enabled
         """
         self.special_exams_enabled = settings.ENABLE_SPECIAL_EXAMS  # pylint: disable=attribute-defined-outside-init
+        self.exams_ida_enabled = exams_ida_enabled(self.course_key)  # pylint: disable=attribute-defined-outside-init
+
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline):
+        """
+        Check if special exams are enabled once for all users.
+
+        The exam attempts are still fetched from edx-proctoring for each user
+        in exam_data, as it has no API for the attempts of many users.
+        """
+        if not processors:
+            return
+        special_exams_enabled = settings.ENABLE_SPECIAL_EXAMS
+        course_exams_ida_enabled = exams_ida_enabled(processors[0].course_key)
+        for processor in processors:
+            processor.special_exams_enabled = special_exams_enabled
+            processor.exams_ida_enabled = course_exams_ida_enabled
 
     def exam_data(self, pruned_course_outline: UserCourseOutlineData) -> SpecialExamAttemptData:
         """
@@ -82,7 +99,7 @@ class SpecialExamsOutlineProcessor(OutlineProcessor):
         special_exam_attempt_context = None
 
         # if exams waffle flag enabled, get exam type internally
-        if exams_ida_enabled(course_key):
+        if self.exams_ida_enabled:
             # add short description based on exam type
             if is_practice_exam:
                 exam_type = _('Practice Exam')
@@ -48,6 +48,24 @@ class TeamPartitionGroupsOutlineProcessor(OutlineProcessor):
             partition_dict_key="id",
         )
 
+    @classmethod
+    def load_data_for_users(cls, processors, full_course_outline) -> None:
+        """
+        Pull the team groups for this course once, and which group each user is in.
+        """
+        if not processors or not CONTENT_GROUPS_FOR_TEAMS.is_enabled(processors[0].course_key):
+            return
+
+        course_key = processors[0].course_key
+        user_partitions = create_team_set_partitions_with_course_id(course_key)
+        for processor in processors:
+            processor.current_user_groups = get_user_partition_groups(
+                course_key,
+                user_partitions,
+                processor.user,
+                partition_dict_key="id",
+            )
+
     def _is_user_excluded_by_partition_group(self, user_partition_groups):
         """
         Is the user part of the group to which the block is restricting content?
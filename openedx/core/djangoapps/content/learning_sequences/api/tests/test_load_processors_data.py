@@ -0,0 +1,87 @@
+"""
+Tests for how the data of OutlineProcessors is loaded, serially or in threads.
+"""
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import crum
+from django.test import override_settings
+from opaque_keys.edx.keys import CourseKey
+
+from ..outlines import _load_processors_data
+from ..processors.base import OutlineProcessor
+
+
+class RecordingOutlineProcessor(OutlineProcessor):
+    """
+    Records the thread and the current request its data was loaded in.
+    """
+    def load_data(self, full_course_outline):
+        self.thread = threading.current_thread()
+        self.request = crum.get_current_request()
+
+
+class FailingOutlineProcessor(OutlineProcessor):
+    def load_data(self, full_course_outline):
+        raise ValueError('load_data failed')
+
+
+@patch('openedx.core.djangoapps.content.learning_sequences.api.outlines.set_custom_attribute')
+class LoadProcessorsDataTestCase(unittest.TestCase):
+    """
+    Test _load_processors_data, which runs load_data on every OutlineProcessor.
+    """
+    def setUp(self):
+        super().setUp()
+        course_key = CourseKey.from_string("course-v1:edX+LoadData+2021")
+        at_time = datetime(2021, 5, 1, tzinfo=timezone.utc)
+        self.processors = {
+            name: RecordingOutlineProcessor(course_key, MagicMock(), at_time)
+            for name in ('first', 'second', 'third')
+        }
+        self.request = MagicMock()
+        crum.set_current_request(self.request)
+        self.addCleanup(crum.set_current_request, None)
+
+    def assert_load_data_timed(self, mock_set_custom_attribute):
+        assert [args[0] for args, _ in mock_set_custom_attribute.call_args_list] == [
+            f'learning_sequences.api.outline_processors.{name}.load_data_ms' for name in self.processors
+        ]
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS=0)
+    def test_serial(self, mock_set_custom_attribute):
+        _load_processors_data(self.processors, MagicMock())
+
+        for processor in self.processors.values():
+            assert processor.thread is threading.current_thread()
+            assert processor.request is self.request
+        self.assert_load_data_timed(mock_set_custom_attribute)
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS=3)
+    def test_threads(self, mock_set_custom_attribute):
+        _load_processors_data(self.processors, MagicMock())
+
+        for processor in self.processors.values():
+            assert processor.thread is not threading.current_thread()
+            assert processor.request is self.request
+        self.assert_load_data_timed(mock_set_custom_attribute)
+        assert crum.get_current_request() is self.request
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS=3)
+    def test_serial_in_transaction(self, mock_set_custom_attribute):  # pylint: disable=unused-argument
+        with patch('openedx.core.djangoapps.content.learning_sequences.api.outlines.transaction') as mock_transaction:
+            mock_transaction.get_connection.return_value.in_atomic_block = True
+            _load_processors_data(self.processors, MagicMock())
+
+        for processor in self.processors.values():
+            assert processor.thread is threading.current_thread()
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS=3)
+    def test_thread_errors_raised(self, mock_set_custom_attribute):  # pylint: disable=unused-argument
+        processor = self.processors['first']
+        self.processors['second'] = FailingOutlineProcessor(processor.course_key, processor.user, processor.at_time)
+
+        with self.assertRaisesRegex(ValueError, 'load_data failed'):
+            _load_processors_data(self.processors, MagicMock())
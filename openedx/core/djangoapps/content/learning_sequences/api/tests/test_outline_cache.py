@@ -0,0 +1,128 @@
+"""
+Tests for the caching of course outlines.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import TestCase
+
+import attr
+from django.core.cache import cache
+from django.test import override_settings
+from opaque_keys.edx.keys import CourseKey
+
+from ...data import CourseOutlineData, CourseVisibility, ExamData, VisibilityData
+from ..outline_cache import CourseOutlineCache, from_compact, to_compact
+from .test_data import generate_sections
+
+
+def make_outline(course_key, published_version="5ebece4b69dd593d82fe2014"):
+    """
+    Returns an outline of the given course, with exams, hidden content and user partition groups.
+    """
+    sections = generate_sections(course_key, [3, 0, 2])
+    first_section = sections[0]
+    sections[0] = attr.evolve(
+        first_section,
+        user_partition_groups={50: frozenset([1, 2])},
+        sequences=[
+            attr.evolve(
+                first_section.sequences[0],
+                exam=ExamData(is_time_limited=True, is_proctored_enabled=True),
+                inaccessible_after_due=True,
+            ),
+            attr.evolve(
+                first_section.sequences[1],
+                visibility=VisibilityData(visible_to_staff_only=True),
+                user_partition_groups={51: frozenset([3]), 50: frozenset([2])},
+            ),
+            first_section.sequences[2],
+        ]
+    )
+    return CourseOutlineData(
+        course_key=course_key,
+        title="Cached Course",
+        published_at=datetime(2020, 5, 19, tzinfo=timezone.utc),
+        published_version=published_version,
+        entrance_exam_id=str(course_key.make_usage_key('chapter', 'ch_1')),
+        days_early_for_beta=2,
+        sections=sections,
+        self_paced=True,
+        course_visibility=CourseVisibility.PUBLIC_OUTLINE,
+    )
+
+
+def make_learning_context(outline, modified=datetime(2020, 5, 20, tzinfo=timezone.utc)):
+    return SimpleNamespace(
+        context_key=outline.course_key, published_version=outline.published_version, modified=modified,
+    )
+
+
+class CompactOutlineTestCase(TestCase):
+    """
+    Test the compact form of outlines that is stored in the django cache.
+    """
+    def test_round_trip(self):
+        outline = make_outline(CourseKey.from_string("course-v1:OpenEdX+Cache+TestRun"))
+        assert from_compact(to_compact(outline)) == outline
+
+    def test_ccx_round_trip(self):
+        outline = make_outline(CourseKey.from_string("ccx-v1:OpenEdX+Cache+TestRun+ccx@1"))
+        assert from_compact(to_compact(outline)) == outline
+
+
+class CourseOutlineCacheTestCase(TestCase):
+    """
+    Test the process and django cache tiers of CourseOutlineCache.
+    """
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.outline_cache = CourseOutlineCache()
+        self.course_key = CourseKey.from_string("course-v1:OpenEdX+Cache+TestRun")
+        self.outline = make_outline(self.course_key)
+        self.learning_context = make_learning_context(self.outline)
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE=2)
+    def test_process_cache(self):
+        assert self.outline_cache.get(self.learning_context) is None
+
+        self.outline_cache.set(self.learning_context, self.outline)
+        assert self.outline_cache.get(self.learning_context) is self.outline
+
+        # Outlines replaced without a new version are cached separately.
+        replaced_context = make_learning_context(self.outline, modified=datetime(2020, 5, 21, tzinfo=timezone.utc))
+        assert self.outline_cache.get(replaced_context) is None
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE=2)
+    def test_lru(self):
+        outlines = [make_outline(self.course_key, published_version=f"version_{index}") for index in range(3)]
+        learning_contexts = [make_learning_context(outline) for outline in outlines]
+        for outline, learning_context in zip(outlines, learning_contexts):
+            self.outline_cache.set(learning_context, outline)
+
+        # The first outline was evicted from the process cache, so it comes
+        # from the django cache.
+        first_outline = self.outline_cache.get(learning_contexts[0])
+        assert first_outline is not outlines[0]
+        assert first_outline == outlines[0]
+        assert self.outline_cache.get(learning_contexts[2]) is outlines[2]
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE=0)
+    def test_process_cache_disabled(self):
+        self.outline_cache.set(self.learning_context, self.outline)
+
+        cached_outline = self.outline_cache.get(self.learning_context)
+        assert cached_outline is not self.outline
+        assert cached_outline == self.outline
+
+    @override_settings(LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE=2)
+    def test_invalidate(self):
+        other_outline = make_outline(CourseKey.from_string("course-v1:OpenEdX+Other+TestRun"))
+        other_learning_context = make_learning_context(other_outline)
+        self.outline_cache.set(self.learning_context, self.outline)
+        self.outline_cache.set(other_learning_context, other_outline)
+
+        self.outline_cache.invalidate(self.course_key)
+
+        assert self.outline_cache.get(self.learning_context) is not self.outline
+        assert self.outline_cache.get(other_learning_context) is other_outline
@@ -50,6 +50,7 @@ from ..outlines import (
     get_course_outline,
     get_user_course_outline,
     get_user_course_outline_details,
+    get_user_course_outlines,
     key_supports_outlines,
     replace_course_outline,
 )
@@ -156,6 +157,17 @@ class CourseOutlineTestCase(CacheIsolationTestCase):
             uncached_new_version_outline = get_course_outline(self.course_key)  # pylint: disable=unused-variable  # noqa: F841
             assert new_version_outline == new_version_outline  # pylint: disable=comparison-with-itself
 
+    def test_replaced_without_new_version(self):
+        replace_course_outline(self.course_outline)
+        assert get_course_outline(self.course_key) == self.course_outline
+
+        # Replacing the outline without a new published version (e.g. when
+        # the outline is regenerated) must not serve the old cached outline.
+        retitled_outline = attr.evolve(self.course_outline, title="Retitled Course")
+        replace_course_outline(retitled_outline)
+        with self.assertNumQueries(5):
+            assert get_course_outline(self.course_key) == retitled_outline
+
 
 class UserCourseOutlineTestCase(CacheIsolationTestCase):
     """
@@ -682,6 +694,19 @@ class ScheduleTestCase(OutlineProcessorTestCase):
         assert len(student_details.outline.sequences) == 5
         assert len(beta_tester_details.outline.sequences) == 5
 
+    def test_course_beta_access_for_users(self):
+        course_outline = attr.evolve(self.outline, days_early_for_beta=6)
+        replace_course_outline(course_outline)
+        at_time = datetime(2020, 5, 9, tzinfo=timezone.utc)  # noqa: UP017
+
+        staff_outline, student_outline, beta_tester_outline = get_user_course_outlines(
+            self.course_key, [self.global_staff, self.student, self.beta_tester], at_time
+        )
+        assert len(staff_outline.accessible_sequences) == 5
+        assert len(student_outline.accessible_sequences) == 0
+        assert len(beta_tester_outline.accessible_sequences) == 4
+        assert beta_tester_outline == get_user_course_outline(self.course_key, self.beta_tester, at_time)
+
     def test_before_section_starts(self):
         staff_details, student_details, beta_tester_details = self.get_details(
             datetime(2020, 5, 14, tzinfo=timezone.utc)  # noqa: UP017
@@ -1204,6 +1229,7 @@ class VisbilityTestCase(OutlineProcessorTestCase):
         assert self.normal_in_normal_key in student_details.outline.sequences
 
 
+@ddt.ddt
 class SequentialVisibilityTestCase(CacheIsolationTestCase):
     """
     Tests sequentials visibility under different course visibility settings i.e public, public_outline, private
@@ -1320,6 +1346,22 @@ class SequentialVisibilityTestCase(CacheIsolationTestCase):
                     assert all(is_sequence_accessible),\
                         'Sequences should be accessible to enrolled, staff users for a public_outline course'
 
+    @ddt.data(CourseVisibility.PUBLIC, CourseVisibility.PUBLIC_OUTLINE, CourseVisibility.PRIVATE)
+    @override_waffle_flag(COURSE_ENABLE_UNENROLLED_ACCESS_FLAG, active=True)
+    def test_outlines_for_users(self, course_visibility):
+        """
+        Test that the outlines of many users at once are the same as their outlines one by one.
+        """
+        course_outline = attr.evolve(self.course_outline, course_visibility=course_visibility)
+        replace_course_outline(course_outline)
+
+        user_course_outlines = get_user_course_outlines(self.course_key, self.all_users, self.course_access_time)
+
+        assert len(user_course_outlines) == len(self.all_users)
+        for user, user_course_outline in zip(self.all_users, user_course_outlines):
+            with self.subTest(user=user):
+                assert user_course_outline == get_user_course_outline(self.course_key, user, self.course_access_time)
+
 
 @ddt.ddt
 class EnrollmentTrackPartitionGroupsTestCase(OutlineProcessorTestCase):  # pylint: disable=missing-class-docstring
@@ -1577,6 +1619,10 @@ class EnrollmentTrackPartitionGroupsTestCase(OutlineProcessorTestCase):  # pylin
             learner_details = get_user_course_outline_details(self.course_key, learner_to_verify, check_date)
             assert len(learner_details.outline.accessible_sequences) == expected_values_dict[learner_to_verify.username]
 
+        learner_outlines = get_user_course_outlines(self.course_key, learners_to_verify, check_date)
+        for learner_to_verify, learner_outline in zip(learners_to_verify, learner_outlines):
+            assert learner_outline == get_user_course_outline(self.course_key, learner_to_verify, check_date)
+
     @ddt.data(
         (
             None,
@@ -1905,6 +1951,10 @@ class CohortPartitionGroupsTestCase(OutlineProcessorTestCase):
             learner_details = get_user_course_outline_details(self.course_key, learner_to_verify, check_date)
             assert len(learner_details.outline.accessible_sequences) == expected_values_dict[learner_to_verify.username]
 
+        learner_outlines = get_user_course_outlines(self.course_key, learners_to_verify, check_date)
+        for learner_to_verify, learner_outline in zip(learners_to_verify, learner_outlines):
+            assert learner_outline == get_user_course_outline(self.course_key, learner_to_verify, check_date)
+
 
 class ContentErrorTestCase(CacheIsolationTestCase):
     """Test error collection and reporting."""
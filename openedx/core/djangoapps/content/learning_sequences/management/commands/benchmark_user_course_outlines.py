@@ -0,0 +1,172 @@
+"""
+Command to compare computing learners' course outlines one by one and in bulk.
+"""
+
+
+import time
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.locator import CourseLocator
+
+from common.djangoapps.student.models import CourseEnrollment
+
+from ...api import get_course_outline, get_user_course_outline, get_user_course_outlines, replace_course_outline
+from ...data import (
+    CourseLearningSequenceData,
+    CourseOutlineData,
+    CourseSectionData,
+    CourseVisibility,
+    VisibilityData,
+)
+from ...models import LearningContext
+
+COURSE_KEY = CourseLocator('edX', 'BenchmarkUserCourseOutlines', 'run')
+USERNAME_PREFIX = 'benchmark_user_course_outlines_'
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Creates the outline of a synthetic course and a number of learners,
+    nine in ten of them enrolled, and reports the time taken and the
+    database queries made to compute their outlines with
+    get_user_course_outline for each learner and with a single call of
+    get_user_course_outlines, checking that both give the same outlines.
+
+    get_user_course_outline is only called for the first --sample
+    learners, as it is much slower.  The outline, learners and
+    enrollments are deleted afterwards.
+
+    Example usage:
+        $ ./manage.py lms benchmark_user_course_outlines --num_users 10000 --settings=devstack
+    """
+    help = 'Compares the time and queries of computing many learners\' course outlines one by one and in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--num_users',
+            help='Number of learners whose outlines are computed in bulk.',
+            default=10000,
+            type=int,
+        )
+        parser.add_argument(
+            '--sample',
+            help='Number of learners whose outlines are also computed one by one.',
+            default=1000,
+            type=int,
+        )
+        parser.add_argument(
+            '--sections',
+            help='Number of sections in the synthetic course.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--sequences',
+            help='Number of sequences in each section.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        if LearningContext.objects.filter(context_key=COURSE_KEY).exists():
+            raise CommandError(f'{COURSE_KEY} already has an outline. Delete it before running the benchmark again.')
+
+        try:
+            replace_course_outline(self._course_outline(options['sections'], options['sequences']))
+            users = self._create_users(options['num_users'])
+            at_time = datetime.now(timezone.utc)
+            # Leave the course outline itself out of both measurements.
+            get_course_outline(COURSE_KEY)
+
+            sample = users[:options['sample']]
+            RequestCache.clear_all_namespaces()
+            with CaptureQueriesContext(connection) as one_by_one_queries:
+                start = time.perf_counter()
+                one_by_one_outlines = [get_user_course_outline(COURSE_KEY, user, at_time) for user in sample]
+                one_by_one_time = time.perf_counter() - start
+
+            RequestCache.clear_all_namespaces()
+            with CaptureQueriesContext(connection) as bulk_queries:
+                start = time.perf_counter()
+                bulk_outlines = get_user_course_outlines(COURSE_KEY, users, at_time)
+                bulk_time = time.perf_counter() - start
+
+            if bulk_outlines[:len(sample)] != one_by_one_outlines:
+                raise CommandError('The outlines computed in bulk differ from the ones computed one by one.')
+        finally:
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+            LearningContext.objects.filter(context_key=COURSE_KEY).delete()
+
+        self.stdout.write(f'{len(users)} learners, {options["sections"] * options["sequences"]} sequences')
+        self.stdout.write(f'{"approach":<16}{"learners":>10}{"ms":>12}{"ms/learner":>12}{"queries":>10}')
+        for approach, num_users, elapsed, queries in (
+            ('one_by_one', len(sample), one_by_one_time, one_by_one_queries),
+            ('bulk', len(users), bulk_time, bulk_queries),
+        ):
+            self.stdout.write('{:<16}{:>10}{:>12.0f}{:>12.3f}{:>10}'.format(  # noqa: UP032
+                approach, num_users, elapsed * 1000, elapsed * 1000 / max(num_users, 1), len(queries),
+            ))
+        # edx-when and edx-proctoring have no APIs for many learners at once.
+        self.stdout.write(
+            'Still loaded for each learner in bulk: dates (edx-when get_dates_for_course) and, in courses '
+            'with special exams, exam attempts (edx-proctoring get_attempt_status_summary).'
+        )
+
+    @staticmethod
+    def _course_outline(num_sections, num_sequences):
+        """
+        Returns the outline of the synthetic course, in which every fourth
+        sequence is visible to staff only.
+        """
+        sections = []
+        for section_index in range(num_sections):
+            sequences = [
+                CourseLearningSequenceData(
+                    usage_key=COURSE_KEY.make_usage_key('sequential', f'sequential_{section_index}_{sequence_index}'),
+                    title=f'Sequence {section_index}.{sequence_index}',
+                    visibility=VisibilityData(visible_to_staff_only=sequence_index % 4 == 3),
+                )
+                for sequence_index in range(num_sequences)
+            ]
+            sections.append(CourseSectionData(
+                usage_key=COURSE_KEY.make_usage_key('chapter', f'chapter_{section_index}'),
+                title=f'Section {section_index}',
+                sequences=sequences,
+            ))
+
+        return CourseOutlineData(
+            course_key=COURSE_KEY,
+            title='Benchmark User Course Outlines',
+            published_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            published_version='5ebece4b69dd593d82fe2020',
+            entrance_exam_id=None,
+            days_early_for_beta=None,
+            sections=sections,
+            self_paced=True,
+            course_visibility=CourseVisibility.PRIVATE,
+        )
+
+    @staticmethod
+    def _create_users(num_users):
+        """
+        Creates the learners and enrolls nine in ten of them, returning the learners.
+        """
+        User.objects.bulk_create(
+            [User(username=f'{USERNAME_PREFIX}{index}', email=f'{USERNAME_PREFIX}{index}@example.com')
+             for index in range(num_users)],
+            batch_size=1000,
+        )
+        users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('id'))
+        CourseEnrollment.objects.bulk_create(
+            [CourseEnrollment(user=user, course_id=COURSE_KEY, mode='audit', is_active=True)
+             for index, user in enumerate(users) if index % 10],
+            batch_size=1000,
+        )
+        return users
@@ -0,0 +1,33 @@
+"""
+Tests for the benchmark_user_course_outlines management command.
+"""
+
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ....models import LearningContext
+from ..benchmark_user_course_outlines import COURSE_KEY, USERNAME_PREFIX
+
+
+class TestBenchmarkUserCourseOutlines(TestCase):
+    """
+    Tests the benchmark_user_course_outlines management command.
+    """
+    def test_benchmark(self):
+        out = StringIO()
+        call_command(
+            'benchmark_user_course_outlines',
+            '--num_users', '12', '--sample', '5', '--sections', '2', '--sequences', '4',
+            stdout=out,
+        )
+        output = out.getvalue()
+
+        assert '12 learners, 8 sequences' in output
+        assert '\none_by_one ' in output
+        assert '\nbulk ' in output
+        assert not get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).exists()
+        assert not LearningContext.objects.filter(context_key=COURSE_KEY).exists()
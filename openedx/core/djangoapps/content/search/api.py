@@ -5,14 +5,17 @@ Content index and search API using Meilisearch
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from typing import Callable, Generator, cast  # noqa: UP035
 
 from attrs import define
+from django import db
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
@@ -77,6 +80,7 @@ LOCK_EXPIRE = 24 * 60 * 60  # Lock expires in 24 hours
 
 MAX_ACCESS_IDS_IN_FILTER = 1_000
 MAX_ORGS_IN_FILTER = 1_000
+MAX_TASKS_IN_FILTER = 1_000
 
 EXCLUDED_XBLOCK_TYPES = ["course", "course_info"]
 
@@ -176,6 +180,35 @@ def _wait_for_meili_task(info: TaskInfo) -> None:
         raise MeilisearchError(err_reason)
 
 
+def _wait_for_meili_tasks(infos: list[TaskInfo]) -> None:
+    """
+    Wait for several Meilisearch tasks to complete, raising an error if any of them failed.
+
+    As Meilisearch processes tasks in the order they were added, this waits for the last
+    task only, then looks for failures among the others with one request per
+    MAX_TASKS_IN_FILTER tasks, rather than waiting for each task in turn.
+    """
+    if not infos:
+        return
+    client = _get_meilisearch_client()
+    *earlier_infos, last_info = infos
+    _wait_for_meili_task(last_info)
+    uids = [str(info.task_uid) for info in earlier_infos]
+    for start in range(0, len(uids), MAX_TASKS_IN_FILTER):
+        batch_uids = uids[start:start + MAX_TASKS_IN_FILTER]
+        failed_tasks = client.get_tasks({
+            "uids": batch_uids,
+            "statuses": ["failed", "canceled"],
+            "limit": len(batch_uids),
+        })
+        for task in failed_tasks.results:
+            try:
+                err_reason = task.error["message"]
+            except (TypeError, KeyError):
+                err_reason = "Unknown error"
+            raise MeilisearchError(err_reason)
+
+
 def _index_exists(index_name: str) -> bool:
     """
     Check if an index exists
@@ -543,9 +576,13 @@ def index_course(
     course_key: CourseKey,
     index_name: str | None = None,
     status_cb: Callable[[str], None] | None = None,
+    tasks: list[TaskInfo] | None = None,
 ) -> list[dict]:
     """
     Rebuilds the index for a given course.
+
+    If a list of tasks is given, the Meilisearch task that adds the documents is
+    appended to it instead of being waited for.
     """
     store = modulestore()
     client = _get_meilisearch_client()
@@ -574,26 +611,73 @@ def index_course(
 
     if docs:
         # Add all the docs in this course at once (usually faster than adding one at a time):
-        _wait_for_meili_task(client.index(index_name).add_documents(docs))
+        task = client.index(index_name).add_documents(docs)
+        if tasks is None:
+            _wait_for_meili_task(task)
+        else:
+            tasks.append(task)
     return docs
 
 
+def _call_in_worker_thread(fn: Callable, *args) -> None:
+    """
+    Call fn in a thread of the rebuild worker pool.
+    """
+    try:
+        fn(*args)
+    finally:
+        # Each worker thread opens its own database connections, which would otherwise stay open.
+        if threading.current_thread() is not threading.main_thread():
+            db.connections.close_all()
+
+
+def _run_in_parallel(fn: Callable, calls: list[tuple], workers: int) -> None:
+    """
+    Call fn with each of the tuples of arguments in calls, with up to `workers` calls at a time.
+
+    If a call raises an exception, the calls that haven't started are cancelled and the
+    exception is raised.
+    """
+    if workers <= 1:
+        for args in calls:
+            fn(*args)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meilisearch-rebuild") as executor:
+        futures = [executor.submit(_call_in_worker_thread, fn, *args) for args in calls]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
 def rebuild_index(  # pylint: disable=too-many-statements
-    status_cb: Callable[[str], None] | None = None, incremental=False
+    status_cb: Callable[[str], None] | None = None, incremental=False, workers: int | None = None
 ) -> None:
     """
     Rebuild the Meilisearch index from scratch
+
+    Courses and libraries are indexed by up to `workers` threads at a time
+    (MEILISEARCH_REBUILD_WORKERS by default). The documents of each course or library
+    are submitted without waiting for each batch to be indexed, then its Meilisearch
+    tasks are waited for at once. With incremental=True, each course or library is
+    recorded in IncrementalIndexCompleted once its documents are indexed, so that an
+    interrupted rebuild resumes where it stopped.
     """
     if status_cb is None:
         status_cb = log.info
+    if workers is None:
+        workers = getattr(settings, "MEILISEARCH_REBUILD_WORKERS", 1)
 
     client = _get_meilisearch_client()
 
     # Get the lists of libraries
     status_cb("Counting libraries...")
-    keys_indexed = []
+    keys_indexed = set()
     if incremental:
-        keys_indexed = list(IncrementalIndexCompleted.objects.values_list("context_key", flat=True))
+        keys_indexed = set(IncrementalIndexCompleted.objects.values_list("context_key", flat=True))
         if keys_indexed:
             status_cb(f"Resuming incremental index - {len(keys_indexed)} courses/libraries already indexed.")
     lib_keys = [
@@ -612,6 +696,13 @@ def rebuild_index(  # pylint: disable=too-many-statements
     num_contexts = num_courses + num_libraries + num_libs_skipped
     num_contexts_done = 0 + num_libs_skipped  # How many courses/libraries we've indexed
     num_blocks_done = 0  # How many individual components/XBlocks we've indexed
+    progress_lock = threading.Lock()
+
+    def context_done(num_blocks: int) -> None:
+        nonlocal num_contexts_done, num_blocks_done
+        with progress_lock:
+            num_contexts_done += 1
+            num_blocks_done += num_blocks
 
     status_cb(f"Found {num_courses} courses, {num_libraries} libraries.")
     with _using_temp_index(status_cb) if not incremental else nullcontext(STUDIO_INDEX_NAME) as index_name:
@@ -626,7 +717,7 @@ def rebuild_index(  # pylint: disable=too-many-statements
         ############## Libraries ##############
         status_cb("Indexing libraries...")
 
-        def index_library(lib_key: LibraryLocatorV2) -> list:
+        def index_library(lib_key: LibraryLocatorV2, tasks: list[TaskInfo]) -> list:
             docs = []
             for component in lib_api.get_library_components(lib_key):
                 try:
@@ -642,13 +733,13 @@ def rebuild_index(  # pylint: disable=too-many-statements
             if docs:
                 try:
                     # Add all the docs in this library at once (usually faster than adding one at a time):
-                    _wait_for_meili_task(client.index(index_name).add_documents(docs))
+                    tasks.append(client.index(index_name).add_documents(docs))
                 except (TypeError, KeyError, MeilisearchError) as err:
                     status_cb(f"Error indexing library {lib_key}: {err}")
             return docs
 
         ############## Collections ##############
-        def index_collection_batch(batch, num_done, library_key) -> int:
+        def index_collection_batch(batch, num_done, library_key, page, tasks: list[TaskInfo]) -> int:
             docs = []
             for collection in batch:
                 try:
@@ -663,13 +754,13 @@ def rebuild_index(  # pylint: disable=too-many-statements
             if docs:
                 try:
                     # Add docs in batch of 100 at once (usually faster than adding one at a time):
-                    _wait_for_meili_task(client.index(index_name).add_documents(docs))
+                    tasks.append(client.index(index_name).add_documents(docs))
                 except (TypeError, KeyError, MeilisearchError) as err:
-                    status_cb(f"Error indexing collection batch {p}: {err}")
+                    status_cb(f"Error indexing collection batch {page}: {err}")
             return num_done
 
         ############## Containers ##############
-        def index_container_batch(batch, num_done, library_key) -> int:
+        def index_container_batch(batch, num_done, library_key, page, tasks: list[TaskInfo]) -> int:
             docs = []
             for container in batch:
                 try:
@@ -694,15 +785,18 @@ def rebuild_index(  # pylint: disable=too-many-statements
             if docs:
                 try:
                     # Add docs in batch of 100 at once (usually faster than adding one at a time):
-                    _wait_for_meili_task(client.index(index_name).add_documents(docs))
+                    tasks.append(client.index(index_name).add_documents(docs))
                 except (TypeError, KeyError, MeilisearchError) as err:
-                    status_cb(f"Error indexing container batch {p}: {err}")
+                    status_cb(f"Error indexing container batch {page}: {err}")
             return num_done
 
-        for lib_key in lib_keys:
-            status_cb(f"{num_contexts_done + 1}/{num_contexts}. Now indexing blocks in library {lib_key}")
-            lib_docs = index_library(lib_key)
-            num_blocks_done += len(lib_docs)
+        def index_library_context(lib_key: LibraryLocatorV2, position: int) -> None:
+            """
+            Index the blocks, collections and containers of a library, then wait for them to be indexed.
+            """
+            status_cb(f"{position}/{num_contexts}. Now indexing blocks in library {lib_key}")
+            tasks: list[TaskInfo] = []
+            lib_docs = index_library(lib_key, tasks)
 
             # To reduce memory usage on large instances, split up the Collections into pages of 100 collections:
             library = lib_api.get_library(lib_key)
@@ -717,6 +811,8 @@ def rebuild_index(  # pylint: disable=too-many-statements
                     paginator.page(p).object_list,
                     num_collections_done,
                     lib_key,
+                    p,
+                    tasks,
                 )
             status_cb(f"Indexed {num_collections_done}/{num_collections} collections in library {lib_key}")
 
@@ -732,33 +828,57 @@ def rebuild_index(  # pylint: disable=too-many-statements
                     paginator.page(p).object_list,
                     num_containers_done,
                     lib_key,
+                    p,
+                    tasks,
                 )
                 status_cb(f"Indexed {num_containers_done}/{num_containers} containers in library {lib_key}")
 
-            # Mark this library as indexed:
-            if incremental:
-                IncrementalIndexCompleted.objects.get_or_create(context_key=lib_key)
+            try:
+                _wait_for_meili_tasks(tasks)
+            except MeilisearchError as err:
+                # The library isn't marked as indexed, so that an incremental rebuild retries it.
+                status_cb(f"Error indexing library {lib_key}: {err}")
+            else:
+                # Mark this library as indexed:
+                if incremental:
+                    IncrementalIndexCompleted.objects.get_or_create(context_key=lib_key)
 
-            num_contexts_done += 1
+            context_done(len(lib_docs))
+
+        _run_in_parallel(
+            index_library_context,
+            [(lib_key, num_libs_skipped + position) for position, lib_key in enumerate(lib_keys, start=1)],
+            workers,
+        )
 
         ############## Courses ##############
         status_cb("Indexing courses...")
-        # To reduce memory usage on large instances, split up the CourseOverviews into pages of 1,000 courses:
 
+        def index_course_context(course: CourseOverview, position: int) -> None:
+            """
+            Index the blocks of a course, then wait for them to be indexed.
+            """
+            status_cb(f"{position}/{num_contexts}. Now indexing course {course.display_name} ({course.id})")
+            tasks: list[TaskInfo] = []
+            course_docs = index_course(course.id, index_name, status_cb, tasks=tasks)
+            _wait_for_meili_tasks(tasks)
+            if incremental:
+                IncrementalIndexCompleted.objects.get_or_create(context_key=course.id)
+            context_done(len(course_docs))
+
+        # To reduce memory usage on large instances, split up the CourseOverviews into pages of 1,000 courses:
         paginator = Paginator(CourseOverview.objects.only("id", "display_name").order_by("-created", "id"), 1000)
+        position = num_contexts_done
         for p in paginator.page_range:
+            calls = []
             for course in paginator.page(p).object_list:
-                status_cb(
-                    f"{num_contexts_done + 1}/{num_contexts}. Now indexing course {course.display_name} ({course.id})"
-                )
+                position += 1
                 if course.id in keys_indexed:
-                    num_contexts_done += 1
+                    status_cb(f"{position}/{num_contexts}. Skipping course {course.display_name} ({course.id})")
+                    context_done(0)
                     continue
-                course_docs = index_course(course.id, index_name, status_cb)
-                if incremental:
-                    IncrementalIndexCompleted.objects.get_or_create(context_key=course.id)
-                num_contexts_done += 1
-                num_blocks_done += len(course_docs)
+                calls.append((course, position))
+            _run_in_parallel(index_course_context, calls, workers)
 
     IncrementalIndexCompleted.objects.all().delete()
     status_cb(f"Done! {num_blocks_done} blocks indexed across {num_contexts_done} courses, collections and libraries.")
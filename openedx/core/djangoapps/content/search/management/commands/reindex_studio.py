@@ -37,11 +37,20 @@ class Command(BaseCommand):
     ./manage.py cms shell -c 'IncrementalIndexCompleted.objects.all().delete()'
 
     This will delete all the IncrementalIndexCompleted records and will help in restarting the index population.
+
+    Use --workers to index several courses and libraries at a time, instead of
+    MEILISEARCH_REBUILD_WORKERS.
     """
 
     help = "Add all course and library content to the Studio search index."
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of courses and libraries indexed at a time. Defaults to MEILISEARCH_REBUILD_WORKERS.",
+        )
         # Removed flags — provide clear error messages for operators with old automation.
         parser.add_argument(
             "--experimental",
@@ -97,7 +106,10 @@ class Command(BaseCommand):
                 "reindex_studio is now a stable command, so the flag is no longer necessary."
             )
 
-        result = rebuild_index_incremental.delay()
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        task_kwargs = {"workers": options["workers"]} if options["workers"] is not None else {}
+        result = rebuild_index_incremental.delay(**task_kwargs)
 
         if settings.CELERY_ALWAYS_EAGER:
             self.stdout.write("Indexing complete!")
@@ -193,20 +193,21 @@ def delete_course_index_docs(course_key_str: str) -> None:
     retry_backoff=True,
 )
 @set_code_owner_attribute
-def rebuild_index_incremental() -> None:
+def rebuild_index_incremental(workers: int | None = None) -> None:
     """
     Celery task to incrementally populate the Studio Meilisearch index.
 
     Uses IncrementalIndexCompleted to track progress and resume from where
     it left off if interrupted. Safe to call multiple times — already-indexed
-    contexts are skipped.
+    contexts are skipped. Courses and libraries are indexed by up to `workers`
+    threads at a time (MEILISEARCH_REBUILD_WORKERS by default).
 
     If a rebuild is already in progress (lock held), the task exits gracefully.
     """
     log.info("Starting incremental Studio search index population...")
 
     try:
-        api.rebuild_index(status_cb=log.info, incremental=True)
+        api.rebuild_index(status_cb=log.info, incremental=True, workers=workers)
     except RuntimeError as exc:
         # rebuild_index -> _using_temp_index or lock contention
         if "already in progress" in str(exc).lower():
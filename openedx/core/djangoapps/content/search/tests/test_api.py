@@ -4,7 +4,9 @@ Tests for the Studio content search API.
 from __future__ import annotations
 
 import copy
+from concurrent.futures import Future
 from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, call, patch
 
 import ddt
@@ -42,6 +44,65 @@ EMPTY_TAGS = {
 }
 
 
+class MeilisearchIndexStandIn:
+    """
+    A stand-in for a Meilisearch index and its task queue, which keeps the documents
+    added to it, and fails the tasks that add a document whose id is in `failing_ids`.
+    """
+
+    def __init__(self, failing_ids=()):
+        self.failing_ids = set(failing_ids)
+        self.documents = {}
+        self.tasks = []
+
+    def add_documents(self, docs):
+        failed = any(doc["id"] in self.failing_ids for doc in docs)
+        if not failed:
+            self.documents.update((doc["id"], doc) for doc in docs)
+        task = SimpleNamespace(
+            uid=len(self.tasks),
+            status="failed" if failed else "succeeded",
+            error={"message": "Document rejected"} if failed else None,
+        )
+        self.tasks.append(task)
+        return SimpleNamespace(task_uid=task.uid)
+
+    def get_tasks(self, parameters):
+        uids = {int(uid) for uid in parameters["uids"]}
+        return SimpleNamespace(results=[
+            task for task in self.tasks if task.uid in uids and task.status in parameters["statuses"]
+        ])
+
+
+class SynchronousExecutor:
+    """
+    A stand-in for ThreadPoolExecutor that runs the calls submitted to it at once, in the
+    calling thread, since the test database is not visible to other threads.
+    """
+    submitted = 0
+
+    def __init__(self, max_workers, thread_name_prefix=""):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        SynchronousExecutor.submitted += 1
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as err:  # pylint: disable=broad-except
+            future.set_exception(err)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
 @ddt.ddt
 @skip_unless_cms
 @patch("openedx.core.djangoapps.content.search.api._wait_for_meili_task", new=MagicMock(return_value=None))
@@ -445,6 +506,57 @@ class TestSearchApi(ModuleStoreTestCase):
         # one missing course indexed
         assert mock_meilisearch.return_value.index.return_value.add_documents.call_count == 8
 
+    def _use_index_stand_in(self, mock_meilisearch, failing_ids=()) -> MeilisearchIndexStandIn:
+        index = MeilisearchIndexStandIn(failing_ids)
+        mock_meilisearch.return_value.index.return_value = index
+        mock_meilisearch.return_value.get_tasks.reset_mock()
+        mock_meilisearch.return_value.get_tasks.side_effect = index.get_tasks
+        return index
+
+    @override_settings(MEILISEARCH_ENABLED=True)
+    @patch("openedx.core.djangoapps.content.search.api.ThreadPoolExecutor", SynchronousExecutor)
+    def test_reindex_meilisearch_parallel(self, mock_meilisearch) -> None:
+        SynchronousExecutor.submitted = 0
+        sequential_index = self._use_index_stand_in(mock_meilisearch)
+        api.rebuild_index(incremental=True, workers=1)
+        assert SynchronousExecutor.submitted == 0
+
+        parallel_index = self._use_index_stand_in(mock_meilisearch)
+        api.rebuild_index(incremental=True, workers=4)
+
+        # The library and the course are each indexed by a worker.
+        assert SynchronousExecutor.submitted == 2
+        assert parallel_index.documents == sequential_index.documents
+        assert {self.doc_sequential["id"], self.doc_problem1["id"], self.collection_dict["id"]} <= set(
+            parallel_index.documents
+        )
+        # The earlier tasks of the library were checked for failures with a single request.
+        assert mock_meilisearch.return_value.get_tasks.call_count == 1
+        assert IncrementalIndexCompleted.objects.count() == 0
+
+    @override_settings(MEILISEARCH_ENABLED=True)
+    def test_reindex_meilisearch_failed_task_resumes(self, mock_meilisearch) -> None:
+        index = self._use_index_stand_in(mock_meilisearch, failing_ids=[self.collection_dict["id"]])
+
+        def simulated_interruption(message):
+            if "Indexing courses" in message:
+                raise Exception("Simulated interruption")
+
+        mock_logger = Mock(side_effect=simulated_interruption)
+        with pytest.raises(Exception, match="Simulated interruption"):
+            api.rebuild_index(mock_logger, incremental=True)
+
+        # The library isn't recorded as indexed, since one of its tasks failed.
+        mock_logger.assert_any_call(
+            f"Error indexing library {self.library.key}: MeilisearchError. Error message: Document rejected"
+        )
+        assert IncrementalIndexCompleted.objects.count() == 0
+
+        index.failing_ids.clear()
+        api.rebuild_index(incremental=True)
+        assert self.collection_dict["id"] in index.documents
+        assert self.doc_sequential["id"] in index.documents
+
     @override_settings(MEILISEARCH_ENABLED=True)
     def test_reset_meilisearch_index(self, mock_meilisearch) -> None:
         api.reset_index()
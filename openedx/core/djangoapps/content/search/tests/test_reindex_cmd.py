@@ -33,6 +33,20 @@ class TestReindexStudioCommand(TestCase):
 
         mock_delay.assert_called_once_with()
 
+    @patch("openedx.core.djangoapps.content.search.tasks.rebuild_index_incremental.delay")
+    def test_workers(self, mock_delay):
+        """Command passes the number of workers to the task."""
+        mock_delay.return_value = Mock(id="fake-task-id")
+
+        call_command("reindex_studio", "--workers", "4")
+
+        mock_delay.assert_called_once_with(workers=4)
+
+    def test_invalid_workers(self):
+        """Command raises error when the number of workers is less than 1."""
+        with pytest.raises(CommandError, match="at least 1"):
+            call_command("reindex_studio", "--workers", "0")
+
     @override_settings(MEILISEARCH_ENABLED=False)
     def test_disabled(self):
         """Command raises error when Meilisearch is disabled."""
@@ -71,6 +85,14 @@ class TestRebuildIndexIncrementalTask(TestCase):
         _, kwargs = mock_rebuild.call_args
         assert kwargs["incremental"] is True
 
+    @patch("openedx.core.djangoapps.content.search.api.rebuild_index")
+    def test_workers(self, mock_rebuild, mock_meilisearch):
+        """Task passes the number of workers to api.rebuild_index."""
+        rebuild_index_incremental(workers=3)
+
+        _, kwargs = mock_rebuild.call_args
+        assert kwargs["workers"] == 3
+
     @patch("openedx.core.djangoapps.content.search.api.rebuild_index")
     def test_rebuild_already_in_progress(self, mock_rebuild, mock_meilisearch):
         """Task exits gracefully if rebuild lock is already held."""
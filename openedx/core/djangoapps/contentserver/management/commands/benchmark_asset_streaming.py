@@ -0,0 +1,147 @@
+"""
+Command to compare the throughput of serving course assets buffered and streamed.
+"""
+
+
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse, StreamingHttpResponse
+from opaque_keys.edx.locator import CourseLocator
+
+from xmodule.contentstore.content import StaticContentStream
+
+from ...views import STREAMING_CHUNK_SIZE, closing_content, multipart_byteranges
+
+# The default size of GridFS chunks.
+GRIDFS_CHUNK_SIZE = 255 * 1024
+
+
+class LocalGridOut:
+    """
+    A stand-in for a GridFS file (GridOut), which keeps its chunks in memory and,
+    like GridOut, copies data out of as many chunks as a read spans.
+    """
+    def __init__(self, data, chunk_size=GRIDFS_CHUNK_SIZE):
+        self.length = len(data)
+        self._chunk_size = chunk_size
+        self._chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+        self._position = 0
+
+    def seek(self, position):
+        self._position = position
+
+    def read(self, size=-1):
+        """
+        Reads up to size bytes from the current position, or all the remaining bytes if size is negative.
+        """
+        remaining = self.length - self._position
+        size = remaining if size < 0 else min(size, remaining)
+        pieces = []
+        while size > 0:
+            chunk_index, offset = divmod(self._position, self._chunk_size)
+            piece = self._chunks[chunk_index][offset:offset + size]
+            pieces.append(piece)
+            self._position += len(piece)
+            size -= len(piece)
+        return b''.join(pieces)
+
+    def close(self):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Serves a synthetic asset from a local GridFS stand-in, in full and as a
+    multipart response to a request for many ranges, and reports the
+    throughput and the peak memory allocated of each approach:
+
+    * buffered: the whole asset is read in 1KB pieces into an HttpResponse,
+      as assets used to be served.
+    * streamed: the asset is streamed in STREAMING_CHUNK_SIZE pieces with a
+      StreamingHttpResponse, as process_request serves assets that aren't cached.
+    * multipart: --ranges ranges spread over the asset are streamed as a
+      multipart/byteranges response.
+
+    Example usage:
+        $ ./manage.py lms benchmark_asset_streaming --size_mb 64 --settings=devstack
+    """
+    help = 'Compares the throughput of serving course assets buffered and streamed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size_mb',
+            help='Size of the synthetic asset, in MB.',
+            default=64,
+            type=int,
+        )
+        parser.add_argument(
+            '--ranges',
+            help='Number of ranges requested in the multipart response.',
+            default=16,
+            type=int,
+        )
+        parser.add_argument(
+            '--repeat',
+            help='Number of times each approach is timed; the best time is reported.',
+            default=3,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        data = bytes(range(256)) * (options['size_mb'] * 4096)
+        location = CourseLocator('edX', 'BenchmarkAssetStreaming', 'run').make_asset_key('asset', 'asset.bin')
+
+        def content():
+            return StaticContentStream(
+                location, 'asset.bin', 'application/octet-stream', LocalGridOut(data), length=len(data),
+            )
+
+        range_length = len(data) // (2 * max(options['ranges'], 1))
+        ranges = [
+            (start, start + range_length - 1)
+            for start in range(0, len(data), 2 * range_length)
+        ][:options['ranges']]
+
+        def buffered():
+            return HttpResponse(content().stream_data())
+
+        def streamed():
+            streamed_content = content()
+            return StreamingHttpResponse(
+                closing_content(streamed_content, streamed_content.stream_data(chunk_size=STREAMING_CHUNK_SIZE))
+            )
+
+        def multipart():
+            streamed_content = content()
+            parts, _length = multipart_byteranges(streamed_content, ranges, 'benchmark')
+            return StreamingHttpResponse(closing_content(streamed_content, parts))
+
+        self.stdout.write(f'{len(data)} bytes, {len(ranges)} ranges of {range_length} bytes')
+        self.stdout.write(f'{"approach":<12}{"bytes":>14}{"ms":>10}{"MB/s":>10}{"peak MB":>10}')
+        for approach, make_response in (('buffered', buffered), ('streamed', streamed), ('multipart', multipart)):
+            elapsed, peak, sent = min(
+                self._serve(make_response) for _ in range(max(options['repeat'], 1))
+            )
+            self.stdout.write('{:<12}{:>14}{:>10.0f}{:>10.0f}{:>10.1f}'.format(  # noqa: UP032
+                approach, sent, elapsed * 1000, sent / max(elapsed, 1e-9) / 2 ** 20, peak / 2 ** 20,
+            ))
+
+    @staticmethod
+    def _serve(make_response):
+        """
+        Makes a response and sends its content nowhere, as a WSGI server would, returning the
+        time taken, the peak memory allocated meanwhile and the number of bytes sent.
+        """
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = make_response()
+        sent = 0
+        for chunk in response:
+            sent += len(chunk)
+        response.close()
+        elapsed = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak, sent
@@ -0,0 +1,43 @@
+"""
+Tests for the benchmark_asset_streaming management command.
+"""
+
+
+from io import StringIO
+from unittest import TestCase
+
+from django.core.management import call_command
+
+from ..benchmark_asset_streaming import LocalGridOut
+
+
+class TestLocalGridOut(TestCase):
+    """
+    Tests the GridFS stand-in of the benchmark.
+    """
+    def test_read(self):
+        data = bytes(range(256)) * 10
+        grid_out = LocalGridOut(data, chunk_size=100)
+
+        assert grid_out.read(50) == data[:50]
+        assert grid_out.read(120) == data[50:170]
+        grid_out.seek(2500)
+        assert grid_out.read(200) == data[2500:]
+        assert grid_out.read(10) == b''
+        grid_out.seek(0)
+        assert grid_out.read() == data
+
+
+class TestBenchmarkAssetStreaming(TestCase):
+    """
+    Tests the benchmark_asset_streaming management command.
+    """
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_asset_streaming', '--size_mb', '1', '--ranges', '4', '--repeat', '1', stdout=out)
+        lines = out.getvalue().splitlines()
+
+        assert lines[0] == '1048576 bytes, 4 ranges of 131072 bytes'
+        assert [line.split()[0] for line in lines[2:]] == ['buffered', 'streamed', 'multipart']
+        # Buffered and streamed responses send the whole asset.
+        assert [line.split()[1] for line in lines[2:4]] == ['1048576', '1048576']
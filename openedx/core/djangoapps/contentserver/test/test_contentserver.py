@@ -7,7 +7,7 @@ import copy
 import datetime
 import logging
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
 import ddt
@@ -322,17 +322,138 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
                                                                                length=self.length_unlocked)
         assert resp['Content-Length'] == str((last_byte - first_byte) + 1)
 
+    def get_full_content(self):
+        return self.client.get(self.url_unlocked).getvalue()
+
+    def assert_multipart_byteranges(self, resp, ranges):
+        """
+        Asserts that the response is a multipart/byteranges message with the given ranges of the unlocked asset.
+        """
+        full_resp = self.client.get(self.url_unlocked)
+        full_content = full_resp.getvalue()
+        assert resp.status_code == 206
+        assert 'Content-Range' not in resp
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        assert content_type == 'multipart/byteranges'
+
+        body = resp.getvalue()
+        assert resp['Content-Length'] == str(len(body))
+        expected_body = b''.join(
+            (
+                f'--{boundary}\r\n'
+                f'Content-Type: {full_resp["Content-Type"]}\r\n'
+                f'Content-Range: bytes {first}-{last}/{self.length_unlocked}\r\n'
+                '\r\n'
+            ).encode('utf-8') + full_content[first:last + 1] + b'\r\n'
+            for first, last in ranges
+        ) + f'--{boundary}--\r\n'.encode('utf-8')
+        assert body == expected_body
+
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with the content of each range.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(  # noqa: UP032
             first=first_byte, last=last_byte))
 
+        self.assert_multipart_byteranges(
+            resp, [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        )
+
+    def test_range_request_multiple_ranges_streamed(self):
+        """
+        Test that multiple ranges of an asset streamed from the contentstore outputs a multipart message.
+        """
+        with self.patch_streamed():
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, 20-29')
+
+        self.assert_multipart_byteranges(resp, [(0, 9), (20, 29)])
+
+    @ddt.data(
+        ('bytes=0-9, 5-19', (0, 19)),
+        ('bytes=20-29, 0-9, 10-19', (0, 29)),
+        ('bytes=0-9, 100000-', (0, 9)),
+    )
+    @ddt.unpack
+    def test_range_request_ranges_merged(self, header_value, expected_range):
+        """
+        Test that overlapping or adjacent ranges are merged, and unsatisfiable ranges ignored, in a single range.
+        """
+        first, last = expected_range
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE=header_value)
+
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes {first}-{last}/{self.length_unlocked}'
+        assert resp.getvalue() == self.get_full_content()[first:last + 1]
+
+    def test_range_request_multiple_ranges_unsatisfiable(self):
+        """
+        Test that a range request without any satisfiable range outputs 416 Requested Range Not Satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={length}-, 5-1'.format(  # noqa: UP032
+            length=self.length_unlocked))
+        assert resp.status_code == 416
+
+    @staticmethod
+    def patch_streamed():
+        """
+        Patches the views so that the asset isn't cached, and is streamed from the contentstore.
+        """
+        return patch.multiple(
+            views,
+            get_cached_content=Mock(return_value=None),
+            load_asset_from_location=Mock(side_effect=lambda location: AssetManager.find(location, as_stream=True)),
+        )
+
+    def test_full_content_streamed(self):
+        """
+        Test that an asset that isn't cached is streamed from the contentstore.
+        """
+        full_content = self.get_full_content()
+        with self.patch_streamed():
+            resp = self.client.get(self.url_unlocked)
+
+        assert resp.status_code == 200
+        assert resp.streaming
+        assert resp['Content-Length'] == str(self.length_unlocked)
+        assert resp.getvalue() == full_content
+
+    def test_range_request_streamed(self):
+        """
+        Test that a range of an asset that isn't cached is streamed from the contentstore.
+        """
+        full_content = self.get_full_content()
+        with self.patch_streamed():
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-')
+
+        assert resp.status_code == 206
+        assert resp.streaming
+        assert resp.getvalue() == full_content[10:]
+
+    def test_etag(self):
+        """
+        Test that the asset digest is sent as the ETag, and that a matching If-None-Match outputs 304 Not Modified.
+        """
+        etag = self.client.get(self.url_unlocked)['ETag']
+        content = AssetManager.find(self.unlocked_asset)
+        assert etag == f'"{content.content_digest}"'
+
+        for if_none_match in (etag, f'W/{etag}', f'"{FAKE_MD5_HASH}", {etag}', '*'):
+            resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=if_none_match)
+            assert resp.status_code == 304
+            assert resp['ETag'] == etag
+
+    def test_etag_not_matching(self):
+        """
+        Test that If-None-Match takes precedence over If-Modified-Since, and the asset is sent if it doesn't match.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH=f'"{FAKE_MD5_HASH}"', HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
         assert resp.status_code == 200
-        assert 'Content-Range' not in resp
         assert resp['Content-Length'] == str(self.length_unlocked)
 
     @ddt.data(
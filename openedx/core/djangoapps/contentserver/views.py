@@ -7,6 +7,7 @@ have 3 views as entry points.
 """
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
     HttpResponse,
@@ -15,7 +16,9 @@ from django.http import (
     HttpResponseNotFound,
     HttpResponseNotModified,
     HttpResponsePermanentRedirect,
+    StreamingHttpResponse,
 )
+from django.utils.http import parse_etags, quote_etag
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
 from opaque_keys import InvalidKeyError
@@ -26,7 +29,7 @@ from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -51,6 +54,11 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Assets that are streamed from GridFS are read in pieces of the size of its
+# chunks (255KB by default), so that each read is served from a single chunk
+# when the reads are aligned, and only that much of the asset is in memory at once.
+STREAMING_CHUNK_SIZE = 255 * 1024
+
 
 def is_asset_request(request):
     """Determines whether the given request is an asset request"""
@@ -85,11 +93,12 @@ def process_request(request):
         except (InvalidLocationError, InvalidKeyError):
             return HttpResponseBadRequest()
 
-        # Attempt to load the asset to make sure it exists, and grab the asset digest
-        # if we're able to load it.
+        # Attempt to load the asset's metadata to make sure it exists, and grab the asset
+        # digest if we're able to load it.  The content itself is only loaded once we know
+        # that it has to be sent.
         actual_digest = None
         try:
-            content = load_asset_from_location(loc)
+            content = load_asset_metadata(loc)
             actual_digest = getattr(content, "content_digest", None)
         except (ItemNotFoundError, NotFoundError):
             return HttpResponseNotFound()
@@ -124,13 +133,27 @@ def process_request(request):
             return HttpResponseForbidden('Unauthorized')
 
         # Figure out if the client sent us a conditional request, and let them know
-        # if this asset has changed since then.
+        # if this asset has changed since then.  If-None-Match takes precedence over
+        # If-Modified-Since when both are sent.
+        etag = get_etag(content)
         last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-        if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            if etag is not None and etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+        elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
             if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
             if if_modified_since == last_modified_at_str:
                 return HttpResponseNotModified()
 
+        # Now load the content, unless it was cached along with the metadata.
+        if content.data is None:
+            try:
+                content = load_asset_from_location(loc)
+            except (ItemNotFoundError, NotFoundError):
+                return HttpResponseNotFound()
+
         # *** File streaming within a byte range ***
         # If a Range is provided, parse Range attribute of the request
         # Add Content-Range in the response if Range is structurally correct
@@ -139,10 +162,6 @@ def process_request(request):
         # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
         response = None
         if request.META.get('HTTP_RANGE'):
-            # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-            if isinstance(content, StaticContent):
-                content = AssetManager.find(loc, as_stream=True)
-
             header_value = request.META['HTTP_RANGE']
             try:
                 unit, ranges = parse_range_header(header_value, content.length)
@@ -156,24 +175,34 @@ def process_request(request):
                 if unit != 'bytes':
                     # Only accept ranges in bytes
                     log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                elif len(ranges) > 1:
-                    # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                    # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                    # But we send back the full content.
-                    log.warning(
-                        "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
-                    )
                 else:
-                    first, last = ranges[0]
+                    # Unsatisfiable ranges are ignored as long as one range is satisfiable, and
+                    # overlapping ranges are merged, so that no byte is sent more than once.
+                    # https://www.rfc-editor.org/rfc/rfc7233#section-4.1
+                    ranges = merge_ranges(
+                        [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                    )
 
-                    if 0 <= first <= last < content.length:
-                        # If the byte range is satisfiable
-                        response = HttpResponse(content.stream_data_in_range(first, last))
+                    if len(ranges) == 1:
+                        first, last = ranges[0]
+                        response = StreamingHttpResponse(
+                            closing_content(content, content_range(content, first, last)), status=206
+                        )
                         response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(  # noqa: UP032
                             first=first, last=last, length=content.length
                         )
                         response['Content-Length'] = str(last - first + 1)
-                        response.status_code = 206  # Partial Content
+                        response['Content-Type'] = content.content_type
+
+                        set_custom_attribute('contentserver.ranged', True)
+                    elif ranges:
+                        # According to Http/1.1 spec content for multiple ranges is sent as a multipart message.
+                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                        boundary = uuid4().hex
+                        parts, length = multipart_byteranges(content, ranges, boundary)
+                        response = StreamingHttpResponse(closing_content(content, parts), status=206)
+                        response['Content-Length'] = str(length)
+                        response['Content-Type'] = f'multipart/byteranges; boundary={boundary}'
 
                         set_custom_attribute('contentserver.ranged', True)
                     else:
@@ -185,16 +214,23 @@ def process_request(request):
 
         # If Range header is absent or syntactically invalid return a full content response.
         if response is None:
-            response = HttpResponse(content.stream_data())
+            if isinstance(content, StaticContentStream):
+                response = StreamingHttpResponse(
+                    closing_content(content, content.stream_data(chunk_size=STREAMING_CHUNK_SIZE))
+                )
+            else:
+                response = HttpResponse(content.data)
             response['Content-Length'] = content.length
+            response['Content-Type'] = content.content_type
 
         set_custom_attribute('contentserver.content_len', content.length)
         set_custom_attribute('contentserver.content_type', content.content_type)
 
         # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
         response['Accept-Ranges'] = 'bytes'
-        response['Content-Type'] = content.content_type
         response['X-Frame-Options'] = 'ALLOW'
+        if etag is not None:
+            response['ETag'] = etag
 
         # Set any caching headers, and do any response cleanup needed.  Based on how much
         # middleware we have in place, there's no easy way to use the built-in Django
@@ -205,6 +241,94 @@ def process_request(request):
         return response
 
 
+def get_etag(content):
+    """
+    Returns the ETag of the given content, which is its digest, or None if it has no digest.
+    """
+    content_digest = getattr(content, "content_digest", None)
+    return quote_etag(content_digest) if content_digest else None
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Determines whether the given If-None-Match header value matches the given ETag.
+
+    If-None-Match uses the weak comparison function, so weak ETags match too.
+    """
+    def strip_weak(tag):
+        return tag[2:] if tag.startswith('W/') else tag
+
+    etags = parse_etags(if_none_match)
+    return '*' in etags or strip_weak(etag) in {strip_weak(tag) for tag in etags}
+
+
+def merge_ranges(ranges):
+    """
+    Returns the given list of (first, last) byte ranges, in order, with
+    overlapping and adjacent ranges merged.
+    """
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def content_range(content, first, last):
+    """
+    Returns an iterator over the bytes of the given content from first to last (included).
+
+    Content streamed from GridFS is read in pieces of STREAMING_CHUNK_SIZE bytes.
+    """
+    if isinstance(content, StaticContentStream):
+        return content.stream_data_in_range(first, last, chunk_size=STREAMING_CHUNK_SIZE)
+    return iter([content.data[first:last + 1]])
+
+
+def closing_content(content, chunks):
+    """
+    Yields the given chunks of the content, and closes the content's stream, if any,
+    once they are all sent or the response is closed.
+    """
+    try:
+        yield from chunks
+    finally:
+        if isinstance(content, StaticContentStream):
+            content.close()
+
+
+def multipart_byteranges(content, ranges, boundary):
+    """
+    Returns an iterator over the parts of a multipart/byteranges body with the given
+    (first, last) byte ranges of the content, and the length of that body.
+    """
+    part_headers = [
+        (
+            f'--{boundary}\r\n'
+            f'Content-Type: {content.content_type}\r\n'
+            f'Content-Range: bytes {first}-{last}/{content.length}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing_boundary = f'--{boundary}--\r\n'.encode('utf-8')
+    length = sum(
+        len(part_header) + (last - first + 1) + len(b'\r\n')
+        for part_header, (first, last) in zip(part_headers, ranges)
+    ) + len(closing_boundary)
+
+    def parts():
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            yield from content_range(content, first, last)
+            yield b'\r\n'
+        yield closing_boundary
+
+    return parts(), length
+
+
 def set_caching_headers(content, location, response):
     """
     Sets caching headers based on whether or not the asset is restricted.
@@ -324,6 +448,19 @@ def is_user_authorized(request, content, location):
     return True
 
 
+def load_asset_metadata(location):
+    """
+    Loads the metadata of an asset, without its content, either from a cache or
+    from the contentstore.
+
+    The contentstore also caches that missing assets don't exist, for a short time.
+    """
+    content = get_cached_content(location)
+    if content is None:
+        content = AssetManager.find_metadata(location)
+    return content
+
+
 def load_asset_from_location(location):
     """
     Loads an asset based on its location, either retrieving it from a cache
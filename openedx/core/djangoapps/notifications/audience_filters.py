@@ -3,16 +3,22 @@ Audience based filters for notifications and Notification filters
 """
 
 import logging
+import threading
+import time
+import uuid
 from abc import abstractmethod
+from collections import OrderedDict, defaultdict
+from functools import cached_property
 from typing import List  # noqa: UP035
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from opaque_keys.edx.keys import CourseKey
 
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
 from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
-from lms.djangoapps.discussion.django_comment_client.utils import get_users_with_roles
 from lms.djangoapps.teams.models import CourseTeam
 from openedx.core.djangoapps.course_date_signals.utils import get_expected_duration
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -30,6 +36,270 @@ from xmodule.modulestore.django import modulestore
 
 logger = logging.getLogger(__name__)
 
+AUDIENCE_PLAN_VERSION_CACHE_KEY = 'notifications.audience_plan.version.{course_key}'
+
+# The forum roles whose users keep access to a course after their audit access expires.
+PRIVILEGED_FORUM_ROLES = [
+    FORUM_ROLE_MODERATOR,
+    FORUM_ROLE_COMMUNITY_TA,
+    FORUM_ROLE_ADMINISTRATOR,
+    FORUM_ROLE_GROUP_MODERATOR,
+]
+
+
+class CourseAudiencePlan:
+    """
+    The users selected by the notification audience filters of a course.
+
+    Each filter's users are loaded with one query the first time they are needed, and
+    kept as sets of user ids, so that filtering an audience is a set operation. Plans
+    are shared by the notifications of a course through CourseAudiencePlanCache.
+    """
+    def __init__(self, course_key):
+        if not isinstance(course_key, CourseKey):
+            course_key = CourseKey.from_string(str(course_key))
+        self.course_key = course_key
+        self._results = {}
+
+    def _get(self, name):
+        """
+        Returns the result `name`, loading it with the method `_load_<name>` the first time.
+        """
+        try:
+            return self._results[name]
+        except KeyError:
+            result = self._results[name] = getattr(self, f'_load_{name}')()
+            return result
+
+    def is_loaded(self, name):
+        """
+        Returns whether the result `name` has been loaded, so that using it costs no query.
+        """
+        return name in self._results
+
+    @staticmethod
+    def _group_user_ids(rows):
+        """
+        Groups (key, user_id) rows into {key: frozenset(user_ids)}, ignoring missing users.
+        """
+        user_ids_by_key = defaultdict(set)
+        for key, user_id in rows:
+            members = user_ids_by_key[key]
+            if user_id is not None:
+                members.add(user_id)
+        return {key: frozenset(user_ids) for key, user_ids in user_ids_by_key.items()}
+
+    def _load_course(self):
+        return modulestore().get_course(self.course_key)
+
+    def _load_enrolled_user_ids(self):
+        return self._group_user_ids(
+            CourseEnrollment.objects.filter(
+                course_id=self.course_key,
+                is_active=True,
+            ).values_list('mode', 'user_id')
+        )
+
+    def _load_forum_role_user_ids(self, roles):
+        return self._group_user_ids(
+            Role.objects.filter(course_id=self.course_key, name__in=roles).values_list('name', 'users__id')
+        )
+
+    def _load_course_role_user_ids(self):
+        return {
+            'staff': frozenset(CourseStaffRole(self.course_key).users_with_role().values_list('id', flat=True)),
+            'instructor': frozenset(
+                CourseInstructorRole(self.course_key).users_with_role().values_list('id', flat=True)
+            ),
+        }
+
+    def _load_team_user_ids(self):
+        return self._group_user_ids(
+            CourseTeam.objects.filter(course_id=self.course_key).values_list('team_id', 'users__id')
+        )
+
+    def _load_cohort_user_ids(self):
+        return self._group_user_ids(
+            CourseUserGroup.objects.filter(course_id=self.course_key).values_list('id', 'users__id')
+        )
+
+    def _load_access_role_user_ids(self):
+        return frozenset(
+            CourseAccessRole.objects.filter(course_id=self.course_key).values_list('user_id', flat=True)
+        )
+
+    def _load_user_ids_with_roles(self):
+        return self._get('access_role_user_ids') | self.forum_role_user_ids(PRIVILEGED_FORUM_ROLES)
+
+    def _load_audit_access(self):
+        """
+        Returns the verified mode of the course, the duration of audit access and the
+        start of audit access limits, if any.
+        """
+        verified_mode = CourseMode.verified_mode_for_course(course=self.course, include_expired=True)
+        access_duration = get_expected_duration(self.course_key)
+        course_time_limit = CourseDurationLimitConfig.current(course_key=self.course_key)
+        enabled_as_of = None
+        if course_time_limit.enabled_for_course(self.course_key):
+            enabled_as_of = course_time_limit.enabled_as_of
+        return verified_mode, access_duration, enabled_as_of
+
+    def _load_audit_enrollment_dates(self):
+        return dict(self.audit_enrollments().values_list('user_id', 'created'))
+
+    @property
+    def course(self):
+        return self._get('course')
+
+    @property
+    def audit_access(self):
+        return self._get('audit_access')
+
+    def enrolled_user_ids(self, modes=None):
+        """
+        Returns the ids of the users actively enrolled in the course, in any of the given modes.
+        """
+        enrolled_user_ids = self._get('enrolled_user_ids')
+        if modes is None:
+            modes = enrolled_user_ids.keys()
+        return frozenset().union(*(enrolled_user_ids.get(mode, ()) for mode in modes))
+
+    def forum_role_user_ids(self, roles):
+        """
+        Returns the ids of the users with any of the given forum roles, loading the roles
+        that were not needed before with one query.
+        """
+        forum_role_user_ids = self._results.setdefault('forum_role_user_ids', {})
+        missing_roles = [role for role in roles if role not in forum_role_user_ids]
+        if missing_roles:
+            loaded = self._load_forum_role_user_ids(missing_roles)
+            for role in missing_roles:
+                forum_role_user_ids[role] = loaded.get(role, frozenset())
+        return frozenset().union(*(forum_role_user_ids[role] for role in roles))
+
+    def course_role_user_ids(self, roles):
+        course_role_user_ids = self._get('course_role_user_ids')
+        return frozenset().union(*(course_role_user_ids[role] for role in roles))
+
+    def team_user_ids(self, team_ids):
+        """
+        Returns the ids of the members of the given teams, or None if none of the teams is in the course.
+        """
+        team_user_ids = self._get('team_user_ids')
+        teams = [team_user_ids[team_id] for team_id in team_ids if team_id in team_user_ids]
+        if not teams:
+            return None
+        return frozenset().union(*teams)
+
+    def cohort_user_ids(self, group_ids):
+        cohort_user_ids = self._get('cohort_user_ids')
+        return frozenset().union(*(cohort_user_ids.get(int(group_id), ()) for group_id in group_ids))
+
+    def user_ids_with_roles(self):
+        """
+        Returns the ids of the users with a course role or a privileged forum role.
+        """
+        return self._get('user_ids_with_roles')
+
+    def audit_enrollments(self):
+        """
+        Returns the queryset of the audit enrollments subject to access expiration.
+        """
+        enrollments = CourseEnrollment.objects.filter(
+            course_id=self.course_key,
+            mode=CourseMode.AUDIT,
+            user__is_staff=False,
+        )
+        enabled_as_of = self.audit_access[2]
+        if enabled_as_of:
+            enrollments = enrollments.filter(created__gte=enabled_as_of)
+        return enrollments
+
+    def audit_enrollment_dates(self):
+        """
+        Returns {user_id: enrollment date} of the audit enrollments subject to access expiration.
+        """
+        return self._get('audit_enrollment_dates')
+
+
+class CourseAudiencePlanCache:
+    """
+    A process-wide LRU cache of CourseAudiencePlans.
+
+    A plan is used until it is older than NOTIFICATION_AUDIENCE_PLAN_TIMEOUT seconds, or
+    until the enrollments, roles, teams or cohorts of its course change: the handlers of
+    those changes replace the version of the course's plan, which is kept in the django
+    cache so that all processes see it.
+    """
+    def __init__(self):
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE', 0)
+
+    @staticmethod
+    def _version(course_key):
+        """
+        Returns the current version of the plan of the course.
+        """
+        key = AUDIENCE_PLAN_VERSION_CACHE_KEY.format(course_key=course_key)
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        return version
+
+    def get(self, course_key):
+        """
+        Returns the plan of the course, cached if possible.
+        """
+        course_key = str(course_key)
+        max_size = self.max_size
+        if not max_size:
+            return CourseAudiencePlan(course_key)
+
+        version = self._version(course_key)
+        now = time.monotonic()
+        timeout = getattr(settings, 'NOTIFICATION_AUDIENCE_PLAN_TIMEOUT', 0)
+        with self._lock:
+            cached = self._plans.get(course_key)
+            if cached and cached[0] == version and now - cached[1] < timeout:
+                self._plans.move_to_end(course_key)
+                return cached[2]
+
+        plan = CourseAudiencePlan(course_key)
+        with self._lock:
+            self._plans[course_key] = (version, now, plan)
+            self._plans.move_to_end(course_key)
+            while len(self._plans) > max_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, course_key):
+        """
+        Stops the use of the current plan of the course, in all processes.
+        """
+        if not self.max_size:
+            return
+        course_key = str(course_key)
+        cache.delete(AUDIENCE_PLAN_VERSION_CACHE_KEY.format(course_key=course_key))
+        with self._lock:
+            self._plans.pop(course_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+
+COURSE_AUDIENCE_PLANS = CourseAudiencePlanCache()
+
+
+def get_course_audience_plan(course_key):
+    return COURSE_AUDIENCE_PLANS.get(course_key)
+
 
 class NotificationAudienceFilterBase:
     """
@@ -40,6 +310,10 @@ class NotificationAudienceFilterBase:
 
     allowed_filters = []
 
+    @cached_property
+    def audience_plan(self):
+        return get_course_audience_plan(self.course_key)
+
     def is_valid_filter(self, values):
         return all(value in self.allowed_filters for value in values)
 
@@ -66,7 +340,7 @@ class ForumRoleAudienceFilter(NotificationAudienceFilterBase):
         """
         if not self.is_valid_filter(roles):
             raise ValueError(f'Invalid roles {roles} passed to RoleAudienceFilter')
-        return [user.id for user in get_users_with_roles(roles, self.course_key)]
+        return list(self.audience_plan.forum_role_user_ids(roles))
 
 
 class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
@@ -82,21 +356,7 @@ class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
         if not self.is_valid_filter(course_roles):
             raise ValueError(f'Invalid roles {course_roles} passed to CourseRoleAudienceFilter')
 
-        user_ids = []
-
-        course_key = self.course_key
-        if not isinstance(course_key, CourseKey):
-            course_key = CourseKey.from_string(course_key)
-
-        if 'staff' in course_roles:
-            staff_users = CourseStaffRole(course_key).users_with_role().values_list('id', flat=True)
-            user_ids.extend(staff_users)
-
-        if 'instructor' in course_roles:
-            instructor_users = CourseInstructorRole(course_key).users_with_role().values_list('id', flat=True)
-            user_ids.extend(instructor_users)
-
-        return user_ids
+        return list(self.audience_plan.course_role_user_ids(course_roles))
 
 
 class EnrollmentAudienceFilter(NotificationAudienceFilterBase):
@@ -111,11 +371,7 @@ class EnrollmentAudienceFilter(NotificationAudienceFilterBase):
         """
         if not self.is_valid_filter(enrollment_modes):
             raise ValueError(f'Invalid enrollment modes {enrollment_modes} passed to EnrollmentAudienceFilter')
-        return CourseEnrollment.objects.filter(
-            course_id=self.course_key,
-            mode__in=enrollment_modes,
-            is_active=True,
-        ).values_list('user_id', flat=True)
+        return list(self.audience_plan.enrolled_user_ids(enrollment_modes))
 
 
 class TeamAudienceFilter(NotificationAudienceFilterBase):
@@ -127,16 +383,12 @@ class TeamAudienceFilter(NotificationAudienceFilterBase):
         """
         Filter users based on team id
         """
-        teams = CourseTeam.objects.filter(team_id__in=team_ids, course_id=self.course_key)
+        user_ids = self.audience_plan.team_user_ids(team_ids)
 
-        if not teams:   # invalid team ids passed
+        if user_ids is None:   # invalid team ids passed
             raise ValueError(f'Invalid Team ids {team_ids} passed to TeamAudienceFilter for course {self.course_key}')
 
-        user_ids = []
-        for team in teams:
-            user_ids.extend(team.users.all().values_list('id', flat=True))
-
-        return user_ids
+        return list(user_ids)
 
 
 class CohortAudienceFilter(NotificationAudienceFilterBase):
@@ -148,10 +400,7 @@ class CohortAudienceFilter(NotificationAudienceFilterBase):
         """
         Filter users based on their cohort ids
         """
-        users_in_cohort = CourseUserGroup.objects.filter(
-            course_id=self.course_key, id__in=group_ids
-        ).values_list('users__id', flat=True)
-        return users_in_cohort
+        return list(self.audience_plan.cohort_user_ids(group_ids))
 
 
 class NotificationFilter:
@@ -159,6 +408,19 @@ class NotificationFilter:
     Filter notifications based on their type
     """
 
+    def __init__(self, audience_size=0):
+        self.audience_size = audience_size
+        self._audience_plans = {}
+
+    def get_audience_plan(self, course_key):
+        """
+        Returns the audience plan of the course, which is kept for the life of this filter.
+        """
+        course_key = str(course_key)
+        if course_key not in self._audience_plans:
+            self._audience_plans[course_key] = get_course_audience_plan(course_key)
+        return self._audience_plans[course_key]
+
     @staticmethod
     def get_users_with_course_role(user_ids: List[int], course_id: str) -> List[int]:  # noqa: UP006
         """
@@ -178,22 +440,30 @@ class NotificationFilter:
 
             course_id=course_id,
             users__id__in=user_ids,
-            name__in=[
-                FORUM_ROLE_MODERATOR,
-                FORUM_ROLE_COMMUNITY_TA,
-                FORUM_ROLE_ADMINISTRATOR,
-                FORUM_ROLE_GROUP_MODERATOR,
-            ]
+            name__in=PRIVILEGED_FORUM_ROLES,
 
         ).values_list('users__id', flat=True)
 
+    def use_audience_plan(self, audience_plan) -> bool:
+        """
+        Returns whether to look up audit enrollments and roles in the sets of all users of the
+        audience plan rather than with queries for each batch of users.
+
+        Loading those sets is only worth it if they are already loaded, or if the plan is kept
+        for other notifications and this notification reaches many users.
+        """
+        if audience_plan.is_loaded('audit_enrollment_dates'):
+            return True
+        return bool(COURSE_AUDIENCE_PLANS.max_size) and (
+            self.audience_size >= getattr(settings, 'NOTIFICATION_AUDIENCE_PLAN_MIN_USERS', 0)
+        )
+
     def filter_audit_expired_users_with_no_role(self, user_ids, course) -> list:
         """
         Check if the user has access to the course this would be true if the user has a course role or a forum role
         """
-        verified_mode = CourseMode.verified_mode_for_course(course=course, include_expired=True)
-        access_duration = get_expected_duration(course.id)
-        course_time_limit = CourseDurationLimitConfig.current(course_key=course.id)
+        audience_plan = self.get_audience_plan(course.id)
+        verified_mode, access_duration, __ = audience_plan.audit_access
         if not verified_mode:
             logger.debug(
                 "NotificationFilter: Course %s does not have a verified mode, so no users will be filtered out",
@@ -201,37 +471,33 @@ class NotificationFilter:
             )
             return user_ids
 
-        users_with_course_role = self.get_users_with_course_role(user_ids, course.id)
-        users_with_forum_roles = self.get_users_with_forum_roles(user_ids, course.id)
-        enrollments = CourseEnrollment.objects.filter(
-            user_id__in=user_ids,
-            course_id=course.id,
-            mode=CourseMode.AUDIT,
-            user__is_staff=False,
-        )
-
-        if course_time_limit.enabled_for_course(course.id):
-            enrollments = enrollments.filter(created__gte=course_time_limit.enabled_as_of)
-        logger.debug("NotificationFilter: Number of audit enrollments for course %s: %s", course.id,
-                     enrollments.count())
-
-        for enrollment in enrollments:
-            if enrollment.user_id in users_with_course_role or enrollment.user_id in users_with_forum_roles:
-                logger.debug(
-                    "NotificationFilter: User %s has a course or forum role for course %s, so they will not be "
-                    "filtered out",
-                    enrollment.user_id,
-                    course.id,
-                )
-                continue
-            content_availability_date = max(enrollment.created, course.start)
+        if self.use_audience_plan(audience_plan):
+            audit_enrollment_dates = audience_plan.audit_enrollment_dates()
+            audit_user_ids = audit_enrollment_dates.keys() & set(user_ids)
+            if not audit_user_ids:
+                return user_ids
+            audit_user_ids -= audience_plan.user_ids_with_roles()
+        else:
+            audit_enrollment_dates = dict(
+                audience_plan.audit_enrollments().filter(user_id__in=user_ids).values_list('user_id', 'created')
+            )
+            audit_user_ids = set(audit_enrollment_dates)
+            if not audit_user_ids:
+                return user_ids
+            audit_user_ids -= set(self.get_users_with_course_role(list(audit_user_ids), course.id))
+            audit_user_ids -= set(self.get_users_with_forum_roles(list(audit_user_ids), course.id))
+
+        expired_user_ids = set()
+        current_time = timezone.now()
+        for user_id in audit_user_ids:
+            content_availability_date = max(audit_enrollment_dates[user_id], course.start)
             expiration_date = content_availability_date + access_duration
-            logger.debug("NotificationFilter: content_availability_date: %s and access_duration: %s",
-                         content_availability_date, access_duration
-                         )
-            if expiration_date and timezone.now() > expiration_date:
-                logger.debug("User %s has expired audit access to course %s", enrollment.user_id, course.id)
-                user_ids.remove(enrollment.user_id)
+            if expiration_date and current_time > expiration_date:
+                expired_user_ids.add(user_id)
+        if expired_user_ids:
+            logger.debug("NotificationFilter: Users %s have expired audit access to course %s",
+                         expired_user_ids, course.id)
+            return [user_id for user_id in user_ids if user_id not in expired_user_ids]
         return user_ids
 
     def apply_filters(self, user_ids, course_key, notification_type) -> list:
@@ -240,7 +506,9 @@ class NotificationFilter:
         """
         notification_config = COURSE_NOTIFICATION_TYPES.get(notification_type, {})
         applicable_filters = notification_config.get('filters', [])
-        course = modulestore().get_course(course_key)
+        if not applicable_filters:
+            return user_ids
+        course = self.get_audience_plan(course_key).course
         for filter_name in applicable_filters:
             logger.debug(
                 "NotificationFilter: Applying filter %s for notification type %s",
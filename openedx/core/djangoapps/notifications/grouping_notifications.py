@@ -5,6 +5,7 @@ import datetime
 from abc import ABC, abstractmethod
 from typing import Dict, Type, Union  # noqa: UP035
 
+from django.utils import timezone
 from pytz import utc
 
 from openedx.core.djangoapps.notifications.base_notification import COURSE_NOTIFICATION_TYPES
@@ -12,6 +13,11 @@ from openedx.core.djangoapps.notifications.models import Notification
 
 from .exceptions import InvalidNotificationTypeError
 
+# The fields of a notification that group_user_notifications updates.
+GROUPED_NOTIFICATION_FIELDS = [
+    'content_context', 'web', 'email', 'content_url', 'last_read', 'last_seen', 'created', 'modified',
+]
+
 
 class BaseNotificationGrouper(ABC):
     """
@@ -138,9 +144,12 @@ class NewResponseOnFollowedPostGrouper(BaseNotificationGrouper):
         return content_context
 
 
-def group_user_notifications(new_notification: Notification, old_notification: Notification):
+def group_user_notifications(new_notification: Notification, old_notification: Notification, save=True):
     """
     Groups user notification based on notification type and group_id
+
+    Returns whether the notification was grouped. If save is False, the caller is responsible
+    for saving old_notification, e.g. with save_grouped_notifications.
     """
     notification_type = new_notification.notification_type
     grouper_class = NotificationRegistry.get_grouper(notification_type)
@@ -153,7 +162,23 @@ def group_user_notifications(new_notification: Notification, old_notification: N
         old_notification.last_read = None
         old_notification.last_seen = None
         old_notification.created = utc.localize(datetime.datetime.now())
-        old_notification.save()
+        if save:
+            old_notification.save()
+        return True
+    return False
+
+
+def save_grouped_notifications(notifications):
+    """
+    Saves the notifications grouped by group_user_notifications with save=False in a single query.
+    """
+    if not notifications:
+        return
+    # bulk_update doesn't update the modified timestamp, unlike save.
+    modified = timezone.now()
+    for notification in notifications:
+        notification.modified = modified
+    Notification.objects.bulk_update(notifications, GROUPED_NOTIFICATION_FIELDS)
 
 
 def get_user_existing_notifications(user_ids, notification_type, group_by_id, course_id):
@@ -5,17 +5,22 @@ import logging
 
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, ProgrammingError, transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from openedx_events.learning.signals import COURSE_NOTIFICATION_REQUESTED, USER_NOTIFICATION_REQUESTED
 
-from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
+from lms.djangoapps.teams.models import CourseTeamMembership
+from openedx.core.djangoapps.course_groups.models import CohortMembership, CourseUserGroup
+from openedx.core.djangoapps.django_comment_common.models import Role
 from openedx.core.djangoapps.notifications.audience_filters import (
+    COURSE_AUDIENCE_PLANS,
     CohortAudienceFilter,
     CourseRoleAudienceFilter,
     EnrollmentAudienceFilter,
     ForumRoleAudienceFilter,
     TeamAudienceFilter,
+    get_course_audience_plan,
 )
 from openedx.core.djangoapps.notifications.base_notification import COURSE_NOTIFICATION_TYPES
 from openedx.core.djangoapps.notifications.models import NotificationPreference
@@ -71,11 +76,7 @@ def calculate_course_wide_notification_audience(course_key, audience_filters):
     Calculate the audience for a course-wide notification based on the audience filters
     """
     if not audience_filters:
-        active_enrollments = CourseEnrollment.objects.filter(
-            course_id=course_key,
-            is_active=True
-        ).values_list('user_id', flat=True)
-        return list(active_enrollments)
+        return list(get_course_audience_plan(course_key).enrolled_user_ids())
 
     audience_user_ids = []
     for filter_type, filter_values in audience_filters.items():
@@ -117,3 +118,45 @@ def generate_course_notifications(signal, sender, course_notification_data, meta
     }
 
     send_notifications.delay(**notification_data)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def invalidate_course_audience_plan(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the audience plan of the course of a changed enrollment, course role or cohort membership.
+    """
+    COURSE_AUDIENCE_PLANS.invalidate(instance.course_id)
+
+
+@receiver(post_save, sender=CourseTeamMembership)
+@receiver(post_delete, sender=CourseTeamMembership)
+def invalidate_team_audience_plan(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the audience plan of the course of a changed team membership.
+    """
+    COURSE_AUDIENCE_PLANS.invalidate(instance.team.course_id)
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+@receiver(m2m_changed, sender=Role.users.through)
+def invalidate_group_audience_plans(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+):  # pylint: disable=unused-argument
+    """
+    Invalidate the audience plans of the courses of user groups or forum roles whose users changed.
+    """
+    if not COURSE_AUDIENCE_PLANS.max_size or action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        course_ids = [instance.course_id]
+    elif action == 'pre_clear':
+        course_ids = model.objects.filter(users=instance).values_list('course_id', flat=True)
+    else:
+        course_ids = model.objects.filter(pk__in=pk_set).values_list('course_id', flat=True)
+    for course_id in set(course_ids):
+        COURSE_AUDIENCE_PLANS.invalidate(course_id)
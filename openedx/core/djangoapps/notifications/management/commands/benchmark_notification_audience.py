@@ -0,0 +1,188 @@
+"""
+Command to measure the cost of calculating and filtering the audience of a course-wide notification.
+"""
+
+
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from opaque_keys.edx.locator import CourseLocator
+
+from common.djangoapps.course_modes.models import CourseMode
+from openedx.core.djangoapps.django_comment_common.models import (
+    FORUM_ROLE_COMMUNITY_TA,
+    FORUM_ROLE_MODERATOR,
+    FORUM_ROLE_STUDENT,
+)
+
+from ...audience_filters import CourseAudiencePlan, NotificationFilter
+from ...handlers import AUDIENCE_FILTER_CLASSES
+
+ENROLLMENT_MODES = [CourseMode.AUDIT] * 6 + [CourseMode.VERIFIED] * 3 + [CourseMode.HONOR]
+
+
+class SyntheticAudiencePlan(CourseAudiencePlan):
+    """
+    A CourseAudiencePlan of a synthetic course, whose users are generated instead of queried.
+    """
+    def __init__(self, course_key, users, teams, cohorts):
+        super().__init__(course_key)
+        self.users = users
+        self.teams = teams
+        self.cohorts = cohorts
+
+    def _rows(self, keys):
+        """
+        Returns a (key, user_id) row for each user, with keys picked at random.
+        """
+        rng = random.Random(0)
+        return [(rng.choice(keys), user_id) for user_id in range(1, self.users + 1)]
+
+    def _load_course(self):
+        return SimpleNamespace(id=self.course_key, start=datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+    def _load_enrolled_user_ids(self):
+        return self._group_user_ids(self._rows(ENROLLMENT_MODES))
+
+    def _load_forum_role_user_ids(self, roles):
+        user_ids_by_role = self._group_user_ids(
+            self._rows([FORUM_ROLE_STUDENT] * 98 + [FORUM_ROLE_MODERATOR, FORUM_ROLE_COMMUNITY_TA])
+        )
+        return {role: user_ids for role, user_ids in user_ids_by_role.items() if role in roles}
+
+    def _load_course_role_user_ids(self):
+        return {'staff': frozenset(range(1, 11)), 'instructor': frozenset(range(1, 3))}
+
+    def _load_team_user_ids(self):
+        return self._group_user_ids(self._rows([f'team-{index}' for index in range(self.teams)]))
+
+    def _load_cohort_user_ids(self):
+        return self._group_user_ids(self._rows(list(range(1, self.cohorts + 1))))
+
+    def _load_access_role_user_ids(self):
+        return frozenset(range(1, 11))
+
+    def _load_audit_access(self):
+        return CourseMode.VERIFIED, timedelta(weeks=8), None
+
+    def _load_audit_enrollment_dates(self):
+        now = timezone.now()
+        audit_user_ids = self.enrolled_user_ids([CourseMode.AUDIT])
+        return {user_id: now - timedelta(days=user_id % 120) for user_id in audit_user_ids}
+
+
+class Command(BaseCommand):
+    """
+    Sends --notifications course-wide notifications to the users of a synthetic course:
+    calculates the audience of each notification with the audience filters, then filters
+    the audience in batches as send_notifications does, and reports the time taken when:
+
+    * uncached: each notification loads a new CourseAudiencePlan, which its filters and
+      batches share, as when NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE is 0.
+    * cached: the notifications share a single CourseAudiencePlan, as when the plan is
+      kept by CourseAudiencePlanCache.
+
+    The batches are always filtered with the sets of the plan, as send_notifications does
+    for audiences of at least NOTIFICATION_AUDIENCE_PLAN_MIN_USERS users when plans are
+    cached; smaller audiences are filtered with queries for each batch instead.
+
+    The users are generated in memory, so the times include loading the synthetic users
+    but not the database queries that load them in a real course.
+
+    Example usage:
+        $ ./manage.py lms benchmark_notification_audience --users 100000 --settings=devstack
+    """
+    help = 'Measures the cost of calculating and filtering the audience of course-wide notifications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            help='Number of users enrolled in the synthetic course.',
+            default=100000,
+            type=int,
+        )
+        parser.add_argument(
+            '--teams',
+            help='Number of teams in the synthetic course.',
+            default=100,
+            type=int,
+        )
+        parser.add_argument(
+            '--cohorts',
+            help='Number of cohorts in the synthetic course.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--notifications',
+            help='Number of notifications sent with each approach.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--batch_size',
+            help='Number of users filtered at a time; defaults to NOTIFICATION_CREATION_BATCH_SIZE.',
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        course_key = CourseLocator('edX', 'BenchmarkNotificationAudience', 'run')
+        batch_size = options['batch_size'] or settings.NOTIFICATION_CREATION_BATCH_SIZE
+        audience_filters = {
+            'enrollments': [CourseMode.AUDIT, CourseMode.VERIFIED],
+            'discussion_roles': [FORUM_ROLE_MODERATOR, FORUM_ROLE_COMMUNITY_TA],
+            'course_roles': ['staff'],
+            'teams': ['team-0', 'team-1'],
+            'cohorts': [1, 2, 3],
+        }
+
+        def make_plan():
+            return SyntheticAudiencePlan(course_key, options['users'], options['teams'], options['cohorts'])
+
+        cached_plan = make_plan()
+        self.stdout.write(
+            f'{options["users"]} users, {options["notifications"]} notifications, batches of {batch_size}'
+        )
+        self.stdout.write(f'{"approach":<12}{"audience":>10}{"filtered":>10}{"audience ms":>14}{"batches ms":>12}')
+        for approach, get_plan in (('uncached', make_plan), ('cached', lambda: cached_plan)):
+            audience_elapsed = batches_elapsed = 0
+            for _ in range(max(options['notifications'], 1)):
+                elapsed = self._notify(get_plan(), audience_filters, batch_size)
+                audience_elapsed += elapsed[0]
+                batches_elapsed += elapsed[1]
+                audience, filtered = elapsed[2:]
+            self.stdout.write('{:<12}{:>10}{:>10}{:>14.0f}{:>12.0f}'.format(  # noqa: UP032
+                approach, audience, filtered, audience_elapsed * 1000, batches_elapsed * 1000,
+            ))
+
+    @staticmethod
+    def _notify(plan, audience_filters, batch_size):
+        """
+        Calculates the audience of a notification and filters it in batches with the given plan,
+        returning the time taken by each step, the size of the audience and the number of users
+        left after filtering.
+        """
+        start = time.perf_counter()
+        audience = set()
+        for filter_type, filter_values in audience_filters.items():
+            filter_instance = AUDIENCE_FILTER_CLASSES[filter_type](plan.course_key)
+            filter_instance.audience_plan = plan
+            audience.update(filter_instance.filter(filter_values))
+        user_ids = list(audience)
+        audience_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        notification_filter = NotificationFilter()
+        notification_filter.get_audience_plan = lambda course_key: plan
+        notification_filter.use_audience_plan = lambda audience_plan: True
+        filtered = 0
+        for index in range(0, len(user_ids), batch_size):
+            batch_user_ids = user_ids[index:index + batch_size]
+            filtered += len(notification_filter.filter_audit_expired_users_with_no_role(batch_user_ids, plan.course))
+        batches_elapsed = time.perf_counter() - start
+        return audience_elapsed, batches_elapsed, len(user_ids), filtered
@@ -0,0 +1,24 @@
+"""
+Tests for the benchmark_notification_audience management command.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class TestBenchmarkNotificationAudience(TestCase):
+    """
+    Tests the benchmark_notification_audience management command.
+    """
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_notification_audience', users=1000, notifications=2, stdout=out)
+        lines = out.getvalue().splitlines()
+        assert lines[0].startswith('1000 users, 2 notifications')
+        rows = [line.split() for line in lines[2:]]
+        assert [row[0] for row in rows] == ['uncached', 'cached']
+        # Both approaches select and filter out the same users.
+        assert rows[0][1:3] == rows[1][1:3]
+        assert 0 < int(rows[0][2]) < int(rows[0][1]) <= 1000
@@ -9,7 +9,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from edx_django_utils.monitoring import set_code_owner_attribute
+from edx_django_utils.monitoring import set_code_owner_attribute, set_custom_attribute
 from opaque_keys.edx.keys import CourseKey
 
 from openedx.core.djangoapps.notifications.audience_filters import NotificationFilter
@@ -29,6 +29,7 @@ from openedx.core.djangoapps.notifications.grouping_notifications import (
     NotificationRegistry,
     get_user_existing_notifications,
     group_user_notifications,
+    save_grouped_notifications,
 )
 from openedx.core.djangoapps.notifications.models import (
     Notification,
@@ -101,9 +102,12 @@ def delete_expired_notifications():
 # pylint: disable=too-many-statements
 @shared_task
 @set_code_owner_attribute
-def send_notifications(user_ids, course_key: str, app_name, notification_type, context, content_url):
+def send_notifications(user_ids, course_key: str, app_name, notification_type, context, content_url, shard=0):
     """
     Send notifications to the users.
+
+    If there are more than NOTIFICATION_FANOUT_SHARD_SIZE users, this task notifies that many
+    of them, then chains another send_notifications task to notify the others.
     """
     if DISABLE_NOTIFICATIONS.is_enabled():
         return
@@ -113,6 +117,11 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
         raise ValidationError(f"Notification is not valid {app_name} {notification_type} {context}")
 
     user_ids = list(set(user_ids))
+    remaining_user_ids = []
+    shard_size = settings.NOTIFICATION_FANOUT_SHARD_SIZE
+    if shard_size and len(user_ids) > shard_size:
+        user_ids, remaining_user_ids = user_ids[:shard_size], user_ids[shard_size:]
+    shard_context = dict(context)
     batch_size = settings.NOTIFICATION_CREATION_BATCH_SIZE
     group_by_id = context.pop('group_by_id', '')
     grouping_function = NotificationRegistry.get_grouper(notification_type)
@@ -126,9 +135,10 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
     push_notification_audience = []
     is_push_notification_enabled = ENABLE_PUSH_NOTIFICATIONS.is_enabled(course_key)
     task_id = str(uuid.uuid4())
+    notification_filter = NotificationFilter(audience_size=len(user_ids))
     for batch_user_ids in get_list_in_batches(user_ids, batch_size):
         logger.debug(f'Sending notifications to {len(batch_user_ids)} users in {course_key}')
-        batch_user_ids = NotificationFilter().apply_filters(batch_user_ids, course_key, notification_type)
+        batch_user_ids = notification_filter.apply_filters(batch_user_ids, course_key, notification_type)
         logger.info(f'After applying filters, sending notifications to {len(batch_user_ids)} users in {course_key}')
 
         existing_notifications = (
@@ -154,6 +164,7 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
             continue
 
         notifications = []
+        grouped_notifications = []
         email_notification_user_ids = []
         for preference in preferences:
             user_id = preference.user_id
@@ -188,8 +199,11 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
                 if push_notification:
                     push_notification_audience.append(user_id)
 
-                if grouping_enabled and existing_notifications.get(user_id, None):
-                    group_user_notifications(new_notification, existing_notifications[user_id])
+                existing_notification = existing_notifications.get(user_id) if grouping_enabled else None
+                if existing_notification and group_user_notifications(
+                    new_notification, existing_notification, save=False
+                ):
+                    grouped_notifications.append(existing_notification)
                 else:
                     notifications.append(new_notification)
 
@@ -200,17 +214,14 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
 
         # send notification to users but use bulk_create
         Notification.objects.bulk_create(notifications)
+        save_grouped_notifications(grouped_notifications)
 
-        # Get fresh records with pk so it can be used in email sending because there is a need to
-        # update the records further down the line.
+        # Email sending needs the saved records, because they are updated further down the line.
         if email_notification_user_ids:
-            email_notification_mapping = {
-                notif.user_id: notif
-                for notif in Notification.objects.filter(
-                    user_id__in=email_notification_user_ids,
-                    content_context__uuid=task_id,
-                )
-            }
+            email_notification_mapping.update(_get_email_notification_mapping(
+                email_notification_user_ids, notifications + grouped_notifications,
+                task_id, course_key, notification_type,
+            ))
     if email_notification_mapping:
         logger.info(
             f"Email Buffered Digest: Sending immediate email notifications to "
@@ -242,6 +253,49 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
                     generated_notification.notification_type, push_notification_audience)
         send_ace_msg_to_push_channel(push_notification_audience, generated_notification)
 
+    set_custom_attribute('notification_fanout_shard', shard)
+    set_custom_attribute('notification_fanout_audience', len(generated_notification_audience))
+    set_custom_attribute('notification_fanout_remaining_users', len(remaining_user_ids))
+    if remaining_user_ids:
+        logger.info(
+            f'Notified shard {shard} of {notification_type} in {course_key}, '
+            f'chaining {len(remaining_user_ids)} remaining users'
+        )
+        send_notifications.delay(
+            remaining_user_ids, str(course_key), app_name, notification_type, shard_context, content_url,
+            shard=shard + 1,
+        )
+
+
+def _get_email_notification_mapping(user_ids, notifications, task_id, course_key, notification_type):
+    """
+    Returns {user_id: notification} for the notifications of the given users created or
+    updated with the content of the task `task_id`.
+    """
+    user_ids = set(user_ids)
+    mapping = {}
+    unsaved_user_ids = []
+    for notification in notifications:
+        if notification.user_id not in user_ids:
+            continue
+        if notification.pk is None:
+            unsaved_user_ids.append(notification.user_id)
+        elif notification.content_context.get('uuid') == task_id:
+            mapping[notification.user_id] = notification
+
+    # Some databases, e.g. MySQL, don't return the primary keys of bulk created records.
+    if unsaved_user_ids:
+        mapping.update({
+            notification.user_id: notification
+            for notification in Notification.objects.filter(
+                user_id__in=unsaved_user_ids,
+                course_id=course_key,
+                notification_type=notification_type,
+                content_context__uuid=task_id,
+            )
+        })
+    return mapping
+
 
 def is_notification_valid(notification_type, context):
     """
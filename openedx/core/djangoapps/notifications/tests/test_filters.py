@@ -6,6 +6,7 @@ from unittest import mock
 from unittest.mock import patch
 
 import ddt
+from django.test import override_settings
 from django.utils.timezone import now
 
 from common.djangoapps.course_modes.models import CourseMode
@@ -24,12 +25,14 @@ from openedx.core.djangoapps.django_comment_common.models import (
     Role,
 )
 from openedx.core.djangoapps.notifications.audience_filters import (
+    COURSE_AUDIENCE_PLANS,
     CohortAudienceFilter,
     CourseRoleAudienceFilter,
     EnrollmentAudienceFilter,
     ForumRoleAudienceFilter,
     NotificationFilter,
     TeamAudienceFilter,
+    get_course_audience_plan,
 )
 from openedx.core.djangoapps.notifications.handlers import calculate_course_wide_notification_audience
 from openedx.features.course_duration_limits.models import CourseDurationLimitConfig
@@ -69,6 +72,40 @@ class CourseExpirationTestCase(ModuleStoreTestCase):
         self.catalog_patch.stop()
         super().tearDown()
 
+    @ddt.data(
+        (0, 2, False),
+        (2, 1, False),
+        (2, 2, True),
+    )
+    @ddt.unpack
+    @mock.patch("openedx.core.djangoapps.course_date_signals.utils.get_course_run_details")
+    def test_audit_expired_filter_audience_plan(
+        self,
+        plan_cache_size,
+        audience_size,
+        plan_loaded,
+        mock_get_course_run_details,
+    ):
+        """
+        Test that the audit enrollments of all users are only loaded into the audience plan for
+        large audiences when plans are cached, and that the result is the same either way.
+        """
+        COURSE_AUDIENCE_PLANS.clear()
+        self.addCleanup(COURSE_AUDIENCE_PLANS.clear)
+        mock_get_course_run_details.return_value = {'weeks_to_complete': 4}
+        notification_filter = NotificationFilter(audience_size=audience_size)
+        with override_settings(
+            NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE=plan_cache_size,
+            NOTIFICATION_AUDIENCE_PLAN_MIN_USERS=2,
+        ):
+            result = notification_filter.filter_audit_expired_users_with_no_role(
+                [self.user.id, self.user_1.id],
+                self.course,
+            )
+        self.assertEqual([self.user_1.id], result)  # noqa: PT009
+        audience_plan = notification_filter.get_audience_plan(self.course.id)
+        assert audience_plan.is_loaded('audit_enrollment_dates') == plan_loaded
+
     @mock.patch("openedx.core.djangoapps.course_date_signals.utils.get_course_run_details")
     def test_audit_expired_filter_with_no_role(
         self,
@@ -467,3 +504,85 @@ class TestAudienceFilter(ModuleStoreTestCase):
         }
         with self.assertRaises(ValueError):  # noqa: PT027
             calculate_course_wide_notification_audience(self.course.id, audience_filters)
+
+
+@override_settings(NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE=2, NOTIFICATION_AUDIENCE_PLAN_TIMEOUT=300)
+class TestCourseAudiencePlanCache(ModuleStoreTestCase):
+    """
+    Tests for the caching and invalidation of course audience plans.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        COURSE_AUDIENCE_PLANS.clear()
+        self.addCleanup(COURSE_AUDIENCE_PLANS.clear)
+        self.course = CourseFactory()
+        self.students = [UserFactory() for _ in range(3)]
+        assign_enrollment_mode_to_users(self.course.id, self.students[:2], CourseMode.AUDIT)
+
+    def test_plan_is_cached(self):
+        plan = get_course_audience_plan(self.course.id)
+        assert plan.enrolled_user_ids() == {student.id for student in self.students[:2]}
+        assert get_course_audience_plan(str(self.course.id)) is plan
+
+        with self.assertNumQueries(0):
+            EnrollmentAudienceFilter(self.course.id).filter([CourseMode.AUDIT])
+
+    @override_settings(NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE=0)
+    def test_plan_cache_disabled(self):
+        assert get_course_audience_plan(self.course.id) is not get_course_audience_plan(self.course.id)
+
+    @override_settings(NOTIFICATION_AUDIENCE_PLAN_TIMEOUT=0)
+    def test_plan_expires(self):
+        assert get_course_audience_plan(self.course.id) is not get_course_audience_plan(self.course.id)
+
+    def test_enrollment_invalidates_plan(self):
+        plan = get_course_audience_plan(self.course.id)
+        plan.enrolled_user_ids()
+
+        CourseEnrollment.enroll(self.students[2], self.course.id, CourseMode.VERIFIED)
+
+        new_plan = get_course_audience_plan(self.course.id)
+        assert new_plan is not plan
+        assert new_plan.enrolled_user_ids([CourseMode.VERIFIED]) == {self.students[2].id}
+
+    def test_cohort_change_invalidates_plan(self):
+        cohort = CohortFactory(course_id=self.course.id, users=self.students[:1])
+        plan = get_course_audience_plan(self.course.id)
+        assert plan.cohort_user_ids([cohort.id]) == {self.students[0].id}
+
+        cohort.users.add(self.students[1])
+
+        new_plan = get_course_audience_plan(self.course.id)
+        assert new_plan is not plan
+        assert new_plan.cohort_user_ids([cohort.id]) == {student.id for student in self.students[:2]}
+
+    def test_team_change_invalidates_plan(self):
+        team = CourseTeamFactory(course_id=self.course.id, team_id='team-0')
+        CourseTeamMembershipFactory.create(team=team, user=self.students[0])
+        plan = get_course_audience_plan(self.course.id)
+        assert plan.team_user_ids(['team-0']) == {self.students[0].id}
+
+        CourseTeamMembershipFactory.create(team=team, user=self.students[1])
+
+        assert get_course_audience_plan(self.course.id).team_user_ids(['team-0']) == {
+            student.id for student in self.students[:2]
+        }
+
+    def test_forum_roles_loaded_as_needed(self):
+        plan = get_course_audience_plan(self.course.id)
+        with self.assertNumQueries(1):
+            assert not plan.forum_role_user_ids([FORUM_ROLE_MODERATOR])
+        with self.assertNumQueries(0):
+            assert not plan.forum_role_user_ids([FORUM_ROLE_MODERATOR])
+        with self.assertNumQueries(1):
+            assert not plan.forum_role_user_ids([FORUM_ROLE_MODERATOR, FORUM_ROLE_STUDENT])
+
+    def test_other_courses_keep_their_plans(self):
+        other_course = CourseFactory()
+        other_plan = get_course_audience_plan(other_course.id)
+
+        CourseEnrollment.enroll(self.students[2], self.course.id)
+
+        assert get_course_audience_plan(other_course.id) is other_plan
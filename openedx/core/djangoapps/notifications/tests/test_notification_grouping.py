@@ -122,6 +122,18 @@ class TestGroupUserNotifications(ModuleStoreTestCase):
         self.assertIsNone(old_notification.last_seen)  # noqa: PT009
         self.assertIsNotNone(old_notification.created)  # noqa: PT009
 
+    @patch('openedx.core.djangoapps.notifications.grouping_notifications.NotificationRegistry.get_grouper')
+    def test_group_user_notifications_without_saving(self, mock_get_grouper):
+        """
+        Test that the function leaves saving to the caller when save is False
+        """
+        mock_get_grouper.return_value = MagicMock(spec=NewPostGrouper)
+        new_notification = MagicMock(spec=Notification)
+        old_notification = MagicMock(spec=Notification)
+
+        assert group_user_notifications(new_notification, old_notification, save=False)
+        self.assertFalse(old_notification.save.called)  # noqa: PT009
+
     def test_group_user_notifications_no_grouper(self):
         """
         Test that the function does nothing if no grouper is found
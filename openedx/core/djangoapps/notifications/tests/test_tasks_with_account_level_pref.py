@@ -8,6 +8,7 @@ from unittest.mock import patch
 import ddt
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.models import CourseEnrollment
@@ -157,6 +158,33 @@ class SendNotificationsTest(ModuleStoreTestCase):
             self.assertEqual(Notification.objects.filter(user_id=self.user.id).count(), 1)  # noqa: PT009
             user_notifications_mock.assert_called_once()
 
+    def test_grouped_notification_sent_by_email(self):
+        """
+        Test send_notifications saves grouped notifications and emails them immediately.
+        """
+        NotificationPreference.objects.update_or_create(
+            user_id=self.user.id,
+            app='discussion',
+            type='new_discussion_post',
+            defaults={'web': True, 'email': True, 'email_cadence': 'Immediately'},
+        )
+        context = {
+            'post_title': 'Test Post',
+            'username': 'Test Author',
+            'group_by_id': 'group_by_id'
+        }
+        with patch('openedx.core.djangoapps.notifications.tasks.send_immediate_cadence_email') as email_mock:
+            for __ in range(2):
+                send_notifications(
+                    [self.user.id], str(self.course_1.id), 'discussion', 'new_discussion_post', {**context},
+                    'https://example.com/'
+                )
+
+        notification = Notification.objects.get(user_id=self.user.id)
+        assert email_mock.call_count == 2
+        assert email_mock.call_args[0][0] == {self.user.id: notification}
+        assert email_mock.call_args[0][0][self.user.id].content_context == notification.content_context
+
     def test_notification_not_created_when_context_is_incomplete(self):
         try:
             send_notifications([self.user.id], str(self.course_1.id), "discussion", "new_comment", {}, "")
@@ -222,6 +250,28 @@ class SendBatchNotificationsTest(ModuleStoreTestCase):
             send_notifications(user_ids, str(self.course.id), notification_app, notification_type,
                                context, "http://test.url")
 
+    @override_settings(NOTIFICATION_FANOUT_SHARD_SIZE=7)
+    def test_large_audience_is_sharded(self):
+        """
+        Tests notifications for large audiences are sent by a chain of tasks
+        """
+        users = self._create_users(20)
+        user_ids = [user.id for user in users]
+        context = {
+            "post_title": "Test Post",
+            "author_name": "Test Author",
+            "replier_name": "Replier Name",
+        }
+        with patch('openedx.core.djangoapps.notifications.tasks.set_custom_attribute') as attribute_mock:
+            send_notifications(user_ids, str(self.course.id), "discussion", "new_comment", context, "http://test.url")
+
+        assert Notification.objects.filter(user_id__in=user_ids).count() == 20
+        remaining_users = [
+            call[0][1] for call in attribute_mock.call_args_list
+            if call[0][0] == 'notification_fanout_remaining_users'
+        ]
+        assert sorted(remaining_users) == [0, 6, 13]
+
     def test_preference_not_created_for_default_off_preference(self):
         """
         Tests if new preferences are NOT created when default preference for
@@ -307,6 +307,29 @@ LANGUAGES = [
     ('zh-tw', '中文 (台灣)'),  # Chinese (Taiwan)
 ]
 
+# .. setting_name: COURSE_STRUCTURE_CACHE_CODEC
+# .. setting_default: 'zlib'
+# .. setting_description: Compression codec used to store split modulestore course structures in the
+#   'course_structure_cache' cache. One of 'zlib', 'zstd' (requires the zstandard package) or 'lz4'
+#   (requires the lz4 package). Falls back to 'zlib' if the codec's package isn't installed. Cached
+#   structures can always be read, whatever codec they were written with.
+COURSE_STRUCTURE_CACHE_CODEC = 'zlib'
+
+# .. setting_name: COURSE_STRUCTURE_CACHE_CHUNK_SIZE
+# .. setting_default: 0
+# .. setting_description: Maximum size, in bytes, of each chunk of a compressed course structure that is
+#   too large (2MB or more) to be stored as a single item in the 'course_structure_cache' cache. Such
+#   structures are split into chunks which are read back with a single get_many call. When 0, structures
+#   that are too large are not cached at all.
+COURSE_STRUCTURE_CACHE_CHUNK_SIZE = 0
+
+# .. setting_name: COURSE_DEFINITION_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: Maximum number of split modulestore definitions kept in each process's in-memory
+#   cache. Definitions never change once they are saved, so cached definitions are served without a
+#   MongoDB query across requests. When 0, definitions are not cached in the process.
+COURSE_DEFINITION_CACHE_SIZE = 0
+
 CACHES = {
     'course_structure_cache': {
         'KEY_PREFIX': 'course_structure',
@@ -1566,8 +1589,49 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     #   For more information, check https://github.com/openedx/edx-platform/pull/13388 and
     #   https://github.com/openedx/edx-platform/pull/14571.
     TASK_MAX_RETRIES=5,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_SIZE']
+    # .. setting_default: 0
+    # .. setting_description: Maximum number of deserialized collected block structures to keep in
+    #   each process' in-memory LRU cache, in front of the django cache and storage. Entries are keyed
+    #   on the version of the stored block structure, and callers always receive a copy. Set to 0 to
+    #   disable the in-process cache.
+    PROCESS_CACHE_SIZE=0,
 )
 
+############################ Learning Sequences ############################
+
+# .. setting_name: LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS
+# .. setting_default: 0
+# .. setting_description: Number of threads that load the data of the outline processors concurrently
+#   when computing a learner's course outline. Each thread uses its own database connections, which are
+#   closed once its processor's data is loaded. When 0, or inside a database transaction (which the
+#   threads couldn't see), the processors load their data one after the other in the request's thread.
+LEARNING_SEQUENCES_OUTLINE_PROCESSOR_WORKERS = 0
+
+# .. setting_name: LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE
+# .. setting_default: 100
+# .. setting_description: Maximum number of course outlines kept in each process's in-memory LRU cache by the
+#   learning_sequences API. Cached outlines are keyed by the course's published version and the time its outline
+#   was last replaced, so they never go stale. When 0, outlines are only cached in the django cache.
+LEARNING_SEQUENCES_OUTLINE_CACHE_SIZE = 100
+
+# .. setting_name: LEARNING_SEQUENCES_OUTLINE_CACHE_TIMEOUT
+# .. setting_default: 86400
+# .. setting_description: Number of seconds the compact form of a course outline is kept in the django cache by
+#   the learning_sequences API.
+LEARNING_SEQUENCES_OUTLINE_CACHE_TIMEOUT = 86400
+
+############################# Course Overviews #############################
+
+# .. setting_name: COURSE_OVERVIEW_CACHE_SIZE
+# .. setting_default: 0
+# .. setting_description: Maximum number of CourseOverviews, with their tabs and image sets, kept in each
+#   process's in-memory cache. Cached overviews are checked against the modification times of the overviews and
+#   image sets in the database, with a single query for all the overviews that are looked up together, so they
+#   never go stale. When 0, overviews are not cached in the process.
+COURSE_OVERVIEW_CACHE_SIZE = 0
+
 ################################ Bulk Email ################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -1670,6 +1734,12 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': None,
 }
 
+# .. setting_name: GRADE_REPORT_USERS_PER_SHARD
+# .. setting_default: 5000
+# .. setting_description: Number of learners graded by each subtask of a grade report, when the
+#   ``instructor_task.use_sharded_grade_reporting`` course waffle flag is enabled.
+GRADE_REPORT_USERS_PER_SHARD = 5000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': None,
@@ -1862,6 +1932,22 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: COURSE_ASSET_METADATA_CACHE_TIMEOUT
+# .. setting_default: 3600
+# .. setting_description: Number of seconds the metadata of a course asset (digest, length, content type, locked
+#   flag and last modification time) is cached by the contentstore, in the 'course_assets' cache if it is
+#   configured and the default cache otherwise. The contentstore deletes the metadata of the assets it changes.
+#   Conditional requests for cached assets are answered without reading them from MongoDB. When 0, the metadata
+#   of assets is not cached.
+COURSE_ASSET_METADATA_CACHE_TIMEOUT = 3600
+
+# .. setting_name: COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: Number of seconds the contentstore caches that a course asset doesn't exist, so that
+#   repeated requests for missing assets (e.g. broken links) are answered without querying MongoDB. When 0, missing
+#   assets are not cached.
+COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT = 60
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -2715,6 +2801,13 @@ API_ACCESS_MANAGER_EMAIL = 'api-access@example.com'
 NOTIFICATIONS_EXPIRY = 60
 EXPIRED_NOTIFICATIONS_DELETE_BATCH_SIZE = 10000
 NOTIFICATION_CREATION_BATCH_SIZE = 76
+# Audiences larger than this are notified by a chain of tasks, each notifying this many users (0 to disable)
+NOTIFICATION_FANOUT_SHARD_SIZE = 20000
+# Number of courses whose notification audience plans each process keeps (0 to disable), and for how many seconds
+NOTIFICATION_AUDIENCE_PLAN_CACHE_SIZE = 0
+NOTIFICATION_AUDIENCE_PLAN_TIMEOUT = 300
+# Notifications reaching fewer users check audit access expiry with queries per batch, not with a cached plan
+NOTIFICATION_AUDIENCE_PLAN_MIN_USERS = 1000
 NOTIFICATIONS_DEFAULT_FROM_EMAIL = "no-reply@example.com"
 NOTIFICATION_DIGEST_LOGO = DEFAULT_EMAIL_LOGO_URL
 NOTIFICATION_IMMEDIATE_EMAIL_BUFFER_MINUTES = 15  # in minutes
@@ -34,6 +34,9 @@ class EffortEstimationTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    # Collecting only changed blocks keeps the course-wide DISABLE_ESTIMATION flag if it was set before, so once
+    # some estimation data is missing, estimates stay disabled until the whole course is collected again.
+    INCREMENTAL_COLLECT = True
 
     # Public xblock field names
     EFFORT_ACTIVITIES = 'effort_activities'
@@ -31,3 +31,10 @@ class AssetManager:
         compressed course structure from the structure cache.
         """
         return contentstore().find(asset_key, throw_on_not_found, as_stream)
+
+    @staticmethod
+    def find_metadata(asset_key, throw_on_not_found=True):
+        """
+        Finds the metadata of a course asset in the deprecated contentstore, without its content.
+        """
+        return contentstore().find_metadata(asset_key, throw_on_not_found)
@@ -314,26 +314,24 @@ class StaticContentStream(StaticContent):  # pylint: disable=missing-class-docst
                          length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
-    def stream_data(self):
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
 
-    def stream_data_in_range(self, first_byte, last_byte):
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
         """
-        Stream the data between first_byte and last_byte (included)
+        Stream the data between first_byte and last_byte (included), in chunks of at most chunk_size bytes
         """
         self._stream.seek(first_byte)
-        position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        remaining = last_byte - first_byte + 1
+        while remaining > 0:
+            chunk = self._stream.read(min(chunk_size, remaining))
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            remaining -= len(chunk)
             yield chunk
 
     def close(self):
@@ -358,6 +356,12 @@ class ContentStore:
     def find(self, filename):
         raise NotImplementedError
 
+    def find_metadata(self, location, throw_on_not_found=True):
+        """
+        Returns a StaticContent with the metadata of the asset at the given location, and no data.
+        """
+        raise NotImplementedError
+
     def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
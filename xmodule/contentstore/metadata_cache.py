@@ -0,0 +1,62 @@
+"""
+Caching of the metadata of assets in the contentstore, and of their absence.
+"""
+
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+# Cached in place of the metadata of assets that don't exist.
+NOT_FOUND = 'not_found'
+
+
+class AssetMetadataCache:
+    """
+    A cache of the metadata of assets: their GridFS files documents, without
+    their content.  It is keyed by the id of each asset in the contentstore,
+    and uses the 'course_assets' cache if it's configured, and the default
+    cache otherwise.
+
+    Metadata is kept for COURSE_ASSET_METADATA_CACHE_TIMEOUT seconds, and the
+    absence of assets for COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT seconds; either
+    is not cached if its timeout is 0.  The contentstore deletes the entries
+    of the assets it changes.
+    """
+    def __init__(self):
+        try:
+            self.cache = caches['course_assets']
+        except InvalidCacheBackendError:
+            self.cache = caches['default']
+
+    @staticmethod
+    def cache_key(content_id):
+        """
+        Returns the cache key of the asset with the given id in the contentstore.
+        """
+        if not isinstance(content_id, str):
+            # Assets of old-style courses are identified by SON documents.
+            content_id = json.dumps(content_id)
+        return 'asset_metadata.v1.{}'.format(hashlib.sha1(content_id.encode('utf-8')).hexdigest())
+
+    def get(self, content_id):
+        """
+        Returns the cached metadata of the asset with the given id, NOT_FOUND if
+        the asset is cached as missing, or None if nothing is cached.
+        """
+        return self.cache.get(self.cache_key(content_id))
+
+    def set(self, content_id, metadata):
+        timeout = getattr(settings, 'COURSE_ASSET_METADATA_CACHE_TIMEOUT', 0)
+        if timeout:
+            self.cache.set(self.cache_key(content_id), metadata, timeout)
+
+    def set_not_found(self, content_id):
+        timeout = getattr(settings, 'COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT', 0)
+        if timeout:
+            self.cache.set(self.cache_key(content_id), NOT_FOUND, timeout)
+
+    def delete(self, content_id):
+        self.cache.delete(self.cache_key(content_id))
@@ -21,6 +21,12 @@ from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from xmodule.util.misc import escape_invalid_characters, get_library_or_course_attribute
 
 from .content import ContentStore, StaticContent, StaticContentStream
+from .metadata_cache import NOT_FOUND, AssetMetadataCache
+
+# The fields of GridFS files documents that make up the metadata of assets.
+METADATA_FIELDS = (
+    'displayname', 'contentType', 'uploadDate', 'thumbnail_location', 'import_path', 'length', 'locked', 'custom_md5',
+)
 
 
 class MongoContentStore(ContentStore):
@@ -49,6 +55,7 @@ class MongoContentStore(ContentStore):
             **kwargs
         }
         self.bucket = bucket
+        self.metadata_cache = AssetMetadataCache()
         self.do_connection()
 
     def do_connection(self):
@@ -150,6 +157,8 @@ class MongoContentStore(ContentStore):
                     fp.write(content.data)
                     fp.custom_md5 = hashlib.md5(content.data).hexdigest()
 
+        # Metadata may have been cached while the file was written.
+        self.metadata_cache.delete(content_id)
         return content
 
     def delete(self, location_or_id):
@@ -160,6 +169,7 @@ class MongoContentStore(ContentStore):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
+        self.metadata_cache.delete(location_or_id)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):  # pylint: disable=arguments-differ
         content_id, __ = self.asset_db_key(location)
@@ -211,6 +221,42 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
+    def find_metadata(self, location, throw_on_not_found=True):
+        """
+        Returns a StaticContent with the metadata of the asset at the given location, and no data.
+
+        The metadata, or the absence of the asset, is cached, so that requests that
+        don't need the content of an asset, like conditional requests and requests
+        for missing assets, are answered without reading the asset from mongo.
+        """
+        content_id, __ = self.asset_db_key(location)
+        metadata = self.metadata_cache.get(content_id)
+        if metadata is None:
+            metadata = self.fs_files.find_one({'_id': content_id}, dict.fromkeys(METADATA_FIELDS, 1))
+            if metadata is None:
+                self.metadata_cache.set_not_found(content_id)
+                metadata = NOT_FOUND
+            else:
+                metadata.pop('_id', None)
+                self.metadata_cache.set(content_id, metadata)
+
+        if metadata == NOT_FOUND:
+            if throw_on_not_found:
+                raise NotFoundError(content_id)
+            return None
+
+        thumbnail_location = metadata.get('thumbnail_location')
+        if thumbnail_location:
+            thumbnail_location = location.course_key.make_asset_key('thumbnail', thumbnail_location[4])
+        return StaticContent(
+            location, metadata.get('displayname'), metadata.get('contentType'), None,
+            last_modified_at=metadata.get('uploadDate'),
+            thumbnail_location=thumbnail_location,
+            import_path=metadata.get('import_path'),
+            length=metadata.get('length'), locked=metadata.get('locked', False),
+            content_digest=metadata.get('custom_md5'),
+        )
+
     def export(self, location, output_directory):  # pylint: disable=missing-function-docstring
         content = self.find(location)
 
@@ -283,6 +329,7 @@ class MongoContentStore(ContentStore):
             items = self.fs_files.find(query)
             for asset in items:
                 self.fs.delete(asset[prefix])
+                self.metadata_cache.delete(asset[prefix])
                 assets_to_delete += 1
 
             self.fs_files.remove(query)
@@ -396,6 +443,7 @@ class MongoContentStore(ContentStore):
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
         result = self.fs_files.update_one({'_id': asset_db_key}, {"$set": attr_dict}, upsert=False)
+        self.metadata_cache.delete(asset_db_key)
         if result.matched_count == 0:
             raise NotFoundError(asset_db_key)
 
@@ -471,6 +519,7 @@ class MongoContentStore(ContentStore):
             # getattr b/c caching may mean some pickled instances don't have attr
             locked=asset.get('locked', False)
         )
+        self.metadata_cache.delete(asset_id)
 
     def delete_all_course_assets(self, course_key):
         """
@@ -483,6 +532,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+            self.metadata_cache.delete(asset_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
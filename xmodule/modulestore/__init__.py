@@ -118,10 +118,17 @@ class BulkOpsRecord:
     """
     For handling nesting of bulk operations
     """
+    # The most usage keys of published blocks that are recorded; beyond
+    # that, the published blocks are treated as unknown.
+    MAX_PUBLISHED_BLOCK_KEYS = 1000
+
     def __init__(self):
         self._active_count = 0
         self.has_publish_item = False
         self.has_library_updated_item = False
+        # The usage keys of the blocks that were published or deleted, or
+        # None if any publish in this bulk operation didn't specify its block.
+        self.published_block_keys = set()
         self._commit_callbacks = []
 
     @property
@@ -150,6 +157,18 @@ class BulkOpsRecord:
         """
         return self._active_count == 1
 
+    def record_published_block(self, usage_key):
+        """
+        Record that the block with the given usage key was published or deleted,
+        or, if usage_key is None, that unknown blocks were published.
+        """
+        if self.published_block_keys is None:
+            return
+        if usage_key is None or len(self.published_block_keys) >= self.MAX_PUBLISHED_BLOCK_KEYS:
+            self.published_block_keys = None
+        else:
+            self.published_block_keys.add(usage_key.for_branch(None))
+
     def defer_until_commit(self, fn):
         """
         Run some code when the changes from this bulk op are committed to the DB
@@ -172,6 +191,8 @@ class ActiveBulkThread(threading.local):
     def __init__(self, bulk_ops_record_type, **kwargs):
         super().__init__(**kwargs)
         self.records = defaultdict(bulk_ops_record_type)
+        # The published block keys of the courses whose course_published signal is being sent.
+        self.published_block_keys = {}
 
 
 class BulkOperationsMixin:
@@ -357,9 +378,33 @@ class BulkOperationsMixin:
         Sends out the signal that items have been published from within this course.
         """
         if self.signal_handler and bulk_ops_record.has_publish_item:
-            # We remove the branch, because publishing always means copying from draft to published
-            self.signal_handler.send("course_published", course_key=course_id.for_branch(None))
+            self._send_course_published_signal(course_id, bulk_ops_record.published_block_keys)
             bulk_ops_record.has_publish_item = False
+            bulk_ops_record.published_block_keys = set()
+
+    def _send_course_published_signal(self, course_key, published_block_keys):
+        """
+        Sends the course_published signal for the course, making the given usage keys
+        of the published blocks available to the receivers through get_published_block_keys.
+        """
+        # We remove the branch, because publishing always means copying from draft to published
+        course_key = course_key.for_branch(None)
+        self._active_bulk_ops.published_block_keys[course_key] = published_block_keys
+        try:
+            self.signal_handler.send("course_published", course_key=course_key)
+        finally:
+            del self._active_bulk_ops.published_block_keys[course_key]
+
+    def get_published_block_keys(self, course_key):
+        """
+        Returns the usage keys of the blocks that were published or deleted in the course,
+        to the receivers of its course_published signal.
+
+        Returns None if the published blocks are not known, or if no course_published signal
+        is being sent for the course.
+        """
+        published_block_keys = self._active_bulk_ops.published_block_keys.get(course_key.for_branch(None))
+        return frozenset(published_block_keys) if published_block_keys is not None else None
 
     def send_bulk_library_updated_signal(self, bulk_ops_record, library_id):
         """
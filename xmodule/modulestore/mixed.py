@@ -987,6 +987,27 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_id)
         return store.has_published_version(xblock)
 
+    def get_course_history_info(self, course_key):
+        """
+        Returns the history info of the structure of the given course, on the
+        branch that the current branch setting maps to.
+
+        Raises NotImplementedError if the course's store does not keep versions.
+        """
+        store = self._verify_modulestore_support(course_key, 'get_course_history_info')
+        return store.get_course_history_info(course_key)
+
+    def get_published_block_keys(self, course_key):
+        """
+        Returns the usage keys of the blocks that were published or deleted in the course,
+        to the receivers of its course_published signal, or None if they are not known.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_published_block_keys')
+        except NotImplementedError:
+            return None
+        return store.get_published_block_keys(course_key)
+
     @strip_key
     def publish(self, location, user_id, **kwargs):
         """
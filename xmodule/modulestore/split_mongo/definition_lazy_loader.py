@@ -12,22 +12,30 @@ class DefinitionLazyLoader:
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
+    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter, prefetch_ids=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param prefetch_ids: an optional set of the ids of other definitions to fetch along
+            with this one, shared with their lazy loaders, and emptied once fetched
         """
         self.modulestore = modulestore
         self.course_key = course_key
         self.definition_locator = DefinitionLocator(block_type, definition_id)
         self.field_converter = field_converter
+        self.prefetch_ids = prefetch_ids
 
     def fetch(self):
         """
         Fetch the definition. Note, the caller should replace this lazy
         loader pointer with the result so as not to fetch more than once
         """
+        if self.prefetch_ids:
+            prefetch_ids = list(self.prefetch_ids)
+            self.prefetch_ids.clear()
+            self.modulestore.prefetch_definitions(self.course_key, prefetch_ids)
+
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
@@ -3,18 +3,25 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 
 
+import copy
 import datetime
+import hashlib
 import logging
 import math
 import pickle
 import re
+import struct
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
 from time import time
 from zoneinfo import ZoneInfo
 
 import pymongo
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import InvalidCacheBackendError, caches
 from django.db.models import F
 from django.db.models.functions import Lower
@@ -195,14 +202,106 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class _CacheCodec:
+    """
+    A compression codec for cached course structures.
+    """
+    def __init__(self, name, codec_id, compress, decompress):
+        self.name = name
+        self.codec_id = codec_id
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _zstd_compress(data):
+    import zstandard  # pylint: disable=import-outside-toplevel
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data):
+    import zstandard  # pylint: disable=import-outside-toplevel
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _lz4_compress(data):
+    import lz4.frame  # pylint: disable=import-outside-toplevel
+    return lz4.frame.compress(data)
+
+
+def _lz4_decompress(data):
+    import lz4.frame  # pylint: disable=import-outside-toplevel
+    return lz4.frame.decompress(data)
+
+
+# 1 = Fastest (slightly larger results)
+ZLIB_CODEC = _CacheCodec('zlib', None, lambda data: zlib.compress(data, 1), zlib.decompress)
+
+# Codecs that can be selected with the COURSE_STRUCTURE_CACHE_CODEC setting,
+# along with the module that must be installed for each of them.
+CACHE_CODECS = {
+    'zlib': (ZLIB_CODEC, None),
+    'zstd': (_CacheCodec('zstd', b'Z', _zstd_compress, _zstd_decompress), 'zstandard'),
+    'lz4': (_CacheCodec('lz4', b'L', _lz4_compress, _lz4_decompress), 'lz4.frame'),
+}
+
+# Cached data compressed with zlib is stored as is, for compatibility with
+# data cached before codecs were configurable.  Data compressed with other
+# codecs starts with this prefix followed by the codec's id, which can never
+# be the start of a zlib stream.
+CODEC_PREFIX = b'CSC'
+
+# Prefix of the manifest stored in place of a structure that was split
+# into chunks.
+CHUNK_MANIFEST_PREFIX = b'CSCM'
+_CHUNK_MANIFEST = struct.Struct('<II40s')
+
+
+@lru_cache(maxsize=None)
+def _get_codec(name):
+    """
+    Returns the _CacheCodec with the given name, or None if the codec is
+    unknown or its library is not installed.
+    """
+    codec, module_name = CACHE_CODECS.get(name, (None, None))
+    if codec is not None and module_name is not None:
+        try:
+            __import__(module_name)
+        except ImportError:
+            log.warning("CourseStructureCache: %s is not installed, %s codec is not available", module_name, name)
+            return None
+    return codec
+
+
+def _get_codec_by_id(codec_id):
+    """
+    Returns the _CacheCodec with the given id, or None if not available.
+    """
+    for name, (codec, _) in CACHE_CODECS.items():
+        if codec.codec_id == codec_id:
+            return _get_codec(name)
+    return None
+
+
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    The compression codec is selected by the COURSE_STRUCTURE_CACHE_CODEC
+    setting, falling back to zlib if the codec is not available.
+
+    Compressed structures larger than the cache's maximum item size are only
+    cached if COURSE_STRUCTURE_CACHE_CHUNK_SIZE is set, in which case they are
+    split across multiple chunk keys.  The structure's key then holds a
+    manifest with the number of chunks and a checksum of the whole data.  The
+    chunk keys include the checksum, so chunks of different versions of the
+    data are never mixed.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    # Only data with a size smaller than this is cached as a single item.
+    MAX_ITEM_SIZE = 2 * 1024 * 1024
 
     def __init__(self):
         self.cache = None
@@ -221,6 +320,10 @@ class CourseStructureCache:
                 compressed_pickled_data = self.cache.get(key)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
+                if compressed_pickled_data is not None and compressed_pickled_data.startswith(CHUNK_MANIFEST_PREFIX):
+                    tagger.tag(chunked='true')
+                    compressed_pickled_data = self._get_chunks(key, compressed_pickled_data, tagger)
+
                 if compressed_pickled_data is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
@@ -228,7 +331,8 @@ class CourseStructureCache:
 
                 tagger.measure('compressed_size', len(compressed_pickled_data))
 
-                pickled_data = zlib.decompress(compressed_pickled_data)
+                with TIMER.timer("CourseStructureCache.decompress", course_context) as tagger_decompress:
+                    pickled_data = self._decompress(compressed_pickled_data, tagger_decompress)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
                 return pickle.loads(pickled_data, encoding='latin-1')
@@ -247,29 +351,178 @@ class CourseStructureCache:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
+            with TIMER.timer("CourseStructureCache.compress", course_context) as tagger_compress:
+                compressed_pickled_data = self._compress(pickled_data, tagger_compress)
             data_size = len(compressed_pickled_data)
             tagger.measure('compressed_size', data_size)
 
             # We rely on the course structure cache default timeout, which should be
             # high by default (~ a few days).
-            total_bytes_in_one_mb = 1024 * 1024
-            if data_size < total_bytes_in_one_mb * 2:  # Only data with a size smaller than 2MB will be cached
+            chunk_size = getattr(settings, 'COURSE_STRUCTURE_CACHE_CHUNK_SIZE', 0)
+            if data_size < self.MAX_ITEM_SIZE:
                 self.cache.set(key, compressed_pickled_data)
+            elif chunk_size:
+                tagger.tag(chunked='true')
+                self._set_chunks(key, compressed_pickled_data, min(chunk_size, self.MAX_ITEM_SIZE - 1), tagger)
             else:
-                chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
+                chunk_size_in_mbs = round(data_size / (1024 * 1024), 2)
 
                 # .. custom_attribute_name: split_mongo_compressed_size_in_mbs
                 # .. custom_attribute_description: contains the data chunk size in MBs. The size on which
                 #   the memcached client failed to store value in course structure cache.
                 monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', chunk_size_in_mbs)
 
+    @staticmethod
+    def _compress(data, tagger):
+        """
+        Compresses the given data with the configured codec.
+        """
+        codec = _get_codec(getattr(settings, 'COURSE_STRUCTURE_CACHE_CODEC', 'zlib')) or ZLIB_CODEC
+        tagger.tag(codec=codec.name)
+        compressed_data = codec.compress(data)
+        if codec.codec_id is None:
+            return compressed_data
+        return CODEC_PREFIX + codec.codec_id + compressed_data
+
+    @staticmethod
+    def _decompress(data, tagger):
+        """
+        Decompresses the given data with the codec it was compressed with.
+
+        Raises ValueError if that codec is not available.
+        """
+        if not data.startswith(CODEC_PREFIX):
+            tagger.tag(codec=ZLIB_CODEC.name)
+            return ZLIB_CODEC.decompress(data)
+
+        codec_id = data[len(CODEC_PREFIX):len(CODEC_PREFIX) + 1]
+        codec = _get_codec_by_id(codec_id)
+        if codec is None:
+            raise ValueError(f"Unavailable course structure cache codec: {codec_id}")
+        tagger.tag(codec=codec.name)
+        return codec.decompress(memoryview(data)[len(CODEC_PREFIX) + 1:])
+
+    @staticmethod
+    def _chunk_keys(key, num_chunks, checksum):
+        """
+        Returns the cache keys of the chunks of the given key's data.
+        """
+        return [f'{key}:{checksum}:{index}' for index in range(num_chunks)]
+
+    def _set_chunks(self, key, data, chunk_size, tagger):
+        """
+        Caches the given data in chunks of at most chunk_size bytes, and
+        then the manifest of those chunks under the given key.
+        """
+        checksum = hashlib.sha1(data).hexdigest()
+        num_chunks = math.ceil(len(data) / chunk_size)
+        chunk_keys = self._chunk_keys(key, num_chunks, checksum)
+        tagger.measure('chunks', num_chunks)
+
+        failed_keys = self.cache.set_many({
+            chunk_key: data[index * chunk_size:(index + 1) * chunk_size]
+            for index, chunk_key in enumerate(chunk_keys)
+        })
+        if failed_keys:
+            log.warning(
+                "CourseStructureCache: Failed to cache %d of %d chunks for %s",
+                len(failed_keys), num_chunks, key,
+            )
+            return
+
+        # The manifest is only written once all chunks are cached, so readers
+        # never find a manifest for chunks that were not written.
+        self.cache.set(key, CHUNK_MANIFEST_PREFIX + _CHUNK_MANIFEST.pack(num_chunks, len(data), checksum.encode()))
+
+    def _get_chunks(self, key, manifest, tagger):
+        """
+        Returns the data described by the given manifest, reassembled from
+        its chunks, or None if any of the chunks was evicted.
+
+        Raises ValueError if the reassembled data doesn't match the manifest.
+        """
+        num_chunks, data_size, checksum = _CHUNK_MANIFEST.unpack(manifest[len(CHUNK_MANIFEST_PREFIX):])
+        checksum = checksum.decode()
+        tagger.measure('chunks', num_chunks)
+
+        chunk_keys = self._chunk_keys(key, num_chunks, checksum)
+        chunks = self.cache.get_many(chunk_keys)
+        if len(chunks) != num_chunks:
+            log.info("CourseStructureCache: %d of %d chunks missing for %s", num_chunks - len(chunks), num_chunks, key)
+            tagger.tag(chunks_missing='true')
+            self.cache.delete(key)
+            return None
+
+        data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+        if len(data) != data_size or hashlib.sha1(data).hexdigest() != checksum:
+            raise ValueError(f"Chunked course structure data does not match its manifest: {key}")
+        return data
+
+
+class DefinitionCache:
+    """
+    A size-bounded, process-wide LRU cache of definitions, keyed by their id.
+
+    Definitions are never changed once they are saved, so cached definitions
+    can't go stale.  Callers may change the definitions they are given,
+    though, so copies of the cached definitions are handed out.
+
+    The cache holds up to COURSE_DEFINITION_CACHE_SIZE definitions, and is
+    disabled if that is 0.
+    """
+    def __init__(self):
+        self._definitions = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'COURSE_DEFINITION_CACHE_SIZE', 0)
+
+    def get_many(self, ids):
+        """
+        Returns a dict of copies of the cached definitions with the given ids.
+        """
+        if not self.max_size:
+            return {}
+        found = {}
+        with self._lock:
+            for definition_id in ids:
+                definition = self._definitions.get(definition_id)
+                if definition is not None:
+                    self._definitions.move_to_end(definition_id)
+                    found[definition_id] = definition
+        return {definition_id: copy.deepcopy(definition) for definition_id, definition in found.items()}
+
+    def set_many(self, definitions):
+        """
+        Caches copies of the given definitions, evicting the least recently
+        used ones beyond the cache's size.
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+        copies = [copy.deepcopy(definition) for definition in definitions if definition is not None]
+        with self._lock:
+            for definition in copies:
+                self._definitions[definition['_id']] = definition
+                self._definitions.move_to_end(definition['_id'])
+            while len(self._definitions) > max_size:
+                self._definitions.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._definitions.clear()
+
+
+DEFINITION_CACHE = DefinitionCache()
+
 
 class MongoPersistenceBackend:
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
+    # The maximum number of definitions fetched by each query of get_definitions.
+    DEFINITIONS_QUERY_CHUNK_SIZE = 1000
 
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
@@ -546,19 +799,35 @@ class MongoPersistenceBackend:
         Get the definition from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_definition", course_context) as tagger:
-            definition = self.definitions.find_one({'_id': key})
+            definition = DEFINITION_CACHE.get_many([key]).get(key)
+            tagger.tag(from_cache=str(definition is not None).lower())
+            if definition is None:
+                definition = self.definitions.find_one({'_id': key})
+                DEFINITION_CACHE.set_many([definition])
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
 
     def get_definitions(self, definitions, course_context=None):
         """
-        Retrieve all definitions listed in `definitions`.
+        Retrieve all definitions listed in `definitions`, from the definition
+        cache or else with one query per DEFINITIONS_QUERY_CHUNK_SIZE ids.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            cached_definitions = DEFINITION_CACHE.get_many(definitions)
+            tagger.measure('from_cache', len(cached_definitions))
+
+            found_definitions = list(cached_definitions.values())
+            missing_ids = [definition_id for definition_id in definitions if definition_id not in cached_definitions]
+            for index in range(0, len(missing_ids), self.DEFINITIONS_QUERY_CHUNK_SIZE):
+                chunk = missing_ids[index:index + self.DEFINITIONS_QUERY_CHUNK_SIZE]
+                with TIMER.timer("get_definitions.find", course_context) as tagger_find:
+                    tagger_find.measure('definitions', len(chunk))
+                    definitions_from_db = list(self.definitions.find({'_id': {'$in': chunk}}))
+                DEFINITION_CACHE.set_many(definitions_from_db)
+                found_definitions.extend(definitions_from_db)
+            return found_definitions
 
     def insert_definition(self, definition, course_context=None):
         """
@@ -609,6 +878,7 @@ class MongoPersistenceBackend:
         If connections is True, then close the connection to the database as well.
         """
         RequestCache(namespace="course_index_cache").clear()
+        DEFINITION_CACHE.clear()
 
         self.ensure_connection()
         connection = self.database.client
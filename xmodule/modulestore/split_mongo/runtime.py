@@ -74,6 +74,8 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        # Map of definition id -> the shared set of definition ids to fetch along with it
+        self.definition_prefetch_ids = {}
 
         user = get_current_user()
         user_id = user.id if user else None
@@ -289,6 +291,7 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
                 block_key.type,
                 definition_id,
                 convert_fields,
+                prefetch_ids=self.definition_prefetch_ids.pop(definition_id, None),
             )
         else:
             definition_loader = None
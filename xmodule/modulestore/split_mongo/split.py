@@ -93,7 +93,12 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError,
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
-from xmodule.modulestore.split_mongo.mongo_connection import DjangoFlexPersistenceBackend, DuplicateKeyError
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    DEFINITION_CACHE,
+    DjangoFlexPersistenceBackend,
+    DuplicateKeyError,
+)
+from xmodule.modulestore.split_mongo.structure_index import STRUCTURE_INDEX_CACHE, StructureIndex
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.keys import BlockKey, derive_key
@@ -348,6 +353,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        STRUCTURE_INDEX_CACHE.discard(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
@@ -412,6 +418,21 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             definition_guid = course_key.as_object_id(definition_guid)
             return self.db_connection.get_definition(definition_guid, course_key)
 
+    def prefetch_definitions(self, course_key, ids):
+        """
+        Fetch the definitions specified in ``ids`` in a single query, so that subsequent
+        calls to get_definition for them don't query the database, provided that the
+        fetched definitions are kept: within a bulk operation on course_key, or in the
+        definition cache. Otherwise, nothing is fetched.
+
+        Arguments:
+            course_key (:class:`.CourseKey`): The course that these definitions are being loaded
+                for (to respect bulk operations).
+            ids (list): A list of definition ids
+        """
+        if ids and (self._is_in_bulk_operation(course_key) or DEFINITION_CACHE.max_size > 0):
+            self.get_definitions(course_key, ids)
+
     def get_definitions(self, course_key, ids):
         """
         Return all definitions that specified in ``ids``.
@@ -634,6 +655,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     DEFAULT_ROOT_LIBRARY_BLOCK_TYPE = 'library'
     DEFAULT_ROOT_COURSE_BLOCK_TYPE = 'course'
 
+    # The definitions of lazily loaded subtrees of up to this many blocks are
+    # fetched together when the definition of one of their blocks is accessed.
+    DEFINITION_PREFETCH_MAX_BLOCKS = 200
+
     def __init__(self, contentstore, doc_store_config, fs_root, render_template,
                  default_class=None,
                  error_tracker=null_error_tracker,
@@ -701,6 +726,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # drop the assets
         super()._drop_database(database, collections, connections)
 
+        STRUCTURE_INDEX_CACHE.clear()
+
         self.db_connection._drop_database(database, collections, connections)  # pylint: disable=protected-access
 
     def cache_items(self, system, base_block_ids, course_key, depth=0, lazy=True):
@@ -746,6 +773,17 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+            elif 1 < len(new_block_data) <= self.DEFINITION_PREFETCH_MAX_BLOCKS:
+                # Lazy loading of a subtree: once the definition of one of its blocks is
+                # accessed, fetch the definitions that the other blocks would otherwise
+                # each fetch on first access along with it (see prefetch_definitions).
+                definition_ids = {
+                    block.definition
+                    for block in new_block_data.values()
+                    if not block.definition_loaded and not isinstance(block.definition, LocalId)
+                }
+                for definition_id in definition_ids:
+                    system.definition_prefetch_ids[definition_id] = definition_ids
 
             system.module_data.update(new_block_data)
             return system.module_data
@@ -1213,18 +1251,33 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         def _block_matches_all(block_data):
             """
-            Check that the block matches all the criteria
+            Check that the block matches the criteria which don't require loading any additional data
             """
-            # do the checks which don't require loading any additional data
-            if (
+            return (
                 self._block_matches(block_data, qualifiers) and
                 self._block_matches(block_data.fields, settings)
-            ):
-                if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
-                    return self._block_matches(definition_block['fields'], content)
-                else:
-                    return True
+            )
+
+        def _content_matches(block_ids):
+            """
+            Return the given block ids whose definitions match the content criteria, fetching
+            all of their definitions at once
+            """
+            if not content:
+                return block_ids
+            blocks = course.structure['blocks']
+            definitions = {
+                definition['_id']: definition
+                for definition in self.get_definitions(
+                    course_locator, [blocks[block_id].definition for block_id in block_ids],
+                )
+            }
+            return [
+                block_id
+                for block_id in block_ids
+                if blocks[block_id].definition in definitions and
+                self._block_matches(definitions[blocks[block_id].definition]['fields'], content)
+            ]
 
         if settings is None:
             settings = {}
@@ -1246,7 +1299,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 if name_matches and _block_matches_all(block):
                     block_ids.append(block_id)
 
-            return self._load_items(course, block_ids, **kwargs)
+            return self._load_items(course, _content_matches(block_ids), **kwargs)
 
         if 'category' in qualifiers:
             qualifiers['block_type'] = qualifiers.pop('category')
@@ -1255,30 +1308,43 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
-
-        if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+        structure_index = self._get_structure_index(course)
+        blocks = course.structure['blocks']
+        block_ids = structure_index.get_candidate_block_keys(course.structure, qualifiers, settings)
+        if block_ids is None:
+            block_ids = structure_index.block_keys
 
-        for block_id, value in course.structure['blocks'].items():
-            if _block_matches_all(value):
+        for block_id in block_ids:
+            if _block_matches_all(blocks[block_id]):
                 if not include_orphans:
                     if (
                         block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
+                        structure_index.has_path_to_root(block_id)
                     ):
                         items.append(block_id)
                 else:
                     items.append(block_id)
 
+        items = _content_matches(items)
         if len(items) > 0:
             return self._load_items(course, items, depth=0, **kwargs)
         else:
             return []
 
+    def _get_structure_index(self, course):
+        """
+        Returns the StructureIndex of the given course envelope's structure.
+
+        Structures that are still being edited in an active bulk operation
+        may change in place, so their indexes are built anew each time
+        rather than cached.
+        """
+        structure = course.structure
+        bulk_write_record = self._get_bulk_ops_record(course.course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return StructureIndex(structure)
+        return STRUCTURE_INDEX_CACHE.get(structure)
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1308,6 +1374,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         :return Bool: whether or not component has path to the root
         """
+        if path_cache is None and parents_cache is None:
+            return self._get_structure_index(course).has_path_to_root(block_key)
 
         if path_cache and block_key in path_cache:
             return path_cache[block_key]
@@ -1315,7 +1383,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if parents_cache is None:
             xblock_parents = self._get_parents_from_structure(block_key, course.structure)
         else:
-            xblock_parents = parents_cache[block_key]
+            xblock_parents = parents_cache.get(block_key, [])
 
         if len(xblock_parents) == 0 and block_key.type in ["course", "library"]:
             # Found, xblock has the path to the root
@@ -1347,14 +1415,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        structure_index = self._get_structure_index(course)
+        all_parent_ids = structure_index.get_parents(BlockKey.from_usage_key(locator))
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
         parent_ids = [
             valid_parent
             for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            if structure_index.has_path_to_root(valid_parent)
         ]
 
         if len(parent_ids) == 0:
@@ -1378,16 +1447,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         detached_categories = [name for name, __ in XBlock.load_tagged_classes("detached")]
         course = self._lookup_course(course_key)
-        items = set(course.structure['blocks'].keys())
-        items.remove(course.structure['root'])
+        root = course.structure['root']
         blocks = course.structure['blocks']
-        for block_id, block_data in blocks.items():
-            items.difference_update(BlockKey(*child) for child in block_data.fields.get('children', []))
-            if block_data.block_type in detached_categories:
-                items.discard(block_id)
         return [
             course_key.make_usage_key(block_type=block_id.type, block_id=block_id.id)
-            for block_id in items
+            for block_id in self._get_structure_index(course).get_parentless_block_keys()
+            if block_id != root and blocks[block_id].block_type not in detached_categories
         ]
 
     def get_course_index_info(self, course_key):
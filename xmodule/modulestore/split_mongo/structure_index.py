@@ -0,0 +1,159 @@
+"""
+Lookup tables over the blocks of a split modulestore structure, so that
+queries such as get_items and get_parent_location don't have to scan every
+block of the structure.
+
+Structures are never changed once they are saved, so the index of a saved
+structure is cached in the process by the structure's id.
+"""
+
+
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+# Blocks of these types with no parents are roots of a structure.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex:
+    """
+    The block keys of a structure by block type, the parents of each
+    block, the blocks with a path to a root, and (built on first use)
+    postings of the blocks by the value of a settings field.
+
+    Block keys are always listed in the order of structure['blocks'].
+    """
+    def __init__(self, structure):
+        self.structure_id = structure['_id']
+        self.block_keys = list(structure['blocks'])
+        self.block_keys_by_type = defaultdict(list)
+        self.parents = defaultdict(list)
+        children = {}
+        for block_key, block_data in structure['blocks'].items():
+            self.block_keys_by_type[block_data.block_type].append(block_key)
+            children[block_key] = block_data.fields.get('children', [])
+            for child_key in children[block_key]:
+                self.parents[BlockKey(*child_key)].append(block_key)
+
+        # Walk down from the roots, rather than up from each block.
+        self._rooted_keys = set()
+        unvisited = [
+            block_key for block_key in self.block_keys
+            if block_key.type in ROOT_BLOCK_TYPES and block_key not in self.parents
+        ]
+        while unvisited:
+            block_key = unvisited.pop()
+            if block_key not in self._rooted_keys:
+                self._rooted_keys.add(block_key)
+                unvisited.extend(BlockKey(*child_key) for child_key in children.get(block_key, []))
+
+        self._postings = {}
+
+    def get_parents(self, block_key):
+        """
+        Returns the keys of the blocks that have block_key as a child.
+        """
+        return self.parents.get(block_key, [])
+
+    def has_path_to_root(self, block_key):
+        """
+        Returns whether block_key is a root, or the descendant of a root.
+        """
+        return block_key in self._rooted_keys or (
+            block_key.type in ROOT_BLOCK_TYPES and block_key not in self.parents
+        )
+
+    def get_parentless_block_keys(self):
+        """
+        Returns the keys of the blocks that aren't the child of any block.
+        """
+        return [block_key for block_key in self.block_keys if block_key not in self.parents]
+
+    def get_block_keys_with_value(self, structure, field_name, value):
+        """
+        Returns the keys of the blocks whose settings field_name equals
+        value, or is a list containing value.  value must be hashable.
+
+        structure is the indexed structure, from which the postings of
+        field_name are built the first time it is queried.
+        """
+        postings = self._postings.get(field_name)
+        if postings is None:
+            postings = defaultdict(list)
+            for block_key, block_data in structure['blocks'].items():
+                if field_name not in block_data.fields:
+                    continue
+                field_value = block_data.fields[field_name]
+                for target in (field_value if isinstance(field_value, list) else [field_value]):
+                    try:
+                        postings[target].append(block_key)
+                    except TypeError:
+                        # Unhashable values can't equal a hashable one.
+                        pass
+            self._postings[field_name] = postings
+        return postings.get(value, [])
+
+    def get_candidate_block_keys(self, structure, qualifiers, settings):
+        """
+        Returns the keys of the blocks that may match the given get_items
+        qualifiers and settings, which must still be checked against each
+        block, or None if the index can't narrow them down.
+        """
+        candidates = None
+        block_type = qualifiers.get('block_type')
+        if isinstance(block_type, str):
+            candidates = self.block_keys_by_type.get(block_type, [])
+
+        for field_name, criteria in settings.items():
+            if not isinstance(criteria, (str, int, float, BlockKey)):
+                continue
+            block_keys = self.get_block_keys_with_value(structure, field_name, criteria)
+            if candidates is None or len(block_keys) < len(candidates):
+                candidates = block_keys
+        return candidates
+
+
+class StructureIndexCache:
+    """
+    A process-wide, size-bounded LRU cache of the indexes of saved
+    structures, keyed by structure id.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._indexes = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, structure):
+        """
+        Returns the index of the given saved structure, building and
+        caching it if needed.
+        """
+        structure_id = structure['_id']
+        with self._lock:
+            index = self._indexes.get(structure_id)
+            if index is not None:
+                self._indexes.move_to_end(structure_id)
+                return index
+
+        index = StructureIndex(structure)
+        with self._lock:
+            self._indexes[structure_id] = index
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+        return index
+
+    def discard(self, structure_id):
+        """
+        Drops the index of the given structure, if cached.
+        """
+        with self._lock:
+            self._indexes.pop(structure_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+STRUCTURE_INDEX_CACHE = StructureIndexCache(max_size=32)
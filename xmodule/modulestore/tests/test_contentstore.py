@@ -8,11 +8,14 @@ import mimetypes
 import shutil
 import unittest
 from tempfile import mkdtemp
+from unittest.mock import patch
 from uuid import uuid4
 
 import ddt
 import path
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test.utils import override_settings
 from opaque_keys.edx.keys import AssetKey
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
 
@@ -222,3 +225,75 @@ class TestContentstore(unittest.TestCase):
         # ensure it didn't remove any from other course
         __, count = self.contentstore.get_all_content_for_course(self.course2_key)
         assert count == len(self.course2_files)
+
+    def use_metadata_cache(self):
+        """
+        Caches the metadata of assets in a local memory cache, and returns a mock
+        counting the queries of files documents.
+        """
+        self.contentstore.metadata_cache.cache = LocMemCache(f'asset_metadata_{uuid4().hex}', {})
+        patcher = patch.object(self.contentstore, 'fs_files', wraps=self.contentstore.fs_files)
+        self.addCleanup(patcher.stop)
+        return patcher.start().find_one
+
+    @ddt.data(True, False)
+    @override_settings(COURSE_ASSET_METADATA_CACHE_TIMEOUT=3600, COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT=60)
+    def test_find_metadata(self, deprecated):
+        """
+        Test that the metadata of assets is cached, and is the same as found with their content
+        """
+        self.set_up_assets(deprecated)
+        mock_find_one = self.use_metadata_cache()
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[1])
+        content = self.contentstore.find(asset_key)
+
+        for _ in range(2):
+            metadata = self.contentstore.find_metadata(asset_key)
+            assert metadata.data is None
+            for propname in ['location', 'name', 'content_type', 'length', 'locked', 'last_modified_at',
+                             'content_digest', 'import_path', 'thumbnail_location']:
+                assert getattr(metadata, propname) == getattr(content, propname)
+        assert mock_find_one.call_count == 1
+
+    @ddt.data(True, False)
+    @override_settings(COURSE_ASSET_METADATA_CACHE_TIMEOUT=3600, COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT=60)
+    def test_find_metadata_invalidated(self, deprecated):
+        """
+        Test that the cached metadata of assets is invalidated when they change, including missing assets
+        """
+        self.set_up_assets(deprecated)
+        mock_find_one = self.use_metadata_cache()
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        locked = self.contentstore.find_metadata(asset_key).locked
+
+        self.contentstore.set_attr(asset_key, 'locked', not locked)
+        assert self.contentstore.find_metadata(asset_key).locked == (not locked)
+
+        self.contentstore.delete(asset_key)
+        with pytest.raises(NotFoundError):
+            self.contentstore.find_metadata(asset_key)
+        assert self.contentstore.find_metadata(asset_key, throw_on_not_found=False) is None
+        assert mock_find_one.call_count == 3
+
+        self.save_asset(self.course1_files[0], asset_key, self.course1_files[0], locked)
+        assert self.contentstore.find_metadata(asset_key).locked == locked
+
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        with pytest.raises(NotFoundError):
+            self.contentstore.find_metadata(asset_key)
+
+    @ddt.data(True, False)
+    @override_settings(COURSE_ASSET_METADATA_CACHE_TIMEOUT=0, COURSE_ASSET_NOT_FOUND_CACHE_TIMEOUT=0)
+    def test_find_metadata_not_cached(self, deprecated):
+        """
+        Test that the metadata of assets isn't cached when its timeouts are 0
+        """
+        self.set_up_assets(deprecated)
+        mock_find_one = self.use_metadata_cache()
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        missing_key = self.course1_key.make_asset_key('asset', 'missing.jpg')
+
+        for _ in range(2):
+            assert self.contentstore.find_metadata(asset_key) is not None
+            assert self.contentstore.find_metadata(missing_key, throw_on_not_found=False) is None
+        assert mock_find_one.call_count == 4
@@ -139,7 +139,8 @@ class CountMongoCallsCourseTraversal(TestCase):
         # These two lines show the way this traversal *should* be done
         # (if you'll eventually access all the fields and load all the definitions anyway).
         (MIXED_SPLIT_MODULESTORE_BUILDER, None, False, True, 2),
-        (MIXED_SPLIT_MODULESTORE_BUILDER, None, True, True, 37),
+        # Lazily loading the whole course fetches the definitions of its blocks in one query, on first access.
+        (MIXED_SPLIT_MODULESTORE_BUILDER, None, True, True, 3),
         (MIXED_SPLIT_MODULESTORE_BUILDER, 0, False, True, 37),
         (MIXED_SPLIT_MODULESTORE_BUILDER, 0, True, True, 37),
         (MIXED_SPLIT_MODULESTORE_BUILDER, None, False, False, 2),
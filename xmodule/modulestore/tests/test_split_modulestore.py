@@ -15,6 +15,7 @@ import ddt
 import pytest
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from xblock.fields import Date, Reference, ReferenceList, ReferenceValueDict, Timedelta
 
@@ -33,7 +34,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import CHUNK_MANIFEST_PREFIX, CourseStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -770,6 +771,7 @@ class SplitModuleCourseTests(SplitModuleTest):
         assert root_block_key.block_id == 'course'
 
 
+@ddt.ddt
 class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
     """Tests for the CourseStructureCache"""
 
@@ -873,6 +875,64 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         mock_set_cache.assert_called()
         mock_set_custom_attribute.assert_not_called()
 
+    @override_settings(COURSE_STRUCTURE_CACHE_CHUNK_SIZE=1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunked(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        # random data doesn't compress, so it is split into several chunks
+        data_chunk = os.urandom(3 * 1024 * 1024)
+        course_cache.set('my_data_chunk', data_chunk)
+        assert enabled_cache.get('my_data_chunk').startswith(CHUNK_MANIFEST_PREFIX)
+        assert course_cache.get('my_data_chunk') == data_chunk
+
+    @override_settings(COURSE_STRUCTURE_CACHE_CHUNK_SIZE=1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunk_evicted(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        course_cache.set('my_data_chunk', os.urandom(3 * 1024 * 1024))
+        with patch.object(enabled_cache, 'get_many', side_effect=lambda keys: {keys[0]: b'chunk'}):
+            assert course_cache.get('my_data_chunk') is None
+
+        # the manifest of the incomplete data is removed
+        assert enabled_cache.get('my_data_chunk') is None
+
+    @override_settings(COURSE_STRUCTURE_CACHE_CHUNK_SIZE=1024 * 1024)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_chunk_corrupted(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        course_cache.set('my_data_chunk', os.urandom(3 * 1024 * 1024))
+        with patch.object(
+            enabled_cache, 'get_many', side_effect=lambda keys: {key: b'\x00' * 1024 * 1024 for key in keys},
+        ):
+            assert course_cache.get('my_data_chunk') is None
+
+        assert enabled_cache.get('my_data_chunk') is None
+
+    @ddt.data('zlib', 'zstd', 'lz4', 'unknown')
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_codecs(self, codec, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+
+        # Codecs whose library is not installed, as well as unknown codecs,
+        # fall back to zlib.
+        structure = {'blocks': list(range(1000))}
+        with override_settings(COURSE_STRUCTURE_CACHE_CODEC=codec):
+            course_cache.set('my_structure', structure)
+
+        # Cached data can be read regardless of the current codec setting.
+        assert course_cache.get('my_structure') == structure
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
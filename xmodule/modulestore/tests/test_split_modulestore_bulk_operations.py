@@ -6,12 +6,13 @@ Tests for bulk operations in Split Modulestore.
 
 import copy
 import unittest
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
 import ddt
 from bson.objectid import ObjectId
-from opaque_keys.edx.locator import CourseLocator
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 
+from xmodule.modulestore import BulkOpsRecord
 from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
 from xmodule.modulestore.split_mongo.split import SplitBulkWriteMixin
 
@@ -647,3 +648,56 @@ class TestBulkWriteMixinOpenAfterPrevTransaction(TestBulkWriteMixinOpen, TestBul
     Test that operations on with an open transaction aren't affected by a previously executed transaction
     """
     pass  # pylint: disable=unnecessary-pass
+
+
+class TestBulkWriteMixinPublishedBlockKeys(TestBulkWriteMixin):
+    """
+    Tests of the usage keys of the published blocks made available to the receivers of the course_published signal.
+    """
+    def setUp(self):
+        super().setUp()
+        self.published_block_keys = []
+        self.bulk.signal_handler = Mock(name='signal_handler')
+        self.bulk.signal_handler.send.side_effect = self._record_published_block_keys
+        self.usage_key = BlockUsageLocator(self.course_key, 'html', 'html_a')
+        self.usage_key_b = BlockUsageLocator(self.course_key, 'html', 'html_b')
+
+    def _record_published_block_keys(self, signal_name, course_key):
+        if signal_name == 'course_published':
+            self.published_block_keys.append(self.bulk.get_published_block_keys(course_key))
+
+    def _publish(self, *usage_keys):
+        """
+        Records the publish of the given blocks within a bulk operation.
+        """
+        self.bulk._begin_bulk_operation(self.course_key)
+        bulk_ops_record = self.bulk._get_bulk_ops_record(self.course_key)
+        for usage_key in usage_keys:
+            bulk_ops_record.has_publish_item = True
+            bulk_ops_record.record_published_block(usage_key)
+        self.bulk._end_bulk_operation(self.course_key)
+
+    def test_published_block_keys(self):
+        self._publish(self.usage_key, self.usage_key_b, self.usage_key)
+        assert self.published_block_keys == [
+            frozenset([self.usage_key.for_branch(None), self.usage_key_b.for_branch(None)]),
+        ]
+        # The keys are only available while the signal is sent.
+        assert self.bulk.get_published_block_keys(self.course_key) is None
+
+    def test_published_block_keys_reset_between_bulk_operations(self):
+        self._publish(self.usage_key)
+        self._publish(self.usage_key_b)
+        assert self.published_block_keys == [
+            frozenset([self.usage_key.for_branch(None)]),
+            frozenset([self.usage_key_b.for_branch(None)]),
+        ]
+
+    def test_unknown_published_block(self):
+        self._publish(self.usage_key, None, self.usage_key_b)
+        assert self.published_block_keys == [None]
+
+    @patch.object(BulkOpsRecord, 'MAX_PUBLISHED_BLOCK_KEYS', 1)
+    def test_too_many_published_blocks(self):
+        self._publish(self.usage_key, self.usage_key_b)
+        assert self.published_block_keys == [None]
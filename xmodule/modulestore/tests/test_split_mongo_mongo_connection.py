@@ -5,10 +5,11 @@ import unittest
 from unittest.mock import patch
 
 import pytest
+from django.test import override_settings
 from pymongo.errors import ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+from xmodule.modulestore.split_mongo.mongo_connection import DEFINITION_CACHE, MongoPersistenceBackend
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -23,3 +24,47 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
         with pytest.raises(HeartbeatFailure):
             useless_conn.heartbeat()
+
+
+class TestGetDefinitions(unittest.TestCase):
+    """ Test that definitions are fetched in chunks, and cached when the definition cache is enabled """
+
+    @patch('pymongo.mongo_client.MongoClient')
+    def setUp(self, MockClient):  # pylint: disable=arguments-differ
+        # pylint: disable=W0613
+        super().setUp()
+        self.connection = MongoPersistenceBackend('useless', 'useless', 'useless')
+        self.connection.definitions.find.side_effect = lambda query: [
+            {'_id': definition_id, 'block_type': 'html', 'fields': {}} for definition_id in query['_id']['$in']
+        ]
+        DEFINITION_CACHE.clear()
+        self.addCleanup(DEFINITION_CACHE.clear)
+
+    def test_chunked_queries(self):
+        with patch.object(MongoPersistenceBackend, 'DEFINITIONS_QUERY_CHUNK_SIZE', 2):
+            definitions = self.connection.get_definitions(['a', 'b', 'c', 'd', 'e'])
+
+        assert [definition['_id'] for definition in definitions] == ['a', 'b', 'c', 'd', 'e']
+        assert self.connection.definitions.find.call_count == 3
+
+    def test_cache_disabled(self):
+        with override_settings(COURSE_DEFINITION_CACHE_SIZE=0):
+            self.connection.get_definitions(['a', 'b'])
+            self.connection.get_definitions(['a', 'b'])
+
+        assert self.connection.definitions.find.call_count == 2
+
+    def test_cache(self):
+        with override_settings(COURSE_DEFINITION_CACHE_SIZE=2):
+            self.connection.get_definitions(['a', 'b'])
+            definitions = self.connection.get_definitions(['a', 'b', 'c'])
+            assert self.connection.definitions.find.call_args[0][0] == {'_id': {'$in': ['c']}}
+            assert sorted(definition['_id'] for definition in definitions) == ['a', 'b', 'c']
+
+            # Cached definitions are copies, which callers may change.
+            definitions[-1]['fields']['data'] = 'changed'
+            assert self.connection.get_definition('c')['fields'] == {}
+
+            # 'a' was evicted as the least recently used definition.
+            self.connection.get_definitions(['a'])
+            assert self.connection.definitions.find.call_args[0][0] == {'_id': {'$in': ['a']}}
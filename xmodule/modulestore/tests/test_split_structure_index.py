@@ -0,0 +1,105 @@
+""" Test the StructureIndex of split modulestore structures """
+
+
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex, StructureIndexCache
+
+COURSE = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'chapter')
+SEQUENTIAL = BlockKey('sequential', 'sequential')
+PROBLEM_1 = BlockKey('problem', 'problem_1')
+PROBLEM_2 = BlockKey('problem', 'problem_2')
+ORPHAN = BlockKey('vertical', 'orphan')
+ORPHAN_CHILD = BlockKey('problem', 'orphan_child')
+
+
+def make_structure():
+    """
+    Returns a structure with a course tree and an orphaned subtree.
+    """
+    blocks = {}
+    for block_key, fields in (
+        (COURSE, {'children': [CHAPTER]}),
+        (CHAPTER, {'children': [SEQUENTIAL], 'display_name': 'Chapter'}),
+        (SEQUENTIAL, {'children': [PROBLEM_1, PROBLEM_2], 'graded': True}),
+        (PROBLEM_1, {'display_name': 'Problem', 'weight': 1, 'tags': ['a', 'b']}),
+        (PROBLEM_2, {'display_name': 'Problem', 'tags': [{'unhashable': 'value'}]}),
+        (ORPHAN, {'children': [ORPHAN_CHILD]}),
+        (ORPHAN_CHILD, {'display_name': 'Problem'}),
+    ):
+        blocks[block_key] = BlockData(block_type=block_key.type, fields=fields)
+    return {'_id': ObjectId(), 'root': COURSE, 'blocks': blocks}
+
+
+class TestStructureIndex(unittest.TestCase):
+    """
+    Test the lookups of StructureIndex.
+    """
+    def setUp(self):
+        super().setUp()
+        self.structure = make_structure()
+        self.index = StructureIndex(self.structure)
+
+    def test_block_keys_by_type(self):
+        assert self.index.block_keys_by_type['problem'] == [PROBLEM_1, PROBLEM_2, ORPHAN_CHILD]
+        assert self.index.block_keys_by_type['course'] == [COURSE]
+
+    def test_parents(self):
+        assert self.index.get_parents(PROBLEM_2) == [SEQUENTIAL]
+        assert self.index.get_parents(COURSE) == []
+        assert self.index.get_parents(BlockKey('problem', 'missing')) == []
+
+    def test_has_path_to_root(self):
+        for block_key in (COURSE, CHAPTER, SEQUENTIAL, PROBLEM_1, PROBLEM_2):
+            assert self.index.has_path_to_root(block_key)
+        assert not self.index.has_path_to_root(ORPHAN)
+        assert not self.index.has_path_to_root(ORPHAN_CHILD)
+
+    def test_parentless_block_keys(self):
+        assert self.index.get_parentless_block_keys() == [COURSE, ORPHAN]
+
+    def test_block_keys_with_value(self):
+        assert self.index.get_block_keys_with_value(self.structure, 'display_name', 'Problem') == [
+            PROBLEM_1, PROBLEM_2, ORPHAN_CHILD,
+        ]
+        assert self.index.get_block_keys_with_value(self.structure, 'tags', 'b') == [PROBLEM_1]
+        assert self.index.get_block_keys_with_value(self.structure, 'children', PROBLEM_1) == [SEQUENTIAL]
+        assert self.index.get_block_keys_with_value(self.structure, 'graded', 1) == [SEQUENTIAL]
+        assert self.index.get_block_keys_with_value(self.structure, 'weight', 2) == []
+
+    def test_candidate_block_keys(self):
+        assert self.index.get_candidate_block_keys(self.structure, {}, {}) is None
+        assert self.index.get_candidate_block_keys(self.structure, {'block_type': 'problem'}, {}) == [
+            PROBLEM_1, PROBLEM_2, ORPHAN_CHILD,
+        ]
+        assert self.index.get_candidate_block_keys(
+            self.structure, {'block_type': 'problem'}, {'weight': 1},
+        ) == [PROBLEM_1]
+        # Criteria that can't be looked up don't narrow the candidates down.
+        assert self.index.get_candidate_block_keys(
+            self.structure, {'block_type': {'$in': ['problem']}}, {'weight': lambda weight: weight > 0},
+        ) is None
+
+
+class TestStructureIndexCache(unittest.TestCase):
+    """
+    Test the LRU cache of StructureIndexes.
+    """
+    def test_lru(self):
+        cache = StructureIndexCache(max_size=2)
+        structures = [make_structure() for _ in range(3)]
+        first_index = cache.get(structures[0])
+        assert cache.get(structures[0]) is first_index
+
+        cache.get(structures[1])
+        cache.get(structures[0])
+        cache.get(structures[2])
+        assert cache.get(structures[0]) is first_index
+
+        cache.discard(structures[0]['_id'])
+        assert cache.get(structures[0]) is not first_index
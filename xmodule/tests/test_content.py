@@ -202,3 +202,18 @@ class ContentTest(unittest.TestCase):  # pylint: disable=missing-class-docstring
             total_length += len(chunck)
 
         assert total_length == ((last_byte - first_byte) + 1)
+
+    @ddt.data(1, 100, 1401, 4096)
+    def test_static_content_stream_stream_data_in_range_chunk_size(self, chunk_size):
+        """
+        Test StaticContentStream stream_data_in_range function with a given chunk size,
+        asserts that we get the requested bytes in chunks of at most chunk_size bytes
+        """
+        data = SAMPLE_STRING
+        item = FakeGridFsItem(data)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+
+        chunks = list(static_content_stream.stream_data_in_range(100, 1500, chunk_size=chunk_size))
+
+        assert ''.join(chunks) == data[100:1501]
+        assert max(len(chunk) for chunk in chunks) <= chunk_size